@@ -0,0 +1,88 @@
+"""
+Bulk exit throughput: serial process_exit loop versus process_exits.
+
+DynamoDB is replaced by an in-process fake that sleeps for a fixed latency on
+every call, so the numbers show how throughput scales with the thread pool
+size rather than measuring AWS itself.
+
+Usage: python benchmarks/bench_bulk_exit.py [tickets] [latency_ms]
+"""
+import os
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from services.parking_service import ParkingService  # noqa: E402
+
+
+class FakeTable:
+    """Minimal Table stand-in that supports the conditional exit update."""
+
+    def __init__(self, items, latency):
+        self.items = items
+        self.latency = latency
+        self.lock = threading.Lock()
+
+    def update_item(self, Key, ExpressionAttributeValues, **kwargs):
+        time.sleep(self.latency)
+        with self.lock:
+            item = self.items[Key['ticket_id']]
+            old = dict(item)
+            item['exit_time'] = ExpressionAttributeValues[':exit_time']
+        return {'Attributes': old}
+
+
+class FakeResource:
+    """Minimal DynamoDB resource stand-in with BatchGetItem."""
+
+    def __init__(self, table):
+        self.table = table
+        self.meta = SimpleNamespace(client=None)
+
+    def Table(self, name):
+        return self.table
+
+    def batch_get_item(self, RequestItems):
+        time.sleep(self.table.latency)
+        (table_name, request), = RequestItems.items()
+        found = [self.table.items[key['ticket_id']] for key in request['Keys']]
+        return {'Responses': {table_name: found}}
+
+
+def build_service(count, latency):
+    entry_time = (datetime.utcnow() - timedelta(hours=2)).isoformat()
+    items = {
+        f"ticket-{i}": {'ticket_id': f"ticket-{i}", 'plate': 'ABC123', 'parking_lot': 1, 'entry_time': entry_time}
+        for i in range(count)
+    }
+    with patch('storage.dynamodb.boto3.resource', return_value=FakeResource(FakeTable(items, latency))):
+        return ParkingService(), list(items)
+
+
+def run(label, count, latency, fn):
+    service, ticket_ids = build_service(count, latency)
+    start = time.perf_counter()
+    fn(service, ticket_ids)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<24} {elapsed * 1000:9.1f}ms  {count / elapsed:9.1f} exits/s")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    latency = (float(sys.argv[2]) if len(sys.argv) > 2 else 5.0) / 1000
+
+    print(f"{count} tickets, {latency * 1000:.1f}ms simulated DynamoDB latency")
+    run('serial process_exit', count, latency,
+        lambda service, ids: [service.process_exit(ticket_id) for ticket_id in ids])
+    for workers in (1, 4, 8, 16, 32):
+        run(f"process_exits workers={workers}", count, latency,
+            lambda service, ids: service.process_exits(ids, max_workers=workers))
+
+
+if __name__ == '__main__':
+    main()
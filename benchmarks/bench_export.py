@@ -0,0 +1,78 @@
+"""
+Ticket export throughput by Scan segment count.
+
+DynamoDB is replaced by an in-process fake client that sleeps for a fixed
+latency on every Scan page, so the numbers show how iter_tickets scales with
+parallel segments rather than measuring AWS itself. Peak read-ahead is
+reported to show that buffering stays bounded.
+
+Usage: python benchmarks/bench_export.py [tickets] [latency_ms] [page_size]
+"""
+import io
+import os
+import sys
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from services.export import write_csv  # noqa: E402
+from services.parking_service import ParkingService  # noqa: E402
+
+
+class FakeClient:
+    """Low-level client stand-in serving segmented Scan pages."""
+
+    def __init__(self, count, latency):
+        self.count = count
+        self.latency = latency
+
+    def scan(self, Limit, Segment=0, TotalSegments=1, ExclusiveStartKey=None, **kwargs):
+        time.sleep(self.latency)
+        # Segment s owns tickets s, s + TotalSegments, ...
+        start = int(ExclusiveStartKey['n']['N']) if ExclusiveStartKey else Segment
+        numbers = list(range(start, self.count, TotalSegments))[:Limit]
+        response = {'Items': [{
+            'ticket_id': {'S': f'ticket-{n}'},
+            'plate': {'S': 'ABC123'},
+            'parking_lot': {'N': str(n % 50 + 1)},
+            'entry_time': {'N': '1704103200'},
+            'exit_time': {'N': '1704106800'}
+        } for n in numbers]}
+        if len(numbers) == Limit and numbers[-1] + TotalSegments < self.count:
+            response['LastEvaluatedKey'] = {'n': {'N': str(numbers[-1] + TotalSegments)}}
+        return response
+
+
+class FakeResource:
+    def __init__(self, client):
+        self.meta = SimpleNamespace(client=client)
+
+    def Table(self, name):
+        return None
+
+
+def run(count, latency, page_size, segments):
+    with patch('storage.dynamodb.boto3.resource', return_value=FakeResource(FakeClient(count, latency))):
+        service = ParkingService()
+
+    start = time.perf_counter()
+    written = write_csv(service.iter_tickets(segments=segments, page_size=page_size), io.StringIO())
+    elapsed = time.perf_counter() - start
+    assert written == count
+    print(f"segments={segments:<3} {elapsed * 1000:9.1f}ms  {count / elapsed:10.1f} tickets/s")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    latency = (float(sys.argv[2]) if len(sys.argv) > 2 else 20.0) / 1000
+    page_size = int(sys.argv[3]) if len(sys.argv) > 3 else 1000
+
+    print(f"{count} tickets, {page_size} per page, {latency * 1000:.1f}ms simulated Scan latency")
+    for segments in (1, 2, 4, 8, 16):
+        run(count, latency, page_size, segments)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+"""
+Bulk fee calculation: scalar calculate_fee loop versus calculate_fees.
+
+Usage: python benchmarks/bench_fee_calculator.py [count]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from services.fee_calculator import FeeCalculator, get_numpy  # noqa: E402
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    calculator = FeeCalculator()
+
+    rng = random.Random(42)
+    durations = [rng.randint(0, 3 * 24 * 60) for _ in range(count)]
+
+    scalar, scalar_s = timed(lambda: [calculator.calculate_fee(d) for d in durations])
+    print(f"scalar loop:              {scalar_s * 1000:9.1f}ms  {count / scalar_s / 1e6:6.2f}M fees/s")
+
+    bulk, bulk_s = timed(lambda: calculator.calculate_fees(durations))
+    assert bulk == scalar
+    print(f"calculate_fees (list):    {bulk_s * 1000:9.1f}ms  {count / bulk_s / 1e6:6.2f}M fees/s")
+
+    np = get_numpy()
+    if np is not None:
+        array = np.array(durations)
+        bulk_array, array_s = timed(lambda: calculator.calculate_fees(array))
+        assert bulk_array.tolist() == scalar
+        print(f"calculate_fees (ndarray): {array_s * 1000:9.1f}ms  {count / array_s / 1e6:6.2f}M fees/s")
+    else:
+        print("NumPy not installed: calculate_fees used the pure Python fallback")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+"""
+Local handler load test on the in-memory storage engine.
+
+Drives the entry and exit Lambda handlers from a thread pool, with all
+storage in process, and reports request throughput for a single lock versus
+striped locks. No AWS calls are made.
+
+Usage: python benchmarks/bench_memory_storage.py [cars] [threads]
+"""
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+os.environ['STORAGE_ENGINE'] = 'memory'
+os.environ['LOG_LEVEL'] = 'WARNING'
+
+import json  # noqa: E402
+
+from handlers import entry, exit  # noqa: E402
+from services.parking_service import ParkingService  # noqa: E402
+from services.provider import set_parking_service  # noqa: E402
+from storage.memory import InMemoryStorage  # noqa: E402
+
+
+def park(index):
+    plate = f"CAR-{index:06d}"
+    response = entry.lambda_handler({'queryStringParameters': {'plate': plate, 'parkingLot': str(index % 50 + 1)}}, None)
+    ticket_id = json.loads(response['body'])['ticketId']
+    response = exit.lambda_handler({'queryStringParameters': {'ticketId': ticket_id}}, None)
+    assert response['statusCode'] == 200
+
+
+def run(label, stripes, cars, threads):
+    set_parking_service(ParkingService(InMemoryStorage(lock_stripes=stripes)))
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(park, range(cars)))
+    elapsed = time.perf_counter() - start
+    print(f"{label:<16} {elapsed * 1000:9.1f}ms  {2 * cars / elapsed:9.0f} requests/s")
+
+
+def main():
+    cars = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    threads = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+
+    print(f"{cars} entries + {cars} exits, {threads} threads")
+    run('64 lock stripes', 64, cars, threads)
+    run('1 lock', 1, cars, threads)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""
+Query parameter validation: extract_query_params + validate_* versus compiled decoders.
+
+Usage: python benchmarks/bench_request_decoding.py [iterations]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from utils.request_decoding import ENTRY_REQUEST  # noqa: E402
+from utils.validation import validate_license_plate, validate_parking_lot, extract_query_params  # noqa: E402
+
+
+def legacy_entry(event):
+    params = extract_query_params(event)
+    plate = params.get('plate', '').strip().upper()
+    parking_lot_str = params.get('parkingLot', '')
+
+    plate_valid, plate_error = validate_license_plate(plate)
+    if not plate_valid:
+        return None, plate_error
+    lot_valid, lot_error = validate_parking_lot(parking_lot_str)
+    if not lot_valid:
+        return None, lot_error
+    return {'plate': plate, 'parking_lot': int(parking_lot_str)}, None
+
+
+def compiled_entry(event):
+    return ENTRY_REQUEST(event.get('queryStringParameters'))
+
+
+def timed(fn, events, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for event in events:
+            fn(event)
+    return time.perf_counter() - start
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    cases = {
+        'valid': [{'queryStringParameters': {'plate': 'abc-123', 'parkingLot': '42'}}],
+        'invalid': [
+            {'queryStringParameters': {'plate': 'ABC@123', 'parkingLot': '42'}},
+            {'queryStringParameters': {'plate': 'ABC123', 'parkingLot': 'abc'}},
+            {'queryStringParameters': None},
+        ],
+    }
+
+    for name, events in cases.items():
+        for event in events:
+            assert legacy_entry(event) == compiled_entry(event)
+
+        requests = iterations * len(events)
+        legacy_s = timed(legacy_entry, events, iterations)
+        compiled_s = timed(compiled_entry, events, iterations)
+        print(f"{name:8s} legacy:   {legacy_s / requests * 1e9:7.0f}ns/request")
+        print(f"{name:8s} compiled: {compiled_s / requests * 1e9:7.0f}ns/request  ({legacy_s / compiled_s:.2f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""
+Per-request logging cost: f-string event dump versus structured log_request.
+
+Usage: python benchmarks/bench_request_logging.py [iterations]
+"""
+import io
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from utils.log import configure_logging, log_request  # noqa: E402
+
+# Representative API Gateway proxy event
+EVENT = {
+    'resource': '/entry',
+    'path': '/entry',
+    'httpMethod': 'POST',
+    'headers': {f'Header-{index}': 'x' * 40 for index in range(20)},
+    'multiValueHeaders': {f'Header-{index}': ['x' * 40] for index in range(20)},
+    'queryStringParameters': {'plate': 'ABC-123', 'parkingLot': '42'},
+    'requestContext': {
+        'requestId': 'c6af9ac6-7b61-11e6-9a41-93e8deadbeef',
+        'identity': {'sourceIp': '203.0.113.10', 'userAgent': 'Mozilla/5.0 ' * 5},
+        'stage': 'prod'
+    },
+    'body': None,
+    'isBase64Encoded': False
+}
+
+
+def run(label, fn, stream, iterations):
+    stream.seek(0)
+    stream.truncate()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:26s} {elapsed / iterations * 1e6:7.2f}us/request  {stream.tell() / iterations:7.0f} bytes/request")
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    stream = io.StringIO()
+    root = logging.getLogger()
+    root.handlers = [logging.StreamHandler(stream)]
+    logger = root
+
+    root.handlers[0].setFormatter(logging.Formatter('%(levelname)s %(message)s'))
+    root.setLevel(logging.INFO)
+    run("f-string event dump", lambda: logger.info(f"Entry request: {EVENT}"), stream, iterations)
+
+    configure_logging('INFO', 0)
+    run("log_request", lambda: log_request(logger, "Entry request", EVENT), stream, iterations)
+
+    configure_logging('INFO', 0.01)
+    run("log_request (1% sampled)", lambda: log_request(logger, "Entry request", EVENT), stream, iterations)
+
+    configure_logging('WARNING', 0)
+    run("log_request (WARNING)", lambda: log_request(logger, "Entry request", EVENT), stream, iterations)
+
+
+if __name__ == '__main__':
+    main()
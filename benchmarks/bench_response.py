@@ -0,0 +1,71 @@
+"""
+Response construction: original create_response versus the cached/pluggable path.
+
+Usage: python benchmarks/bench_response.py [iterations]
+"""
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from utils import response  # noqa: E402
+from utils.response import success_response, not_found_response, set_json_encoder, stdlib_dumps  # noqa: E402
+
+EXIT_BODY = {'plate': 'ABC-123', 'totalTimeMinutes': 90, 'parkingLot': 5, 'chargeUSD': 15.0}
+BATCH_BODY = {'results': [
+    {'ticketId': f'a1b2c3d4-e5f6-7890-abcd-ef12345678{index:02d}', 'status': 'processed', **EXIT_BODY}
+    for index in range(100)
+]}
+
+
+def legacy_create_response(status_code, body, headers=None):
+    default_headers = {
+        'Content-Type': 'application/json',
+        'Access-Control-Allow-Origin': '*',
+        'Access-Control-Allow-Methods': 'GET, POST, OPTIONS',
+        'Access-Control-Allow-Headers': 'Content-Type'
+    }
+    if headers:
+        default_headers.update(headers)
+    return {'statusCode': status_code, 'headers': default_headers, 'body': json.dumps(body, default=str)}
+
+
+def legacy_not_found(message):
+    return legacy_create_response(404, {'error': message, 'statusCode': 404, 'errorCode': 'NOT_FOUND'})
+
+
+def per_call(fn, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1e9
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    cases = [
+        ('success (exit body)', lambda: legacy_create_response(200, EXIT_BODY), lambda: success_response(EXIT_BODY), 1),
+        ('success (100 results)', lambda: legacy_create_response(200, BATCH_BODY), lambda: success_response(BATCH_BODY), 100),
+        ('error (not found)', lambda: legacy_not_found("Ticket not found"), lambda: not_found_response("Ticket not found"), 1),
+    ]
+    encoders = [('json', stdlib_dumps)]
+    if response.orjson is not None:
+        encoders.append(('orjson', response.orjson_dumps))
+
+    for label, legacy, current, scale in cases:
+        count = max(iterations // scale, 1)
+        legacy_ns = per_call(legacy, count)
+        print(f"{label:22s} legacy:  {legacy_ns:9.0f}ns")
+        for name, dumps in encoders:
+            set_json_encoder(dumps)
+            if name == 'json':
+                assert current() == legacy()
+            current_ns = per_call(current, count)
+            print(f"{label:22s} {name + ':':8s} {current_ns:9.0f}ns  ({legacy_ns / current_ns:.2f}x)")
+    set_json_encoder(None)
+
+
+if __name__ == '__main__':
+    main()
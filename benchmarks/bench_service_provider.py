@@ -0,0 +1,48 @@
+"""
+Cold versus warm ParkingService acquisition.
+
+Compares building a new ParkingService per request (the old handler
+behaviour) with the container-scoped provider. No AWS calls are made: only
+session, resource and table construction are measured.
+
+Usage: python benchmarks/bench_service_provider.py [iterations]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+os.environ.setdefault('AWS_DEFAULT_REGION', 'eu-north-1')
+
+from services.parking_service import ParkingService  # noqa: E402
+from services.provider import get_parking_service, reset_parking_service  # noqa: E402
+
+
+def measure(fn, iterations):
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return samples[len(samples) // 2], samples[int(len(samples) * 0.95) - 1]
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    per_request_p50, per_request_p95 = measure(ParkingService, iterations)
+
+    reset_parking_service()
+    start = time.perf_counter()
+    get_parking_service()
+    cold_ms = (time.perf_counter() - start) * 1000
+    warm_p50, warm_p95 = measure(get_parking_service, iterations)
+
+    print(f"new ParkingService per request: p50={per_request_p50:.3f}ms p95={per_request_p95:.3f}ms")
+    print(f"provider cold (first call):     {cold_ms:.3f}ms")
+    print(f"provider warm:                  p50={warm_p50 * 1000:.3f}us p95={warm_p95 * 1000:.3f}us")
+
+
+if __name__ == '__main__':
+    main()
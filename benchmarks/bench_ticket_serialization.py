@@ -0,0 +1,66 @@
+"""
+ParkingTicket storage format: legacy ISO-8601 items versus compact epoch items.
+
+Reports DynamoDB item size and to_dict / from_dict cost per ticket.
+
+Usage: python benchmarks/bench_ticket_serialization.py [iterations]
+"""
+import os
+import sys
+import timeit
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from models.parking_ticket import ParkingTicket  # noqa: E402
+
+
+def item_size(item):
+    """Approximate DynamoDB item size: attribute names plus values."""
+    size = 0
+    for name, value in item.items():
+        size += len(name)
+        if value is None:
+            size += 1
+        elif isinstance(value, str):
+            size += len(value.encode('utf-8'))
+        else:
+            # Numbers take about one byte per two significant digits, plus one
+            size += (len(str(value).lstrip('-')) + 1) // 2 + 1
+    return size
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+
+    ticket = ParkingTicket.create_new("ABC123", 42)
+    compact = ticket.to_dict()
+    legacy = {
+        'ticket_id': ticket.ticket_id,
+        'plate': ticket.plate,
+        'parking_lot': ticket.parking_lot,
+        'entry_time': ticket.entry_time.isoformat(),
+        'exit_time': None,
+        'active_plate': ticket.plate
+    }
+
+    print(f"active item size:  legacy={item_size(legacy)}B compact={item_size(compact)}B")
+
+    ticket.mark_exit()
+    exited = ticket.to_dict()
+    legacy_exited = dict(legacy, exit_time=ticket.exit_time.isoformat())
+    del legacy_exited['active_plate']
+    print(f"exited item size:  legacy={item_size(legacy_exited)}B compact={item_size(exited)}B")
+
+    for label, fn in [
+        ('to_dict (compact)', ticket.to_dict),
+        ('from_dict (compact)', lambda: ParkingTicket.from_dict(compact)),
+        ('from_dict (legacy ISO)', lambda: ParkingTicket.from_dict(legacy)),
+        ('datetime.fromisoformat', lambda: datetime.fromisoformat(legacy['entry_time'])),
+    ]:
+        seconds = timeit.timeit(fn, number=iterations)
+        print(f"{label:<24} {seconds / iterations * 1e9:8.0f}ns/op")
+
+
+if __name__ == '__main__':
+    main()
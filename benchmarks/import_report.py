@@ -0,0 +1,130 @@
+"""
+Cold-start import report for each Lambda handler.
+
+Each handler is bundled the way scripts/package.sh does it and imported in a
+fresh interpreter under `python -X importtime`, once from sources only and
+once with precompiled bytecode. The report shows total import time, the
+share of each top-level package and the slowest modules by self time.
+Building the ParkingService, which first imports boto3, is reported
+separately because it happens on the first request rather than at import.
+
+Usage: python benchmarks/import_report.py [handler ...] [--top 10] [--json]
+"""
+import argparse
+import compileall
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+from typing import Dict, List
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, os.path.join(ROOT, 'scripts'))
+
+from bundle import source_files, SRC_DIR  # noqa: E402
+
+HANDLERS = ['entry', 'exit', 'batch_entry', 'batch_exit', 'occupancy']
+IMPORT_LINE = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+SERVICE_INIT = 'from services.provider import get_parking_service; get_parking_service()'
+
+
+def build_bundle(handler: str, target: str) -> None:
+    for path in source_files(f'handlers.{handler}'):
+        destination = os.path.join(target, os.path.relpath(path, SRC_DIR))
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+        with open(path, 'rb') as source, open(destination, 'wb') as copy:
+            copy.write(source.read())
+
+
+def import_times(bundle: str, code: str) -> List[dict]:
+    """Run code with -X importtime; returns one entry per imported module, in microseconds."""
+    env = dict(os.environ, PYTHONPATH=bundle, AWS_DEFAULT_REGION=os.environ.get('AWS_DEFAULT_REGION', 'eu-north-1'))
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=bundle, env=env, capture_output=True, text=True, check=True
+    )
+
+    modules = []
+    for line in result.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if match:
+            modules.append({
+                'module': match.group(4),
+                'self_us': int(match.group(1)),
+                'cumulative_us': int(match.group(2)),
+                'depth': len(match.group(3)) // 2
+            })
+    return modules
+
+
+def summarize(modules: List[dict], top: int) -> dict:
+    by_package: Dict[str, int] = {}
+    for module in modules:
+        package = module['module'].split('.')[0]
+        by_package[package] = by_package.get(package, 0) + module['self_us']
+
+    return {
+        'total_ms': round(sum(module['self_us'] for module in modules) / 1000, 2),
+        'by_package_ms': {
+            package: round(us / 1000, 2)
+            for package, us in sorted(by_package.items(), key=lambda pair: pair[1], reverse=True)[:top]
+        },
+        'slowest_modules_ms': {
+            module['module']: round(module['self_us'] / 1000, 2)
+            for module in sorted(modules, key=lambda module: module['self_us'], reverse=True)[:top]
+        }
+    }
+
+
+def report(handler: str, top: int) -> dict:
+    with tempfile.TemporaryDirectory() as bundle:
+        build_bundle(handler, bundle)
+        import_code = f'import handlers.{handler}'
+
+        # Sources only: nothing cached yet, and -B keeps it that way
+        source = summarize(import_times(bundle, f'import sys; sys.dont_write_bytecode = True; {import_code}'), top)
+
+        compileall.compile_dir(bundle, quiet=1, invalidation_mode=compileall.py_compile.PycInvalidationMode.UNCHECKED_HASH)
+        compiled_modules = import_times(bundle, f'{import_code}; {SERVICE_INIT}')
+
+    # Modules imported by the service init line come after the handler's own imports
+    handler_index = next(index for index, module in enumerate(compiled_modules) if module['module'] == f'handlers.{handler}')
+    return {
+        'import_from_source': source,
+        'import_precompiled': summarize(compiled_modules[:handler_index + 1], top),
+        'first_request_service_init': summarize(compiled_modules[handler_index + 1:], top)
+    }
+
+
+def print_report(handler: str, result: dict) -> None:
+    print(f"handlers.{handler}")
+    for phase, summary in result.items():
+        print(f"  {phase:<28} {summary['total_ms']:8.2f}ms")
+        packages = ', '.join(f"{name} {ms:.1f}" for name, ms in summary['by_package_ms'].items())
+        print(f"    by package (ms): {packages}")
+        modules = ', '.join(f"{name} {ms:.1f}" for name, ms in summary['slowest_modules_ms'].items())
+        print(f"    slowest (ms):    {modules}")
+    print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('handlers', nargs='*', default=HANDLERS)
+    parser.add_argument('--top', type=int, default=8)
+    parser.add_argument('--json', action='store_true', help='print the report as JSON')
+    args = parser.parse_args()
+
+    results = {handler: report(handler, args.top) for handler in args.handlers}
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for handler, result in results.items():
+            print_report(handler, result)
+
+
+if __name__ == '__main__':
+    main()
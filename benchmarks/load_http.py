@@ -0,0 +1,154 @@
+"""
+HTTP load test for the long-running server (python -m server).
+
+Opens keep-alive connections and sends entry requests, or entry/exit
+pairs, as fast as the server answers. Reports throughput and p50/p95/p99
+latency in milliseconds.
+
+Usage:
+    python benchmarks/load_http.py [--url http://127.0.0.1:8080] [--connections 64]
+                                   [--requests 20000] [--scenario entry|entry-exit] [--spawn]
+
+With --spawn, a server on the in-memory storage engine is started in a
+separate process for the run.
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from typing import List, Optional
+from urllib.parse import urlsplit
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+
+
+class Connection:
+    """One keep-alive HTTP/1.1 connection."""
+
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+
+    async def request(self, method: str, target: str, body: bytes = b'') -> tuple:
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+        self.writer.write(
+            f"{method} {target} HTTP/1.1\r\nHost: {self.host}\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body
+        )
+        head = await self.reader.readuntil(b'\r\n\r\n')
+
+        lines = head.decode('latin-1').split('\r\n')
+        status = int(lines[0].split(' ')[1])
+        headers = {name.lower(): value.strip() for name, _, value in (line.partition(':') for line in lines[1:] if line)}
+        payload = await self.reader.readexactly(int(headers.get('content-length', '0')))
+
+        if headers.get('connection', '').lower() == 'close':
+            self.close()
+        return status, payload
+
+    def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+
+async def worker(index: int, host: str, port: int, scenario: str, counter, latencies: List[float], errors: List[str]):
+    connection = Connection(host, port)
+    try:
+        for request_number in counter:
+            start = time.perf_counter()
+            plate = f'LOAD-{index:03d}-{request_number % 100000:05d}'
+            status, payload = await connection.request('POST', f'/entry?plate={plate}&parkingLot={request_number % 50 + 1}')
+            if status != 201:
+                errors.append(f'entry {status}')
+                continue
+
+            if scenario == 'entry-exit':
+                ticket_id = json.loads(payload)['ticketId']
+                status, _ = await connection.request('POST', f'/exit?ticketId={ticket_id}')
+                if status != 200:
+                    errors.append(f'exit {status}')
+                    continue
+
+            latencies.append(time.perf_counter() - start)
+    finally:
+        connection.close()
+
+
+def percentile(samples: List[float], p: float) -> float:
+    """Nearest-rank percentile of sorted samples."""
+    rank = max(1, int(round(p / 100 * len(samples))))
+    return samples[min(rank, len(samples)) - 1]
+
+
+async def run(url: str, connections: int, requests: int, scenario: str) -> dict:
+    target = urlsplit(url)
+    host, port = target.hostname, target.port or 80
+    counter = iter(range(requests))
+    latencies: List[float] = []
+    errors: List[str] = []
+
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        worker(index, host, port, scenario, counter, latencies, errors) for index in range(connections)
+    ))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        'scenario': scenario,
+        'connections': connections,
+        'requests': len(latencies),
+        'errors': len(errors),
+        'seconds': round(elapsed, 3),
+        'requests_per_second': round(len(latencies) / elapsed, 1),
+        'latency_ms': {
+            f'p{p}': round(percentile(latencies, p) * 1000, 3) for p in (50, 95, 99)
+        } if latencies else {}
+    }
+
+
+def spawn_server(port: int) -> subprocess.Popen:
+    env = dict(os.environ, PYTHONPATH=SRC, STORAGE_ENGINE='memory', LOG_LEVEL='WARNING')
+    process = subprocess.Popen([sys.executable, '-m', 'server', '--port', str(port)], env=env)
+
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1).close()
+            return process
+        except OSError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError('server did not start')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--url', default='http://127.0.0.1:8080')
+    parser.add_argument('--connections', type=int, default=64)
+    parser.add_argument('--requests', type=int, default=20000)
+    parser.add_argument('--scenario', choices=['entry', 'entry-exit'], default='entry')
+    parser.add_argument('--spawn', action='store_true', help='start a server on the in-memory engine for the run')
+    args = parser.parse_args()
+
+    server = spawn_server(urlsplit(args.url).port or 80) if args.spawn else None
+    try:
+        result = asyncio.run(run(args.url, args.connections, args.requests, args.scenario))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == '__main__':
+    main()
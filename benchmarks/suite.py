@@ -0,0 +1,236 @@
+"""
+Benchmark suite: handler latency, handler cold import, fee calculation and
+ticket serialization.
+
+Handlers run on the in-memory storage engine, so no AWS calls are made.
+Every benchmark reports p50/p95/p99 in microseconds as JSON. Fast operations
+are timed in batches and each sample is the per-call average of one batch.
+
+Results are compared with the committed baseline (benchmarks/baseline.json):
+any percentile slower than the baseline by more than the threshold is flagged
+as a regression. Passing --baseline or --fail-on-regression without an existing
+baseline file is an error.
+
+Usage:
+    python benchmarks/suite.py [--only NAME ...] [--output results.json]
+                               [--baseline benchmarks/baseline.json] [--threshold 0.25]
+                               [--save-baseline] [--fail-on-regression]
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+sys.path.insert(0, SRC)
+os.environ['STORAGE_ENGINE'] = 'memory'
+os.environ['LOG_LEVEL'] = 'WARNING'
+
+from models.parking_ticket import ParkingTicket  # noqa: E402
+from services.fee_calculator import FeeCalculator  # noqa: E402
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+PERCENTILES = (50, 95, 99)
+
+
+def percentile(samples: List[float], p: float) -> float:
+    """Nearest-rank percentile of sorted samples."""
+    rank = max(1, int(round(p / 100 * len(samples))))
+    return samples[min(rank, len(samples)) - 1]
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """Percentiles and mean of samples in seconds, reported in microseconds."""
+    samples = sorted(sample * 1e6 for sample in samples)
+    summary = {f'p{p}': round(percentile(samples, p), 3) for p in PERCENTILES}
+    summary['mean'] = round(sum(samples) / len(samples), 3)
+    summary['samples'] = len(samples)
+    return summary
+
+
+def sample(fn: Callable[[], None], count: int, batch: int = 1, warmup: int = 10) -> List[float]:
+    """Time fn, returning per-call seconds averaged over batches of calls."""
+    for _ in range(warmup):
+        fn()
+
+    samples = []
+    for _ in range(count):
+        start = time.perf_counter()
+        for _ in range(batch):
+            fn()
+        samples.append((time.perf_counter() - start) / batch)
+    return samples
+
+
+def bench_entry_handler(count: int) -> List[float]:
+    from handlers import entry
+    from services.parking_service import ParkingService
+    from services.provider import set_parking_service
+
+    set_parking_service(ParkingService())
+    counter = iter(range(10 ** 9))
+
+    def invoke():
+        index = next(counter)
+        event = {'queryStringParameters': {'plate': f'CAR-{index % 100000:05d}', 'parkingLot': str(index % 50 + 1)}}
+        response = entry.lambda_handler(event, None)
+        assert response['statusCode'] == 201
+
+    return sample(invoke, count)
+
+
+def bench_exit_handler(count: int) -> List[float]:
+    from handlers import exit
+    from services.parking_service import ParkingService
+    from services.provider import set_parking_service
+
+    service = ParkingService()
+    set_parking_service(service)
+    warmup = 10
+    ticket_ids = iter([service.create_entry(f'CAR-{index:05d}', index % 50 + 1) for index in range(count + warmup)])
+
+    def invoke():
+        response = exit.lambda_handler({'queryStringParameters': {'ticketId': next(ticket_ids)}}, None)
+        assert response['statusCode'] == 200
+
+    return sample(invoke, count, warmup=warmup)
+
+
+def bench_cold_import(module: str, count: int) -> List[float]:
+    """Import a handler in a fresh interpreter; only the import itself is timed."""
+    code = (
+        'import sys, time; sys.path.insert(0, sys.argv[1]); '
+        f'start = time.perf_counter(); import {module}; print(time.perf_counter() - start)'
+    )
+    return [
+        float(subprocess.run([sys.executable, '-c', code, SRC], check=True, capture_output=True, text=True).stdout)
+        for _ in range(count)
+    ]
+
+
+def bench_calculate_fee(count: int) -> List[float]:
+    calculator = FeeCalculator(10.0, 15)
+    durations = iter([random.Random(42).randint(0, 3 * 24 * 60) for _ in range(1000)] * (count + 10) * 10)
+    return sample(lambda: calculator.calculate_fee(next(durations)), count, batch=1000)
+
+
+def bench_calculate_fees(count: int) -> List[float]:
+    calculator = FeeCalculator(10.0, 15)
+    rng = random.Random(42)
+    durations = [rng.randint(0, 3 * 24 * 60) for _ in range(10_000)]
+    return sample(lambda: calculator.calculate_fees(durations), count, warmup=2)
+
+
+def bench_ticket_to_dict(count: int) -> List[float]:
+    ticket = ParkingTicket('a1b2c3d4-e5f6-7890-abcd-ef1234567890', 'ABC-123', 42, datetime(2024, 1, 1, 10, 0, 0))
+    return sample(ticket.to_dict, count, batch=1000)
+
+
+def bench_ticket_from_dict(count: int) -> List[float]:
+    ticket = ParkingTicket(
+        'a1b2c3d4-e5f6-7890-abcd-ef1234567890', 'ABC-123', 42,
+        datetime(2024, 1, 1, 10, 0, 0), datetime(2024, 1, 1, 10, 0, 0) + timedelta(minutes=90)
+    )
+    item = ticket.to_dict()
+    return sample(lambda: ParkingTicket.from_dict(item), count, batch=1000)
+
+
+# name -> (benchmark, sample count)
+BENCHMARKS: Dict[str, tuple] = {
+    'handler.entry': (bench_entry_handler, 5000),
+    'handler.exit': (bench_exit_handler, 5000),
+    'import.handlers.entry': (lambda count: bench_cold_import('handlers.entry', count), 15),
+    'import.handlers.exit': (lambda count: bench_cold_import('handlers.exit', count), 15),
+    'fee.calculate_fee': (bench_calculate_fee, 200),
+    'fee.calculate_fees_10k': (bench_calculate_fees, 50),
+    'ticket.to_dict': (bench_ticket_to_dict, 200),
+    'ticket.from_dict': (bench_ticket_from_dict, 200),
+}
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]], threshold: float) -> List[str]:
+    """
+    Flag percentiles slower than the baseline by more than the threshold.
+
+    Returns:
+        Regression descriptions; each flagged result also gets a 'regressions' entry
+    """
+    regressions = []
+    for name, summary in results.items():
+        reference = baseline.get(name)
+        if not reference:
+            continue
+
+        for key in (f'p{p}' for p in PERCENTILES):
+            if key in reference and reference[key] > 0 and summary[key] > reference[key] * (1 + threshold):
+                change = summary[key] / reference[key] - 1
+                summary.setdefault('regressions', {})[key] = round(change, 3)
+                regressions.append(f"{name} {key}: {reference[key]:.3f}us -> {summary[key]:.3f}us (+{change:.0%})")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--only', nargs='*', help='benchmark names or prefixes to run')
+    parser.add_argument('--output', help='write results JSON to this file instead of stdout')
+    parser.add_argument('--baseline', help=f'baseline results JSON (default: {DEFAULT_BASELINE})')
+    parser.add_argument('--threshold', type=float, default=0.25, help='allowed slowdown before flagging (0.25 = 25%%)')
+    parser.add_argument('--scale', type=float, default=1.0, help='multiply sample counts')
+    parser.add_argument('--save-baseline', action='store_true', help='store these results as the baseline')
+    parser.add_argument('--fail-on-regression', action='store_true', help='exit with status 1 on regressions')
+    args = parser.parse_args(argv)
+
+    baseline_path = args.baseline or DEFAULT_BASELINE
+    if not args.save_baseline and not os.path.exists(baseline_path):
+        # A requested comparison must not silently pass without a reference
+        if args.baseline or args.fail_on_regression:
+            parser.error(f"baseline {baseline_path} not found; create it with --save-baseline")
+        print(f"No baseline at {baseline_path}; regressions are not checked", file=sys.stderr)
+
+    results: Dict[str, Dict[str, float]] = {}
+    for name, (bench, count) in BENCHMARKS.items():
+        if args.only and not any(name.startswith(prefix) for prefix in args.only):
+            continue
+        results[name] = summarize(bench(max(1, int(count * args.scale))))
+        print(f"{name:<24} p50={results[name]['p50']:>10.3f}us  p95={results[name]['p95']:>10.3f}us  "
+              f"p99={results[name]['p99']:>10.3f}us", file=sys.stderr)
+
+    regressions: List[str] = []
+    if os.path.exists(baseline_path) and not args.save_baseline:
+        with open(baseline_path) as f:
+            regressions = compare(results, json.load(f)['results'], args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+
+    report = {
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'timestamp': datetime.utcnow().isoformat(timespec='seconds') + 'Z',
+        'unit': 'us',
+        'results': results,
+        'regressions': regressions
+    }
+
+    if args.save_baseline:
+        with open(baseline_path, 'w') as f:
+            json.dump(report, f, indent=2)
+            f.write('\n')
+        print(f"Baseline saved to {baseline_path}", file=sys.stderr)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+    return 1 if regressions and args.fail_on_regression else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,17 +1,25 @@
-# Archive source code for Lambda deployment
-data "archive_file" "lambda_zip" {
-  type        = "zip"
-  source_dir  = "../src"
-  output_path = "../dist/lambda_function.zip"
+# Per-handler bundles built by scripts/package.sh (only the modules each
+# handler imports, with precompiled bytecode)
+locals {
+  lambda_packages = {
+    entry         = "../dist/entry.zip"
+    exit          = "../dist/exit.zip"
+    batch_entry   = "../dist/batch_entry.zip"
+    batch_exit    = "../dist/batch_exit.zip"
+    occupancy     = "../dist/occupancy.zip"
+    quote         = "../dist/quote.zip"
+    rollups       = "../dist/rollups.zip"
+    rollup_stream = "../dist/rollup_stream.zip"
+  }
 }
 
 # Entry Lambda function
 resource "aws_lambda_function" "entry_lambda" {
-  filename         = data.archive_file.lambda_zip.output_path
+  filename         = local.lambda_packages.entry
   function_name    = "${var.project_name}-entry"
   role             = aws_iam_role.lambda_role.arn
   handler          = "handlers.entry.lambda_handler"
-  source_code_hash = data.archive_file.lambda_zip.output_base64sha256
+  source_code_hash = filebase64sha256(local.lambda_packages.entry)
   runtime          = "python3.12"
   timeout          = 30
 
@@ -20,6 +28,16 @@ resource "aws_lambda_function" "entry_lambda" {
       PARKING_TABLE_NAME        = aws_dynamodb_table.parking_tickets.name
       HOURLY_RATE               = var.hourly_rate
       BILLING_INCREMENT_MINUTES = var.billing_increment_minutes
+      TICKET_ID_SECRET          = random_password.ticket_id_secret.result
+      TARIFF_SCHEDULE           = var.tariff_schedule
+      OCCUPANCY_TABLE_NAME      = aws_dynamodb_table.parking_occupancy.name
+      OCCUPANCY_SHARDS          = var.occupancy_shards
+      OCCUPANCY_HOT_LOTS        = var.occupancy_hot_lots
+      METRICS_ENABLED           = var.metrics_enabled
+      LOG_LEVEL                 = var.log_level
+      LOG_EVENT_SAMPLE_RATE     = var.log_event_sample_rate
+      IDEMPOTENCY_TABLE_NAME    = aws_dynamodb_table.parking_idempotency.name
+      IDEMPOTENCY_TTL_SECONDS   = var.idempotency_ttl_seconds
     }
   }
 
@@ -32,11 +50,11 @@ resource "aws_lambda_function" "entry_lambda" {
 
 # Exit Lambda function
 resource "aws_lambda_function" "exit_lambda" {
-  filename         = data.archive_file.lambda_zip.output_path
+  filename         = local.lambda_packages.exit
   function_name    = "${var.project_name}-exit"
   role             = aws_iam_role.lambda_role.arn
   handler          = "handlers.exit.lambda_handler"
-  source_code_hash = data.archive_file.lambda_zip.output_base64sha256
+  source_code_hash = filebase64sha256(local.lambda_packages.exit)
   runtime          = "python3.12"
   timeout          = 30
 
@@ -45,6 +63,15 @@ resource "aws_lambda_function" "exit_lambda" {
       PARKING_TABLE_NAME        = aws_dynamodb_table.parking_tickets.name
       HOURLY_RATE               = var.hourly_rate
       BILLING_INCREMENT_MINUTES = var.billing_increment_minutes
+      TICKET_ID_SECRET          = random_password.ticket_id_secret.result
+      TARIFF_SCHEDULE           = var.tariff_schedule
+      OCCUPANCY_TABLE_NAME      = aws_dynamodb_table.parking_occupancy.name
+      OCCUPANCY_SHARDS          = var.occupancy_shards
+      OCCUPANCY_HOT_LOTS        = var.occupancy_hot_lots
+      DYNAMODB_HEDGE_READS      = var.hedge_reads
+      METRICS_ENABLED           = var.metrics_enabled
+      LOG_LEVEL                 = var.log_level
+      LOG_EVENT_SAMPLE_RATE     = var.log_event_sample_rate
     }
   }
 
@@ -55,6 +82,215 @@ resource "aws_lambda_function" "exit_lambda" {
   }
 }
 
+# Batch entry Lambda function
+resource "aws_lambda_function" "batch_entry_lambda" {
+  filename         = local.lambda_packages.batch_entry
+  function_name    = "${var.project_name}-batch-entry"
+  role             = aws_iam_role.lambda_role.arn
+  handler          = "handlers.batch_entry.lambda_handler"
+  source_code_hash = filebase64sha256(local.lambda_packages.batch_entry)
+  runtime          = "python3.12"
+  timeout          = 30
+
+  environment {
+    variables = {
+      PARKING_TABLE_NAME        = aws_dynamodb_table.parking_tickets.name
+      HOURLY_RATE               = var.hourly_rate
+      BILLING_INCREMENT_MINUTES = var.billing_increment_minutes
+      TICKET_ID_SECRET          = random_password.ticket_id_secret.result
+      TARIFF_SCHEDULE           = var.tariff_schedule
+      OCCUPANCY_TABLE_NAME      = aws_dynamodb_table.parking_occupancy.name
+      OCCUPANCY_SHARDS          = var.occupancy_shards
+      OCCUPANCY_HOT_LOTS        = var.occupancy_hot_lots
+      LOG_LEVEL                 = var.log_level
+      LOG_EVENT_SAMPLE_RATE     = var.log_event_sample_rate
+    }
+  }
+
+  tags = {
+    Name        = "ParkingBatchEntryFunction"
+    Environment = var.environment
+    Project     = "parking-lot-system"
+  }
+}
+
+# Batch exit Lambda function
+resource "aws_lambda_function" "batch_exit_lambda" {
+  filename         = local.lambda_packages.batch_exit
+  function_name    = "${var.project_name}-batch-exit"
+  role             = aws_iam_role.lambda_role.arn
+  handler          = "handlers.batch_exit.lambda_handler"
+  source_code_hash = filebase64sha256(local.lambda_packages.batch_exit)
+  runtime          = "python3.12"
+  timeout          = 30
+
+  environment {
+    variables = {
+      PARKING_TABLE_NAME        = aws_dynamodb_table.parking_tickets.name
+      HOURLY_RATE               = var.hourly_rate
+      BILLING_INCREMENT_MINUTES = var.billing_increment_minutes
+      TICKET_ID_SECRET          = random_password.ticket_id_secret.result
+      TARIFF_SCHEDULE           = var.tariff_schedule
+      OCCUPANCY_TABLE_NAME      = aws_dynamodb_table.parking_occupancy.name
+      OCCUPANCY_SHARDS          = var.occupancy_shards
+      OCCUPANCY_HOT_LOTS        = var.occupancy_hot_lots
+      EXIT_WORKERS              = var.exit_workers
+      DYNAMODB_HEDGE_READS      = var.hedge_reads
+      LOG_LEVEL                 = var.log_level
+      LOG_EVENT_SAMPLE_RATE     = var.log_event_sample_rate
+    }
+  }
+
+  tags = {
+    Name        = "ParkingBatchExitFunction"
+    Environment = var.environment
+    Project     = "parking-lot-system"
+  }
+}
+
+# Occupancy Lambda function
+resource "aws_lambda_function" "occupancy_lambda" {
+  filename         = local.lambda_packages.occupancy
+  function_name    = "${var.project_name}-occupancy"
+  role             = aws_iam_role.lambda_role.arn
+  handler          = "handlers.occupancy.lambda_handler"
+  source_code_hash = filebase64sha256(local.lambda_packages.occupancy)
+  runtime          = "python3.12"
+  timeout          = 30
+
+  environment {
+    variables = {
+      PARKING_TABLE_NAME    = aws_dynamodb_table.parking_tickets.name
+      OCCUPANCY_TABLE_NAME  = aws_dynamodb_table.parking_occupancy.name
+      OCCUPANCY_SHARDS      = var.occupancy_shards
+      OCCUPANCY_HOT_LOTS    = var.occupancy_hot_lots
+      LOG_LEVEL             = var.log_level
+      LOG_EVENT_SAMPLE_RATE = var.log_event_sample_rate
+    }
+  }
+
+  tags = {
+    Name        = "ParkingOccupancyFunction"
+    Environment = var.environment
+    Project     = "parking-lot-system"
+  }
+}
+
+# Quote Lambda function; read-only, prices with the same tariff as exit
+resource "aws_lambda_function" "quote_lambda" {
+  filename         = local.lambda_packages.quote
+  function_name    = "${var.project_name}-quote"
+  role             = aws_iam_role.lambda_role.arn
+  handler          = "handlers.quote.lambda_handler"
+  source_code_hash = filebase64sha256(local.lambda_packages.quote)
+  runtime          = "python3.12"
+  timeout          = 30
+
+  environment {
+    variables = {
+      PARKING_TABLE_NAME        = aws_dynamodb_table.parking_tickets.name
+      HOURLY_RATE               = var.hourly_rate
+      BILLING_INCREMENT_MINUTES = var.billing_increment_minutes
+      TICKET_ID_SECRET          = random_password.ticket_id_secret.result
+      TARIFF_SCHEDULE           = var.tariff_schedule
+      DYNAMODB_HEDGE_READS      = var.hedge_reads
+      LOG_LEVEL                 = var.log_level
+      LOG_EVENT_SAMPLE_RATE     = var.log_event_sample_rate
+    }
+  }
+
+  tags = {
+    Name        = "ParkingQuoteFunction"
+    Environment = var.environment
+    Project     = "parking-lot-system"
+  }
+}
+
+# Rollup query Lambda function
+resource "aws_lambda_function" "rollups_lambda" {
+  filename         = local.lambda_packages.rollups
+  function_name    = "${var.project_name}-rollups"
+  role             = aws_iam_role.lambda_role.arn
+  handler          = "handlers.rollups.lambda_handler"
+  source_code_hash = filebase64sha256(local.lambda_packages.rollups)
+  runtime          = "python3.12"
+  timeout          = 30
+
+  environment {
+    variables = {
+      PARKING_TABLE_NAME    = aws_dynamodb_table.parking_tickets.name
+      ROLLUP_TABLE_NAME     = aws_dynamodb_table.parking_rollups.name
+      LOG_LEVEL             = var.log_level
+      LOG_EVENT_SAMPLE_RATE = var.log_event_sample_rate
+    }
+  }
+
+  tags = {
+    Name        = "ParkingRollupsFunction"
+    Environment = var.environment
+    Project     = "parking-lot-system"
+  }
+}
+
+# Rollup stream consumer; prices legacy exits with the same tariff as the exit functions
+resource "aws_lambda_function" "rollup_stream_lambda" {
+  filename         = local.lambda_packages.rollup_stream
+  function_name    = "${var.project_name}-rollup-stream"
+  role             = aws_iam_role.lambda_role.arn
+  handler          = "handlers.rollup_stream.lambda_handler"
+  source_code_hash = filebase64sha256(local.lambda_packages.rollup_stream)
+  runtime          = "python3.12"
+  timeout          = 60
+
+  environment {
+    variables = {
+      PARKING_TABLE_NAME        = aws_dynamodb_table.parking_tickets.name
+      ROLLUP_TABLE_NAME         = aws_dynamodb_table.parking_rollups.name
+      HOURLY_RATE               = var.hourly_rate
+      BILLING_INCREMENT_MINUTES = var.billing_increment_minutes
+      TARIFF_SCHEDULE           = var.tariff_schedule
+      LOG_LEVEL                 = var.log_level
+    }
+  }
+
+  tags = {
+    Name        = "ParkingRollupStreamFunction"
+    Environment = var.environment
+    Project     = "parking-lot-system"
+  }
+}
+
+# Only updates of exited tickets reach the consumer; it counts those that set exit_time.
+# Failed batches are split and retried a bounded number of times, so a bad
+# record cannot block its shard; what is left goes to the failure queue.
+resource "aws_lambda_event_source_mapping" "rollup_stream" {
+  event_source_arn                   = aws_dynamodb_table.parking_tickets.stream_arn
+  function_name                      = aws_lambda_function.rollup_stream_lambda.arn
+  starting_position                  = "LATEST"
+  batch_size                         = var.rollup_batch_size
+  maximum_batching_window_in_seconds = var.rollup_batching_window_seconds
+  bisect_batch_on_function_error     = true
+  maximum_retry_attempts             = var.rollup_max_retry_attempts
+  maximum_record_age_in_seconds      = var.rollup_max_record_age_seconds
+
+  destination_config {
+    on_failure {
+      destination_arn = aws_sqs_queue.rollup_stream_failures.arn
+    }
+  }
+
+  filter_criteria {
+    filter {
+      pattern = jsonencode({
+        eventName = ["MODIFY"]
+        dynamodb = {
+          NewImage = { exit_time = { N = [{ exists = true }] } }
+        }
+      })
+    }
+  }
+}
+
 # CloudWatch Log Groups for Lambda functions
 resource "aws_cloudwatch_log_group" "entry_lambda_logs" {
   name              = "/aws/lambda/${aws_lambda_function.entry_lambda.function_name}"
@@ -76,4 +312,70 @@ resource "aws_cloudwatch_log_group" "exit_lambda_logs" {
     Environment = var.environment
     Project     = "parking-lot-system"
   }
-} 
\ No newline at end of file
+} 
+
+resource "aws_cloudwatch_log_group" "batch_entry_lambda_logs" {
+  name              = "/aws/lambda/${aws_lambda_function.batch_entry_lambda.function_name}"
+  retention_in_days = var.log_retention_days
+
+  tags = {
+    Name        = "ParkingBatchEntryLogs"
+    Environment = var.environment
+    Project     = "parking-lot-system"
+  }
+}
+
+resource "aws_cloudwatch_log_group" "batch_exit_lambda_logs" {
+  name              = "/aws/lambda/${aws_lambda_function.batch_exit_lambda.function_name}"
+  retention_in_days = var.log_retention_days
+
+  tags = {
+    Name        = "ParkingBatchExitLogs"
+    Environment = var.environment
+    Project     = "parking-lot-system"
+  }
+}
+
+resource "aws_cloudwatch_log_group" "occupancy_lambda_logs" {
+  name              = "/aws/lambda/${aws_lambda_function.occupancy_lambda.function_name}"
+  retention_in_days = var.log_retention_days
+
+  tags = {
+    Name        = "ParkingOccupancyLogs"
+    Environment = var.environment
+    Project     = "parking-lot-system"
+  }
+}
+
+resource "aws_cloudwatch_log_group" "quote_lambda_logs" {
+  name              = "/aws/lambda/${aws_lambda_function.quote_lambda.function_name}"
+  retention_in_days = var.log_retention_days
+
+  tags = {
+    Name        = "ParkingQuoteLogs"
+    Environment = var.environment
+    Project     = "parking-lot-system"
+  }
+}
+
+resource "aws_cloudwatch_log_group" "rollups_lambda_logs" {
+  name              = "/aws/lambda/${aws_lambda_function.rollups_lambda.function_name}"
+  retention_in_days = var.log_retention_days
+
+  tags = {
+    Name        = "ParkingRollupsLogs"
+    Environment = var.environment
+    Project     = "parking-lot-system"
+  }
+}
+
+resource "aws_cloudwatch_log_group" "rollup_stream_lambda_logs" {
+  name              = "/aws/lambda/${aws_lambda_function.rollup_stream_lambda.function_name}"
+  retention_in_days = var.log_retention_days
+
+  tags = {
+    Name        = "ParkingRollupStreamLogs"
+    Environment = var.environment
+    Project     = "parking-lot-system"
+  }
+}
@@ -9,6 +9,10 @@ terraform {
       source  = "hashicorp/archive"
       version = "~> 2.0"
     }
+    random = {
+      source  = "hashicorp/random"
+      version = "~> 3.0"
+    }
   }
 }
 
@@ -27,6 +31,30 @@ resource "aws_dynamodb_table" "parking_tickets" {
     type = "S"
   }
 
+  attribute {
+    name = "active_plate"
+    type = "S"
+  }
+
+  # Sparse index: active_plate is only set while a ticket is active, so
+  # lost-ticket lookups by plate never touch exited tickets
+  global_secondary_index {
+    name               = "active-plate-index"
+    hash_key           = "active_plate"
+    projection_type    = "INCLUDE"
+    non_key_attributes = ["plate", "parking_lot", "entry_time"]
+  }
+
+  # Set by scripts/archive_tickets.py once a ticket is archived
+  ttl {
+    attribute_name = "expires_at"
+    enabled        = true
+  }
+
+  # Consumed by the rollup stream function
+  stream_enabled   = true
+  stream_view_type = "NEW_AND_OLD_IMAGES"
+
   tags = {
     Name        = "ParkingTickets"
     Environment = var.environment
@@ -34,6 +62,95 @@ resource "aws_dynamodb_table" "parking_tickets" {
   }
 }
 
+# DynamoDB table for per-lot occupancy counters (write-sharded)
+resource "aws_dynamodb_table" "parking_occupancy" {
+  name         = var.occupancy_table_name
+  billing_mode = "PAY_PER_REQUEST"
+  hash_key     = "counter_id"
+
+  attribute {
+    name = "counter_id"
+    type = "S"
+  }
+
+  tags = {
+    Name        = "ParkingOccupancy"
+    Environment = var.environment
+    Project     = "parking-lot-system"
+  }
+}
+
+# DynamoDB table for entry idempotency keys; records expire with DynamoDB TTL
+resource "aws_dynamodb_table" "parking_idempotency" {
+  name         = var.idempotency_table_name
+  billing_mode = "PAY_PER_REQUEST"
+  hash_key     = "idempotency_key"
+
+  attribute {
+    name = "idempotency_key"
+    type = "S"
+  }
+
+  ttl {
+    attribute_name = "expires_at"
+    enabled        = true
+  }
+
+  tags = {
+    Name        = "ParkingIdempotency"
+    Environment = var.environment
+    Project     = "parking-lot-system"
+  }
+}
+
+# DynamoDB table for hourly and daily revenue rollups per lot
+resource "aws_dynamodb_table" "parking_rollups" {
+  name         = var.rollup_table_name
+  billing_mode = "PAY_PER_REQUEST"
+  hash_key     = "series"
+  range_key    = "bucket_start"
+
+  attribute {
+    name = "series"
+    type = "S"
+  }
+
+  attribute {
+    name = "bucket_start"
+    type = "S"
+  }
+
+  # Markers of exits already counted ("exit#<ticket ID>") expire after a week
+  ttl {
+    attribute_name = "expires_at"
+    enabled        = true
+  }
+
+  tags = {
+    Name        = "ParkingRollups"
+    Environment = var.environment
+    Project     = "parking-lot-system"
+  }
+}
+
+# Stream batches the rollup consumer gave up on, for inspection and replay
+resource "aws_sqs_queue" "rollup_stream_failures" {
+  name                      = "${var.project_name}-rollup-stream-failures"
+  message_retention_seconds = 1209600
+
+  tags = {
+    Name        = "ParkingRollupStreamFailures"
+    Environment = var.environment
+    Project     = "parking-lot-system"
+  }
+}
+
+# HMAC key for signed ticket IDs; replacing it invalidates outstanding signed tickets
+resource "random_password" "ticket_id_secret" {
+  length  = 48
+  special = false
+}
+
 # IAM role for Lambda functions
 resource "aws_iam_role" "lambda_role" {
   name = "${var.project_name}-lambda-role"
@@ -70,13 +187,37 @@ resource "aws_iam_role_policy" "lambda_dynamodb_policy" {
         Effect = "Allow"
         Action = [
           "dynamodb:GetItem",
+          "dynamodb:BatchGetItem",
           "dynamodb:PutItem",
+          "dynamodb:BatchWriteItem",
           "dynamodb:UpdateItem",
+          "dynamodb:ConditionCheckItem",
           "dynamodb:DeleteItem",
           "dynamodb:Query",
           "dynamodb:Scan"
         ]
-        Resource = aws_dynamodb_table.parking_tickets.arn
+        Resource = [
+          aws_dynamodb_table.parking_tickets.arn,
+          "${aws_dynamodb_table.parking_tickets.arn}/index/*",
+          aws_dynamodb_table.parking_occupancy.arn,
+          aws_dynamodb_table.parking_idempotency.arn,
+          aws_dynamodb_table.parking_rollups.arn
+        ]
+      },
+      {
+        Effect = "Allow"
+        Action = [
+          "dynamodb:DescribeStream",
+          "dynamodb:GetRecords",
+          "dynamodb:GetShardIterator",
+          "dynamodb:ListStreams"
+        ]
+        Resource = aws_dynamodb_table.parking_tickets.stream_arn
+      },
+      {
+        Effect   = "Allow"
+        Action   = "sqs:SendMessage"
+        Resource = aws_sqs_queue.rollup_stream_failures.arn
       }
     ]
   })
@@ -109,6 +250,11 @@ resource "aws_api_gateway_deployment" "parking_api_deployment" {
   depends_on = [
     aws_api_gateway_integration.entry_integration,
     aws_api_gateway_integration.exit_integration,
+    aws_api_gateway_integration.batch_entry_integration,
+    aws_api_gateway_integration.batch_exit_integration,
+    aws_api_gateway_integration.occupancy_integration,
+    aws_api_gateway_integration.rollups_integration,
+    aws_api_gateway_integration.quote_integration,
   ]
 
   rest_api_id = aws_api_gateway_rest_api.parking_api.id
@@ -133,6 +279,41 @@ resource "aws_api_gateway_resource" "exit_resource" {
   path_part   = "exit"
 }
 
+# /entry/batch resource
+resource "aws_api_gateway_resource" "batch_entry_resource" {
+  rest_api_id = aws_api_gateway_rest_api.parking_api.id
+  parent_id   = aws_api_gateway_resource.entry_resource.id
+  path_part   = "batch"
+}
+
+# /exit/batch resource
+resource "aws_api_gateway_resource" "batch_exit_resource" {
+  rest_api_id = aws_api_gateway_rest_api.parking_api.id
+  parent_id   = aws_api_gateway_resource.exit_resource.id
+  path_part   = "batch"
+}
+
+# /occupancy resource
+resource "aws_api_gateway_resource" "occupancy_resource" {
+  rest_api_id = aws_api_gateway_rest_api.parking_api.id
+  parent_id   = aws_api_gateway_rest_api.parking_api.root_resource_id
+  path_part   = "occupancy"
+}
+
+# /rollups resource
+resource "aws_api_gateway_resource" "rollups_resource" {
+  rest_api_id = aws_api_gateway_rest_api.parking_api.id
+  parent_id   = aws_api_gateway_rest_api.parking_api.root_resource_id
+  path_part   = "rollups"
+}
+
+# /quote resource
+resource "aws_api_gateway_resource" "quote_resource" {
+  rest_api_id = aws_api_gateway_rest_api.parking_api.id
+  parent_id   = aws_api_gateway_rest_api.parking_api.root_resource_id
+  path_part   = "quote"
+}
+
 # POST method for /entry
 resource "aws_api_gateway_method" "entry_post" {
   rest_api_id   = aws_api_gateway_rest_api.parking_api.id
@@ -149,6 +330,46 @@ resource "aws_api_gateway_method" "exit_post" {
   authorization = "NONE"
 }
 
+# POST method for /entry/batch
+resource "aws_api_gateway_method" "batch_entry_post" {
+  rest_api_id   = aws_api_gateway_rest_api.parking_api.id
+  resource_id   = aws_api_gateway_resource.batch_entry_resource.id
+  http_method   = "POST"
+  authorization = "NONE"
+}
+
+# POST method for /exit/batch
+resource "aws_api_gateway_method" "batch_exit_post" {
+  rest_api_id   = aws_api_gateway_rest_api.parking_api.id
+  resource_id   = aws_api_gateway_resource.batch_exit_resource.id
+  http_method   = "POST"
+  authorization = "NONE"
+}
+
+# GET method for /occupancy
+resource "aws_api_gateway_method" "occupancy_get" {
+  rest_api_id   = aws_api_gateway_rest_api.parking_api.id
+  resource_id   = aws_api_gateway_resource.occupancy_resource.id
+  http_method   = "GET"
+  authorization = "NONE"
+}
+
+# GET method for /rollups
+resource "aws_api_gateway_method" "rollups_get" {
+  rest_api_id   = aws_api_gateway_rest_api.parking_api.id
+  resource_id   = aws_api_gateway_resource.rollups_resource.id
+  http_method   = "GET"
+  authorization = "NONE"
+}
+
+# GET method for /quote
+resource "aws_api_gateway_method" "quote_get" {
+  rest_api_id   = aws_api_gateway_rest_api.parking_api.id
+  resource_id   = aws_api_gateway_resource.quote_resource.id
+  http_method   = "GET"
+  authorization = "NONE"
+}
+
 # Integration for /entry
 resource "aws_api_gateway_integration" "entry_integration" {
   rest_api_id             = aws_api_gateway_rest_api.parking_api.id
@@ -169,6 +390,56 @@ resource "aws_api_gateway_integration" "exit_integration" {
   uri                     = aws_lambda_function.exit_lambda.invoke_arn
 }
 
+# Integration for /entry/batch
+resource "aws_api_gateway_integration" "batch_entry_integration" {
+  rest_api_id             = aws_api_gateway_rest_api.parking_api.id
+  resource_id             = aws_api_gateway_resource.batch_entry_resource.id
+  http_method             = aws_api_gateway_method.batch_entry_post.http_method
+  integration_http_method = "POST"
+  type                    = "AWS_PROXY"
+  uri                     = aws_lambda_function.batch_entry_lambda.invoke_arn
+}
+
+# Integration for /exit/batch
+resource "aws_api_gateway_integration" "batch_exit_integration" {
+  rest_api_id             = aws_api_gateway_rest_api.parking_api.id
+  resource_id             = aws_api_gateway_resource.batch_exit_resource.id
+  http_method             = aws_api_gateway_method.batch_exit_post.http_method
+  integration_http_method = "POST"
+  type                    = "AWS_PROXY"
+  uri                     = aws_lambda_function.batch_exit_lambda.invoke_arn
+}
+
+# Integration for /occupancy
+resource "aws_api_gateway_integration" "occupancy_integration" {
+  rest_api_id             = aws_api_gateway_rest_api.parking_api.id
+  resource_id             = aws_api_gateway_resource.occupancy_resource.id
+  http_method             = aws_api_gateway_method.occupancy_get.http_method
+  integration_http_method = "POST"
+  type                    = "AWS_PROXY"
+  uri                     = aws_lambda_function.occupancy_lambda.invoke_arn
+}
+
+# Integration for /rollups
+resource "aws_api_gateway_integration" "rollups_integration" {
+  rest_api_id             = aws_api_gateway_rest_api.parking_api.id
+  resource_id             = aws_api_gateway_resource.rollups_resource.id
+  http_method             = aws_api_gateway_method.rollups_get.http_method
+  integration_http_method = "POST"
+  type                    = "AWS_PROXY"
+  uri                     = aws_lambda_function.rollups_lambda.invoke_arn
+}
+
+# Integration for /quote
+resource "aws_api_gateway_integration" "quote_integration" {
+  rest_api_id             = aws_api_gateway_rest_api.parking_api.id
+  resource_id             = aws_api_gateway_resource.quote_resource.id
+  http_method             = aws_api_gateway_method.quote_get.http_method
+  integration_http_method = "POST"
+  type                    = "AWS_PROXY"
+  uri                     = aws_lambda_function.quote_lambda.invoke_arn
+}
+
 # Lambda permissions for API Gateway
 resource "aws_lambda_permission" "entry_lambda_permission" {
   statement_id  = "AllowExecutionFromAPIGateway"
@@ -184,4 +455,44 @@ resource "aws_lambda_permission" "exit_lambda_permission" {
   function_name = aws_lambda_function.exit_lambda.function_name
   principal     = "apigateway.amazonaws.com"
   source_arn    = "${aws_api_gateway_rest_api.parking_api.execution_arn}/*/*"
-} 
\ No newline at end of file
+} 
+
+resource "aws_lambda_permission" "batch_entry_lambda_permission" {
+  statement_id  = "AllowExecutionFromAPIGateway"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.batch_entry_lambda.function_name
+  principal     = "apigateway.amazonaws.com"
+  source_arn    = "${aws_api_gateway_rest_api.parking_api.execution_arn}/*/*"
+}
+
+resource "aws_lambda_permission" "batch_exit_lambda_permission" {
+  statement_id  = "AllowExecutionFromAPIGateway"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.batch_exit_lambda.function_name
+  principal     = "apigateway.amazonaws.com"
+  source_arn    = "${aws_api_gateway_rest_api.parking_api.execution_arn}/*/*"
+}
+
+resource "aws_lambda_permission" "occupancy_lambda_permission" {
+  statement_id  = "AllowExecutionFromAPIGateway"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.occupancy_lambda.function_name
+  principal     = "apigateway.amazonaws.com"
+  source_arn    = "${aws_api_gateway_rest_api.parking_api.execution_arn}/*/*"
+}
+
+resource "aws_lambda_permission" "rollups_lambda_permission" {
+  statement_id  = "AllowExecutionFromAPIGateway"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.rollups_lambda.function_name
+  principal     = "apigateway.amazonaws.com"
+  source_arn    = "${aws_api_gateway_rest_api.parking_api.execution_arn}/*/*"
+}
+
+resource "aws_lambda_permission" "quote_lambda_permission" {
+  statement_id  = "AllowExecutionFromAPIGateway"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.quote_lambda.function_name
+  principal     = "apigateway.amazonaws.com"
+  source_arn    = "${aws_api_gateway_rest_api.parking_api.execution_arn}/*/*"
+}
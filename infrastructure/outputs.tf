@@ -13,6 +13,26 @@ output "dynamodb_table_arn" {
   value       = aws_dynamodb_table.parking_tickets.arn
 }
 
+output "occupancy_table_name" {
+  description = "DynamoDB occupancy counter table name"
+  value       = aws_dynamodb_table.parking_occupancy.name
+}
+
+output "idempotency_table_name" {
+  description = "DynamoDB entry idempotency key table name"
+  value       = aws_dynamodb_table.parking_idempotency.name
+}
+
+output "rollup_stream_failure_queue_url" {
+  description = "SQS queue receiving rollup stream batches that could not be processed"
+  value       = aws_sqs_queue.rollup_stream_failures.url
+}
+
+output "rollup_table_name" {
+  description = "DynamoDB revenue rollup table name"
+  value       = aws_dynamodb_table.parking_rollups.name
+}
+
 output "entry_lambda_arn" {
   description = "Entry Lambda function ARN"
   value       = aws_lambda_function.entry_lambda.arn
@@ -23,6 +43,26 @@ output "exit_lambda_arn" {
   value       = aws_lambda_function.exit_lambda.arn
 }
 
+output "batch_entry_lambda_arn" {
+  description = "Batch entry Lambda function ARN"
+  value       = aws_lambda_function.batch_entry_lambda.arn
+}
+
+output "batch_exit_lambda_arn" {
+  description = "Batch exit Lambda function ARN"
+  value       = aws_lambda_function.batch_exit_lambda.arn
+}
+
+output "occupancy_lambda_arn" {
+  description = "Occupancy Lambda function ARN"
+  value       = aws_lambda_function.occupancy_lambda.arn
+}
+
+output "quote_lambda_arn" {
+  description = "Quote Lambda function ARN"
+  value       = aws_lambda_function.quote_lambda.arn
+}
+
 output "api_gateway_rest_api_id" {
   description = "API Gateway REST API ID"
   value       = aws_api_gateway_rest_api.parking_api.id
@@ -34,8 +34,104 @@ variable "billing_increment_minutes" {
   default     = "15"
 }
 
+variable "tariff_schedule" {
+  description = "Optional JSON time-of-day tariff schedule; empty uses the flat hourly rate"
+  type        = string
+  default     = ""
+}
+
 variable "log_retention_days" {
   description = "CloudWatch log retention in days"
   type        = number
   default     = 14
-} 
\ No newline at end of file
+} 
+
+variable "log_level" {
+  description = "Log level of the Lambda functions"
+  type        = string
+  default     = "INFO"
+}
+
+variable "log_event_sample_rate" {
+  description = "Fraction of requests logged with the full API Gateway event"
+  type        = string
+  default     = "0"
+}
+
+variable "metrics_enabled" {
+  description = "Emit per-stage timing and DynamoDB capacity metrics from the entry and exit functions (\"true\" or \"false\")"
+  type        = string
+  default     = "false"
+}
+
+variable "exit_workers" {
+  description = "Thread pool size used by the batch exit function"
+  type        = string
+  default     = "8"
+}
+
+variable "hedge_reads" {
+  description = "Send a second ticket read when the first is slower than the recent p95 (\"true\" or \"false\")"
+  type        = string
+  default     = "false"
+}
+
+variable "occupancy_table_name" {
+  description = "DynamoDB table name for per-lot occupancy counters"
+  type        = string
+  default     = "parking-occupancy"
+}
+
+variable "idempotency_table_name" {
+  description = "DynamoDB table name for entry idempotency keys"
+  type        = string
+  default     = "parking-idempotency"
+}
+
+variable "idempotency_ttl_seconds" {
+  description = "How long an entry idempotency key is remembered"
+  type        = number
+  default     = 86400
+}
+
+variable "rollup_table_name" {
+  description = "DynamoDB table name for hourly and daily revenue rollups"
+  type        = string
+  default     = "parking-rollups"
+}
+
+variable "rollup_batch_size" {
+  description = "Stream records per rollup consumer invocation"
+  type        = number
+  default     = 100
+}
+
+variable "rollup_batching_window_seconds" {
+  description = "How long the stream waits to fill a rollup batch"
+  type        = number
+  default     = 5
+}
+
+variable "rollup_max_retry_attempts" {
+  description = "Retries of a failing rollup stream batch before it goes to the failure queue"
+  type        = number
+  default     = 10
+}
+
+variable "rollup_max_record_age_seconds" {
+  description = "Age after which unprocessed stream records go to the failure queue"
+  type        = number
+  default     = 3600
+}
+
+variable "occupancy_shards" {
+  description = "Default number of occupancy counter shards per parking lot"
+  type        = string
+  default     = "1"
+}
+
+variable "occupancy_hot_lots" {
+  description = "Shard count overrides for busy lots, e.g. \"12:8,15:4\""
+  type        = string
+  default     = ""
+}
\ No newline at end of file
@@ -0,0 +1,44 @@
+"""
+Archive exited tickets out of the parking-tickets table.
+
+Tickets that exited more than --older-than-days ago are streamed from the
+table in pages, written to gzip-compressed newline-delimited JSON files in a
+local directory or under an s3://bucket/prefix, and then marked with the
+table's TTL attribute so DynamoDB deletes them.
+
+Usage: python scripts/archive_tickets.py <destination> [--older-than-days 90]
+                                         [--records-per-file 100000] [--page-size 1000] [--dry-run]
+"""
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from services.archiver import TicketArchiver, DEFAULT_RECORDS_PER_FILE  # noqa: E402
+from storage.base import create_storage  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('destination', help='local directory or s3://bucket/prefix')
+    parser.add_argument('--older-than-days', type=int, default=int(os.getenv('ARCHIVE_AFTER_DAYS', '90')))
+    parser.add_argument('--records-per-file', type=int, default=DEFAULT_RECORDS_PER_FILE)
+    parser.add_argument('--page-size', type=int, default=1000, help='items per Scan call')
+    parser.add_argument('--dry-run', action='store_true', help='write archive files but do not expire tickets')
+    args = parser.parse_args()
+
+    summary = TicketArchiver(create_storage()).archive(
+        args.destination,
+        args.older_than_days,
+        records_per_file=args.records_per_file,
+        page_size=args.page_size,
+        expire=not args.dry_run
+    )
+    print(json.dumps(summary, indent=2))
+    return 1 if summary['notExpired'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,51 @@
+"""
+Copy the source modules a Lambda handler can import into a bundle directory.
+
+The import graph is followed from the handler module, including imports made
+inside functions, so lazily imported modules are bundled too. Only modules
+under src/ are copied; the Lambda runtime provides the standard library and
+boto3.
+
+Usage: python scripts/bundle.py <handler module> <output dir>
+       e.g. python scripts/bundle.py handlers.entry build/entry
+"""
+import modulefinder
+import os
+import shutil
+import sys
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+
+def source_files(module: str) -> list:
+    """Source files under src/ reachable from a module."""
+    finder = modulefinder.ModuleFinder(path=[SRC_DIR] + sys.path[1:])
+    finder.import_hook(module)
+
+    files = set()
+    for found in finder.modules.values():
+        path = found.__file__ and os.path.abspath(found.__file__)
+        if path and path.startswith(SRC_DIR + os.sep):
+            files.add(path)
+            # Parent packages are needed for the import to resolve
+            parent = os.path.dirname(path)
+            while parent != SRC_DIR:
+                files.add(os.path.join(parent, '__init__.py'))
+                parent = os.path.dirname(parent)
+    return sorted(files)
+
+
+def main():
+    if len(sys.argv) != 3:
+        sys.exit(__doc__)
+    module, output_dir = sys.argv[1], sys.argv[2]
+
+    for path in source_files(module):
+        target = os.path.join(output_dir, os.path.relpath(path, SRC_DIR))
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        shutil.copy2(path, target)
+        print(os.path.relpath(path, SRC_DIR))
+
+
+if __name__ == '__main__':
+    main()
@@ -43,29 +43,9 @@ fi
 
 echo -e "${GREEN}Prerequisites check passed${NC}"
 
-# Create dist directory if it doesn't exist
-mkdir -p "$DIST_DIR"
-
-# Package Lambda function
-echo -e "${YELLOW}Packaging Lambda function...${NC}"
-cd "$SRC_DIR"
-
-# Create a temporary directory for packaging
-TEMP_DIR=$(mktemp -d)
-cp -r . "$TEMP_DIR/"
-
-# Install dependencies in the temp directory
-cd "$TEMP_DIR"
-pip install -r "$PROJECT_ROOT/requirements.txt" -t .
-
-# Create the zip file
-cd "$TEMP_DIR"
-zip -r "$DIST_DIR/lambda_function.zip" . -x "*.pyc" "*__pycache__*"
-
-# Clean up temp directory
-rm -rf "$TEMP_DIR"
-
-echo -e "${GREEN}Lambda function packaged successfully${NC}"
+# Package Lambda functions (one bundle per handler)
+echo -e "${YELLOW}Packaging Lambda functions...${NC}"
+"$SCRIPT_DIR/package.sh"
 
 # Deploy infrastructure with Terraform
 echo -e "${YELLOW}Deploying infrastructure with Terraform...${NC}"
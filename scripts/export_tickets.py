@@ -0,0 +1,53 @@
+"""
+Export every ticket in the tickets table to CSV or NDJSON.
+
+The table is read with parallel segmented Scans and written as a stream, so
+memory use stays constant however large the table is. Raise --segments to
+export faster, at the cost of more read capacity.
+
+Usage: python scripts/export_tickets.py [--format csv|ndjson] [--segments 8]
+                                        [--page-size 1000] [--output tickets.csv]
+"""
+import argparse
+import gzip
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from services.export import WRITERS  # noqa: E402
+from services.parking_service import ParkingService  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--format', choices=sorted(WRITERS), default='csv')
+    parser.add_argument('--segments', type=int, default=int(os.getenv('EXPORT_SEGMENTS', '4')), help='parallel Scan segments')
+    parser.add_argument('--page-size', type=int, default=1000, help='items per Scan call')
+    parser.add_argument('--output', default='-', help='output file, gzip-compressed if it ends in .gz (default: stdout)')
+    args = parser.parse_args()
+
+    if args.output == '-':
+        output = sys.stdout
+    elif args.output.endswith('.gz'):
+        output = gzip.open(args.output, 'wt', encoding='utf-8', newline='')
+    else:
+        output = open(args.output, 'w', encoding='utf-8', newline='')
+
+    start = time.perf_counter()
+    try:
+        tickets = ParkingService().iter_tickets(segments=args.segments, page_size=args.page_size)
+        count = WRITERS[args.format](tickets, output)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    elapsed = time.perf_counter() - start
+    summary = {'tickets': count, 'seconds': round(elapsed, 3), 'ticketsPerSecond': round(count / elapsed, 1) if elapsed else None}
+    print(json.dumps(summary), file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,33 @@
+"""
+Add tickets parked before the plate index existed to the active-plate-index.
+
+Lost-ticket exits find the active ticket by plate through a sparse index on
+active_plate. Only tickets created since that index was introduced carry the
+attribute, so run this once after deploying it; until then older tickets
+still parked cannot be exited by plate. Tickets already indexed are skipped,
+so the script can be repeated.
+
+Usage: python scripts/index_active_plates.py [--page-size 1000]
+"""
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from storage.dynamodb import DynamoDBStorage  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--page-size', type=int, default=1000, help='items per Scan call')
+    args = parser.parse_args()
+
+    indexed = DynamoDBStorage().index_active_plates(page_size=args.page_size)
+    print(json.dumps({'indexed': indexed}, indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
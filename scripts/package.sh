@@ -16,35 +16,52 @@ PROJECT_ROOT="$(dirname "$SCRIPT_DIR")"
 SRC_DIR="$PROJECT_ROOT/src"
 DIST_DIR="$PROJECT_ROOT/dist"
 
-echo -e "${GREEN}Packaging Lambda function...${NC}"
+# Handlers deployed as separate functions; each gets its own bundle
+HANDLERS="entry exit batch_entry batch_exit occupancy quote rollups rollup_stream"
 
-# Create dist directory if it doesn't exist
-mkdir -p "$DIST_DIR"
-
-# Remove existing package
-rm -f "$DIST_DIR/lambda_function.zip"
+# Bytecode must match the Lambda runtime (python3.12)
+PYTHON="${PYTHON:-python3.12}"
 
-# Create a temporary directory for packaging
-TEMP_DIR=$(mktemp -d)
-echo -e "${YELLOW}Using temporary directory: $TEMP_DIR${NC}"
+echo -e "${GREEN}Packaging Lambda functions...${NC}"
 
-# Copy source code
-cp -r "$SRC_DIR"/* "$TEMP_DIR/"
-
-# Install dependencies
-cd "$TEMP_DIR"
-echo -e "${YELLOW}Installing dependencies...${NC}"
-pip install -r "$PROJECT_ROOT/requirements.txt" -t . --no-deps
+# Create dist directory if it doesn't exist
+mkdir -p "$DIST_DIR"
 
-# Create the zip file
-echo -e "${YELLOW}Creating zip package...${NC}"
-zip -r "$DIST_DIR/lambda_function.zip" . -x "*.pyc" "*__pycache__*" "*.git*"
+COMPILE=1
+if ! "$PYTHON" -c 'import sys; sys.exit(sys.version_info[:2] != (3, 12))' 2>/dev/null; then
+    echo -e "${YELLOW}$PYTHON is not Python 3.12; packaging without precompiled bytecode${NC}"
+    COMPILE=0
+fi
 
-# Clean up temp directory
-rm -rf "$TEMP_DIR"
+for HANDLER in $HANDLERS; do
+    echo -e "${YELLOW}Bundling handlers.$HANDLER...${NC}"
+    rm -f "$DIST_DIR/$HANDLER.zip"
+    
+    # Create a temporary directory for packaging
+    TEMP_DIR=$(mktemp -d)
+    
+    # Copy only the modules this handler can import
+    python3 "$SCRIPT_DIR/bundle.py" "handlers.$HANDLER" "$TEMP_DIR" > /dev/null
+    
+    # boto3 is provided by the Lambda runtime; set VENDOR_DEPENDENCIES=1 to pin requirements.txt instead
+    if [ "${VENDOR_DEPENDENCIES:-0}" = "1" ]; then
+        pip install -q -r "$PROJECT_ROOT/requirements.txt" -t "$TEMP_DIR"
+    fi
+    
+    # Precompile so cold starts load bytecode instead of compiling sources.
+    # unchecked-hash pycs stay valid whatever timestamps the zip restores.
+    if [ "$COMPILE" = "1" ]; then
+        "$PYTHON" -m compileall -q -j 0 --invalidation-mode unchecked-hash "$TEMP_DIR"
+    fi
+    
+    # Create the zip file
+    (cd "$TEMP_DIR" && zip -qr -X "$DIST_DIR/$HANDLER.zip" . -x "*.git*")
+    
+    # Clean up temp directory
+    rm -rf "$TEMP_DIR"
+    
+    PACKAGE_SIZE=$(du -h "$DIST_DIR/$HANDLER.zip" | cut -f1)
+    echo -e "${GREEN}Package created: $DIST_DIR/$HANDLER.zip ($PACKAGE_SIZE)${NC}"
+done
 
-# Show package info
-PACKAGE_SIZE=$(du -h "$DIST_DIR/lambda_function.zip" | cut -f1)
-echo -e "${GREEN}Lambda package created successfully!${NC}"
-echo -e "${GREEN}Package location: $DIST_DIR/lambda_function.zip${NC}"
-echo -e "${GREEN}Package size: $PACKAGE_SIZE${NC}" 
\ No newline at end of file
+echo -e "${GREEN}Lambda packages created successfully!${NC}"
@@ -0,0 +1,67 @@
+from typing import Dict, Any, List, Tuple
+
+from services.provider import get_parking_service
+from utils.response import success_response, validation_error_response, internal_error_response
+from utils.log import get_logger, log_request
+from utils.request_decoding import ENTRY_REQUEST
+from utils.validation import extract_json_body
+
+# Configure logging
+logger = get_logger()
+
+# Upper bound on entries accepted in a single request
+MAX_BATCH_ENTRIES = 100
+
+
+def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    """
+    Lambda handler for batch parking entry endpoint.
+    
+    Expected: POST /entry/batch with body { "entries": [{ "plate": "<string>", "parkingLot": <int> }, ...] }
+    Returns: { "results": [{ "ticketId": "<uuid>", "status": "created" }, ...] } in request order
+    """
+    log_request(logger, "Batch entry request", event, context)
+    
+    try:
+        body = extract_json_body(event)
+        entries = body.get('entries') if isinstance(body, dict) else None
+        
+        if not isinstance(entries, list) or not entries:
+            return validation_error_response("Entries are required and must be a non-empty list")
+        
+        if len(entries) > MAX_BATCH_ENTRIES:
+            return validation_error_response(f"At most {MAX_BATCH_ENTRIES} entries are allowed per request")
+        
+        # Validate every entry, keeping the position of the valid ones
+        results: List[Dict[str, Any]] = [None] * len(entries)
+        valid_positions: List[int] = []
+        valid_entries: List[Tuple[str, int]] = []
+        
+        for index, entry in enumerate(entries):
+            values, error = ENTRY_REQUEST(entry if isinstance(entry, dict) else {})
+            if error:
+                results[index] = {'ticketId': None, 'status': 'invalid', 'error': error}
+                continue
+            
+            valid_positions.append(index)
+            valid_entries.append((values['plate'], values['parking_lot']))
+        
+        if valid_entries:
+            parking_service = get_parking_service()
+            created = parking_service.create_entries(valid_entries)
+            for index, result in zip(valid_positions, created):
+                results[index] = result
+        
+        logger.info("Processed batch entry", extra={'valid': len(valid_entries), 'total': len(entries)})
+        
+        return success_response({
+            'results': results
+        })
+        
+    except ValueError as e:
+        logger.error("Validation error: %s", e)
+        return validation_error_response(str(e))
+    
+    except Exception as e:
+        logger.error("Internal error in batch entry handler: %s", e)
+        return internal_error_response("Failed to create parking entries")
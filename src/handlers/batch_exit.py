@@ -0,0 +1,69 @@
+from typing import Dict, Any, List
+
+from services.provider import get_parking_service
+from utils.response import success_response, validation_error_response, internal_error_response
+from utils.log import get_logger, log_request
+from utils.validation import extract_json_body
+from utils.request_decoding import EXIT_REQUEST
+
+# Configure logging
+logger = get_logger()
+
+# Upper bound on tickets accepted in a single request
+MAX_BATCH_EXITS = 500
+
+
+def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    """
+    Lambda handler for bulk parking exit endpoint.
+    
+    Expected: POST /exit/batch with body { "ticketIds": ["<string>", ...] }
+    Returns: { "results": [{ "ticketId": "<string>", "status": "processed", "plate": "<string>",
+               "totalTimeMinutes": <int>, "parkingLot": <int>, "chargeUSD": <float> }, ...] } in request order
+    """
+    log_request(logger, "Batch exit request", event, context)
+    
+    try:
+        body = extract_json_body(event)
+        ticket_ids = body.get('ticketIds') if isinstance(body, dict) else None
+        
+        if not isinstance(ticket_ids, list) or not ticket_ids:
+            return validation_error_response("Ticket IDs are required and must be a non-empty list")
+        
+        if len(ticket_ids) > MAX_BATCH_EXITS:
+            return validation_error_response(f"At most {MAX_BATCH_EXITS} tickets are allowed per request")
+        
+        # Validate every ticket ID, keeping the position of the valid ones
+        results: List[Dict[str, Any]] = [None] * len(ticket_ids)
+        valid_positions: List[int] = []
+        valid_ids: List[str] = []
+        
+        for index, ticket_id in enumerate(ticket_ids):
+            # Same schema as a single exit; each ID is decoded once
+            params, error = EXIT_REQUEST({'ticketId': ticket_id})
+            if error:
+                results[index] = {'ticketId': ticket_id, 'status': 'invalid', 'error': error}
+                continue
+            
+            valid_positions.append(index)
+            valid_ids.append(params['ticket_id'])
+        
+        if valid_ids:
+            parking_service = get_parking_service()
+            processed = parking_service.process_exits(valid_ids)
+            for index, result in zip(valid_positions, processed):
+                results[index] = result
+        
+        logger.info("Processed batch exit", extra={'valid': len(valid_ids), 'total': len(ticket_ids)})
+        
+        return success_response({
+            'results': results
+        })
+        
+    except ValueError as e:
+        logger.error("Validation error: %s", e)
+        return validation_error_response(str(e))
+    
+    except Exception as e:
+        logger.error("Internal error in batch exit handler: %s", e)
+        return internal_error_response("Failed to process parking exits")
@@ -1,58 +1,59 @@
-import logging
 from typing import Dict, Any
 
-from services.parking_service import ParkingService
+from services.provider import get_parking_service
 from utils.response import success_response, validation_error_response, internal_error_response
-from utils.validation import validate_license_plate, validate_parking_lot, extract_query_params
+from utils.log import get_logger, log_request
+from utils.metrics import emit_metrics, stage
+from utils.request_decoding import ENTRY_REQUEST, ENTRY_HEADERS
+from utils.validation import extract_header
 
 # Configure logging
-logger = logging.getLogger()
-logger.setLevel(logging.INFO)
+logger = get_logger()
 
 
+@emit_metrics('entry')
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
     Lambda handler for parking entry endpoint.
     
     Expected: POST /entry?plate=<string>&parkingLot=<int>
+              optional header Idempotency-Key: <token> (retries return the original ticket)
     Returns: { "ticketId": "<uuid>" }
     """
-    logger.info(f"Entry request: {event}")
+    log_request(logger, "Entry request", event, context)
     
     try:
-        # Extract query parameters
-        params = extract_query_params(event)
-        plate = params.get('plate', '').strip().upper()
-        parking_lot_str = params.get('parkingLot', '')
+        # Decode and validate query parameters
+        with stage('validate'):
+            values, error = ENTRY_REQUEST(event.get('queryStringParameters'))
+        if error:
+            logger.warning("Invalid entry request: %s", error)
+            return validation_error_response(error)
         
-        # Validate license plate
-        plate_valid, plate_error = validate_license_plate(plate)
-        if not plate_valid:
-            logger.warning(f"Invalid plate validation: {plate_error}")
-            return validation_error_response(plate_error)
+        plate = values['plate']
+        parking_lot = values['parking_lot']
         
-        # Validate parking lot
-        lot_valid, lot_error = validate_parking_lot(parking_lot_str)
-        if not lot_valid:
-            logger.warning(f"Invalid parking lot validation: {lot_error}")
-            return validation_error_response(lot_error)
-        
-        parking_lot = int(parking_lot_str)
+        with stage('validate'):
+            headers, error = ENTRY_HEADERS({'Idempotency-Key': extract_header(event, 'Idempotency-Key')})
+        if error:
+            logger.warning("Invalid entry request: %s", error)
+            return validation_error_response(error)
         
         # Create parking entry
-        parking_service = ParkingService()
-        ticket_id = parking_service.create_entry(plate, parking_lot)
+        parking_service = get_parking_service()
+        ticket_id = parking_service.create_entry(plate, parking_lot, headers['idempotency_key'])
         
-        logger.info(f"Created parking entry: ticket_id={ticket_id}, plate={plate}, lot={parking_lot}")
+        logger.info("Created parking entry", extra={'ticketId': ticket_id, 'plate': plate, 'parkingLot': parking_lot})
         
-        return success_response({
-            'ticketId': ticket_id
-        }, 201)
+        with stage('serialize'):
+            return success_response({
+                'ticketId': ticket_id
+            }, 201)
         
     except ValueError as e:
-        logger.error(f"Validation error: {str(e)}")
+        logger.error("Validation error: %s", e)
         return validation_error_response(str(e))
     
     except Exception as e:
-        logger.error(f"Internal error in entry handler: {str(e)}")
+        logger.error("Internal error in entry handler: %s", e)
         return internal_error_response("Failed to create parking entry") 
\ No newline at end of file
@@ -1,46 +1,55 @@
-import logging
 from typing import Dict, Any
 
-from services.parking_service import ParkingService
+from services.provider import get_parking_service
 from utils.response import success_response, validation_error_response, not_found_response, internal_error_response
-from utils.validation import validate_ticket_id, extract_query_params
+from utils.log import get_logger, log_request
+from utils.metrics import emit_metrics, stage
+from utils.request_decoding import EXIT_REQUEST, LOST_TICKET_EXIT_REQUEST
 
 # Configure logging
-logger = logging.getLogger()
-logger.setLevel(logging.INFO)
+logger = get_logger()
 
 
+@emit_metrics('exit')
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
     Lambda handler for parking exit endpoint.
     
     Expected: POST /exit?ticketId=<string>
+              POST /exit?plate=<string>[&parkingLot=<int>] (lost ticket)
     Returns: { "plate": "<string>", "totalTimeMinutes": <int>, "parkingLot": <int>, "chargeUSD": <float> }
+             (lost ticket responses also include "ticketId")
     """
-    logger.info(f"Exit request: {event}")
+    log_request(logger, "Exit request", event, context)
     
     try:
-        # Extract query parameters
-        params = extract_query_params(event)
-        ticket_id = params.get('ticketId', '').strip()
+        params = event.get('queryStringParameters') or {}
         
-        # Validate ticket ID
-        ticket_valid, ticket_error = validate_ticket_id(ticket_id)
-        if not ticket_valid:
-            logger.warning(f"Invalid ticket ID validation: {ticket_error}")
-            return validation_error_response(ticket_error)
+        # Lost ticket: exit by license plate
+        if not str(params.get('ticketId') or '').strip() and str(params.get('plate') or '').strip():
+            return _exit_by_plate(params)
+        
+        # Decode and validate ticket ID
+        with stage('validate'):
+            values, error = EXIT_REQUEST(params)
+        if error:
+            logger.warning("Invalid ticket ID validation: %s", error)
+            return validation_error_response(error)
+        
+        ticket_id = values['ticket_id']
         
         # Process parking exit
-        parking_service = ParkingService()
+        parking_service = get_parking_service()
         exit_info = parking_service.process_exit(ticket_id)
         
-        logger.info(f"Processed parking exit: {exit_info}")
+        logger.info("Processed parking exit", extra={**exit_info, 'cache': parking_service.cache_stats()})
         
-        return success_response(exit_info)
+        with stage('serialize'):
+            return success_response(exit_info)
         
     except ValueError as e:
         error_msg = str(e)
-        logger.warning(f"Business logic error: {error_msg}")
+        logger.warning("Business logic error: %s", error_msg)
         
         # Check if it's a not found error
         if "not found" in error_msg.lower():
@@ -49,5 +58,25 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             return validation_error_response(error_msg)
     
     except Exception as e:
-        logger.error(f"Internal error in exit handler: {str(e)}")
-        return internal_error_response("Failed to process parking exit") 
\ No newline at end of file
+        logger.error("Internal error in exit handler: %s", e)
+        return internal_error_response("Failed to process parking exit") 
+
+
+def _exit_by_plate(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Validate lost-ticket parameters and process the exit by plate."""
+    with stage('validate'):
+        values, error = LOST_TICKET_EXIT_REQUEST(params)
+    if error:
+        logger.warning("Invalid lost ticket exit request: %s", error)
+        return validation_error_response(error)
+    
+    plate = values['plate']
+    parking_lot = values['parking_lot']
+    
+    parking_service = get_parking_service()
+    exit_info = parking_service.process_exit_by_plate(plate, parking_lot)
+    
+    logger.info("Processed parking exit by plate", extra={**exit_info, 'cache': parking_service.cache_stats()})
+    
+    with stage('serialize'):
+        return success_response(exit_info)
\ No newline at end of file
@@ -0,0 +1,54 @@
+from typing import Dict, Any
+
+from services.provider import get_parking_service
+from utils.response import success_response, validation_error_response, not_implemented_response, internal_error_response
+from utils.log import get_logger, log_request
+from utils.request_decoding import OCCUPANCY_REQUEST
+from utils.validation import extract_query_params
+
+# Configure logging
+logger = get_logger()
+
+# Upper bound on lots accepted in a single request
+MAX_OCCUPANCY_LOTS = 100
+
+
+def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    """
+    Lambda handler for parking lot occupancy endpoint.
+    
+    Expected: GET /occupancy?parkingLot=<int> or GET /occupancy?parkingLots=<int>,<int>,...
+    Returns: { "occupancy": [{ "parkingLot": <int>, "occupied": <int> }, ...] }
+    """
+    log_request(logger, "Occupancy request", event, context)
+    
+    try:
+        # Extract query parameters
+        params = extract_query_params(event)
+        lots_param = params.get('parkingLots') or params.get('parkingLot', '')
+        
+        if lots_param.count(',') >= MAX_OCCUPANCY_LOTS:
+            return validation_error_response(f"At most {MAX_OCCUPANCY_LOTS} parking lots are allowed per request")
+        
+        # Validate and de-duplicate parking lots
+        values, error = OCCUPANCY_REQUEST({'parkingLots': lots_param})
+        if error:
+            logger.warning("Invalid parking lot validation: %s", error)
+            return validation_error_response(error)
+        
+        parking_lots = values['parking_lots']
+        
+        parking_service = get_parking_service()
+        if not parking_service.storage.occupancy_enabled:
+            logger.warning("Occupancy requested but occupancy tracking is not enabled")
+            return not_implemented_response("Occupancy tracking is not enabled")
+        
+        occupancy = parking_service.get_occupancy(parking_lots)
+        
+        return success_response({
+            'occupancy': [{'parkingLot': lot, 'occupied': occupancy[lot]} for lot in parking_lots]
+        })
+        
+    except Exception as e:
+        logger.error("Internal error in occupancy handler: %s", e)
+        return internal_error_response("Failed to get parking lot occupancy")
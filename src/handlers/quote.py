@@ -0,0 +1,44 @@
+from typing import Dict, Any
+
+from services.provider import get_parking_service
+from utils.response import success_response, validation_error_response, not_found_response, internal_error_response
+from utils.log import get_logger, log_request
+from utils.request_decoding import QUOTE_REQUEST
+
+# Configure logging
+logger = get_logger()
+
+
+def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    """
+    Lambda handler for the fee quote endpoint used by pay stations.
+    
+    Expected: GET /quote?ticketId=<string>
+    Returns: { "ticketId": "<string>", "plate": "<string>", "parkingLot": <int>,
+               "entryTime": "<string>", "quotedAt": "<string>",
+               "totalTimeMinutes": <int>, "amountDueUSD": <float> }
+    Nothing is written; the ticket stays active until POST /exit.
+    """
+    log_request(logger, "Quote request", event, context)
+    
+    try:
+        values, error = QUOTE_REQUEST(event.get('queryStringParameters'))
+        if error:
+            logger.warning("Invalid ticket ID validation: %s", error)
+            return validation_error_response(error)
+        
+        quote = get_parking_service().quote_exit(values['ticket_id'])
+        
+        return success_response(quote)
+    
+    except ValueError as e:
+        error_msg = str(e)
+        logger.warning("Business logic error: %s", error_msg)
+        
+        if "not found" in error_msg.lower():
+            return not_found_response(error_msg)
+        return validation_error_response(error_msg)
+    
+    except Exception as e:
+        logger.error("Internal error in quote handler: %s", e)
+        return internal_error_response("Failed to quote parking fee")
@@ -0,0 +1,47 @@
+from typing import Dict, Any
+
+from services.provider import get_parking_service
+from services.rollups import exited_ticket
+from storage.dynamodb import deserialize
+from utils.log import get_logger
+
+# Configure logging
+logger = get_logger()
+
+
+def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    """
+    Lambda handler consuming the tickets table's DynamoDB stream.
+    
+    Expected: a batch of stream records with NEW_AND_OLD_IMAGES
+    Returns: { "records": <int>, "exits": <int>, "buckets": <int> }
+    
+    Exits in the batch are summed per lot and hour/day bucket and added to
+    the rollup table in transactions of up to 100 buckets and exit markers.
+    Errors are raised so Lambda retries the batch, or splits it to isolate a
+    failing record. The markers keep exits that an earlier attempt already
+    counted from being added twice.
+    """
+    records = event.get('Records') or []
+    
+    tickets = []
+    for record in records:
+        images = record.get('dynamodb') or {}
+        old_image = images.get('OldImage')
+        new_image = images.get('NewImage')
+        ticket = exited_ticket(
+            deserialize(old_image) if old_image else None,
+            deserialize(new_image) if new_image else None
+        )
+        if ticket is not None:
+            tickets.append(ticket)
+    
+    buckets = get_parking_service().record_rollups(tickets) if tickets else 0
+    
+    logger.info("Processed rollup stream batch", extra={
+        'records': len(records),
+        'exits': len(tickets),
+        'buckets': buckets
+    })
+    
+    return {'records': len(records), 'exits': len(tickets), 'buckets': buckets}
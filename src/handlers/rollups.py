@@ -0,0 +1,63 @@
+from datetime import datetime
+from typing import Dict, Any
+
+from models.rollup import format_bucket
+from services.provider import get_parking_service
+from services.rollups import ROLLUP_PERIODS, bucket_start
+from utils.response import success_response, validation_error_response, internal_error_response
+from utils.log import get_logger, log_request
+from utils.request_decoding import ROLLUP_REQUEST
+from utils.validation import extract_query_params
+
+# Configure logging
+logger = get_logger()
+
+# Buckets returned when no range is given, and the most allowed in one request
+DEFAULT_ROLLUP_BUCKETS = {'hour': 24, 'day': 30}
+MAX_ROLLUP_BUCKETS = 1000
+
+
+def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    """
+    Lambda handler for revenue and dwell-time rollups.
+    
+    Expected: GET /rollups?parkingLot=<int>[&period=hour|day][&from=<ISO-8601>][&to=<ISO-8601>]
+    Returns: { "parkingLot": <int>, "period": "<string>", "from": "<string>", "to": "<string>",
+               "buckets": [{ "start": "<string>", "exits": <int>, "revenueUSD": <float>,
+                             "totalMinutes": <int>, "averageMinutes": <float> }, ...] }
+             (buckets without exits are omitted)
+    """
+    log_request(logger, "Rollups request", event, context)
+    
+    try:
+        values, error = ROLLUP_REQUEST(extract_query_params(event))
+        if error:
+            logger.warning("Invalid rollups request: %s", error)
+            return validation_error_response(error)
+        
+        period = values['period'] or 'hour'
+        end = bucket_start(values['end'] or datetime.utcnow(), period)
+        if values['start'] is not None:
+            start = bucket_start(values['start'], period)
+        else:
+            start = end - ROLLUP_PERIODS[period] * (DEFAULT_ROLLUP_BUCKETS[period] - 1)
+        
+        if start > end:
+            return validation_error_response("'from' must not be after 'to'")
+        if (end - start) // ROLLUP_PERIODS[period] >= MAX_ROLLUP_BUCKETS:
+            return validation_error_response(f"At most {MAX_ROLLUP_BUCKETS} buckets are allowed per request")
+        
+        parking_service = get_parking_service()
+        buckets = parking_service.get_rollups(values['parking_lot'], period, start, end)
+        
+        return success_response({
+            'parkingLot': values['parking_lot'],
+            'period': period,
+            'from': format_bucket(start),
+            'to': format_bucket(end),
+            'buckets': buckets
+        })
+    
+    except Exception as e:
+        logger.error("Internal error in rollups handler: %s", e)
+        return internal_error_response("Failed to get rollups")
@@ -1,10 +1,41 @@
-from datetime import datetime
-from typing import Dict, Any, Optional
+from datetime import datetime, timedelta
+from typing import Dict, Any, Optional, Union
 from dataclasses import dataclass
-import uuid
+from decimal import Decimal
 
+from models.ticket_id import new_ticket_id
 
-@dataclass
+# Timestamps are stored as integer seconds since the Unix epoch (UTC)
+EPOCH = datetime(1970, 1, 1)
+
+# Attributes needed to build a ParkingTicket, for read projections
+TICKET_ATTRIBUTE_NAMES = [
+    'ticket_id', 'plate', 'parking_lot', 'entry_time', 'exit_time', 'charge_cents', 'duration_minutes'
+]
+TICKET_ATTRIBUTES = ', '.join(TICKET_ATTRIBUTE_NAMES)
+
+
+def to_epoch(value: datetime) -> int:
+    """Convert a naive UTC datetime to epoch seconds."""
+    return int((value - EPOCH).total_seconds())
+
+
+def from_storage_time(value: Union[str, int, Decimal]) -> datetime:
+    """
+    Parse a stored timestamp.
+    
+    Args:
+        value: Epoch seconds (compact format) or ISO-8601 string (legacy items)
+        
+    Returns:
+        Naive UTC datetime
+    """
+    if isinstance(value, str):
+        return datetime.fromisoformat(value)
+    return EPOCH + timedelta(0, int(value))
+
+
+@dataclass(slots=True)
 class ParkingTicket:
     """Data model for parking tickets."""
     
@@ -13,36 +44,55 @@ class ParkingTicket:
     parking_lot: int
     entry_time: datetime
     exit_time: Optional[datetime] = None
+    # Set on exit; tickets exited before charges were stored have neither
+    charge_cents: Optional[int] = None
+    duration_minutes: Optional[int] = None
     
     @classmethod
     def create_new(cls, plate: str, parking_lot: int) -> 'ParkingTicket':
         """Create a new parking ticket with generated ID and current timestamp."""
+        entry_time = datetime.utcnow()
         return cls(
-            ticket_id=str(uuid.uuid4()),
+            ticket_id=new_ticket_id(entry_time, parking_lot),
             plate=plate.strip(),
             parking_lot=parking_lot,
-            entry_time=datetime.utcnow()
+            entry_time=entry_time
         )
     
     def to_dict(self) -> Dict[str, Any]:
-        """Convert ticket to dictionary for DynamoDB storage."""
-        return {
+        """Convert ticket to dictionary for DynamoDB storage (epoch timestamps, no null attributes)."""
+        data = {
             'ticket_id': self.ticket_id,
             'plate': self.plate,
             'parking_lot': self.parking_lot,
-            'entry_time': self.entry_time.isoformat(),
-            'exit_time': self.exit_time.isoformat() if self.exit_time else None
+            'entry_time': to_epoch(self.entry_time)
         }
+        
+        if self.exit_time:
+            data['exit_time'] = to_epoch(self.exit_time)
+        else:
+            # Sparse index key: only active tickets appear in the plate index
+            data['active_plate'] = self.plate
+        
+        if self.charge_cents is not None:
+            data['charge_cents'] = self.charge_cents
+            data['duration_minutes'] = self.duration_minutes
+        
+        return data
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'ParkingTicket':
-        """Create ticket from DynamoDB data."""
+        """Create ticket from DynamoDB data (compact or legacy ISO-8601 format)."""
+        exit_time = data.get('exit_time')
+        charge_cents = data.get('charge_cents')
         return cls(
             ticket_id=data['ticket_id'],
             plate=data['plate'],
             parking_lot=int(data['parking_lot']),
-            entry_time=datetime.fromisoformat(data['entry_time']),
-            exit_time=datetime.fromisoformat(data['exit_time']) if data.get('exit_time') else None
+            entry_time=from_storage_time(data['entry_time']),
+            exit_time=from_storage_time(exit_time) if exit_time else None,
+            charge_cents=int(charge_cents) if charge_cents is not None else None,
+            duration_minutes=int(data['duration_minutes']) if charge_cents is not None else None
         )
     
     def mark_exit(self) -> None:
@@ -55,4 +105,4 @@ class ParkingTicket:
             raise ValueError("Cannot calculate duration without exit time")
         
         duration = self.exit_time - self.entry_time
-        return int(duration.total_seconds() / 60) 
\ No newline at end of file
+        return int(duration.total_seconds() / 60)
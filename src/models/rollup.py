@@ -0,0 +1,47 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Any, NamedTuple
+
+from models.parking_ticket import ParkingTicket
+
+
+class RollupKey(NamedTuple):
+    """One rollup bucket: a lot's totals for the hour or day starting at bucket_start."""
+    
+    parking_lot: int
+    period: str
+    bucket_start: datetime
+
+
+@dataclass(slots=True)
+class RollupTotals:
+    """Exit count, revenue and dwell time accumulated in a bucket."""
+    
+    exits: int = 0
+    revenue_cents: int = 0
+    dwell_minutes: int = 0
+    
+    def add(self, ticket: ParkingTicket) -> None:
+        """Count an exited ticket; its charge and duration must be set."""
+        self.exits += 1
+        self.revenue_cents += ticket.charge_cents
+        self.dwell_minutes += ticket.duration_minutes
+    
+    @classmethod
+    def from_item(cls, item: Dict[str, Any]) -> 'RollupTotals':
+        """Read totals from a stored rollup item."""
+        return cls(
+            exits=int(item.get('exits', 0)),
+            revenue_cents=int(item.get('revenue_cents', 0)),
+            dwell_minutes=int(item.get('dwell_minutes', 0))
+        )
+
+
+def format_bucket(start: datetime) -> str:
+    """Stored form of a bucket start; ISO-8601 UTC, so buckets sort in time order."""
+    return start.isoformat() + 'Z'
+
+
+def series_key(parking_lot: int, period: str) -> str:
+    """Partition key holding all buckets of one lot and period."""
+    return f"{parking_lot}#{period}"
@@ -0,0 +1,108 @@
+import hmac
+import os
+import re
+import uuid
+from datetime import datetime, timedelta
+from typing import NamedTuple, Optional
+
+# Signed ID layout (20 bytes, 32 base32 characters):
+#   entry time (5 bytes, epoch seconds) | parking lot (2 bytes) | random (5 bytes) | HMAC-SHA256 (8 bytes)
+# The entry time comes first, so IDs sort by entry time.
+SIGNED_ID_LENGTH = 32
+_PAYLOAD_BYTES = 12
+_SIGNATURE_BYTES = 8
+
+# Base 32 digits as int() reads them; the alphabet is in ASCII order, so
+# encoded IDs sort like the bytes and decode with a single int(value, 32)
+_DIGITS = '0123456789abcdefghijklmnopqrstuv'
+
+_LEGACY_ID_PATTERN = re.compile(r'[a-f0-9\-]{36}')
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+class SignedTicketId(NamedTuple):
+    """Fields carried by a signed ticket ID."""
+    
+    entry_time: datetime
+    parking_lot: int
+
+
+def _get_secret() -> Optional[bytes]:
+    """Signing key from TICKET_ID_SECRET, or None if signed IDs are disabled."""
+    secret = os.environ.get('TICKET_ID_SECRET')
+    return secret.encode() if secret else None
+
+
+def _sign(secret: bytes, payload: bytes) -> bytes:
+    return hmac.digest(secret, payload, 'sha256')[:_SIGNATURE_BYTES]
+
+
+def new_ticket_id(entry_time: datetime, parking_lot: int) -> str:
+    """
+    Generate a ticket ID.
+    
+    With TICKET_ID_SECRET set the ID is signed and carries the entry time and
+    lot; otherwise a random UUID is returned.
+    
+    Args:
+        entry_time: Naive UTC entry time (stored with one second resolution)
+        parking_lot: Parking lot identifier (1-9999)
+    
+    Returns:
+        Ticket ID
+    """
+    secret = _get_secret()
+    if secret is None:
+        return str(uuid.uuid4())
+    
+    payload = int((entry_time - _EPOCH).total_seconds()).to_bytes(5, 'big') + parking_lot.to_bytes(2, 'big') + os.urandom(5)
+    number = int.from_bytes(payload + _sign(secret, payload), 'big')
+    return ''.join(_DIGITS[(number >> shift) & 31] for shift in range(5 * (SIGNED_ID_LENGTH - 1), -1, -5))
+
+
+def decode_signed_ticket_id(ticket_id: str) -> Optional[SignedTicketId]:
+    """
+    Decode and verify a signed ticket ID without any storage access.
+    
+    Args:
+        ticket_id: Ticket ID, in any case
+    
+    Returns:
+        SignedTicketId, or None if the ID is malformed, forged or signed IDs are disabled
+    """
+    secret = _get_secret()
+    # int() would also accept '_', signs and non-ASCII digits
+    if secret is None or len(ticket_id) != SIGNED_ID_LENGTH or not (ticket_id.isascii() and ticket_id.isalnum()):
+        return None
+    
+    try:
+        raw = int(ticket_id, 32).to_bytes(20, 'big')
+    except ValueError:
+        return None
+    
+    payload = raw[:_PAYLOAD_BYTES]
+    if not hmac.compare_digest(raw[_PAYLOAD_BYTES:], _sign(secret, payload)):
+        return None
+    
+    return SignedTicketId(
+        entry_time=_EPOCH + timedelta(0, int.from_bytes(payload[:5], 'big')),
+        parking_lot=int.from_bytes(payload[5:7], 'big')
+    )
+
+
+def normalize_ticket_id(value: str) -> Optional[str]:
+    """
+    Validate a ticket ID from a request.
+    
+    Args:
+        value: Stripped ticket ID
+    
+    Returns:
+        The ID in canonical form (signed IDs are lower case), or None if invalid
+    """
+    if len(value) == SIGNED_ID_LENGTH:
+        return value.lower() if decode_signed_ticket_id(value) else None
+    if _LEGACY_ID_PATTERN.fullmatch(value.lower()):
+        return value
+    return None
@@ -0,0 +1,27 @@
+"""
+Serve the parking API over HTTP for deployments without Lambda.
+
+Usage: PYTHONPATH=src python -m server [--host 0.0.0.0] [--port 8080] [--workers 32]
+"""
+import argparse
+import asyncio
+
+from server.http_server import ParkingHTTPServer
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n\n')[0])
+    parser.add_argument('--host', default='127.0.0.1', help='interface to listen on')
+    parser.add_argument('--port', type=int, default=8080, help='TCP port')
+    parser.add_argument('--workers', type=int, help='handler threads (default: SERVER_WORKERS, else 32)')
+    args = parser.parse_args()
+    
+    server = ParkingHTTPServer(args.host, args.port, args.workers)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
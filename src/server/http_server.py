@@ -0,0 +1,237 @@
+import asyncio
+import importlib
+import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from typing import Dict, Any, Optional, Tuple, Callable
+from urllib.parse import urlsplit, parse_qsl
+
+from services.provider import get_parking_service
+from utils.log import get_logger
+from utils.response import error_response
+
+# API Gateway routes: (method, path) -> handler module
+ROUTES: Dict[Tuple[str, str], str] = {
+    ('POST', '/entry'): 'handlers.entry',
+    ('POST', '/exit'): 'handlers.exit',
+    ('POST', '/entry/batch'): 'handlers.batch_entry',
+    ('POST', '/exit/batch'): 'handlers.batch_exit',
+    ('GET', '/occupancy'): 'handlers.occupancy',
+    ('GET', '/rollups'): 'handlers.rollups',
+    ('GET', '/quote'): 'handlers.quote',
+}
+
+# Largest accepted request head and body; batch requests stay well below these
+MAX_HEAD_BYTES = 16 * 1024
+MAX_BODY_BYTES = 1024 * 1024
+
+# Idle keep-alive connections are closed after this many seconds
+KEEP_ALIVE_TIMEOUT_SECONDS = 30
+
+_REASONS = {
+    200: 'OK', 201: 'Created', 204: 'No Content', 400: 'Bad Request', 404: 'Not Found',
+    405: 'Method Not Allowed', 408: 'Request Timeout', 411: 'Length Required',
+    413: 'Payload Too Large', 500: 'Internal Server Error'
+}
+
+LambdaHandler = Callable[[Dict[str, Any], Any], Dict[str, Any]]
+
+logger = get_logger()
+
+
+class BadRequest(Exception):
+    """A request that cannot be parsed; answered with the given status."""
+    
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def build_event(method: str, target: str, headers: Dict[str, str], body: bytes) -> Dict[str, Any]:
+    """
+    Build the API Gateway proxy event a handler expects from an HTTP request.
+    
+    Args:
+        method: HTTP method
+        target: Request target (path and query string)
+        headers: Request headers
+        body: Request body
+    
+    Returns:
+        Lambda proxy integration event
+    """
+    url = urlsplit(target)
+    query = dict(parse_qsl(url.query, keep_blank_values=True))
+    
+    return {
+        'httpMethod': method,
+        'path': url.path,
+        'headers': headers,
+        'queryStringParameters': query or None,
+        'body': body.decode('utf-8', errors='replace') if body else None,
+        'isBase64Encoded': False,
+        'requestContext': {'requestId': str(uuid.uuid4()), 'httpMethod': method, 'path': url.path}
+    }
+
+
+def render_response(response: Dict[str, Any], keep_alive: bool) -> bytes:
+    """Serialize a handler's proxy response as an HTTP/1.1 response."""
+    status = int(response.get('statusCode', 200))
+    body = response.get('body') or ''
+    body_bytes = body.encode('utf-8') if isinstance(body, str) else bytes(body)
+    
+    lines = [f"HTTP/1.1 {status} {_REASONS.get(status, 'Unknown')}"]
+    for name, value in (response.get('headers') or {}).items():
+        lines.append(f"{name}: {value}")
+    lines.append(f"Content-Length: {len(body_bytes)}")
+    lines.append('Connection: keep-alive' if keep_alive else 'Connection: close')
+    
+    return ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + body_bytes
+
+
+class ParkingHTTPServer:
+    """
+    Serve the Lambda handlers over HTTP/1.1 with asyncio.
+    
+    Connections are handled by the event loop; each request runs its
+    unchanged lambda_handler on a thread pool, because the handlers and
+    boto3 are blocking. All requests share one warm ParkingService, and so
+    one storage client and connection pool.
+    """
+    
+    def __init__(self, host: str = '127.0.0.1', port: int = 8080, workers: Optional[int] = None):
+        """
+        Initialize the server.
+        
+        Args:
+            host: Interface to listen on
+            port: TCP port (0 picks a free port)
+            workers: Handler threads (default: SERVER_WORKERS environment variable, else 32)
+        """
+        self.host = host
+        self.port = port
+        self.workers = workers or int(os.getenv('SERVER_WORKERS', '32'))
+        self.handlers: Dict[Tuple[str, str], LambdaHandler] = {
+            route: importlib.import_module(module).lambda_handler for route, module in ROUTES.items()
+        }
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+    
+    async def start(self) -> None:
+        """Build the shared service and start listening."""
+        # One storage connection per handler thread avoids pool churn under load
+        os.environ.setdefault('DYNAMODB_MAX_POOL_CONNECTIONS', str(self.workers))
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='handler')
+        
+        # Build the service before the first request, as a warm Lambda container would have it
+        await asyncio.get_running_loop().run_in_executor(self._executor, get_parking_service)
+        
+        self._server = await asyncio.start_server(self._serve_connection, self.host, self.port, limit=MAX_HEAD_BYTES)
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info("HTTP server listening", extra={'host': self.host, 'port': self.port, 'workers': self.workers})
+    
+    async def serve_forever(self) -> None:
+        """Start the server if needed and serve until cancelled."""
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+    
+    async def close(self) -> None:
+        """Stop accepting connections and release the handler threads."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+    
+    async def _serve_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            keep_alive = True
+            while keep_alive:
+                try:
+                    request = await asyncio.wait_for(self._read_request(reader), KEEP_ALIVE_TIMEOUT_SECONDS)
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+                    break
+                except BadRequest as e:
+                    writer.write(render_response(error_response(str(e), e.status), keep_alive=False))
+                    await writer.drain()
+                    break
+                
+                if request is None:
+                    break
+                
+                method, target, headers, body, keep_alive = request
+                response = await self._dispatch(method, target, headers, body)
+                writer.write(render_response(response, keep_alive))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+    
+    async def _read_request(self, reader: asyncio.StreamReader) -> Optional[tuple]:
+        """
+        Read one request from a connection.
+        
+        Returns:
+            (method, target, headers, body, keep_alive), or None when the client closed the connection
+        
+        Raises:
+            BadRequest: If the request is malformed or too large
+        """
+        try:
+            head = await reader.readuntil(b'\r\n\r\n')
+        except asyncio.IncompleteReadError as e:
+            if not e.partial.strip():
+                return None
+            raise BadRequest(400, "Incomplete request")
+        except asyncio.LimitOverrunError:
+            raise BadRequest(413, "Request head too large")
+        
+        lines = head.decode('latin-1').split('\r\n')
+        try:
+            method, target, version = lines[0].split(' ')
+        except ValueError:
+            raise BadRequest(400, "Malformed request line")
+        
+        headers: Dict[str, str] = {}
+        for line in lines[1:]:
+            if line:
+                name, _, value = line.partition(':')
+                headers[name.strip()] = value.strip()
+        lowered = {name.lower(): value for name, value in headers.items()}
+        
+        if 'chunked' in lowered.get('transfer-encoding', '').lower():
+            raise BadRequest(411, "Chunked request bodies are not supported")
+        try:
+            length = int(lowered.get('content-length', '0'))
+        except ValueError:
+            raise BadRequest(400, "Invalid Content-Length")
+        if length < 0 or length > MAX_BODY_BYTES:
+            raise BadRequest(413, "Request body too large")
+        
+        body = await reader.readexactly(length) if length else b''
+        
+        connection = lowered.get('connection', '').lower()
+        keep_alive = connection != 'close' if version == 'HTTP/1.1' else connection == 'keep-alive'
+        return method.upper(), target, headers, body, keep_alive
+    
+    async def _dispatch(self, method: str, target: str, headers: Dict[str, str], body: bytes) -> Dict[str, Any]:
+        """Run the route's lambda_handler on the thread pool."""
+        path = urlsplit(target).path.rstrip('/') or '/'
+        handler = self.handlers.get((method, path))
+        if handler is None:
+            if any(route_path == path for _, route_path in self.handlers):
+                return error_response("Method not allowed", 405)
+            return error_response("Not found", 404)
+        
+        event = build_event(method, target, headers, body)
+        context = SimpleNamespace(aws_request_id=event['requestContext']['requestId'], function_name='local-server')
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, handler, event, context)
+        except Exception as e:
+            # Handlers catch their own errors; this only guards the server loop
+            logger.error("Unhandled error in %s: %s", path, e)
+            return error_response("Internal server error", 500)
@@ -0,0 +1,179 @@
+import gzip
+import json
+import os
+import tempfile
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Any, List, Optional
+
+from models.parking_ticket import ParkingTicket
+from storage.base import TicketStorage
+
+DEFAULT_RECORDS_PER_FILE = 100_000
+
+
+class ArchiveWriter:
+    """
+    Write ticket records to gzip-compressed newline-delimited JSON files.
+    
+    Records are split into parts of at most records_per_file lines. The
+    destination is a local directory or an s3://bucket/prefix URL; S3 parts
+    are written to a temporary file and uploaded when complete.
+    """
+    
+    def __init__(self, destination: str, name: str, records_per_file: int = DEFAULT_RECORDS_PER_FILE):
+        """
+        Initialize the writer.
+        
+        Args:
+            destination: Local directory or s3://bucket/prefix
+            name: File name prefix; parts are named <name>-<part>.ndjson.gz
+            records_per_file: Maximum records per part
+        """
+        self.destination = destination
+        self.name = name
+        self.records_per_file = records_per_file
+        self.files: List[str] = []
+        self._part = 0
+        self._file = None
+        self._path: Optional[str] = None
+        self._count = 0
+        self._s3 = None
+    
+    @property
+    def room(self) -> int:
+        """Records that still fit in the current part."""
+        return self.records_per_file - self._count
+    
+    def write(self, records: List[Dict[str, Any]]) -> None:
+        """Append records to the current part, opening one if needed."""
+        if self._file is None:
+            self._open()
+        
+        self._file.write(''.join(json.dumps(record, separators=(',', ':')) + '\n' for record in records))
+        self._count += len(records)
+    
+    def close_part(self) -> Optional[str]:
+        """
+        Finish the current part and upload it if the destination is S3.
+        
+        Returns:
+            Location of the finished part, or None if no part was open
+        """
+        if self._file is None:
+            return None
+        
+        self._file.close()
+        self._file = None
+        self._count = 0
+        
+        location = self._path
+        if self.destination.startswith('s3://'):
+            bucket, _, prefix = self.destination[len('s3://'):].partition('/')
+            key = '/'.join(part for part in (prefix.strip('/'), os.path.basename(self._path)) if part)
+            try:
+                self._s3_client().upload_file(self._path, bucket, key)
+            finally:
+                os.remove(self._path)
+            location = f's3://{bucket}/{key}'
+        
+        self.files.append(location)
+        return location
+    
+    def _open(self) -> None:
+        self._part += 1
+        file_name = f'{self.name}-{self._part:05d}.ndjson.gz'
+        
+        if self.destination.startswith('s3://'):
+            directory = tempfile.gettempdir()
+        else:
+            directory = self.destination
+            os.makedirs(directory, exist_ok=True)
+        
+        self._path = os.path.join(directory, file_name)
+        self._file = gzip.open(self._path, 'wt', encoding='utf-8')
+    
+    def _s3_client(self):
+        if self._s3 is None:
+            import boto3
+            self._s3 = boto3.client('s3')
+        return self._s3
+
+
+class TicketArchiver:
+    """
+    Move exited tickets out of the hot table into compressed archive files.
+    
+    Tickets are streamed from storage in pages and written to the archive.
+    Only after a part is complete (and uploaded) are its tickets marked for
+    TTL expiry, so a failed run never expires a ticket that was not archived,
+    and a repeated run skips tickets that already are.
+    """
+    
+    def __init__(self, storage: TicketStorage, clock: Callable[[], datetime] = datetime.utcnow):
+        """
+        Initialize the archiver.
+        
+        Args:
+            storage: Ticket storage to archive from
+            clock: Current UTC time source
+        """
+        self.storage = storage
+        self.clock = clock
+    
+    def archive(
+        self,
+        destination: str,
+        older_than_days: int,
+        records_per_file: int = DEFAULT_RECORDS_PER_FILE,
+        page_size: int = 1000,
+        expire: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Archive tickets that exited more than older_than_days ago.
+        
+        Args:
+            destination: Local directory or s3://bucket/prefix
+            older_than_days: Minimum age of the exit, in days
+            records_per_file: Maximum records per archive file
+            page_size: Items per storage read
+            expire: Whether to mark archived tickets for TTL expiry (False for a dry run)
+        
+        Returns:
+            Summary with the cutoff, archived and expired counts, files written
+            and IDs that could not be marked for expiry
+        """
+        now = self.clock().replace(microsecond=0)
+        cutoff = now - timedelta(days=older_than_days)
+        writer = ArchiveWriter(destination, f"tickets-{cutoff.strftime('%Y%m%dT%H%M%SZ')}", records_per_file)
+        
+        archived = 0
+        expired = 0
+        not_expired: List[str] = []
+        part_items: List[Dict[str, Any]] = []
+        
+        def finish_part():
+            nonlocal expired
+            writer.close_part()
+            if expire and part_items:
+                failed = self.storage.expire_tickets(part_items, now)
+                expired += len(part_items) - len(failed)
+                not_expired.extend(failed)
+            part_items.clear()
+        
+        for page in self.storage.scan_exited(cutoff, page_size):
+            while page:
+                chunk, page = page[:writer.room], page[writer.room:]
+                writer.write([ParkingTicket.from_dict(item).to_dict() for item in chunk])
+                part_items.extend(chunk)
+                archived += len(chunk)
+                if writer.room == 0:
+                    finish_part()
+        finish_part()
+        
+        return {
+            'cutoff': cutoff.isoformat() + 'Z',
+            'archived': archived,
+            'expired': expired,
+            'files': writer.files,
+            'notExpired': not_expired
+        }
@@ -0,0 +1,56 @@
+import csv
+import json
+from typing import Dict, Any, IO, Iterable
+
+from models.parking_ticket import ParkingTicket
+
+EXPORT_FIELDS = ['ticket_id', 'plate', 'parking_lot', 'entry_time', 'exit_time']
+
+
+def export_record(ticket: ParkingTicket) -> Dict[str, Any]:
+    """Flat export row for a ticket, with ISO-8601 UTC timestamps."""
+    return {
+        'ticket_id': ticket.ticket_id,
+        'plate': ticket.plate,
+        'parking_lot': ticket.parking_lot,
+        'entry_time': ticket.entry_time.isoformat() + 'Z',
+        'exit_time': ticket.exit_time.isoformat() + 'Z' if ticket.exit_time else None
+    }
+
+
+def write_csv(tickets: Iterable[ParkingTicket], output: IO[str]) -> int:
+    """
+    Stream tickets to CSV with a header row.
+    
+    Returns:
+        Number of tickets written
+    """
+    writer = csv.DictWriter(output, fieldnames=EXPORT_FIELDS, lineterminator='\n')
+    writer.writeheader()
+    
+    count = 0
+    for ticket in tickets:
+        writer.writerow(export_record(ticket))
+        count += 1
+    return count
+
+
+def write_ndjson(tickets: Iterable[ParkingTicket], output: IO[str]) -> int:
+    """
+    Stream tickets as newline-delimited JSON.
+    
+    Returns:
+        Number of tickets written
+    """
+    count = 0
+    for ticket in tickets:
+        output.write(json.dumps(export_record(ticket), separators=(',', ':')))
+        output.write('\n')
+        count += 1
+    return count
+
+
+WRITERS = {
+    'csv': write_csv,
+    'ndjson': write_ndjson,
+}
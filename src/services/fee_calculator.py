@@ -1,7 +1,25 @@
 import math
-from typing import Optional
+from datetime import datetime
+from typing import Any, Optional, Sequence, List, Union, Dict
 import os
 
+# NumPy is optional and only used for bulk pricing, so it is imported on first
+# use instead of on every cold start; None once it turns out to be missing
+_NOT_LOADED = object()
+np: Any = _NOT_LOADED
+
+
+def get_numpy() -> Any:
+    """Return the numpy module, or None if it is not installed (bulk pricing then falls back to pure Python)."""
+    global np
+    if np is _NOT_LOADED:
+        try:
+            import numpy
+            np = numpy
+        except ImportError:
+            np = None
+    return np
+
 
 class FeeCalculator:
     """Modular fee calculation service for parking charges."""
@@ -31,7 +49,67 @@ class FeeCalculator:
             return 0.0
         
         # Round up to next billing increment
-        billable_minutes = math.ceil(duration_minutes / self.billing_increment_minutes) * self.billing_increment_minutes
+        return self._fee_for_increments(math.ceil(duration_minutes / self.billing_increment_minutes))
+    
+    def calculate_stay_fee(self, entry_time: datetime, exit_time: datetime) -> float:
+        """
+        Calculate parking fee for a stay.
+        
+        The flat rate only depends on the duration; tariff calculators use the
+        entry and exit times to apply time-of-day pricing.
+        
+        Args:
+            entry_time: Entry timestamp
+            exit_time: Exit timestamp
+            
+        Returns:
+            Fee in USD rounded to 2 decimal places
+        """
+        return self.calculate_fee(int((exit_time - entry_time).total_seconds() / 60))
+    
+    def calculate_fees(self, durations: Union[Sequence[int], 'np.ndarray']) -> Union[List[float], 'np.ndarray']:
+        """
+        Calculate parking fees for many durations at once.
+        
+        Durations are converted to billing increments in one vectorized pass.
+        Fees only depend on the increment count, so each distinct count is
+        priced once with the same arithmetic as calculate_fee and the results
+        are scattered back, which keeps them identical to the scalar path.
+        
+        Args:
+            durations: Parking durations in minutes (sequence or NumPy array)
+            
+        Returns:
+            Fees in USD, as a NumPy array for array input, otherwise a list
+        """
+        np = get_numpy()
+        if np is None:
+            return self._calculate_fees_python(durations)
+        
+        minutes = np.asarray(durations, dtype=np.float64)
+        increments = np.ceil(minutes / self.billing_increment_minutes).astype(np.int64)
+        increments[minutes <= 0] = 0
+        
+        counts, positions = np.unique(increments, return_inverse=True)
+        prices = np.array([self._fee_for_increments(int(count)) if count > 0 else 0.0 for count in counts])
+        fees = prices[positions.reshape(minutes.shape)]
+        
+        return fees if isinstance(durations, np.ndarray) else fees.tolist()
+    
+    def _calculate_fees_python(self, durations: Sequence[int]) -> List[float]:
+        """Bulk pricing without NumPy, pricing each distinct duration once."""
+        prices: Dict[int, float] = {}
+        fees = []
+        for duration in durations:
+            fee = prices.get(duration)
+            if fee is None:
+                fee = prices[duration] = self.calculate_fee(duration)
+            fees.append(fee)
+        return fees
+    
+    def _fee_for_increments(self, increments: int) -> float:
+        """Fee in USD for a number of started billing increments."""
+        billable_minutes = increments * self.billing_increment_minutes
         
         # Calculate fee based on hourly rate
         fee = (billable_minutes / 60) * self.hourly_rate
@@ -47,5 +125,31 @@ class FeeCalculator:
         }
 
 
-# Default instance for easy import
-default_calculator = FeeCalculator() 
\ No newline at end of file
+def create_default_calculator() -> FeeCalculator:
+    """
+    Create the calculator configured by the environment.
+    
+    Uses the tariff schedule in TARIFF_SCHEDULE (JSON) when set, otherwise
+    the flat HOURLY_RATE / BILLING_INCREMENT_MINUTES pricing.
+    """
+    schedule = os.getenv('TARIFF_SCHEDULE')
+    if schedule:
+        from services.tariff import TariffFeeCalculator
+        return TariffFeeCalculator.from_json(schedule)
+    return FeeCalculator()
+
+
+_default_calculator: Optional[FeeCalculator] = None
+
+
+def get_default_calculator() -> FeeCalculator:
+    """
+    Return the shared calculator configured by the environment.
+    
+    Built on first use rather than at import, so importing this module never
+    pulls in the tariff engine (which itself imports this module).
+    """
+    global _default_calculator
+    if _default_calculator is None:
+        _default_calculator = create_default_calculator()
+    return _default_calculator 
\ No newline at end of file
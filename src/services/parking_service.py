@@ -1,48 +1,111 @@
-import boto3
+import math
 import os
-from typing import Optional, Dict, Any
-from botocore.exceptions import ClientError
+from datetime import datetime
+from typing import Optional, Dict, Any, Iterator, List, Tuple, Union
 
-from models.parking_ticket import ParkingTicket
-from services.fee_calculator import default_calculator
+from models.parking_ticket import ParkingTicket, TICKET_ATTRIBUTE_NAMES
+from models.ticket_id import decode_signed_ticket_id
+from services.fee_calculator import get_default_calculator
+from storage.base import (
+    TicketStorage, StorageError, ExitCharge, IDEMPOTENCY_CONFLICT, ROLLUP_WRITE_LIMIT, create_storage,
+    idempotency_ttl_seconds
+)
+from utils.cache import TTLCache
+from utils.metrics import stage
 
 
 class ParkingService:
-    """Service for managing parking tickets and DynamoDB operations."""
+    """Service for managing parking tickets on top of a storage engine."""
     
-    def __init__(self):
-        """Initialize service with DynamoDB client."""
-        self.dynamodb = boto3.resource('dynamodb')
-        self.table_name = os.getenv('PARKING_TABLE_NAME', 'parking-tickets')
-        self.table = self.dynamodb.Table(self.table_name)
-        self.fee_calculator = default_calculator
+    def __init__(self, storage: Optional[TicketStorage] = None):
+        """
+        Initialize service.
+        
+        Args:
+            storage: Storage engine (default: engine selected by STORAGE_ENGINE)
+        """
+        self.storage = storage or create_storage()
+        self.fee_calculator = get_default_calculator()
+        self.exit_workers = int(os.getenv('EXIT_WORKERS', '8'))
+        # Recent idempotency keys of this container: (ticket ID, plate, lot) by key
+        self.recent_entries = TTLCache(int(os.getenv('IDEMPOTENCY_CACHE_SIZE', '1000')), idempotency_ttl_seconds())
+        # Ticket items read or exited by this container. Active tickets can be
+        # exited elsewhere, so they expire quickly; exited tickets never change
+        self.ticket_cache = TTLCache(
+            int(os.getenv('TICKET_CACHE_SIZE', '10000')),
+            float(os.getenv('TICKET_CACHE_TTL_SECONDS', '5'))
+        )
     
-    def create_entry(self, plate: str, parking_lot: int) -> str:
+    def create_entry(self, plate: str, parking_lot: int, idempotency_key: Optional[str] = None) -> str:
         """
         Create a new parking entry.
         
+        Repeating a request with the same idempotency key returns the original
+        ticket ID instead of creating another ticket. Keys seen recently by this
+        container are answered from memory; others are resolved by the
+        conditional write in storage.
+        
         Args:
             plate: License plate number
             parking_lot: Parking lot identifier
+            idempotency_key: Optional client request token
             
         Returns:
-            Generated ticket ID
+            Generated ticket ID, or the original ticket ID for a repeated key
             
         Raises:
-            Exception: If DynamoDB operation fails
+            ValueError: If the idempotency key was used for a different entry
+            Exception: If the storage operation fails
         """
+        if idempotency_key is not None:
+            recent = self.recent_entries.get(idempotency_key)
+            if recent is not None:
+                ticket_id, recent_plate, recent_lot = recent
+                if (recent_plate, recent_lot) != (plate.strip(), parking_lot):
+                    raise ValueError(IDEMPOTENCY_CONFLICT)
+                return ticket_id
+        
         ticket = ParkingTicket.create_new(plate, parking_lot)
+        with stage('store'):
+            ticket_id = self.storage.put_ticket(ticket, idempotency_key)
         
-        try:
-            self.table.put_item(Item=ticket.to_dict())
-            return ticket.ticket_id
-        except ClientError as e:
-            raise Exception(f"Failed to create parking entry: {e.response['Error']['Message']}")
+        if idempotency_key is not None:
+            self.recent_entries.set(idempotency_key, (ticket_id, ticket.plate, ticket.parking_lot))
+        return ticket_id
+    
+    def create_entries(self, entries: List[Tuple[str, int]]) -> List[Dict[str, Any]]:
+        """
+        Create several parking entries with batched storage writes.
+        
+        Args:
+            entries: List of (plate, parking_lot) pairs, already validated
+            
+        Returns:
+            List of results in input order, each with 'ticketId' and 'status'
+            ('created' or 'failed', the latter with an 'error' message)
+        """
+        tickets = [ParkingTicket.create_new(plate, parking_lot) for plate, parking_lot in entries]
+        errors = self.storage.put_tickets(tickets) if tickets else {}
+        
+        results = []
+        for ticket in tickets:
+            if ticket.ticket_id in errors:
+                results.append({'ticketId': None, 'status': 'failed', 'error': errors[ticket.ticket_id]})
+            else:
+                results.append({'ticketId': ticket.ticket_id, 'status': 'created'})
+        return results
     
     def process_exit(self, ticket_id: str) -> Dict[str, Any]:
         """
         Process parking exit and calculate charges.
         
+        Signed IDs are priced before the write, so their charge and duration
+        are stored in the exit update itself. Legacy IDs are priced from the
+        ticket read that precedes the write, where the storage engine does one
+        (DynamoDB with occupancy tracking, the memory engine). A plain
+        DynamoDB UpdateItem exit has no such read, so it stores no charge and
+        the rollup stream consumer prices it the same way.
+        
         Args:
             ticket_id: Unique ticket identifier
             
@@ -51,46 +114,363 @@ class ParkingService:
             
         Raises:
             ValueError: If ticket not found or already processed
-            Exception: If DynamoDB operation fails
+            Exception: If the storage operation fails
+        """
+        # Exited tickets never change, so a repeat exit needs no storage call
+        cached = self.ticket_cache.get(ticket_id)
+        if cached is not None and cached.get('exit_time'):
+            raise ValueError(f"Ticket {ticket_id} already processed")
+        
+        # Stored timestamps have one second resolution
+        exit_time = datetime.utcnow().replace(microsecond=0)
+        
+        # Signed IDs carry entry time and lot: price before the write, and
+        # let storage pick the lot counter without reading the ticket first
+        signed = decode_signed_ticket_id(ticket_id)
+        if signed is not None:
+            with stage('fee'):
+                charge_usd = self.fee_calculator.calculate_stay_fee(signed.entry_time, exit_time)
+                charge = exit_charge(charge_usd, signed.entry_time, exit_time)
+            with stage('store'):
+                item = self.storage.exit_ticket(ticket_id, exit_time, signed.parking_lot, charge)
+        else:
+            priced: List[Tuple[float, ExitCharge]] = []
+            
+            def price(entry_time: datetime) -> ExitCharge:
+                with stage('fee'):
+                    charge_usd = self.fee_calculator.calculate_stay_fee(entry_time, exit_time)
+                priced.append((charge_usd, exit_charge(charge_usd, entry_time, exit_time)))
+                return priced[-1][1]
+            
+            with stage('store'):
+                item = self.storage.exit_ticket(ticket_id, exit_time, price=price)
+            charge_usd, charge = priced[-1] if priced else (None, None)
+        
+        ticket = ParkingTicket.from_dict(item)
+        ticket.exit_time = exit_time
+        if charge is not None:
+            ticket.charge_cents, ticket.duration_minutes = charge
+        else:
+            with stage('fee'):
+                charge_usd = self.fee_calculator.calculate_stay_fee(ticket.entry_time, exit_time)
+        self.ticket_cache.set(ticket_id, ticket.to_dict(), math.inf)
+        
+        return {
+            'plate': ticket.plate,
+            'totalTimeMinutes': ticket.get_duration_minutes(),
+            'parkingLot': ticket.parking_lot,
+            'chargeUSD': charge_usd
+        }
+    
+    def quote_exit(self, ticket_id: str) -> Dict[str, Any]:
+        """
+        Price a ticket as if it exited now, without writing anything.
+        
+        The ticket is read through the ticket cache with an eventually
+        consistent, projected read, so a pay station polling the amount due
+        costs at most one small read per cache TTL and never a write.
+        
+        Args:
+            ticket_id: Unique ticket identifier
+            
+        Returns:
+            Dictionary with the ticket, the quote time and the amount due
+            
+        Raises:
+            ValueError: If ticket not found or already processed
+            Exception: If the storage operation fails
+        """
+        item = self._read_ticket_item(ticket_id)
+        if item is None:
+            raise ValueError(f"Ticket {ticket_id} not found")
+        
+        ticket = ParkingTicket.from_dict(item)
+        if ticket.exit_time:
+            raise ValueError(f"Ticket {ticket_id} already processed")
+        
+        # Same resolution as process_exit, so paying right away matches the quote
+        quoted_at = datetime.utcnow().replace(microsecond=0)
+        
+        return {
+            'ticketId': ticket_id,
+            'plate': ticket.plate,
+            'parkingLot': ticket.parking_lot,
+            'entryTime': ticket.entry_time.isoformat() + 'Z',
+            'quotedAt': quoted_at.isoformat() + 'Z',
+            'totalTimeMinutes': int((quoted_at - ticket.entry_time).total_seconds() / 60),
+            'amountDueUSD': self.fee_calculator.calculate_stay_fee(ticket.entry_time, quoted_at)
+        }
+    
+    def process_exit_by_plate(self, plate: str, parking_lot: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Process parking exit for a lost ticket, located by license plate.
+        
+        Args:
+            plate: License plate number
+            parking_lot: Optional parking lot, required if the plate is parked in several lots
+            
+        Returns:
+            Dictionary with exit information and charges, plus the 'ticketId' that was closed
+            
+        Raises:
+            ValueError: If no single active ticket matches or the ticket was processed meanwhile
+            Exception: If the storage operation fails
+        """
+        tickets = self.find_active_by_plate(plate, parking_lot)
+        
+        if not tickets:
+            raise ValueError(f"Active ticket for plate {plate} not found")
+        
+        if len(tickets) > 1:
+            raise ValueError(f"Multiple active tickets for plate {plate}, parking lot is required")
+        
+        ticket_id = tickets[0].ticket_id
+        return {'ticketId': ticket_id, **self.process_exit(ticket_id)}
+    
+    def process_exits(self, ticket_ids: List[str], max_workers: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Process several parking exits concurrently.
+        
+        Tickets this container has seen exit are answered from the ticket
+        cache. Exit states of the rest are read in one batch so missing and
+        already exited tickets are answered without a write. The remaining tickets go through
+        process_exit on a bounded thread pool, so the conditional update still
+        decides the outcome if another gate exits a ticket in the meantime.
+        
+        Args:
+            ticket_ids: Ticket identifiers to close out
+            max_workers: Thread pool size (default: EXIT_WORKERS)
+            
+        Returns:
+            List of results in input order. Processed tickets have the same
+            fields as process_exit plus 'ticketId' and status 'processed';
+            others have status 'not_found', 'already_processed' or 'failed'
+            and an 'error' message. A ticket listed more than once is exited
+            once: its first occurrence carries the outcome and each repeat has
+            status 'duplicate', so a charge is never reported twice.
         """
+        results: Dict[str, Dict[str, Any]] = {}
+        unique_ids = []
+        for ticket_id in dict.fromkeys(ticket_ids):
+            cached = self.ticket_cache.get(ticket_id)
+            if cached is not None and cached.get('exit_time'):
+                results[ticket_id] = self._exit_error(ticket_id, 'already_processed', f"Ticket {ticket_id} already processed")
+            else:
+                unique_ids.append(ticket_id)
+        
         try:
-            # Get ticket from database
-            response = self.table.get_item(Key={'ticket_id': ticket_id})
+            items = self.storage.get_exit_states(unique_ids) if unique_ids else None
+        except StorageError:
+            # The pre-read is an optimisation only; let the updates decide
+            items = None
+        
+        pending = []
+        for ticket_id in unique_ids:
+            if items is not None and ticket_id in items.missing:
+                results[ticket_id] = self._exit_error(ticket_id, 'not_found', f"Ticket {ticket_id} not found")
+            elif items is not None and items.found.get(ticket_id, {}).get('exit_time'):
+                results[ticket_id] = self._exit_error(ticket_id, 'already_processed', f"Ticket {ticket_id} already processed")
+            else:
+                pending.append(ticket_id)
+        
+        if pending:
+            # Only bulk exits need a thread pool; keep it out of the import path
+            from concurrent.futures import ThreadPoolExecutor
             
-            if 'Item' not in response:
-                raise ValueError(f"Ticket {ticket_id} not found")
+            workers = min(max_workers or self.exit_workers, len(pending))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for ticket_id, result in zip(pending, executor.map(self._exit_one, pending)):
+                    results[ticket_id] = result
+        
+        ordered = []
+        reported = set()
+        for ticket_id in ticket_ids:
+            if ticket_id in reported:
+                ordered.append(self._exit_error(ticket_id, 'duplicate', f"Ticket {ticket_id} is repeated in this request"))
+            else:
+                reported.add(ticket_id)
+                ordered.append(results[ticket_id])
+        return ordered
+    
+    def _exit_one(self, ticket_id: str) -> Dict[str, Any]:
+        """Run process_exit for one ticket of a bulk request, capturing errors."""
+        try:
+            return {'ticketId': ticket_id, 'status': 'processed', **self.process_exit(ticket_id)}
+        except ValueError as e:
+            status = 'not_found' if 'not found' in str(e).lower() else 'already_processed'
+            return self._exit_error(ticket_id, status, str(e))
+        except Exception as e:
+            return self._exit_error(ticket_id, 'failed', str(e))
+    
+    @staticmethod
+    def _exit_error(ticket_id: str, status: str, message: str) -> Dict[str, Any]:
+        return {'ticketId': ticket_id, 'status': status, 'error': message}
+    
+    def iter_tickets(
+        self,
+        segments: Optional[int] = None,
+        page_size: int = 1000,
+        raw: bool = False,
+        attributes: Optional[List[str]] = None
+    ) -> Iterator[Union[ParkingTicket, Dict[str, Any]]]:
+        """
+        Stream every ticket in storage.
+        
+        Storage is read by parallel segments with a bounded read-ahead, so
+        memory use does not grow with the table. Order is not defined.
+        
+        Args:
+            segments: Parallel readers (default: EXPORT_SEGMENTS, else 4)
+            page_size: Items per storage read
+            raw: Yield storage items instead of ParkingTicket objects
+            attributes: Attributes to read for raw items (default: all; tickets need TICKET_ATTRIBUTES)
             
-            ticket = ParkingTicket.from_dict(response['Item'])
+        Yields:
+            ParkingTicket objects, or item dictionaries if raw
             
-            # Check if already exited
-            if ticket.exit_time:
-                raise ValueError(f"Ticket {ticket_id} already processed")
+        Raises:
+            Exception: If a storage read fails
+        """
+        segments = segments or int(os.getenv('EXPORT_SEGMENTS', '4'))
+        if not raw:
+            attributes = TICKET_ATTRIBUTE_NAMES
+        
+        for page in self.storage.iter_ticket_pages(segments, page_size, attributes):
+            if raw:
+                yield from page
+            else:
+                for item in page:
+                    yield ParkingTicket.from_dict(item)
+    
+    def record_rollups(self, tickets: List[ParkingTicket]) -> int:
+        """
+        Add exited tickets to the hourly and daily rollups of their lots, once each.
+        
+        Tickets exited without a stored charge (legacy IDs) are priced here
+        with the same fee calculator as process_exit. Tickets are written in
+        chunks of at most ROLLUP_WRITE_LIMIT buckets plus exits. Exits that
+        an earlier attempt already counted are dropped from their chunk and
+        the rest is written again, so a batch retried at any time, whole or
+        split, counts every exit exactly once.
+        
+        Args:
+            tickets: Exited tickets
             
-            # Mark exit and calculate charges
-            ticket.mark_exit()
-            duration_minutes = ticket.get_duration_minutes()
-            charge_usd = self.fee_calculator.calculate_fee(duration_minutes)
+        Returns:
+            Number of rollup bucket updates written
             
-            # Update ticket in database
-            self.table.update_item(
-                Key={'ticket_id': ticket_id},
-                UpdateExpression='SET exit_time = :exit_time',
-                ExpressionAttributeValues={':exit_time': ticket.exit_time.isoformat()}
-            )
+        Raises:
+            Exception: If the storage operation fails
+        """
+        # Only the rollup functions use the rollup helpers; keep them out of the import path
+        from services.rollups import rollup_keys
+        
+        for ticket in tickets:
+            if ticket.charge_cents is None:
+                charge_usd = self.fee_calculator.calculate_stay_fee(ticket.entry_time, ticket.exit_time)
+                ticket.charge_cents, ticket.duration_minutes = exit_charge(charge_usd, ticket.entry_time, ticket.exit_time)
+        
+        updated = 0
+        chunk: List[ParkingTicket] = []
+        buckets = set()
+        for ticket in tickets:
+            keys = buckets.union(rollup_keys(ticket))
+            if chunk and len(chunk) + 1 + len(keys) > ROLLUP_WRITE_LIMIT:
+                updated += self._add_rollup_chunk(chunk)
+                chunk, keys = [], set(rollup_keys(ticket))
+            chunk.append(ticket)
+            buckets = keys
+        if chunk:
+            updated += self._add_rollup_chunk(chunk)
+        return updated
+    
+    def _add_rollup_chunk(self, tickets: List[ParkingTicket]) -> int:
+        """Write one chunk, leaving out exits storage reports as already counted."""
+        from services.rollups import aggregate_exits
+        
+        while tickets:
+            deltas = aggregate_exits(tickets)
+            counted = self.storage.add_rollups(deltas, [ticket.ticket_id for ticket in tickets])
+            if not counted:
+                return len(deltas)
+            tickets = [ticket for ticket in tickets if ticket.ticket_id not in counted]
+        return 0
+    
+    def get_rollups(self, parking_lot: int, period: str, start: datetime, end: datetime) -> List[Dict[str, Any]]:
+        """
+        Get a lot's revenue, exit count and dwell time per hour or day.
+        
+        Args:
+            parking_lot: Parking lot identifier
+            period: 'hour' or 'day'
+            start: First bucket to include (any time within it)
+            end: Last bucket to include (any time within it)
             
-            return {
-                'plate': ticket.plate,
-                'totalTimeMinutes': duration_minutes,
-                'parkingLot': ticket.parking_lot,
-                'chargeUSD': charge_usd
-            }
+        Returns:
+            Buckets with exits, in time order; buckets without exits are omitted
             
-        except ClientError as e:
-            raise Exception(f"Failed to process exit: {e.response['Error']['Message']}")
+        Raises:
+            ValueError: If the period is unknown
+            Exception: If the storage operation fails
+        """
+        from services.rollups import ROLLUP_PERIODS, bucket_start, rollup_response
+        
+        if period not in ROLLUP_PERIODS:
+            raise ValueError(f"Unknown rollup period: {period}")
+        
+        items = self.storage.get_rollups(parking_lot, period, bucket_start(start, period), bucket_start(end, period))
+        return [rollup_response(item) for item in items]
+    
+    def cache_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Hit and miss counters of the container-level caches."""
+        return {
+            'ticketCache': self.ticket_cache.stats(),
+            'idempotencyCache': self.recent_entries.stats()
+        }
+    
+    def get_occupancy(self, parking_lots: List[int]) -> Dict[int, int]:
+        """
+        Get the number of occupied spaces for one or more parking lots.
+        
+        Args:
+            parking_lots: Parking lot identifiers
+            
+        Returns:
+            Occupied spaces by parking lot
+            
+        Raises:
+            Exception: If occupancy tracking is disabled or the storage operation fails
+        """
+        if not self.storage.occupancy_enabled:
+            raise Exception("Occupancy tracking is not enabled")
+        
+        return self.storage.get_occupancy(parking_lots)
+    
+    def find_active_by_plate(self, plate: str, parking_lot: Optional[int] = None) -> List[ParkingTicket]:
+        """
+        Find active (not yet exited) tickets for a license plate.
+        
+        Tickets are found through the plate index. Tickets parked before the
+        index existed are only found once scripts/index_active_plates.py
+        has added them.
+        
+        Args:
+            plate: License plate number
+            parking_lot: Optional parking lot to restrict the search to
+            
+        Returns:
+            Active tickets, most recent entry first
+            
+        Raises:
+            Exception: If the storage operation fails
+        """
+        tickets = [ParkingTicket.from_dict(item) for item in self.storage.find_active_by_plate(plate, parking_lot)]
+        tickets.sort(key=lambda ticket: ticket.entry_time, reverse=True)
+        return tickets
     
     def get_ticket(self, ticket_id: str) -> Optional[ParkingTicket]:
         """
-        Retrieve a parking ticket by ID.
+        Retrieve a parking ticket by ID, through the container's ticket cache.
         
         Args:
             ticket_id: Unique ticket identifier
@@ -99,11 +479,30 @@ class ParkingService:
             ParkingTicket object or None if not found
         """
         try:
-            response = self.table.get_item(Key={'ticket_id': ticket_id})
-            
-            if 'Item' in response:
-                return ParkingTicket.from_dict(response['Item'])
+            item = self._read_ticket_item(ticket_id)
+        except StorageError:
             return None
-            
-        except ClientError:
-            return None 
\ No newline at end of file
+        
+        return ParkingTicket.from_dict(item) if item is not None else None
+    
+    def _read_ticket_item(self, ticket_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Read a ticket item through the ticket cache.
+        
+        Raises:
+            StorageError: If the read fails
+        """
+        item = self.ticket_cache.get(ticket_id)
+        if item is None:
+            item = self.storage.get_ticket(ticket_id)
+            if item is not None:
+                self.ticket_cache.set(ticket_id, item, math.inf if item.get('exit_time') else None)
+        return item
+
+
+def exit_charge(charge_usd: float, entry_time: datetime, exit_time: datetime) -> ExitCharge:
+    """Stored form of an exit's charge: whole cents and whole minutes."""
+    return ExitCharge(
+        charge_cents=round(charge_usd * 100),
+        duration_minutes=int((exit_time - entry_time).total_seconds() / 60)
+    )
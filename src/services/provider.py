@@ -0,0 +1,41 @@
+import threading
+from typing import Optional
+
+from services.parking_service import ParkingService
+
+# Container-scoped service instance. Lambda keeps module state alive between
+# warm invocations, so the boto3 resource, credentials and connection pool are
+# built once per container instead of once per request.
+_service: Optional[ParkingService] = None
+_lock = threading.Lock()
+
+
+def get_parking_service() -> ParkingService:
+    """
+    Return the shared ParkingService, creating it on first use.
+    
+    Returns:
+        ParkingService instance shared by all handlers in this container
+    """
+    global _service
+    
+    service = _service
+    if service is None:
+        with _lock:
+            if _service is None:
+                _service = ParkingService()
+            service = _service
+    return service
+
+
+def set_parking_service(service: Optional[ParkingService]) -> None:
+    """Inject a ParkingService instance (used by tests and local tooling)."""
+    global _service
+    
+    with _lock:
+        _service = service
+
+
+def reset_parking_service() -> None:
+    """Drop the shared instance so the next call builds a fresh one."""
+    set_parking_service(None)
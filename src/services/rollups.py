@@ -0,0 +1,78 @@
+from datetime import datetime, timedelta
+from typing import Dict, Any, Iterable, List, Optional
+
+from models.parking_ticket import ParkingTicket
+from models.rollup import RollupKey, RollupTotals
+
+# Rollup granularities and the length of their buckets
+ROLLUP_PERIODS: Dict[str, timedelta] = {
+    'hour': timedelta(hours=1),
+    'day': timedelta(days=1),
+}
+
+
+def bucket_start(time: datetime, period: str) -> datetime:
+    """Start of the hour or day bucket containing time."""
+    start = time.replace(minute=0, second=0, microsecond=0)
+    return start.replace(hour=0) if period == 'day' else start
+
+
+def exited_ticket(old_image: Optional[Dict[str, Any]], new_image: Optional[Dict[str, Any]]) -> Optional[ParkingTicket]:
+    """
+    Ticket that exited in a change, if any.
+    
+    A ticket exits at most once, so counting the change that sets exit_time
+    counts every exit exactly once. Later rewrites (such as archiving) keep
+    the exit time and are not counted.
+    
+    Args:
+        old_image: Item before the change (None for inserts)
+        new_image: Item after the change (None for deletes)
+    
+    Returns:
+        The exited ticket (without a charge if it was exited by a legacy ID),
+        or None if the change was not an exit
+    """
+    if not new_image or not new_image.get('exit_time') or (old_image or {}).get('exit_time'):
+        return None
+    return ParkingTicket.from_dict(new_image)
+
+
+def rollup_keys(ticket: ParkingTicket) -> List[RollupKey]:
+    """Buckets an exited ticket counts in: one per period, by exit time."""
+    return [
+        RollupKey(ticket.parking_lot, period, bucket_start(ticket.exit_time, period))
+        for period in ROLLUP_PERIODS
+    ]
+
+
+def aggregate_exits(tickets: Iterable[ParkingTicket]) -> Dict[RollupKey, RollupTotals]:
+    """
+    Sum exited tickets into hourly and daily buckets of their lot, by exit time.
+    
+    Args:
+        tickets: Exited tickets with charge and duration set
+    
+    Returns:
+        Totals by bucket, so a batch of exits costs one write per bucket
+    """
+    deltas: Dict[RollupKey, RollupTotals] = {}
+    for ticket in tickets:
+        for key in rollup_keys(ticket):
+            totals = deltas.get(key)
+            if totals is None:
+                totals = deltas[key] = RollupTotals()
+            totals.add(ticket)
+    return deltas
+
+
+def rollup_response(item: Dict[str, Any]) -> Dict[str, Any]:
+    """API representation of a stored rollup bucket."""
+    totals = RollupTotals.from_item(item)
+    return {
+        'start': item['bucket_start'],
+        'exits': totals.exits,
+        'revenueUSD': totals.revenue_cents / 100,
+        'totalMinutes': totals.dwell_minutes,
+        'averageMinutes': round(totals.dwell_minutes / totals.exits, 1) if totals.exits else 0
+    }
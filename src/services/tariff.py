@@ -0,0 +1,216 @@
+import json
+import math
+from bisect import bisect_right
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Optional, List, Dict, Any, Tuple
+from zoneinfo import ZoneInfo
+
+from services.fee_calculator import FeeCalculator
+
+MINUTES_PER_DAY = 24 * 60
+
+
+@dataclass(frozen=True)
+class TimeBand:
+    """Hourly rate applying from a minute of the day until the next band starts."""
+    
+    start_minute: int
+    hourly_rate: float
+
+
+class CompiledTariff:
+    """
+    Precomputed cumulative price table for a daily band schedule.
+    
+    The day is covered twice (two consecutive days) so any window of up to 24
+    hours starting within the first day can be priced as the difference of two
+    cumulative prices. Each cumulative price is a binary search over the band
+    boundaries plus a linear step inside the band.
+    """
+    
+    def __init__(self, bands: List[TimeBand]):
+        """
+        Compile a band schedule.
+        
+        Args:
+            bands: Time bands; the band active before the first start is the
+                last band of the previous day
+        """
+        if not bands:
+            raise ValueError("Tariff requires at least one time band")
+        
+        bands = sorted(bands, key=lambda band: band.start_minute)
+        starts = [band.start_minute for band in bands]
+        if len(set(starts)) != len(starts) or starts[0] < 0 or starts[-1] >= MINUTES_PER_DAY:
+            raise ValueError("Tariff band starts must be distinct times of day")
+        
+        # Band running across midnight into the first start of the day
+        if starts[0] != 0:
+            bands.insert(0, TimeBand(0, bands[-1].hourly_rate))
+        
+        self.starts: List[int] = []
+        self.rates: List[float] = []
+        for day in range(2):
+            for band in bands:
+                self.starts.append(day * MINUTES_PER_DAY + band.start_minute)
+                self.rates.append(band.hourly_rate / 60)
+        
+        self.cumulative: List[float] = [0.0]
+        for index in range(1, len(self.starts)):
+            length = self.starts[index] - self.starts[index - 1]
+            self.cumulative.append(self.cumulative[-1] + length * self.rates[index - 1])
+        
+        self.day_price = self.price_to(MINUTES_PER_DAY)
+    
+    def price_to(self, minute: float) -> float:
+        """Cumulative price from the start of the first day up to a minute (0 to 2880)."""
+        index = bisect_right(self.starts, minute) - 1
+        return self.cumulative[index] + (minute - self.starts[index]) * self.rates[index]
+    
+    def price_window(self, start_minute: float, length: float) -> float:
+        """Price of a window of up to 24 hours starting at a minute of the day."""
+        return self.price_to(start_minute + length) - self.price_to(start_minute)
+
+
+class TariffFeeCalculator(FeeCalculator):
+    """
+    Fee calculator for time-of-day and tiered tariffs.
+    
+    Supports time bands (e.g. a night rate), a premium rate for the first
+    period of a stay and a cap per 24 hours of parking. Stays are priced with
+    calculate_stay_fee in O(log bands) regardless of how many days they span;
+    duration-only methods inherited from FeeCalculator keep the flat rate.
+    """
+    
+    def __init__(
+        self,
+        bands: List[TimeBand],
+        daily_cap: Optional[float] = None,
+        first_period_rate: Optional[float] = None,
+        first_period_minutes: int = 60,
+        tz: Optional[str] = None,
+        hourly_rate: Optional[float] = None,
+        billing_increment_minutes: Optional[int] = None
+    ):
+        """
+        Initialize tariff calculator.
+        
+        Args:
+            bands: Time bands of the daily schedule
+            daily_cap: Maximum charge per 24 hours of parking, in USD
+            first_period_rate: Hourly rate replacing the band rates at the start of a stay
+            first_period_minutes: Length of the premium first period (default: 60 minutes)
+            tz: Time zone the band times are expressed in (default: UTC)
+            hourly_rate: Flat rate for duration-only pricing (default: $10/hour)
+            billing_increment_minutes: Billing increment in minutes (default: 15 minutes)
+        """
+        super().__init__(hourly_rate, billing_increment_minutes)
+        self.tariff = CompiledTariff(bands)
+        self.daily_cap = daily_cap
+        self.first_period_rate = first_period_rate
+        self.first_period_minutes = first_period_minutes
+        self.tz = ZoneInfo(tz) if tz else timezone.utc
+    
+    @classmethod
+    def from_json(cls, schedule: str) -> 'TariffFeeCalculator':
+        """
+        Build a calculator from a JSON schedule, e.g.
+        
+            {"bands": [{"start": "07:00", "hourlyRate": 12}, {"start": "19:00", "hourlyRate": 4}],
+             "dailyCap": 60, "firstHourRate": 15, "timezone": "Europe/Stockholm"}
+        
+        Args:
+            schedule: JSON document describing the tariff
+        
+        Returns:
+            TariffFeeCalculator for the schedule
+        """
+        config: Dict[str, Any] = json.loads(schedule)
+        bands = [TimeBand(parse_time_of_day(band['start']), float(band['hourlyRate'])) for band in config['bands']]
+        
+        return cls(
+            bands,
+            daily_cap=config.get('dailyCap'),
+            first_period_rate=config.get('firstHourRate'),
+            first_period_minutes=int(config.get('firstPeriodMinutes', 60)),
+            tz=config.get('timezone'),
+            billing_increment_minutes=config.get('billingIncrementMinutes')
+        )
+    
+    def calculate_stay_fee(self, entry_time: datetime, exit_time: datetime) -> float:
+        """
+        Calculate parking fee for a stay using the tariff schedule.
+        
+        Args:
+            entry_time: Entry timestamp (naive values are UTC)
+            exit_time: Exit timestamp (naive values are UTC)
+        
+        Returns:
+            Fee in USD rounded to 2 decimal places
+        """
+        duration_minutes = int((exit_time - entry_time).total_seconds() / 60)
+        if duration_minutes <= 0:
+            return 0.0
+        
+        # Round up to next billing increment
+        billable_minutes = math.ceil(duration_minutes / self.billing_increment_minutes) * self.billing_increment_minutes
+        
+        local_entry = self._local_time(entry_time)
+        start = local_entry.hour * 60 + local_entry.minute + local_entry.second / 60
+        
+        # Every full day starts at the same time of day, so all full days but
+        # the first (which carries the premium period) cost the same
+        full_days, remainder = divmod(billable_minutes, MINUTES_PER_DAY)
+        windows: List[Tuple[float, int]] = []
+        if full_days:
+            windows.append((self._window_price(start, MINUTES_PER_DAY, first=True), 1))
+            if full_days > 1:
+                windows.append((self.tariff.day_price, full_days - 1))
+        if remainder:
+            windows.append((self._window_price(start, remainder, first=not full_days), 1))
+        
+        fee = sum(self._capped(price) * count for price, count in windows)
+        
+        # Round to 2 decimal places
+        return round(fee, 2)
+    
+    def get_billing_info(self) -> dict:
+        """Get current billing configuration."""
+        info = super().get_billing_info()
+        info.update({
+            'daily_cap_usd': self.daily_cap,
+            'first_period_rate_usd': self.first_period_rate,
+            'first_period_minutes': self.first_period_minutes
+        })
+        return info
+    
+    def _window_price(self, start: float, length: int, first: bool) -> float:
+        """Band price of a window, with the premium first period if it opens the stay."""
+        if not first or self.first_period_rate is None:
+            return self.tariff.price_window(start, length)
+        
+        premium = min(length, self.first_period_minutes)
+        return premium * self.first_period_rate / 60 + self.tariff.price_window((start + premium) % MINUTES_PER_DAY, length - premium)
+    
+    def _capped(self, price: float) -> float:
+        return min(price, self.daily_cap) if self.daily_cap is not None else price
+    
+    def _local_time(self, value: datetime) -> datetime:
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.astimezone(self.tz)
+
+
+def parse_time_of_day(value: str) -> int:
+    """
+    Parse a "HH:MM" time of day.
+    
+    Returns:
+        Minutes since midnight
+    """
+    hours, minutes = value.split(':')
+    minute = int(hours) * 60 + int(minutes)
+    if not 0 <= minute < MINUTES_PER_DAY:
+        raise ValueError(f"Invalid time of day: {value}")
+    return minute
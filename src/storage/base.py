@@ -0,0 +1,273 @@
+import os
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import TYPE_CHECKING, Optional, Dict, Any, Callable, Iterator, List, NamedTuple, Set
+
+from models.parking_ticket import ParkingTicket, to_epoch
+
+if TYPE_CHECKING:
+    # Rollup types are only needed for annotations; handlers that never touch
+    # rollups don't import them
+    from models.rollup import RollupKey, RollupTotals
+
+# Idempotency keys are remembered for a day unless IDEMPOTENCY_TTL_SECONDS says otherwise
+DEFAULT_IDEMPOTENCY_TTL_SECONDS = 24 * 60 * 60
+
+IDEMPOTENCY_CONFLICT = "Idempotency key was already used for a different entry"
+
+# Buckets plus exit markers written by one add_rollups call; DynamoDB
+# transactions take at most 100 items
+ROLLUP_WRITE_LIMIT = 100
+
+# How long an exit is remembered as counted. Stream records are kept for 24
+# hours, so no retry of a batch can arrive after its markers expire
+ROLLUP_EXIT_MARKER_TTL_SECONDS = 7 * 24 * 60 * 60
+
+
+class StorageError(Exception):
+    """A storage operation failed for reasons other than the ticket's state."""
+
+
+class ExitCharge(NamedTuple):
+    """Charge and duration stored with a ticket's exit."""
+    
+    charge_cents: int
+    duration_minutes: int
+
+
+# Prices an exit from the ticket's entry time, for engines that read the ticket before writing the exit
+ExitPricer = Callable[[datetime], ExitCharge]
+
+
+class BatchGetResult(NamedTuple):
+    """Outcome of a batched read, keyed by the item's key value."""
+    
+    found: Dict[str, Dict[str, Any]]
+    missing: Set[str]
+
+
+class TicketStorage(ABC):
+    """
+    Storage engine behind ParkingService.
+    
+    Items are exchanged in the ParkingTicket.to_dict storage format. Engines
+    must apply the same conditional-write rules: a ticket is created only if
+    its ID is unused, and exits only if it exists and has not exited yet.
+    Ticket state errors are raised as ValueError, engine failures as
+    StorageError.
+    """
+    
+    # Whether per-lot occupancy is maintained alongside tickets
+    occupancy_enabled: bool = False
+    
+    @abstractmethod
+    def put_ticket(self, ticket: ParkingTicket, idempotency_key: Optional[str] = None) -> str:
+        """
+        Store a new ticket, counting it towards its lot's occupancy.
+        
+        With an idempotency key, the key is recorded in the same conditional
+        write as the ticket. If the key is already recorded for the same plate
+        and lot, nothing is written and the original ticket ID is returned.
+        
+        Returns:
+            ID of the stored ticket, or of the original ticket for a repeated key
+            
+        Raises:
+            ValueError: If the idempotency key was recorded for a different entry
+            StorageError: If the write fails or the ticket ID is already used
+        """
+    
+    @abstractmethod
+    def put_tickets(self, tickets: List[ParkingTicket]) -> Dict[str, str]:
+        """
+        Store several new tickets.
+        
+        Returns:
+            Error message by ticket ID for tickets that were not stored
+        """
+    
+    @abstractmethod
+    def exit_ticket(
+        self,
+        ticket_id: str,
+        exit_time: datetime,
+        parking_lot: Optional[int] = None,
+        charge: Optional[ExitCharge] = None,
+        price: Optional[ExitPricer] = None
+    ) -> Dict[str, Any]:
+        """
+        Set a ticket's exit time if it exists and has not exited yet.
+        
+        Args:
+            ticket_id: Ticket to close
+            exit_time: Exit time
+            parking_lot: The ticket's lot when already known (from a signed ID)
+            charge: Charge and duration to store in the same write, when already known
+            price: Used instead of charge when it is not known. Engines that
+                read the ticket before the write price it from the read and
+                store the result in the write; others ignore it
+            
+        Returns:
+            The ticket item as it was before the exit
+            
+        Raises:
+            ValueError: If the ticket is not found or already processed
+            StorageError: If the write fails
+        """
+    
+    @abstractmethod
+    def get_exit_states(self, ticket_ids: List[str]) -> BatchGetResult:
+        """
+        Read the ID and exit time of several tickets.
+        
+        Returns:
+            BatchGetResult by ticket ID; IDs that could not be read are in neither set
+            
+        Raises:
+            StorageError: If the read fails
+        """
+    
+    @abstractmethod
+    def get_ticket(self, ticket_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Read a ticket item.
+        
+        Raises:
+            StorageError: If the read fails
+        """
+    
+    @abstractmethod
+    def find_active_by_plate(self, plate: str, parking_lot: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Find items of tickets that have not exited yet for a license plate.
+        
+        Raises:
+            StorageError: If the read fails
+        """
+    
+    @abstractmethod
+    def get_occupancy(self, parking_lots: List[int]) -> Dict[int, int]:
+        """
+        Get occupied spaces by parking lot.
+        
+        Raises:
+            StorageError: If the read fails
+        """
+    
+    @abstractmethod
+    def iter_ticket_pages(
+        self,
+        segments: int = 1,
+        page_size: int = 1000,
+        attributes: Optional[List[str]] = None,
+        max_buffered_pages: Optional[int] = None
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Read every ticket item, in pages.
+        
+        Args:
+            segments: Parallel readers; pages from different segments interleave
+            page_size: Items per read
+            attributes: Attributes to read (default: all)
+            max_buffered_pages: Pages read ahead of the consumer (default: twice the segments)
+            
+        Raises:
+            StorageError: If a read fails
+        """
+    
+    @abstractmethod
+    def scan_exited(self, exited_before: datetime, page_size: int = 1000) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Read tickets that exited before a cutoff and are not yet expiring, in pages.
+        
+        Raises:
+            StorageError: If a read fails
+        """
+    
+    @abstractmethod
+    def expire_tickets(self, items: List[Dict[str, Any]], expires_at: datetime) -> List[str]:
+        """
+        Mark exited ticket items for removal once expires_at has passed.
+        
+        Args:
+            items: Items as returned by scan_exited
+            expires_at: Time after which the tickets may be deleted
+            
+        Returns:
+            IDs of tickets that could not be marked
+        """
+    
+    @abstractmethod
+    def add_rollups(self, deltas: Dict['RollupKey', 'RollupTotals'], exit_ids: List[str]) -> Set[str]:
+        """
+        Add exit totals to their rollup buckets and mark the exits counted, atomically.
+        
+        The markers make the update idempotent: once an exit is counted, any
+        later write that includes it is rejected as a whole, however long
+        after the first one it is retried.
+        
+        Args:
+            deltas: Totals to add, by bucket
+            exit_ids: IDs of the exited tickets summed in deltas; buckets and
+                exits together are at most ROLLUP_WRITE_LIMIT
+        
+        Returns:
+            IDs among exit_ids that were already counted. If there are any,
+            nothing was written
+        
+        Raises:
+            StorageError: If the write fails
+        """
+    
+    @abstractmethod
+    def get_rollups(self, parking_lot: int, period: str, start: datetime, end: datetime) -> List[Dict[str, Any]]:
+        """
+        Read a lot's rollup items with bucket starts between start and end (inclusive), in time order.
+        
+        Raises:
+            StorageError: If the read fails
+        """
+
+
+def idempotency_record(idempotency_key: str, ticket: ParkingTicket, ttl_seconds: int) -> Dict[str, Any]:
+    """Item remembering which ticket an idempotency key created, expiring after ttl_seconds."""
+    return {
+        'idempotency_key': idempotency_key,
+        'ticket_id': ticket.ticket_id,
+        'plate': ticket.plate,
+        'parking_lot': ticket.parking_lot,
+        'expires_at': to_epoch(ticket.entry_time) + ttl_seconds
+    }
+
+
+def replayed_ticket_id(record: Dict[str, Any], ticket: ParkingTicket) -> str:
+    """
+    Ticket ID of a recorded idempotency key, for a request repeating it.
+    
+    Raises:
+        ValueError: If the key was recorded for a different plate or lot
+    """
+    if record['plate'] != ticket.plate or int(record['parking_lot']) != ticket.parking_lot:
+        raise ValueError(IDEMPOTENCY_CONFLICT)
+    return record['ticket_id']
+
+
+def idempotency_ttl_seconds() -> int:
+    return int(os.getenv('IDEMPOTENCY_TTL_SECONDS', str(DEFAULT_IDEMPOTENCY_TTL_SECONDS)))
+
+
+def create_storage() -> TicketStorage:
+    """
+    Create the storage engine configured by the environment.
+    
+    STORAGE_ENGINE selects "dynamodb" (default) or "memory", the in-process
+    engine for local load tests and benchmarks.
+    """
+    engine = os.getenv('STORAGE_ENGINE', 'dynamodb').lower()
+    if engine == 'memory':
+        from storage.memory import InMemoryStorage
+        return InMemoryStorage()
+    if engine == 'dynamodb':
+        from storage.dynamodb import DynamoDBStorage
+        return DynamoDBStorage()
+    raise ValueError(f"Unknown storage engine: {engine}")
@@ -0,0 +1,791 @@
+import boto3
+import contextvars
+import os
+import time
+from datetime import datetime
+from typing import TYPE_CHECKING, Optional, Dict, Any, Iterator, List, Set
+from boto3.dynamodb.conditions import Attr, Key
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
+from botocore.config import Config
+from botocore.exceptions import ClientError
+
+from models.parking_ticket import ParkingTicket, TICKET_ATTRIBUTES, from_storage_time, to_epoch
+from storage.base import (
+    TicketStorage, StorageError, BatchGetResult, ExitCharge, ExitPricer, ROLLUP_EXIT_MARKER_TTL_SECONDS,
+    idempotency_record, idempotency_ttl_seconds, replayed_ticket_id
+)
+from storage.occupancy import OccupancyCounters
+from utils.log import get_logger
+from utils.metrics import capacity_kwargs, record_capacity, stage
+
+if TYPE_CHECKING:
+    from models.rollup import RollupKey, RollupTotals
+
+logger = get_logger()
+
+# Ticket exists and has no exit time yet. Older items store exit_time as an
+# explicit NULL attribute, so that counts as "not exited" too.
+ACTIVE_TICKET_CONDITION = (
+    'attribute_exists(ticket_id) AND '
+    '(attribute_not_exists(exit_time) OR attribute_type(exit_time, :null))'
+)
+
+# Key is unused, or its record expired but TTL has not deleted it yet
+IDEMPOTENCY_KEY_AVAILABLE = 'attribute_not_exists(idempotency_key) OR expires_at <= :now'
+
+# DynamoDB TTL attribute of the tickets table, set on archived tickets
+TICKET_TTL_ATTRIBUTE = 'expires_at'
+
+# Sparse GSI keyed by plate; the key attribute is removed on exit
+ACTIVE_PLATE_INDEX = 'active-plate-index'
+
+# DynamoDB BatchWriteItem accepts at most 25 put requests per call
+BATCH_WRITE_LIMIT = 25
+BATCH_MAX_ATTEMPTS = 5
+BATCH_RETRY_BASE_DELAY_SECONDS = 0.05
+
+# Errors of requests DynamoDB rejected without applying them, safe to resend
+THROTTLING_ERROR_CODES = frozenset({
+    'ProvisionedThroughputExceededException', 'ThrottlingException', 'RequestLimitExceeded'
+})
+
+# DynamoDB BatchGetItem accepts at most 100 keys per call
+BATCH_GET_LIMIT = 100
+
+# Exit attributes set in the same update as the exit time
+EXIT_UPDATE = 'SET exit_time = :exit_time REMOVE active_plate'
+CHARGED_EXIT_UPDATE = (
+    'SET exit_time = :exit_time, charge_cents = :charge_cents, duration_minutes = :duration_minutes '
+    'REMOVE active_plate'
+)
+
+# Markers of counted exits share the rollup table: series "exit#<ticket ID>"
+ROLLUP_EXIT_MARKER_PREFIX = 'exit#'
+ROLLUP_EXIT_MARKER_SORT_KEY = 'counted'
+
+ROLLUP_UPDATE = (
+    'SET parking_lot = :parking_lot '
+    'ADD exits :exits, revenue_cents :revenue_cents, dwell_minutes :dwell_minutes'
+)
+
+
+_serializer = TypeSerializer()
+_deserializer = TypeDeserializer()
+
+
+def client_config() -> Config:
+    """
+    botocore settings for the DynamoDB client, from the environment.
+    
+    The botocore defaults (60 second socket timeouts, legacy retries) let a
+    stalled call hold a 30 second Lambda for most of its budget. Short
+    timeouts fail such calls fast, so a retry on a fresh connection can
+    still succeed, and adaptive retries back off when DynamoDB throttles.
+    
+    Returns:
+        Config built from DYNAMODB_CONNECT_TIMEOUT_SECONDS, DYNAMODB_READ_TIMEOUT_SECONDS,
+        DYNAMODB_MAX_ATTEMPTS, DYNAMODB_RETRY_MODE, DYNAMODB_TCP_KEEPALIVE and
+        DYNAMODB_MAX_POOL_CONNECTIONS
+    """
+    return Config(
+        connect_timeout=float(os.getenv('DYNAMODB_CONNECT_TIMEOUT_SECONDS', '1')),
+        read_timeout=float(os.getenv('DYNAMODB_READ_TIMEOUT_SECONDS', '2')),
+        retries={
+            'max_attempts': int(os.getenv('DYNAMODB_MAX_ATTEMPTS', '3')),
+            'mode': os.getenv('DYNAMODB_RETRY_MODE', 'adaptive')
+        },
+        tcp_keepalive=os.getenv('DYNAMODB_TCP_KEEPALIVE', 'true').lower() == 'true',
+        # Long-running servers share one client across many threads; Lambda handles one request at a time
+        max_pool_connections=int(os.getenv('DYNAMODB_MAX_POOL_CONNECTIONS', '10'))
+    )
+
+
+def serialize(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert an item to low-level DynamoDB format for client calls."""
+    return {key: _serializer.serialize(value) for key, value in item.items()}
+
+
+def deserialize(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a low-level DynamoDB item back to Python values."""
+    return {key: _deserializer.deserialize(value) for key, value in item.items()}
+
+
+class DynamoDBStorage(TicketStorage):
+    """Ticket storage in DynamoDB, with optional sharded occupancy counters."""
+    
+    def __init__(self):
+        """Initialize storage with DynamoDB client."""
+        config = client_config()
+        self.dynamodb = boto3.resource('dynamodb', config=config)
+        self.table_name = os.getenv('PARKING_TABLE_NAME', 'parking-tickets')
+        self.table = self.dynamodb.Table(self.table_name)
+        self.client = self.dynamodb.meta.client
+        self.occupancy = OccupancyCounters.from_env()
+        self.idempotency_table_name = os.getenv('IDEMPOTENCY_TABLE_NAME', 'parking-idempotency')
+        self.idempotency_ttl_seconds = idempotency_ttl_seconds()
+        self.rollup_table_name = os.getenv('ROLLUP_TABLE_NAME', 'parking-rollups')
+        self.rollup_table = self.dynamodb.Table(self.rollup_table_name)
+        self._executor = None
+        self.hedge = None
+        if os.getenv('DYNAMODB_HEDGE_READS', 'false').lower() == 'true':
+            # Hedging is opt-in per function; don't import it otherwise
+            from concurrent.futures import ThreadPoolExecutor
+            from utils.hedging import HedgedCaller
+            self.hedge = HedgedCaller(
+                ThreadPoolExecutor(max_workers=config.max_pool_connections, thread_name_prefix='ticket-hedge'),
+                percentile=float(os.getenv('DYNAMODB_HEDGE_PERCENTILE', '95')),
+                initial_delay=float(os.getenv('DYNAMODB_HEDGE_DELAY_MS', '20')) / 1000
+            )
+    
+    @property
+    def occupancy_enabled(self) -> bool:
+        return self.occupancy is not None
+    
+    def put_ticket(self, ticket: ParkingTicket, idempotency_key: Optional[str] = None) -> str:
+        if idempotency_key is None and not self.occupancy:
+            try:
+                response = self.table.put_item(Item=ticket.to_dict(), **capacity_kwargs())
+            except ClientError as e:
+                raise StorageError(f"Failed to create parking entry: {e.response['Error']['Message']}")
+            record_capacity(response, 'write')
+            return ticket.ticket_id
+        
+        # Ticket, idempotency record and lot counter are written atomically
+        transact_items = [
+            {
+                'Put': {
+                    'TableName': self.table_name,
+                    'Item': serialize(ticket.to_dict()),
+                    'ConditionExpression': 'attribute_not_exists(ticket_id)'
+                }
+            }
+        ]
+        if self.occupancy:
+            transact_items.append(self.occupancy.transact_update(ticket.parking_lot, 1))
+        if idempotency_key is not None:
+            transact_items.append({
+                'Put': {
+                    'TableName': self.idempotency_table_name,
+                    'Item': serialize(idempotency_record(idempotency_key, ticket, self.idempotency_ttl_seconds)),
+                    'ConditionExpression': IDEMPOTENCY_KEY_AVAILABLE,
+                    'ExpressionAttributeValues': {':now': {'N': str(to_epoch(ticket.entry_time))}},
+                    'ReturnValuesOnConditionCheckFailure': 'ALL_OLD'
+                }
+            })
+        
+        try:
+            response = self.client.transact_write_items(TransactItems=transact_items, **capacity_kwargs())
+        except ClientError as e:
+            # A repeated key fails the record's condition and returns the record
+            reasons = e.response.get('CancellationReasons') or []
+            if idempotency_key is not None and len(reasons) == len(transact_items):
+                reason = reasons[-1]
+                if reason.get('Code') == 'ConditionalCheckFailed' and reason.get('Item'):
+                    return replayed_ticket_id(deserialize(reason['Item']), ticket)
+            raise StorageError(f"Failed to create parking entry: {e.response['Error']['Message']}")
+        
+        record_capacity(response, 'write')
+        return ticket.ticket_id
+    
+    def put_tickets(self, tickets: List[ParkingTicket]) -> Dict[str, str]:
+        """Store tickets with BatchWriteItem, in chunks of BATCH_WRITE_LIMIT items."""
+        errors: Dict[str, str] = {}
+        
+        for start in range(0, len(tickets), BATCH_WRITE_LIMIT):
+            chunk = tickets[start:start + BATCH_WRITE_LIMIT]
+            try:
+                unprocessed = self._batch_put([ticket.to_dict() for ticket in chunk])
+            except ClientError as e:
+                message = f"Failed to create parking entry: {e.response['Error']['Message']}"
+                errors.update({ticket.ticket_id: message for ticket in chunk})
+                continue
+            
+            for item in unprocessed:
+                errors[item['ticket_id']] = "Failed to create parking entry: write capacity exceeded"
+        
+        if self.occupancy:
+            self._add_occupancy([ticket.parking_lot for ticket in tickets if ticket.ticket_id not in errors])
+        
+        return errors
+    
+    def _batch_put(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Write up to BATCH_WRITE_LIMIT items, retrying unprocessed ones with backoff.
+        
+        Returns:
+            Items that were still unprocessed after the last attempt
+        """
+        requests = [{'PutRequest': {'Item': item}} for item in items]
+        
+        for attempt in range(BATCH_MAX_ATTEMPTS):
+            if attempt:
+                time.sleep(BATCH_RETRY_BASE_DELAY_SECONDS * (2 ** (attempt - 1)))
+            
+            response = self.dynamodb.batch_write_item(RequestItems={self.table_name: requests})
+            requests = response.get('UnprocessedItems', {}).get(self.table_name, [])
+            if not requests:
+                return []
+        
+        return [request['PutRequest']['Item'] for request in requests]
+    
+    def _add_occupancy(self, parking_lots: List[int]) -> None:
+        """
+        Increment lot counters for tickets created outside a transaction.
+        
+        Batch writes cannot be combined with transactions, so counters for
+        batch-created tickets are adjusted afterwards with one update per lot.
+        The tickets already exist at this point, so a failure here is not
+        reported back to the caller. Throttled updates are retried with
+        backoff; an update that still fails is logged with its lot and count,
+        since the counter now under-reports by that many cars.
+        """
+        counts: Dict[int, int] = {}
+        for lot in parking_lots:
+            counts[lot] = counts.get(lot, 0) + 1
+        
+        for lot, count in counts.items():
+            update = self.occupancy.transact_update(lot, count)['Update']
+            for attempt in range(BATCH_MAX_ATTEMPTS):
+                if attempt:
+                    time.sleep(BATCH_RETRY_BASE_DELAY_SECONDS * (2 ** (attempt - 1)))
+                try:
+                    self.client.update_item(**update)
+                    break
+                except ClientError as e:
+                    code = e.response['Error']['Code']
+                    if code in THROTTLING_ERROR_CODES and attempt < BATCH_MAX_ATTEMPTS - 1:
+                        continue
+                    logger.warning("Failed to update occupancy counter: %s", e.response['Error']['Message'], extra={
+                        'parkingLot': lot,
+                        'count': count,
+                        'errorCode': code
+                    })
+                    break
+    
+    def exit_ticket(
+        self,
+        ticket_id: str,
+        exit_time: datetime,
+        parking_lot: Optional[int] = None,
+        charge: Optional[ExitCharge] = None,
+        price: Optional[ExitPricer] = None
+    ) -> Dict[str, Any]:
+        if self.occupancy:
+            return self._exit_with_occupancy(ticket_id, exit_time, parking_lot, charge, price)
+        # A single UpdateItem has no read before it to price from, so price is
+        # not used here; such exits are priced by the rollup consumer
+        return self._exit_ticket(ticket_id, exit_time, charge)
+    
+    def _exit_ticket(self, ticket_id: str, exit_time: datetime, charge: Optional[ExitCharge] = None) -> Dict[str, Any]:
+        """
+        Mark a ticket as exited in a single conditional update.
+        
+        Returns:
+            The ticket item as it was before the exit
+        """
+        try:
+            # Set exit time only if the ticket exists and has not exited yet,
+            # returning the stored ticket in the same round trip
+            values = {':exit_time': to_epoch(exit_time), ':null': 'NULL'}
+            if charge is not None:
+                values.update({':charge_cents': charge.charge_cents, ':duration_minutes': charge.duration_minutes})
+            
+            with stage('update'):
+                response = self.table.update_item(
+                    Key={'ticket_id': ticket_id},
+                    UpdateExpression=CHARGED_EXIT_UPDATE if charge is not None else EXIT_UPDATE,
+                    ConditionExpression=ACTIVE_TICKET_CONDITION,
+                    ExpressionAttributeValues=values,
+                    ReturnValues='ALL_OLD',
+                    ReturnValuesOnConditionCheckFailure='ALL_OLD',
+                    **capacity_kwargs()
+                )
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+                # The old item is only returned when the ticket exists
+                if e.response.get('Item'):
+                    raise ValueError(f"Ticket {ticket_id} already processed")
+                raise ValueError(f"Ticket {ticket_id} not found")
+            raise StorageError(f"Failed to process exit: {e.response['Error']['Message']}")
+        
+        record_capacity(response, 'write')
+        return response['Attributes']
+    
+    def _exit_with_occupancy(
+        self,
+        ticket_id: str,
+        exit_time: datetime,
+        parking_lot: Optional[int] = None,
+        charge: Optional[ExitCharge] = None,
+        price: Optional[ExitPricer] = None
+    ) -> Dict[str, Any]:
+        """
+        Mark a ticket as exited and decrement its lot counter atomically.
+        
+        The lot is needed to pick the counter. Without a lot hint the ticket
+        is read first, and that read also prices the exit when no charge is
+        given; with one (from a signed ID) the read, still needed for the
+        plate, runs alongside the transaction instead of before it.
+        
+        Returns:
+            The ticket item as it was before the exit
+        """
+        if parking_lot is None:
+            item = self._read_ticket(ticket_id)
+            if item is None:
+                raise ValueError(f"Ticket {ticket_id} not found")
+            if item.get('exit_time'):
+                raise ValueError(f"Ticket {ticket_id} already processed")
+            if charge is None and price is not None:
+                charge = price(from_storage_time(item['entry_time']))
+            
+            self._transact_exit(ticket_id, exit_time, int(item['parking_lot']), charge, known_to_exist=True)
+            return item
+        
+        # The read runs in this request's context, so its time and capacity are counted
+        read = self._read_executor().submit(contextvars.copy_context().run, self._read_ticket, ticket_id)
+        self._transact_exit(ticket_id, exit_time, parking_lot, charge)
+        
+        # The exit succeeded, so the ticket exists; the read may already see the exit
+        item = read.result()
+        if item is None:
+            raise StorageError(f"Failed to process exit: ticket {ticket_id} could not be read")
+        for name in ('exit_time', 'charge_cents', 'duration_minutes'):
+            item.pop(name, None)
+        return item
+    
+    def _read_ticket(self, ticket_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Read a ticket for the exit path.
+        
+        Lot, plate and entry time never change, so only a miss is re-read
+        consistently.
+        """
+        try:
+            with stage('read'):
+                item = self._get_ticket_item(ticket_id)
+                if item is None:
+                    response = self.table.get_item(
+                        Key={'ticket_id': ticket_id},
+                        ProjectionExpression=TICKET_ATTRIBUTES,
+                        ConsistentRead=True,
+                        **capacity_kwargs()
+                    )
+                    record_capacity(response, 'read')
+                    item = response.get('Item')
+        except ClientError as e:
+            raise StorageError(f"Failed to process exit: {e.response['Error']['Message']}")
+        return item
+    
+    def _get_ticket_item(self, ticket_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Eventually consistent ticket read, hedged when DYNAMODB_HEDGE_READS is on.
+        
+        A second identical read is sent if the first is slower than the
+        recent p95 latency, and the first answer is used. Reads are
+        idempotent, so the only cost is the extra read capacity of the
+        hedged few percent.
+        """
+        kwargs = {'Key': {'ticket_id': ticket_id}, 'ProjectionExpression': TICKET_ATTRIBUTES, **capacity_kwargs()}
+        if self.hedge is None:
+            response = self.table.get_item(**kwargs)
+        else:
+            response = self.hedge.call(self.table.get_item, **kwargs)
+        record_capacity(response, 'read')
+        return response.get('Item')
+    
+    def _read_executor(self):
+        """Thread pool for reads that overlap a write, created on first use."""
+        if self._executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+            self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='ticket-read')
+        return self._executor
+    
+    def _transact_exit(
+        self,
+        ticket_id: str,
+        exit_time: datetime,
+        parking_lot: int,
+        charge: Optional[ExitCharge] = None,
+        known_to_exist: bool = False
+    ) -> None:
+        """Set the exit time (and charge) and decrement the lot counter in one transaction."""
+        values = {':exit_time': {'N': str(to_epoch(exit_time))}, ':null': {'S': 'NULL'}}
+        if charge is not None:
+            values[':charge_cents'] = {'N': str(charge.charge_cents)}
+            values[':duration_minutes'] = {'N': str(charge.duration_minutes)}
+        
+        try:
+            with stage('update'):
+                response = self.client.transact_write_items(TransactItems=[
+                    {
+                        'Update': {
+                            'TableName': self.table_name,
+                            'Key': {'ticket_id': {'S': ticket_id}},
+                            'UpdateExpression': CHARGED_EXIT_UPDATE if charge is not None else EXIT_UPDATE,
+                            'ConditionExpression': ACTIVE_TICKET_CONDITION,
+                            'ExpressionAttributeValues': values,
+                            'ReturnValuesOnConditionCheckFailure': 'ALL_OLD'
+                        }
+                    },
+                    self.occupancy.transact_update(parking_lot, -1)
+                ], **capacity_kwargs())
+        except ClientError as e:
+            reasons = e.response.get('CancellationReasons') or [{}]
+            if reasons[0].get('Code') == 'ConditionalCheckFailed':
+                # The old item is only returned when the ticket exists
+                if known_to_exist or 'Item' in reasons[0]:
+                    raise ValueError(f"Ticket {ticket_id} already processed")
+                raise ValueError(f"Ticket {ticket_id} not found")
+            raise StorageError(f"Failed to process exit: {e.response['Error']['Message']}")
+        
+        record_capacity(response, 'write')
+    
+    def get_exit_states(self, ticket_ids: List[str]) -> BatchGetResult:
+        try:
+            return self._batch_get(self.table_name, 'ticket_id', ticket_ids, 'ticket_id, exit_time')
+        except ClientError as e:
+            raise StorageError(f"Failed to get tickets: {e.response['Error']['Message']}")
+    
+    def _batch_get(self, table_name: str, key_name: str, key_values: List[Any], projection: str) -> BatchGetResult:
+        """
+        Fetch items with BatchGetItem, in chunks of BATCH_GET_LIMIT keys.
+        
+        Unprocessed keys are retried with backoff; keys still unprocessed after
+        the last attempt are reported as neither found nor missing.
+        
+        Returns:
+            BatchGetResult with found items by key value and missing key values
+        """
+        found: Dict[Any, Dict[str, Any]] = {}
+        unresolved = set()
+        
+        for start in range(0, len(key_values), BATCH_GET_LIMIT):
+            keys = [{key_name: value} for value in key_values[start:start + BATCH_GET_LIMIT]]
+            
+            for attempt in range(BATCH_MAX_ATTEMPTS):
+                if attempt:
+                    time.sleep(BATCH_RETRY_BASE_DELAY_SECONDS * (2 ** (attempt - 1)))
+                
+                response = self.dynamodb.batch_get_item(RequestItems={
+                    table_name: {'Keys': keys, 'ProjectionExpression': projection}
+                })
+                for item in response.get('Responses', {}).get(table_name, []):
+                    found[item[key_name]] = item
+                
+                keys = response.get('UnprocessedKeys', {}).get(table_name, {}).get('Keys', [])
+                if not keys:
+                    break
+            
+            unresolved.update(key[key_name] for key in keys)
+        
+        missing = {value for value in key_values if value not in found and value not in unresolved}
+        return BatchGetResult(found, missing)
+    
+    def get_ticket(self, ticket_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            return self._get_ticket_item(ticket_id)
+        except ClientError as e:
+            raise StorageError(f"Failed to get ticket: {e.response['Error']['Message']}")
+    
+    def find_active_by_plate(self, plate: str, parking_lot: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Query the sparse plate index, so the cost depends on the number of
+        cars currently parked with that plate, not the table size.
+        """
+        query = {
+            'IndexName': ACTIVE_PLATE_INDEX,
+            'KeyConditionExpression': Key('active_plate').eq(plate),
+            'ProjectionExpression': 'ticket_id, plate, parking_lot, entry_time',
+            **capacity_kwargs()
+        }
+        if parking_lot is not None:
+            query['FilterExpression'] = Attr('parking_lot').eq(parking_lot)
+        
+        items = []
+        try:
+            while True:
+                with stage('read'):
+                    response = self.table.query(**query)
+                record_capacity(response, 'read')
+                items.extend(response.get('Items', []))
+                
+                if 'LastEvaluatedKey' not in response:
+                    break
+                query['ExclusiveStartKey'] = response['LastEvaluatedKey']
+        except ClientError as e:
+            raise StorageError(f"Failed to find tickets: {e.response['Error']['Message']}")
+        
+        return items
+    
+    def index_active_plates(self, page_size: int = 1000) -> int:
+        """
+        Add active tickets written before the plate index existed to it.
+        
+        Only tickets created since then carry active_plate, so older tickets
+        still parked cannot be found by plate until this has run once. Each
+        ticket is updated only while it is still active, so a ticket exiting
+        during the run is not indexed again. Indexed tickets are skipped, so
+        an interrupted run can simply be repeated.
+        
+        Returns:
+            Number of tickets added to the index
+        
+        Raises:
+            StorageError: If the scan or an update fails
+        """
+        scan_kwargs = {
+            'TableName': self.table_name,
+            'Limit': page_size,
+            'FilterExpression': (
+                'attribute_not_exists(active_plate) AND '
+                '(attribute_not_exists(exit_time) OR attribute_type(exit_time, :null))'
+            ),
+            'ProjectionExpression': 'ticket_id, plate',
+            'ExpressionAttributeValues': {':null': {'S': 'NULL'}}
+        }
+        
+        indexed = 0
+        for page in self._scan_pages(scan_kwargs, segments=1, max_buffered_pages=2):
+            for item in page:
+                try:
+                    self.table.update_item(
+                        Key={'ticket_id': item['ticket_id']},
+                        UpdateExpression='SET active_plate = :plate',
+                        ConditionExpression=ACTIVE_TICKET_CONDITION,
+                        ExpressionAttributeValues={':plate': item['plate'], ':null': 'NULL'}
+                    )
+                except ClientError as e:
+                    if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+                        continue
+                    raise StorageError(f"Failed to index ticket: {e.response['Error']['Message']}")
+                indexed += 1
+        
+        return indexed
+    
+    def get_occupancy(self, parking_lots: List[int]) -> Dict[int, int]:
+        """
+        Sum the counter shards of each lot. All shards of all requested lots
+        are read with BatchGetItem, so a single call covers up to 100 shards.
+        """
+        counter_ids = [counter_id for lot in parking_lots for counter_id in self.occupancy.counter_ids(lot)]
+        
+        try:
+            result = self._batch_get(self.occupancy.table_name, 'counter_id', counter_ids, 'counter_id, occupied')
+        except ClientError as e:
+            raise StorageError(f"Failed to get occupancy: {e.response['Error']['Message']}")
+        
+        occupancy = {}
+        for lot in parking_lots:
+            occupancy[lot] = sum(
+                int(result.found.get(counter_id, {}).get('occupied', 0))
+                for counter_id in self.occupancy.counter_ids(lot)
+            )
+        return occupancy
+    
+    def iter_ticket_pages(
+        self,
+        segments: int = 1,
+        page_size: int = 1000,
+        attributes: Optional[List[str]] = None,
+        max_buffered_pages: Optional[int] = None
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Parallel segmented Scan of the whole table; see _scan_pages."""
+        scan_kwargs: Dict[str, Any] = {'TableName': self.table_name, 'Limit': page_size}
+        if attributes:
+            names = {f'#a{index}': name for index, name in enumerate(attributes)}
+            scan_kwargs['ProjectionExpression'] = ', '.join(names)
+            scan_kwargs['ExpressionAttributeNames'] = names
+        
+        return self._scan_pages(scan_kwargs, segments, max_buffered_pages or 2 * segments)
+    
+    def scan_exited(self, exited_before: datetime, page_size: int = 1000) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Scan for tickets that exited before the cutoff, one page per Scan call.
+        
+        Tickets already marked with the TTL attribute are skipped, so an
+        interrupted archive run can simply be repeated. Legacy items store
+        exit_time as an ISO-8601 string, which compares in time order too.
+        """
+        scan_kwargs = {
+            'TableName': self.table_name,
+            'Limit': page_size,
+            'FilterExpression': '(exit_time < :cutoff OR exit_time < :cutoff_iso) AND attribute_not_exists(#ttl)',
+            'ExpressionAttributeNames': {'#ttl': TICKET_TTL_ATTRIBUTE},
+            'ExpressionAttributeValues': {
+                ':cutoff': {'N': str(to_epoch(exited_before))},
+                ':cutoff_iso': {'S': exited_before.isoformat()}
+            }
+        }
+        return self._scan_pages(scan_kwargs, segments=1, max_buffered_pages=2)
+    
+    def _scan_pages(self, scan_kwargs: Dict[str, Any], segments: int, max_buffered_pages: int) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Run a Scan in parallel segments, yielding pages as they arrive.
+        
+        Each segment is scanned by its own thread with the thread-safe
+        low-level client. Pages go through a queue of at most
+        max_buffered_pages, so a slow consumer pauses the scanners instead of
+        letting pages pile up in memory. Closing the generator stops them.
+        
+        Raises:
+            StorageError: If a Scan call fails
+        """
+        import queue
+        import threading
+        
+        pages: queue.Queue = queue.Queue(maxsize=max(1, max_buffered_pages))
+        stop = threading.Event()
+        done = object()
+        
+        def put(value: Any) -> None:
+            while not stop.is_set():
+                try:
+                    pages.put(value, timeout=0.1)
+                    return
+                except queue.Full:
+                    continue
+        
+        def scan_segment(segment: int) -> None:
+            kwargs = dict(scan_kwargs, Segment=segment, TotalSegments=segments) if segments > 1 else dict(scan_kwargs)
+            try:
+                while not stop.is_set():
+                    response = self.client.scan(**kwargs)
+                    # Limit applies before any filter, so pages can be empty
+                    if response.get('Items'):
+                        put([deserialize(item) for item in response['Items']])
+                    if 'LastEvaluatedKey' not in response:
+                        break
+                    kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+            except ClientError as e:
+                put(StorageError(f"Failed to scan tickets: {e.response['Error']['Message']}"))
+            except Exception as e:
+                # Timeouts and connection errors are not ClientErrors; a segment
+                # that stops early must fail the scan, not end it short
+                put(StorageError(f"Failed to scan tickets: {e}"))
+            finally:
+                put(done)
+        
+        threads = [
+            threading.Thread(target=scan_segment, args=(segment,), name=f'scan-{segment}', daemon=True)
+            for segment in range(segments)
+        ]
+        for thread in threads:
+            thread.start()
+        
+        try:
+            remaining = segments
+            while remaining:
+                page = pages.get()
+                if page is done:
+                    remaining -= 1
+                elif isinstance(page, StorageError):
+                    raise page
+                else:
+                    yield page
+        finally:
+            stop.set()
+    
+    def expire_tickets(self, items: List[Dict[str, Any]], expires_at: datetime) -> List[str]:
+        """
+        Set the TTL attribute so DynamoDB deletes the tickets in the background.
+        
+        Exited tickets never change, so the scanned items are written back
+        whole with BatchWriteItem (25 per call) instead of one UpdateItem each.
+        """
+        failed: List[str] = []
+        expires_epoch = to_epoch(expires_at)
+        
+        for start in range(0, len(items), BATCH_WRITE_LIMIT):
+            chunk = [{**item, TICKET_TTL_ATTRIBUTE: expires_epoch} for item in items[start:start + BATCH_WRITE_LIMIT]]
+            try:
+                unprocessed = self._batch_put(chunk)
+            except ClientError:
+                failed.extend(item['ticket_id'] for item in chunk)
+                continue
+            failed.extend(item['ticket_id'] for item in unprocessed)
+        
+        return failed
+    
+    def add_rollups(self, deltas: Dict['RollupKey', 'RollupTotals'], exit_ids: List[str]) -> Set[str]:
+        """
+        Apply bucket totals with atomic ADD updates in one transaction, together
+        with a conditional marker item per exit.
+        
+        A marker that already exists cancels the transaction, and the
+        cancellation reasons tell which exits were counted before. The markers
+        live in the rollup table under their own series, with a TTL.
+        """
+        from models.rollup import format_bucket, series_key
+        
+        expires_at = {'N': str(int(time.time()) + ROLLUP_EXIT_MARKER_TTL_SECONDS)}
+        items = [
+            {
+                'Put': {
+                    'TableName': self.rollup_table_name,
+                    'Item': {
+                        'series': {'S': ROLLUP_EXIT_MARKER_PREFIX + exit_id},
+                        'bucket_start': {'S': ROLLUP_EXIT_MARKER_SORT_KEY},
+                        TICKET_TTL_ATTRIBUTE: expires_at
+                    },
+                    'ConditionExpression': 'attribute_not_exists(series)'
+                }
+            }
+            for exit_id in exit_ids
+        ]
+        for key in sorted(deltas):
+            totals = deltas[key]
+            items.append({
+                'Update': {
+                    'TableName': self.rollup_table_name,
+                    'Key': {
+                        'series': {'S': series_key(key.parking_lot, key.period)},
+                        'bucket_start': {'S': format_bucket(key.bucket_start)}
+                    },
+                    'UpdateExpression': ROLLUP_UPDATE,
+                    'ExpressionAttributeValues': {
+                        ':parking_lot': {'N': str(key.parking_lot)},
+                        ':exits': {'N': str(totals.exits)},
+                        ':revenue_cents': {'N': str(totals.revenue_cents)},
+                        ':dwell_minutes': {'N': str(totals.dwell_minutes)}
+                    }
+                }
+            })
+        
+        try:
+            self.client.transact_write_items(TransactItems=items)
+        except ClientError as e:
+            reasons = e.response.get('CancellationReasons') or []
+            counted = {
+                exit_id for exit_id, reason in zip(exit_ids, reasons)
+                if reason.get('Code') == 'ConditionalCheckFailed'
+            }
+            if counted:
+                return counted
+            raise StorageError(f"Failed to update rollups: {e.response['Error']['Message']}")
+        return set()
+    
+    def get_rollups(self, parking_lot: int, period: str, start: datetime, end: datetime) -> List[Dict[str, Any]]:
+        """Query one lot's series by bucket range, so the cost grows with buckets returned only."""
+        from models.rollup import format_bucket, series_key
+        
+        query = {
+            'KeyConditionExpression': (
+                Key('series').eq(series_key(parking_lot, period)) &
+                Key('bucket_start').between(format_bucket(start), format_bucket(end))
+            )
+        }
+        
+        items = []
+        try:
+            while True:
+                response = self.rollup_table.query(**query)
+                items.extend(response.get('Items', []))
+                
+                if 'LastEvaluatedKey' not in response:
+                    break
+                query['ExclusiveStartKey'] = response['LastEvaluatedKey']
+        except ClientError as e:
+            raise StorageError(f"Failed to get rollups: {e.response['Error']['Message']}")
+        
+        return items
@@ -0,0 +1,242 @@
+import os
+import threading
+from datetime import datetime
+from typing import TYPE_CHECKING, Optional, Dict, Any, Iterator, List, Set
+
+from models.parking_ticket import ParkingTicket, from_storage_time, to_epoch
+from storage.base import (
+    TicketStorage, StorageError, BatchGetResult, ExitCharge, ExitPricer, idempotency_record, idempotency_ttl_seconds,
+    replayed_ticket_id
+)
+
+if TYPE_CHECKING:
+    from models.rollup import RollupKey, RollupTotals
+
+DEFAULT_LOCK_STRIPES = 64
+
+
+class _LockStripes:
+    """Fixed set of locks; a key always maps to the same lock."""
+    
+    def __init__(self, count: int):
+        self.locks = [threading.Lock() for _ in range(max(1, count))]
+    
+    def __call__(self, key: Any) -> threading.Lock:
+        return self.locks[hash(key) % len(self.locks)]
+
+
+class InMemoryStorage(TicketStorage):
+    """
+    Thread-safe in-process ticket storage.
+    
+    Writes to different tickets, plates and lots take different locks, so
+    concurrent requests only contend when they hash to the same stripe.
+    Conditional writes follow the DynamoDB engine: IDs are never reused and a
+    ticket exits at most once. Lock order is idempotency key, ticket, plate,
+    then lot.
+    Data lives as long as the process; intended for local load tests and
+    benchmarks of the service logic.
+    """
+    
+    def __init__(self, lock_stripes: Optional[int] = None, track_occupancy: bool = True):
+        """
+        Initialize empty storage.
+        
+        Args:
+            lock_stripes: Number of locks per structure (default: MEMORY_LOCK_STRIPES, else 64)
+            track_occupancy: Whether to maintain per-lot occupancy
+        """
+        stripes = lock_stripes or int(os.getenv('MEMORY_LOCK_STRIPES', str(DEFAULT_LOCK_STRIPES)))
+        self.occupancy_enabled = track_occupancy
+        
+        self._tickets: Dict[str, Dict[str, Any]] = {}
+        self._active_by_plate: Dict[str, Set[str]] = {}
+        self._occupied: Dict[int, int] = {}
+        self._idempotency: Dict[str, Dict[str, Any]] = {}
+        self._rollups: Dict[tuple, Dict[str, Any]] = {}
+        self._counted_exits: Set[str] = set()
+        self._rollup_lock = threading.Lock()
+        self.idempotency_ttl_seconds = idempotency_ttl_seconds()
+        self._key_locks = _LockStripes(stripes)
+        self._ticket_locks = _LockStripes(stripes)
+        self._plate_locks = _LockStripes(stripes)
+        self._lot_locks = _LockStripes(stripes)
+    
+    def put_ticket(self, ticket: ParkingTicket, idempotency_key: Optional[str] = None) -> str:
+        if idempotency_key is None:
+            self._insert(ticket)
+            return ticket.ticket_id
+        
+        with self._key_locks(idempotency_key):
+            record = self._idempotency.get(idempotency_key)
+            if record is not None and record['expires_at'] > to_epoch(ticket.entry_time):
+                return replayed_ticket_id(record, ticket)
+            
+            self._insert(ticket)
+            self._idempotency[idempotency_key] = idempotency_record(idempotency_key, ticket, self.idempotency_ttl_seconds)
+        
+        return ticket.ticket_id
+    
+    def _insert(self, ticket: ParkingTicket) -> None:
+        item = ticket.to_dict()
+        
+        with self._ticket_locks(ticket.ticket_id):
+            if ticket.ticket_id in self._tickets:
+                raise StorageError("Failed to create parking entry: ticket already exists")
+            self._tickets[ticket.ticket_id] = item
+            
+            if 'active_plate' in item:
+                self._index_plate(ticket.plate, ticket.ticket_id, add=True)
+                self._adjust_occupancy(ticket.parking_lot, 1)
+    
+    def put_tickets(self, tickets: List[ParkingTicket]) -> Dict[str, str]:
+        errors: Dict[str, str] = {}
+        for ticket in tickets:
+            try:
+                self._insert(ticket)
+            except StorageError as e:
+                errors[ticket.ticket_id] = str(e)
+        return errors
+    
+    def exit_ticket(
+        self,
+        ticket_id: str,
+        exit_time: datetime,
+        parking_lot: Optional[int] = None,
+        charge: Optional[ExitCharge] = None,
+        price: Optional[ExitPricer] = None
+    ) -> Dict[str, Any]:
+        with self._ticket_locks(ticket_id):
+            item = self._tickets.get(ticket_id)
+            if item is None:
+                raise ValueError(f"Ticket {ticket_id} not found")
+            if item.get('exit_time'):
+                raise ValueError(f"Ticket {ticket_id} already processed")
+            if charge is None and price is not None:
+                charge = price(from_storage_time(item['entry_time']))
+            
+            # Items are replaced, never mutated, so lock-free readers see a consistent item
+            exited = {key: value for key, value in item.items() if key != 'active_plate'}
+            exited['exit_time'] = to_epoch(exit_time)
+            if charge is not None:
+                exited.update(charge._asdict())
+            self._tickets[ticket_id] = exited
+            
+            self._index_plate(item['plate'], ticket_id, add=False)
+            self._adjust_occupancy(int(item['parking_lot']), -1)
+        
+        return dict(item)
+    
+    def get_exit_states(self, ticket_ids: List[str]) -> BatchGetResult:
+        found: Dict[str, Dict[str, Any]] = {}
+        for ticket_id in ticket_ids:
+            item = self._tickets.get(ticket_id)
+            if item is not None:
+                found[ticket_id] = {key: item[key] for key in ('ticket_id', 'exit_time') if key in item}
+        
+        return BatchGetResult(found, {ticket_id for ticket_id in ticket_ids if ticket_id not in found})
+    
+    def get_ticket(self, ticket_id: str) -> Optional[Dict[str, Any]]:
+        item = self._tickets.get(ticket_id)
+        return dict(item) if item is not None else None
+    
+    def find_active_by_plate(self, plate: str, parking_lot: Optional[int] = None) -> List[Dict[str, Any]]:
+        with self._plate_locks(plate):
+            ticket_ids = list(self._active_by_plate.get(plate, ()))
+        
+        items = []
+        for ticket_id in ticket_ids:
+            item = self._tickets.get(ticket_id)
+            if item is None or 'exit_time' in item:
+                continue
+            if parking_lot is None or int(item['parking_lot']) == parking_lot:
+                items.append(dict(item))
+        return items
+    
+    def get_occupancy(self, parking_lots: List[int]) -> Dict[int, int]:
+        return {lot: self._occupied.get(lot, 0) for lot in parking_lots}
+    
+    def iter_ticket_pages(
+        self,
+        segments: int = 1,
+        page_size: int = 1000,
+        attributes: Optional[List[str]] = None,
+        max_buffered_pages: Optional[int] = None
+    ) -> Iterator[List[Dict[str, Any]]]:
+        # Items are replaced, never mutated, so a snapshot of the values is consistent per item
+        items = list(self._tickets.values())
+        for start in range(0, len(items), page_size):
+            page = items[start:start + page_size]
+            if attributes:
+                yield [{key: item[key] for key in attributes if key in item} for item in page]
+            else:
+                yield [dict(item) for item in page]
+    
+    def scan_exited(self, exited_before: datetime, page_size: int = 1000) -> Iterator[List[Dict[str, Any]]]:
+        cutoff = to_epoch(exited_before)
+        exited = [item for item in list(self._tickets.values()) if item.get('exit_time', cutoff) < cutoff]
+        for start in range(0, len(exited), page_size):
+            yield [dict(item) for item in exited[start:start + page_size]]
+    
+    def expire_tickets(self, items: List[Dict[str, Any]], expires_at: datetime) -> List[str]:
+        """There is no background TTL deletion in memory, so tickets are removed right away."""
+        for item in items:
+            ticket_id = item['ticket_id']
+            with self._ticket_locks(ticket_id):
+                if self._tickets.get(ticket_id, {}).get('exit_time'):
+                    del self._tickets[ticket_id]
+        return []
+    
+    def add_rollups(self, deltas: Dict['RollupKey', 'RollupTotals'], exit_ids: List[str]) -> Set[str]:
+        from models.rollup import format_bucket, series_key
+        
+        with self._rollup_lock:
+            counted = self._counted_exits.intersection(exit_ids)
+            if counted:
+                return counted
+            self._counted_exits.update(exit_ids)
+            
+            for key, totals in deltas.items():
+                item_key = (series_key(key.parking_lot, key.period), format_bucket(key.bucket_start))
+                item = self._rollups.get(item_key) or {
+                    'series': item_key[0], 'bucket_start': item_key[1], 'parking_lot': key.parking_lot,
+                    'exits': 0, 'revenue_cents': 0, 'dwell_minutes': 0
+                }
+                self._rollups[item_key] = {
+                    **item,
+                    'exits': item['exits'] + totals.exits,
+                    'revenue_cents': item['revenue_cents'] + totals.revenue_cents,
+                    'dwell_minutes': item['dwell_minutes'] + totals.dwell_minutes
+                }
+        return set()
+    
+    def get_rollups(self, parking_lot: int, period: str, start: datetime, end: datetime) -> List[Dict[str, Any]]:
+        from models.rollup import format_bucket, series_key
+        
+        series = series_key(parking_lot, period)
+        first, last = format_bucket(start), format_bucket(end)
+        with self._rollup_lock:
+            items = [
+                dict(item) for (item_series, bucket), item in self._rollups.items()
+                if item_series == series and first <= bucket <= last
+            ]
+        return sorted(items, key=lambda item: item['bucket_start'])
+    
+    def _index_plate(self, plate: str, ticket_id: str, add: bool) -> None:
+        with self._plate_locks(plate):
+            if add:
+                self._active_by_plate.setdefault(plate, set()).add(ticket_id)
+                return
+            
+            ticket_ids = self._active_by_plate.get(plate)
+            if ticket_ids is not None:
+                ticket_ids.discard(ticket_id)
+                if not ticket_ids:
+                    del self._active_by_plate[plate]
+    
+    def _adjust_occupancy(self, parking_lot: int, delta: int) -> None:
+        if not self.occupancy_enabled:
+            return
+        
+        with self._lot_locks(parking_lot):
+            self._occupied[parking_lot] = self._occupied.get(parking_lot, 0) + delta
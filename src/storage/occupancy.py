@@ -0,0 +1,100 @@
+import os
+import random
+from typing import Optional, Dict, Any, List
+
+
+class OccupancyCounters:
+    """
+    Layout of the per-lot occupancy counter items.
+    
+    Each lot has one or more counter items ("shards") keyed by
+    "<parking_lot>#<shard>". Writers pick a random shard so a busy lot spreads
+    its increments over several partitions; readers add up all shards.
+    """
+    
+    def __init__(self, table_name: str, default_shards: int = 1, hot_lots: Optional[Dict[int, int]] = None):
+        """
+        Initialize counter layout.
+        
+        Args:
+            table_name: DynamoDB table holding the counter items
+            default_shards: Number of counter shards per lot (default: 1)
+            hot_lots: Shard count overrides for busy lots, by parking lot
+        """
+        self.table_name = table_name
+        self.default_shards = max(1, default_shards)
+        self.hot_lots = hot_lots or {}
+    
+    @classmethod
+    def from_env(cls) -> Optional['OccupancyCounters']:
+        """
+        Build the layout from environment configuration.
+        
+        OCCUPANCY_TABLE_NAME enables tracking, OCCUPANCY_SHARDS sets the default
+        shard count and OCCUPANCY_HOT_LOTS overrides it per lot ("12:8,15:4").
+        
+        Returns:
+            OccupancyCounters, or None if occupancy tracking is not configured
+        """
+        table_name = os.getenv('OCCUPANCY_TABLE_NAME')
+        if not table_name:
+            return None
+        
+        return cls(
+            table_name,
+            default_shards=int(os.getenv('OCCUPANCY_SHARDS', '1')),
+            hot_lots=parse_hot_lots(os.getenv('OCCUPANCY_HOT_LOTS', ''))
+        )
+    
+    def shard_count(self, parking_lot: int) -> int:
+        """Number of counter shards used by a parking lot."""
+        return self.hot_lots.get(parking_lot, self.default_shards)
+    
+    def counter_ids(self, parking_lot: int) -> List[str]:
+        """All counter item keys of a parking lot."""
+        return [f"{parking_lot}#{shard}" for shard in range(self.shard_count(parking_lot))]
+    
+    def write_counter_id(self, parking_lot: int) -> str:
+        """Counter item key to use for a single increment or decrement."""
+        return f"{parking_lot}#{random.randrange(self.shard_count(parking_lot))}"
+    
+    def transact_update(self, parking_lot: int, delta: int) -> Dict[str, Any]:
+        """
+        Build a TransactWriteItems entry adjusting a lot's occupancy.
+        
+        Args:
+            parking_lot: Parking lot identifier
+            delta: Change in occupied spaces (+1 on entry, -1 on exit)
+            
+        Returns:
+            'Update' transaction item in low-level DynamoDB format
+        """
+        return {
+            'Update': {
+                'TableName': self.table_name,
+                'Key': {'counter_id': {'S': self.write_counter_id(parking_lot)}},
+                'UpdateExpression': 'SET parking_lot = :parking_lot ADD occupied :delta',
+                'ExpressionAttributeValues': {
+                    ':parking_lot': {'N': str(parking_lot)},
+                    ':delta': {'N': str(delta)}
+                }
+            }
+        }
+
+
+def parse_hot_lots(value: str) -> Dict[int, int]:
+    """
+    Parse per-lot shard overrides.
+    
+    Args:
+        value: Comma separated "<parking_lot>:<shards>" pairs, e.g. "12:8,15:4"
+        
+    Returns:
+        Dictionary of shard counts by parking lot
+    """
+    hot_lots = {}
+    for pair in value.split(','):
+        if pair.strip():
+            parking_lot, shards = pair.split(':')
+            hot_lots[int(parking_lot)] = int(shards)
+    return hot_lots
@@ -0,0 +1,97 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache whose entries expire a fixed time after being set.
+    
+    Meant for module-level caches that live as long as a warm Lambda
+    container: bounded in size, and never serving entries older than the TTL.
+    Lookups are counted so hit rates can be reported.
+    """
+    
+    def __init__(self, maxsize: int, ttl_seconds: float, clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize an empty cache.
+        
+        Args:
+            maxsize: Maximum number of entries; the least recently used entry is evicted first
+            ttl_seconds: Lifetime of an entry
+            clock: Time source in seconds (default: time.monotonic)
+        """
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        """Return a live entry, marking it recently used, or default."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            
+            expires_at, value = entry
+            if expires_at <= self.clock():
+                del self._entries[key]
+                self.misses += 1
+                return default
+            
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+    
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        """
+        Store an entry, evicting the least recently used one if full.
+        
+        Args:
+            key: Entry key
+            value: Entry value
+            ttl_seconds: Lifetime of this entry (default: the cache TTL; math.inf keeps it until evicted)
+        """
+        if self.maxsize <= 0:
+            return
+        
+        ttl_seconds = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        with self._lock:
+            self._entries[key] = (self.clock() + ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+    
+    def pop(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        """Remove an entry, returning its value if it was live."""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+        
+        if entry is None or entry[0] <= self.clock():
+            return default
+        return entry[1]
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Lookup counters and current size."""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'size': len(self._entries),
+            'hitRate': round(self.hits / lookups, 4) if lookups else 0.0
+        }
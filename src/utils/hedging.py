@@ -0,0 +1,117 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Executor, TimeoutError as FutureTimeout, wait
+from typing import Any, Callable, Dict, Optional
+
+
+class HedgedCaller:
+    """
+    Run idempotent calls with a backup request when the first one is slow.
+    
+    The first request runs on a thread pool. If it has not answered after
+    the hedge delay, an identical second request is sent and whichever
+    succeeds first is returned. The delay follows a percentile of recent
+    request latencies, so only the slowest few percent of calls are hedged.
+    Only use it for reads that are safe to repeat.
+    """
+    
+    def __init__(
+        self,
+        executor: Executor,
+        percentile: float = 95,
+        initial_delay: float = 0.02,
+        min_delay: float = 0.002,
+        window: int = 512,
+        min_samples: int = 32
+    ):
+        """
+        Initialize the caller.
+        
+        Args:
+            executor: Thread pool running the requests
+            percentile: Latency percentile used as the hedge delay
+            initial_delay: Delay in seconds until min_samples latencies are known
+            min_delay: Lower bound of the delay in seconds
+            window: Number of recent latencies kept
+            min_samples: Latencies needed before the percentile is used
+        """
+        self.executor = executor
+        self.percentile = percentile
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.min_samples = min_samples
+        self._latencies: deque = deque(maxlen=window)
+        self._delay = initial_delay
+        self._since_update = 0
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.hedged = 0
+        self.backup_wins = 0
+    
+    @property
+    def delay(self) -> float:
+        """Current hedge delay in seconds."""
+        return self._delay
+    
+    def record(self, seconds: float) -> None:
+        """Add a request latency; the delay is recomputed every min_samples requests."""
+        with self._lock:
+            self._latencies.append(seconds)
+            self._since_update += 1
+            if self._since_update < self.min_samples or len(self._latencies) < self.min_samples:
+                return
+            self._since_update = 0
+            samples = sorted(self._latencies)
+            rank = min(len(samples) - 1, int(len(samples) * self.percentile / 100))
+            self._delay = max(self.min_delay, samples[rank])
+    
+    def call(self, function: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Call function, hedging it once if it is slower than the delay.
+        
+        Returns:
+            Result of the first request to succeed
+        
+        Raises:
+            Exception: The error of the last request, if none succeeded
+        """
+        def timed() -> Any:
+            start = time.perf_counter()
+            result = function(*args, **kwargs)
+            self.record(time.perf_counter() - start)
+            return result
+        
+        with self._lock:
+            self.calls += 1
+        primary = self.executor.submit(timed)
+        try:
+            return primary.result(timeout=self._delay)
+        except FutureTimeout:
+            pass
+        
+        with self._lock:
+            self.hedged += 1
+        backup = self.executor.submit(timed)
+        pending = {primary, backup}
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is backup:
+                        with self._lock:
+                            self.backup_wins += 1
+                    return future.result()
+                error = future.exception()
+        raise error
+    
+    def stats(self) -> Dict[str, Any]:
+        """Call, hedge and backup win counters with the current delay in milliseconds."""
+        with self._lock:
+            return {
+                'calls': self.calls,
+                'hedged': self.hedged,
+                'backupWins': self.backup_wins,
+                'delayMs': round(self._delay * 1000, 3)
+            }
@@ -0,0 +1,108 @@
+import json
+import logging
+import os
+import random
+import sys
+import time
+from typing import Dict, Any, Optional
+
+# Attributes every LogRecord carries; anything else was passed through `extra`
+_RECORD_ATTRIBUTES = frozenset(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {'message', 'asctime'}
+
+_sample_rate = 0.0
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Format log records as one compact JSON object per line.
+    
+    Messages keep %-style arguments, so nothing is formatted unless a record
+    is actually emitted. Fields passed with `extra` become top-level keys.
+    """
+    
+    converter = time.gmtime
+    
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            'time': self.formatTime(record, '%Y-%m-%dT%H:%M:%S') + f'.{int(record.msecs):03d}Z',
+            'level': record.levelname,
+            'message': record.getMessage()
+        }
+        
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        
+        return json.dumps(entry, separators=(',', ':'), default=str)
+
+
+def configure_logging(level: Optional[str] = None, sample_rate: Optional[float] = None) -> None:
+    """
+    Configure the root logger for structured JSON output.
+    
+    Args:
+        level: Log level name (default: LOG_LEVEL environment variable, else INFO)
+        sample_rate: Fraction of requests logged with the full event
+            (default: LOG_EVENT_SAMPLE_RATE environment variable, else 0)
+    """
+    global _sample_rate
+    
+    level = (level or os.environ.get('LOG_LEVEL') or 'INFO').upper()
+    root = logging.getLogger()
+    root.setLevel(level if isinstance(logging.getLevelName(level), int) else logging.INFO)
+    
+    if sample_rate is None:
+        try:
+            sample_rate = float(os.environ.get('LOG_EVENT_SAMPLE_RATE', '0'))
+        except ValueError:
+            sample_rate = 0.0
+    _sample_rate = min(max(sample_rate, 0.0), 1.0)
+    
+    # The Lambda runtime installs its own handler on the root logger
+    if not root.handlers:
+        root.addHandler(logging.StreamHandler(sys.stdout))
+    formatter = JsonFormatter()
+    for handler in root.handlers:
+        handler.setFormatter(formatter)
+
+
+def get_logger() -> logging.Logger:
+    """Get the handler logger, configuring structured logging on first use."""
+    root = logging.getLogger()
+    if not any(isinstance(handler.formatter, JsonFormatter) for handler in root.handlers):
+        configure_logging()
+    return root
+
+
+def log_request(logger: logging.Logger, message: str, event: Dict[str, Any], context: Any = None) -> None:
+    """
+    Log an incoming API Gateway request.
+    
+    Only the route, request IDs and query parameters are logged. The full
+    event is added at DEBUG level, or for a sampled fraction of requests.
+    
+    Args:
+        logger: Logger to write to
+        message: Log message
+        event: Lambda event
+        context: Lambda context
+    """
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    
+    request_context = event.get('requestContext') or {}
+    fields: Dict[str, Any] = {
+        'method': event.get('httpMethod'),
+        'path': event.get('path'),
+        'requestId': request_context.get('requestId'),
+        'awsRequestId': getattr(context, 'aws_request_id', None),
+        'query': event.get('queryStringParameters')
+    }
+    
+    if logger.isEnabledFor(logging.DEBUG) or (_sample_rate and random.random() < _sample_rate):
+        fields['event'] = event
+    
+    logger.info(message, extra=fields)
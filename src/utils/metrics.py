@@ -0,0 +1,194 @@
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from contextvars import ContextVar
+from typing import Dict, Any, Callable, Optional
+
+# Capacity requested from DynamoDB while a request is being measured
+RETURN_CAPACITY = {'ReturnConsumedCapacity': 'TOTAL'}
+_NO_CAPACITY: Dict[str, Any] = {}
+
+_enabled: Optional[bool] = None
+_namespace = 'ParkingLot'
+
+# Serializes EMF lines from concurrent handler threads
+_write_lock = threading.Lock()
+
+# Recorder of the request running on this thread, if metrics are enabled
+_current: ContextVar[Optional['RequestMetrics']] = ContextVar('request_metrics', default=None)
+
+
+class RequestMetrics:
+    """Stage timings and DynamoDB capacity accumulated during one request."""
+    
+    def __init__(self, handler: str):
+        self.handler = handler
+        self.values: Dict[str, float] = {}
+        self._lock = threading.Lock()
+    
+    def add(self, name: str, value: float) -> None:
+        """Add to a metric; stages and calls may repeat within a request."""
+        with self._lock:
+            self.values[name] = self.values.get(name, 0) + value
+    
+    def emf_document(self, timestamp_ms: int) -> Dict[str, Any]:
+        """
+        The request's metrics as a CloudWatch Embedded Metric Format document.
+        
+        CloudWatch extracts each metric listed under "_aws" from the log line,
+        with the handler name as the dimension; no PutMetricData calls are made.
+        """
+        definitions = [
+            {'Name': name, 'Unit': 'Milliseconds' if name.endswith('Ms') else 'Count'}
+            for name in self.values
+        ]
+        return {
+            '_aws': {
+                'Timestamp': timestamp_ms,
+                'CloudWatchMetrics': [{
+                    'Namespace': _namespace,
+                    'Dimensions': [['handler']],
+                    'Metrics': definitions
+                }]
+            },
+            'handler': self.handler,
+            **{name: round(value, 3) for name, value in self.values.items()}
+        }
+
+
+class _Stage:
+    """Times a block and adds the milliseconds to the request's <name>Ms metric."""
+    
+    __slots__ = ('recorder', 'name', 'start')
+    
+    def __init__(self, recorder: RequestMetrics, name: str):
+        self.recorder = recorder
+        self.name = name
+    
+    def __enter__(self) -> None:
+        self.start = time.perf_counter()
+    
+    def __exit__(self, *exc_info: Any) -> None:
+        self.recorder.add(self.name + 'Ms', (time.perf_counter() - self.start) * 1000)
+
+
+class _NoStage:
+    """Stage used outside a measured request; does nothing."""
+    
+    __slots__ = ()
+    
+    def __enter__(self) -> None:
+        pass
+    
+    def __exit__(self, *exc_info: Any) -> None:
+        pass
+
+
+_NO_STAGE = _NoStage()
+
+
+def configure_metrics(enabled: Optional[bool] = None, namespace: Optional[str] = None) -> None:
+    """
+    Configure request metrics.
+    
+    Args:
+        enabled: Emit metrics (default: METRICS_ENABLED environment variable, else off)
+        namespace: CloudWatch namespace (default: METRICS_NAMESPACE environment variable, else ParkingLot)
+    """
+    global _enabled, _namespace
+    
+    if enabled is None:
+        enabled = os.environ.get('METRICS_ENABLED', 'false').lower() == 'true'
+    _enabled = enabled
+    _namespace = namespace or os.environ.get('METRICS_NAMESPACE') or 'ParkingLot'
+
+
+def stage(name: str):
+    """
+    Time a block of the current request.
+    
+    Outside a measured request this returns a shared no-op context manager,
+    so a disabled hook costs one context variable lookup.
+    
+    Args:
+        name: Stage name; the metric is <name>Ms
+    """
+    recorder = _current.get()
+    if recorder is None:
+        return _NO_STAGE
+    return _Stage(recorder, name)
+
+
+def capacity_kwargs() -> Dict[str, Any]:
+    """DynamoDB request parameters asking for consumed capacity, only while measuring."""
+    return RETURN_CAPACITY if _current.get() is not None else _NO_CAPACITY
+
+
+def record_capacity(response: Dict[str, Any], kind: str) -> None:
+    """
+    Add the ConsumedCapacity of a DynamoDB response to the current request.
+    
+    Args:
+        response: DynamoDB response; transactions and batches return a list, one per table
+        kind: 'read' or 'write', giving readCapacityUnits or writeCapacityUnits
+    """
+    recorder = _current.get()
+    if recorder is None:
+        return
+    
+    consumed = response.get('ConsumedCapacity')
+    if not consumed:
+        return
+    if isinstance(consumed, dict):
+        consumed = [consumed]
+    recorder.add(kind + 'CapacityUnits', sum(float(entry.get('CapacityUnits', 0)) for entry in consumed))
+
+
+def write_emf(document: Dict[str, Any]) -> None:
+    """
+    Write an EMF document as one line on stdout.
+    
+    The line bypasses the logging module, so LOG_LEVEL cannot drop metrics.
+    Lambda sends stdout to CloudWatch Logs like any log line.
+    """
+    line = json.dumps(document, separators=(',', ':')) + '\n'
+    with _write_lock:
+        sys.stdout.write(line)
+        sys.stdout.flush()
+
+
+def emit_metrics(handler: str) -> Callable:
+    """
+    Measure a Lambda handler and write its metrics as one EMF line per request.
+    
+    The whole invocation is recorded as totalMs, alongside the stages and
+    capacity recorded while it ran. With metrics disabled the handler is
+    called directly.
+    
+    Args:
+        handler: Handler name, used as the metric dimension
+    """
+    def decorator(function: Callable) -> Callable:
+        @functools.wraps(function)
+        def wrapper(event: Dict[str, Any], context: Any) -> Any:
+            if _enabled is None:
+                configure_metrics()
+            if not _enabled:
+                return function(event, context)
+            
+            recorder = RequestMetrics(handler)
+            token = _current.set(recorder)
+            start = time.perf_counter()
+            try:
+                return function(event, context)
+            finally:
+                recorder.add('totalMs', (time.perf_counter() - start) * 1000)
+                _current.reset(token)
+                write_emf(recorder.emf_document(int(time.time() * 1000)))
+        
+        return wrapper
+    
+    return decorator
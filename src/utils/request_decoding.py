@@ -0,0 +1,188 @@
+import re
+from datetime import datetime, timezone
+from typing import Dict, Any, Optional, Tuple, Callable, List, NamedTuple
+
+from models.ticket_id import normalize_ticket_id
+
+# Result of decoding a request: (values, None) on success, (None, error) otherwise
+DecodeResult = Tuple[Optional[Dict[str, Any]], Optional[str]]
+FieldParser = Callable[[Any], Tuple[Any, Optional[str]]]
+
+_PLATE_PATTERN = re.compile(r'[A-Za-z0-9\s\-]+')
+_IDEMPOTENCY_KEY_PATTERN = re.compile(r'[A-Za-z0-9_\-:.]{1,64}')
+
+
+class Field(NamedTuple):
+    """Declarative description of one request parameter."""
+    
+    name: str
+    kind: str
+    dest: str
+    required: bool = True
+
+
+def plate(name: str = 'plate', dest: str = 'plate', required: bool = True) -> Field:
+    """License plate: trimmed, upper-cased, 2-15 alphanumeric characters, spaces or hyphens."""
+    return Field(name, 'plate', dest, required)
+
+
+def parking_lot(name: str = 'parkingLot', dest: str = 'parking_lot', required: bool = True) -> Field:
+    """Parking lot identifier: integer between 1 and 9999."""
+    return Field(name, 'parking_lot', dest, required)
+
+
+def parking_lots(name: str = 'parkingLots', dest: str = 'parking_lots', required: bool = True) -> Field:
+    """Comma separated parking lot identifiers, de-duplicated in request order."""
+    return Field(name, 'parking_lots', dest, required)
+
+
+def ticket_id(name: str = 'ticketId', dest: str = 'ticket_id', required: bool = True) -> Field:
+    """Ticket identifier: trimmed, UUID format."""
+    return Field(name, 'ticket_id', dest, required)
+
+
+def idempotency_key(name: str = 'Idempotency-Key', dest: str = 'idempotency_key', required: bool = False) -> Field:
+    """Client request token: trimmed, 1-64 letters, digits, '-', '_', ':' or '.'."""
+    return Field(name, 'idempotency_key', dest, required)
+
+
+def rollup_period(name: str = 'period', dest: str = 'period', required: bool = False) -> Field:
+    """Rollup granularity: 'hour' or 'day', case-insensitive."""
+    return Field(name, 'rollup_period', dest, required)
+
+
+def timestamp(name: str, dest: str, required: bool = False) -> Field:
+    """ISO-8601 date or time; times with an offset are converted to naive UTC."""
+    return Field(name, 'timestamp', dest, required)
+
+
+def _parse_plate(value: Any) -> Tuple[Any, Optional[str]]:
+    value = str(value).strip().upper() if value else ''
+    if not value:
+        return None, "License plate is required and must be a string"
+    if len(value) < 2 or len(value) > 15:
+        return None, "License plate must be between 2 and 15 characters"
+    if not _PLATE_PATTERN.fullmatch(value):
+        return None, "License plate contains invalid characters"
+    return value, None
+
+
+def _parse_parking_lot(value: Any) -> Tuple[Any, Optional[str]]:
+    if value is None or value == '':
+        return None, "Parking lot is required"
+    try:
+        lot = int(value)
+    except (ValueError, TypeError):
+        return None, "Parking lot must be a valid integer"
+    if lot < 1 or lot > 9999:
+        return None, "Parking lot must be between 1 and 9999"
+    return lot, None
+
+
+def _parse_parking_lots(value: Any) -> Tuple[Any, Optional[str]]:
+    if value is None or value == '':
+        return None, "Parking lot is required"
+    lots: Dict[int, None] = {}
+    for item in str(value).split(','):
+        lot, error = _parse_parking_lot(item.strip())
+        if error:
+            return None, error
+        lots[lot] = None
+    return list(lots), None
+
+
+def _parse_ticket_id(value: Any) -> Tuple[Any, Optional[str]]:
+    if not value or not isinstance(value, str) or not value.strip():
+        return None, "Ticket ID is required and must be a string"
+    value = normalize_ticket_id(value.strip())
+    if value is None:
+        return None, "Invalid ticket ID format"
+    return value, None
+
+
+def _parse_idempotency_key(value: Any) -> Tuple[Any, Optional[str]]:
+    value = value.strip() if isinstance(value, str) else ''
+    if not _IDEMPOTENCY_KEY_PATTERN.fullmatch(value):
+        return None, "Idempotency key must be 1-64 letters, digits, '-', '_', ':' or '.'"
+    return value, None
+
+
+def _parse_rollup_period(value: Any) -> Tuple[Any, Optional[str]]:
+    # Only the rollups endpoint parses periods; keep the rollup helpers out of the import path
+    from services.rollups import ROLLUP_PERIODS
+    
+    value = value.strip().lower() if isinstance(value, str) else ''
+    if value not in ROLLUP_PERIODS:
+        return None, f"Period must be one of: {', '.join(ROLLUP_PERIODS)}"
+    return value, None
+
+
+def _parse_timestamp(value: Any) -> Tuple[Any, Optional[str]]:
+    try:
+        parsed = datetime.fromisoformat(value.strip())
+    except (ValueError, TypeError, AttributeError):
+        return None, f"Invalid timestamp: {value}; expected ISO-8601, e.g. 2024-01-01T10:00:00Z"
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed, None
+
+
+_PARSERS: Dict[str, FieldParser] = {
+    'plate': _parse_plate,
+    'parking_lot': _parse_parking_lot,
+    'parking_lots': _parse_parking_lots,
+    'ticket_id': _parse_ticket_id,
+    'idempotency_key': _parse_idempotency_key,
+    'rollup_period': _parse_rollup_period,
+    'timestamp': _parse_timestamp,
+}
+
+
+def compile_decoder(*fields: Field) -> Callable[[Optional[Dict[str, Any]]], DecodeResult]:
+    """
+    Compile a request schema into a single decoding function.
+    
+    Field parsers are resolved once here, so decoding a request is one pass
+    over the raw parameters: each value is trimmed, checked and converted at
+    most once. Error messages match the utils.validation functions, and
+    fields are checked in the order given.
+    
+    Args:
+        fields: Request parameters in validation order
+    
+    Returns:
+        Function taking the raw parameter mapping (e.g. queryStringParameters,
+        which may be None) and returning (values by dest name, None) or
+        (None, error message)
+    """
+    steps: List[Tuple[str, str, bool, FieldParser]] = [
+        (field.name, field.dest, field.required, _PARSERS[field.kind]) for field in fields
+    ]
+    
+    def decode(params: Optional[Dict[str, Any]]) -> DecodeResult:
+        params = params or {}
+        values: Dict[str, Any] = {}
+        for name, dest, required, parse in steps:
+            raw = params.get(name)
+            if not required and (raw is None or raw == ''):
+                values[dest] = None
+                continue
+            value, error = parse(raw)
+            if error:
+                return None, error
+            values[dest] = value
+        return values, None
+    
+    return decode
+
+
+# Request schemas, compiled at import
+ENTRY_REQUEST = compile_decoder(plate(), parking_lot())
+EXIT_REQUEST = compile_decoder(ticket_id())
+QUOTE_REQUEST = compile_decoder(ticket_id())
+LOST_TICKET_EXIT_REQUEST = compile_decoder(plate(), parking_lot(required=False))
+OCCUPANCY_REQUEST = compile_decoder(parking_lots())
+ENTRY_HEADERS = compile_decoder(idempotency_key())
+ROLLUP_REQUEST = compile_decoder(
+    parking_lot(), rollup_period(), timestamp('from', 'start'), timestamp('to', 'end')
+)
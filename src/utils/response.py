@@ -1,5 +1,90 @@
 import json
-from typing import Any, Dict, Optional
+import os
+from functools import lru_cache
+from types import MappingProxyType, ModuleType
+from typing import Any, Callable, Dict, Mapping, Optional
+
+# Headers sent with every response; copied per response so callers can't alter the template
+DEFAULT_HEADERS: Mapping[str, str] = MappingProxyType({
+    'Content-Type': 'application/json',
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Methods': 'GET, POST, OPTIONS',
+    'Access-Control-Allow-Headers': 'Content-Type'
+})
+
+# Reused encoder, byte-identical to json.dumps(body, default=str)
+_stdlib_encoder = json.JSONEncoder(default=str)
+
+
+@lru_cache(maxsize=1)
+def _load_orjson() -> Optional[ModuleType]:
+    """
+    Import orjson on first use.
+    
+    orjson is optional and only used when selected, so handlers using the
+    standard library encoder don't pay for importing it on a cold start.
+    
+    Returns:
+        The orjson module, or None if it is not installed
+    """
+    try:
+        import orjson
+    except ImportError:
+        return None
+    return orjson
+
+
+def stdlib_dumps(body: Any) -> str:
+    """Serialize with the standard library encoder."""
+    return _stdlib_encoder.encode(body)
+
+
+def orjson_dumps(body: Any) -> str:
+    """
+    Serialize with orjson.
+    
+    Output decodes to the same JSON as stdlib_dumps (values the stdlib
+    encoder passes to str() are passed to str() here too) but is compact and
+    keeps non-ASCII characters unescaped. Bodies orjson rejects, such as
+    integers beyond 64 bits, are encoded with the standard library.
+    """
+    orjson = _load_orjson()
+    options = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+    try:
+        return orjson.dumps(body, default=str, option=options).decode()
+    except orjson.JSONEncodeError:
+        return stdlib_dumps(body)
+
+
+def _default_dumps() -> Callable[[Any], str]:
+    """
+    Pick the encoder from RESPONSE_JSON_ENCODER.
+    
+    "json" (the default) keeps responses byte-identical to
+    json.dumps(body, default=str). "orjson" opts in to the faster, compact
+    encoder when orjson is installed; clients must not depend on the exact
+    bytes then.
+    """
+    choice = os.getenv('RESPONSE_JSON_ENCODER', 'json').lower()
+    if choice == 'orjson' and _load_orjson() is not None:
+        return orjson_dumps
+    return stdlib_dumps
+
+
+_dumps: Callable[[Any], str] = _default_dumps()
+
+
+def set_json_encoder(dumps: Optional[Callable[[Any], str]]) -> None:
+    """
+    Replace the response body encoder.
+    
+    Args:
+        dumps: Function serializing a body to a JSON string, or None to restore
+            the encoder selected from the environment
+    """
+    global _dumps
+    _dumps = dumps or _default_dumps()
+    _fixed_error_body.cache_clear()
 
 
 def create_response(
@@ -18,20 +103,19 @@ def create_response(
     Returns:
         Lambda response dictionary
     """
-    default_headers = {
-        'Content-Type': 'application/json',
-        'Access-Control-Allow-Origin': '*',
-        'Access-Control-Allow-Methods': 'GET, POST, OPTIONS',
-        'Access-Control-Allow-Headers': 'Content-Type'
-    }
+    return _build_response(status_code, _dumps(body), headers)
+
+
+def _build_response(status_code: int, body: str, headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    response_headers = DEFAULT_HEADERS.copy()
     
     if headers:
-        default_headers.update(headers)
+        response_headers.update(headers)
     
     return {
         'statusCode': status_code,
-        'headers': default_headers,
-        'body': json.dumps(body, default=str)
+        'headers': response_headers,
+        'body': body
     }
 
 
@@ -42,6 +126,11 @@ def success_response(body: Any, status_code: int = 200) -> Dict[str, Any]:
 
 def error_response(message: str, status_code: int = 500, error_code: Optional[str] = None) -> Dict[str, Any]:
     """Create error response."""
+    return _build_response(status_code, _error_body(message, status_code, error_code))
+
+
+def _error_body(message: str, status_code: int, error_code: Optional[str]) -> str:
+    """Serialized error body."""
     error_body = {
         'error': message,
         'statusCode': status_code
@@ -50,7 +139,13 @@ def error_response(message: str, status_code: int = 500, error_code: Optional[st
     if error_code:
         error_body['errorCode'] = error_code
     
-    return create_response(status_code, error_body)
+    return _dumps(error_body)
+
+
+# Bodies of errors whose message never varies, such as each handler's internal
+# error, encoded once per encoder. Other messages often carry a ticket ID or
+# plate and would only evict each other, so they are encoded per response.
+_fixed_error_body = lru_cache(maxsize=64)(_error_body)
 
 
 def validation_error_response(message: str) -> Dict[str, Any]:
@@ -63,6 +158,11 @@ def not_found_response(message: str = "Resource not found") -> Dict[str, Any]:
     return error_response(message, 404, 'NOT_FOUND')
 
 
+def not_implemented_response(message: str) -> Dict[str, Any]:
+    """Create error response for a feature this deployment does not provide."""
+    return error_response(message, 501, 'NOT_IMPLEMENTED')
+
+
 def internal_error_response(message: str = "Internal server error") -> Dict[str, Any]:
     """Create internal server error response."""
-    return error_response(message, 500, 'INTERNAL_ERROR') 
\ No newline at end of file
+    return _build_response(500, _fixed_error_body(message, 500, 'INTERNAL_ERROR')) 
\ No newline at end of file
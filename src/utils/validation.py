@@ -1,6 +1,10 @@
+import base64
+import json
 import re
 from typing import Dict, Any, Optional, Tuple
 
+from models.ticket_id import normalize_ticket_id
+
 
 def validate_license_plate(plate: str) -> Tuple[bool, Optional[str]]:
     """
@@ -62,10 +66,8 @@ def validate_ticket_id(ticket_id: Any) -> Tuple[bool, Optional[str]]:
     if not ticket_id or not isinstance(ticket_id, str):
         return False, "Ticket ID is required and must be a string"
     
-    ticket_id = ticket_id.strip()
-    
-    # Basic UUID format validation
-    if not re.match(r'^[a-f0-9\-]{36}$', ticket_id.lower()):
+    # Signed IDs are verified without storage access; legacy UUIDs by format
+    if normalize_ticket_id(ticket_id.strip()) is None:
         return False, "Invalid ticket ID format"
     
     return True, None
@@ -88,4 +90,53 @@ def extract_query_params(event: Dict[str, Any]) -> Dict[str, str]:
         return {}
     
     # Normalize to empty strings if None values
-    return {k: v or '' for k, v in query_params.items()} 
\ No newline at end of file
+    return {k: v or '' for k, v in query_params.items()} 
+
+
+def extract_json_body(event: Dict[str, Any]) -> Any:
+    """
+    Extract and decode the JSON request body from Lambda event.
+    
+    Args:
+        event: Lambda event dictionary
+        
+    Returns:
+        Decoded JSON value, or None if the body is empty
+        
+    Raises:
+        ValueError: If the body is not valid JSON
+    """
+    body = event.get('body')
+    if not body:
+        return None
+    
+    try:
+        if event.get('isBase64Encoded'):
+            body = base64.b64decode(body).decode('utf-8')
+        return json.loads(body)
+    except (TypeError, ValueError):
+        raise ValueError("Request body must be valid JSON")
+
+
+def extract_header(event: Dict[str, Any], name: str) -> Optional[str]:
+    """
+    Extract a request header from Lambda event, ignoring case.
+    
+    Args:
+        event: Lambda event dictionary
+        name: Header name
+        
+    Returns:
+        Header value, or None if absent
+    """
+    headers = event.get('headers') or {}
+    
+    value = headers.get(name)
+    if value is not None:
+        return value
+    
+    name = name.lower()
+    for key, value in headers.items():
+        if key.lower() == name:
+            return value
+    return None
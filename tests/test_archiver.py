@@ -0,0 +1,126 @@
+import gzip
+import json
+import os
+import pytest
+from datetime import datetime
+from unittest.mock import patch
+
+from src.models.parking_ticket import ParkingTicket
+from src.services.archiver import TicketArchiver
+from src.storage.memory import InMemoryStorage
+
+NOW = datetime(2024, 6, 1, 12, 0, 0)
+
+
+def read_archive(path):
+    with gzip.open(path, 'rt') as f:
+        return [json.loads(line) for line in f]
+
+
+class TestTicketArchiver:
+    """Test cases for archiving exited tickets."""
+
+    @pytest.fixture
+    def storage(self):
+        storage = InMemoryStorage()
+        # Two tickets exited in January, one in May, one still parked
+        for index, exit_time in enumerate([datetime(2024, 1, 2), datetime(2024, 1, 3), datetime(2024, 5, 30), None]):
+            storage.put_ticket(ParkingTicket(f'ticket-{index}', f'CAR{index}', 1, datetime(2024, 1, 1)))
+            if exit_time:
+                storage.exit_ticket(f'ticket-{index}', exit_time)
+        return storage
+
+    def test_archives_and_expires_old_exits(self, storage, tmp_path):
+        """Test that only tickets exited before the cutoff are archived and removed."""
+        summary = TicketArchiver(storage, clock=lambda: NOW).archive(str(tmp_path), older_than_days=30)
+        
+        assert summary['archived'] == 2
+        assert summary['expired'] == 2
+        assert summary['notExpired'] == []
+        assert summary['cutoff'] == '2024-05-02T12:00:00Z'
+        
+        records = read_archive(summary['files'][0])
+        assert sorted(record['ticket_id'] for record in records) == ['ticket-0', 'ticket-1']
+        assert records[0] == ParkingTicket.from_dict(records[0]).to_dict()
+        
+        assert storage.get_ticket('ticket-0') is None
+        assert storage.get_ticket('ticket-2') is not None
+        assert storage.get_ticket('ticket-3') is not None
+
+    def test_splits_files(self, storage, tmp_path):
+        """Test that archive files hold at most records_per_file records."""
+        summary = TicketArchiver(storage, clock=lambda: NOW).archive(
+            str(tmp_path), older_than_days=0, records_per_file=2, page_size=1
+        )
+        
+        assert summary['archived'] == 3
+        assert [len(read_archive(path)) for path in summary['files']] == [2, 1]
+        assert all(os.path.basename(path).endswith('.ndjson.gz') for path in summary['files'])
+
+    def test_dry_run_keeps_tickets(self, storage, tmp_path):
+        """Test that a dry run writes files but expires nothing."""
+        summary = TicketArchiver(storage, clock=lambda: NOW).archive(str(tmp_path), older_than_days=30, expire=False)
+        
+        assert summary['archived'] == 2
+        assert summary['expired'] == 0
+        assert storage.get_ticket('ticket-0') is not None
+
+    def test_nothing_to_archive(self, tmp_path):
+        """Test that no file is written when no ticket qualifies."""
+        summary = TicketArchiver(InMemoryStorage(), clock=lambda: NOW).archive(str(tmp_path), older_than_days=30)
+        
+        assert summary['archived'] == 0
+        assert summary['files'] == []
+
+    def test_s3_destination(self, storage):
+        """Test that parts are uploaded under the S3 prefix."""
+        with patch('boto3.client') as mock_client:
+            summary = TicketArchiver(storage, clock=lambda: NOW).archive('s3://archive-bucket/tickets', older_than_days=30)
+        
+        upload = mock_client.return_value.upload_file
+        upload.assert_called_once()
+        path, bucket, key = upload.call_args.args
+        assert bucket == 'archive-bucket'
+        assert key.startswith('tickets/tickets-20240502T120000Z-')
+        assert summary['files'] == [f's3://archive-bucket/{key}']
+        assert not os.path.exists(path)
+
+
+class TestDynamoDBArchiveStorage:
+    """Test cases for the DynamoDB archive reads and TTL writes."""
+
+    @pytest.fixture
+    def storage(self):
+        with patch('src.storage.dynamodb.boto3.resource') as mock_resource:
+            from src.storage.dynamodb import DynamoDBStorage
+            yield DynamoDBStorage()
+
+    def test_scan_exited_pages(self, storage):
+        """Test that scans follow LastEvaluatedKey, skip empty pages and filter on the cutoff."""
+        storage.client.scan.side_effect = [
+            {'Items': [{'ticket_id': {'S': 'a'}}], 'LastEvaluatedKey': {'ticket_id': {'S': 'a'}}},
+            {'Items': [], 'LastEvaluatedKey': {'ticket_id': {'S': 'b'}}},
+            {'Items': [{'ticket_id': {'S': 'c'}}]}
+        ]
+        
+        pages = list(storage.scan_exited(datetime(2024, 1, 1), page_size=10))
+        
+        assert pages == [[{'ticket_id': 'a'}], [{'ticket_id': 'c'}]]
+        calls = storage.client.scan.call_args_list
+        assert calls[0].kwargs['Limit'] == 10
+        assert calls[0].kwargs['ExpressionAttributeValues'][':cutoff'] == {'N': '1704067200'}
+        assert 'ExclusiveStartKey' not in calls[0].kwargs
+        assert calls[2].kwargs['ExclusiveStartKey'] == {'ticket_id': {'S': 'b'}}
+
+    def test_expire_tickets_sets_ttl(self, storage):
+        """Test that items are written back with the TTL attribute in batches of 25."""
+        storage.dynamodb.batch_write_item.return_value = {'UnprocessedItems': {}}
+        items = [{'ticket_id': f't{index}', 'exit_time': 1} for index in range(30)]
+        
+        failed = storage.expire_tickets(items, datetime(2024, 1, 1))
+        
+        assert failed == []
+        calls = storage.dynamodb.batch_write_item.call_args_list
+        assert len(calls) == 2
+        first = calls[0].kwargs['RequestItems'][storage.table_name][0]['PutRequest']['Item']
+        assert first == {'ticket_id': 't0', 'exit_time': 1, 'expires_at': 1704067200}
@@ -0,0 +1,104 @@
+import pytest
+import json
+from unittest.mock import patch, Mock
+
+from src.handlers.batch_entry import lambda_handler, MAX_BATCH_ENTRIES
+
+
+class TestBatchEntryHandler:
+    """Test cases for batch entry Lambda handler."""
+
+    def test_successful_batch_entry(self):
+        """Test successful batch entry creation."""
+        event = {
+            'body': json.dumps({'entries': [
+                {'plate': 'abc123', 'parkingLot': 1},
+                {'plate': 'XYZ789', 'parkingLot': '2'}
+            ]})
+        }
+        
+        with patch('src.handlers.batch_entry.get_parking_service') as mock_get_service:
+            mock_service = Mock()
+            mock_service.create_entries.return_value = [
+                {'ticketId': 'ticket-1', 'status': 'created'},
+                {'ticketId': 'ticket-2', 'status': 'created'}
+            ]
+            mock_get_service.return_value = mock_service
+            
+            response = lambda_handler(event, {})
+        
+        assert response['statusCode'] == 200
+        body = json.loads(response['body'])
+        assert [result['ticketId'] for result in body['results']] == ['ticket-1', 'ticket-2']
+        mock_service.create_entries.assert_called_once_with([('ABC123', 1), ('XYZ789', 2)])
+
+    def test_invalid_entries_reported_in_place(self):
+        """Test that invalid entries keep their position and skip the write."""
+        event = {
+            'body': json.dumps({'entries': [
+                {'plate': '', 'parkingLot': 1},
+                {'plate': 'XYZ789', 'parkingLot': 2},
+                {'plate': 'ABC123', 'parkingLot': 'invalid'}
+            ]})
+        }
+        
+        with patch('src.handlers.batch_entry.get_parking_service') as mock_get_service:
+            mock_service = Mock()
+            mock_service.create_entries.return_value = [{'ticketId': 'ticket-2', 'status': 'created'}]
+            mock_get_service.return_value = mock_service
+            
+            response = lambda_handler(event, {})
+        
+        body = json.loads(response['body'])
+        assert body['results'][0]['status'] == 'invalid'
+        assert 'License plate is required' in body['results'][0]['error']
+        assert body['results'][1] == {'ticketId': 'ticket-2', 'status': 'created'}
+        assert 'Parking lot must be a valid integer' in body['results'][2]['error']
+        mock_service.create_entries.assert_called_once_with([('XYZ789', 2)])
+
+    def test_all_entries_invalid_skips_service(self):
+        """Test that no write happens when every entry is invalid."""
+        event = {'body': json.dumps({'entries': [{'plate': 'ABC123', 'parkingLot': 10000}]})}
+        
+        with patch('src.handlers.batch_entry.get_parking_service') as mock_get_service:
+            response = lambda_handler(event, {})
+        
+        assert response['statusCode'] == 200
+        body = json.loads(response['body'])
+        assert 'Parking lot must be between 1 and 9999' in body['results'][0]['error']
+        mock_get_service.assert_not_called()
+
+    @pytest.mark.parametrize("body", [None, '', '{}', '{"entries": []}', '{"entries": "x"}', '[1, 2]'])
+    def test_missing_entries(self, body):
+        """Test batch entry with missing or empty entries."""
+        response = lambda_handler({'body': body}, {})
+        
+        assert response['statusCode'] == 400
+        assert 'Entries are required' in json.loads(response['body'])['error']
+
+    def test_invalid_json_body(self):
+        """Test batch entry with malformed JSON body."""
+        response = lambda_handler({'body': '{not json'}, {})
+        
+        assert response['statusCode'] == 400
+        assert 'valid JSON' in json.loads(response['body'])['error']
+
+    def test_too_many_entries(self):
+        """Test batch entry rejects oversized batches."""
+        entries = [{'plate': 'ABC123', 'parkingLot': 1}] * (MAX_BATCH_ENTRIES + 1)
+        
+        response = lambda_handler({'body': json.dumps({'entries': entries})}, {})
+        
+        assert response['statusCode'] == 400
+
+    def test_service_exception(self):
+        """Test batch entry handler with service exception."""
+        event = {'body': json.dumps({'entries': [{'plate': 'ABC123', 'parkingLot': 1}]})}
+        
+        with patch('src.handlers.batch_entry.get_parking_service') as mock_get_service:
+            mock_get_service.return_value.create_entries.side_effect = Exception("Database error")
+            
+            response = lambda_handler(event, {})
+        
+        assert response['statusCode'] == 500
+        assert 'Failed to create parking entries' in json.loads(response['body'])['error']
@@ -0,0 +1,99 @@
+import pytest
+import json
+from datetime import datetime
+from unittest.mock import patch, Mock
+
+from src.handlers.batch_exit import lambda_handler, MAX_BATCH_EXITS
+from src.models.ticket_id import normalize_ticket_id, new_ticket_id
+
+
+class TestBatchExitHandler:
+    """Test cases for bulk exit Lambda handler."""
+
+    def test_successful_batch_exit(self):
+        """Test successful bulk exit processing."""
+        event = {
+            'body': json.dumps({'ticketIds': [
+                ' a1b2c3d4-e5f6-7890-abcd-ef1234567890 ',
+                'b1b2c3d4-e5f6-7890-abcd-ef1234567890'
+            ]})
+        }
+        expected_results = [
+            {'ticketId': 'a1b2c3d4-e5f6-7890-abcd-ef1234567890', 'status': 'processed',
+             'plate': 'ABC123', 'totalTimeMinutes': 45, 'parkingLot': 1, 'chargeUSD': 7.5},
+            {'ticketId': 'b1b2c3d4-e5f6-7890-abcd-ef1234567890', 'status': 'not_found',
+             'error': 'Ticket b1b2c3d4-e5f6-7890-abcd-ef1234567890 not found'}
+        ]
+        
+        with patch('src.handlers.batch_exit.get_parking_service') as mock_get_service:
+            mock_service = Mock()
+            mock_service.process_exits.return_value = expected_results
+            mock_get_service.return_value = mock_service
+            
+            response = lambda_handler(event, {})
+        
+        assert response['statusCode'] == 200
+        assert json.loads(response['body'])['results'] == expected_results
+        mock_service.process_exits.assert_called_once_with([
+            'a1b2c3d4-e5f6-7890-abcd-ef1234567890',
+            'b1b2c3d4-e5f6-7890-abcd-ef1234567890'
+        ])
+
+    def test_invalid_ticket_ids_reported_in_place(self):
+        """Test that malformed ticket IDs are reported without processing."""
+        event = {'body': json.dumps({'ticketIds': ['invalid-ticket-id', 'a1b2c3d4-e5f6-7890-abcd-ef1234567890']})}
+        
+        with patch('src.handlers.batch_exit.get_parking_service') as mock_get_service:
+            mock_service = Mock()
+            mock_service.process_exits.return_value = [{'ticketId': 'a1b2c3d4-e5f6-7890-abcd-ef1234567890', 'status': 'processed'}]
+            mock_get_service.return_value = mock_service
+            
+            response = lambda_handler(event, {})
+        
+        results = json.loads(response['body'])['results']
+        assert results[0] == {'ticketId': 'invalid-ticket-id', 'status': 'invalid', 'error': 'Invalid ticket ID format'}
+        assert results[1]['status'] == 'processed'
+        mock_service.process_exits.assert_called_once_with(['a1b2c3d4-e5f6-7890-abcd-ef1234567890'])
+
+    def test_ticket_ids_decoded_once(self):
+        """Test that each signed ticket ID is decoded and verified once."""
+        with patch.dict('os.environ', {'TICKET_ID_SECRET': 'test-secret'}):
+            ticket_ids = [new_ticket_id(datetime(2024, 1, 1, 10, 0, 0), lot) for lot in (1, 2)]
+            event = {'body': json.dumps({'ticketIds': ticket_ids})}
+            
+            with patch('src.handlers.batch_exit.get_parking_service') as mock_get_service, \
+                 patch('utils.request_decoding.normalize_ticket_id', wraps=normalize_ticket_id) as decode:
+                mock_get_service.return_value.process_exits.return_value = [{'status': 'processed'}] * 2
+                
+                lambda_handler(event, {})
+        
+        assert decode.call_count == 2
+        mock_get_service.return_value.process_exits.assert_called_once_with(ticket_ids)
+
+    @pytest.mark.parametrize("body", [None, '{}', '{"ticketIds": []}', '{"ticketIds": "x"}'])
+    def test_missing_ticket_ids(self, body):
+        """Test bulk exit with missing or empty ticket IDs."""
+        response = lambda_handler({'body': body}, {})
+        
+        assert response['statusCode'] == 400
+        assert 'Ticket IDs are required' in json.loads(response['body'])['error']
+
+    def test_too_many_ticket_ids(self):
+        """Test bulk exit rejects oversized batches."""
+        ticket_ids = ['a1b2c3d4-e5f6-7890-abcd-ef1234567890'] * (MAX_BATCH_EXITS + 1)
+        
+        response = lambda_handler({'body': json.dumps({'ticketIds': ticket_ids})}, {})
+        
+        assert response['statusCode'] == 400
+
+    def test_service_exception(self):
+        """Test bulk exit handler with service exception."""
+        event = {'body': json.dumps({'ticketIds': ['a1b2c3d4-e5f6-7890-abcd-ef1234567890']})}
+        
+        with patch('src.handlers.batch_exit.get_parking_service') as mock_get_service:
+            mock_get_service.return_value.process_exits.side_effect = Exception("Database error")
+            
+            response = lambda_handler(event, {})
+        
+        assert response['statusCode'] == 500
+        assert 'Failed to process parking exits' in json.loads(response['body'])['error']
@@ -0,0 +1,82 @@
+import pytest
+
+from src.utils.cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTTLCache:
+    """Test cases for the TTL cache."""
+
+    @pytest.fixture
+    def clock(self):
+        return FakeClock()
+
+    def test_get_and_set(self, clock):
+        """Test basic lookups."""
+        cache = TTLCache(2, 60, clock)
+        cache.set('a', 1)
+        
+        assert cache.get('a') == 1
+        assert cache.get('b') is None
+        assert cache.get('b', 'default') == 'default'
+
+    def test_entries_expire(self, clock):
+        """Test that entries are dropped after the TTL."""
+        cache = TTLCache(2, 60, clock)
+        cache.set('a', 1)
+        
+        clock.now = 60
+        
+        assert cache.get('a') is None
+        assert len(cache) == 0
+
+    def test_evicts_least_recently_used(self, clock):
+        """Test that the oldest entry is evicted when full."""
+        cache = TTLCache(2, 60, clock)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+        
+        assert cache.get('b') is None
+        assert cache.get('a') == 1
+        assert cache.get('c') == 3
+
+    def test_pop_and_clear(self, clock):
+        """Test explicit removal."""
+        cache = TTLCache(2, 60, clock)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        
+        assert cache.pop('a') == 1
+        assert cache.pop('a') is None
+        cache.clear()
+        assert len(cache) == 0
+
+    def test_entry_ttl_override(self, clock):
+        """Test that single entries can outlive the cache TTL."""
+        cache = TTLCache(2, 60, clock)
+        cache.set('a', 1, float('inf'))
+        cache.set('b', 2)
+        
+        clock.now = 10 ** 9
+        
+        assert cache.get('a') == 1
+        assert cache.get('b') is None
+
+    def test_stats(self, clock):
+        """Test hit, miss and eviction counters."""
+        cache = TTLCache(1, 60, clock)
+        cache.set('a', 1)
+        cache.get('a')
+        cache.get('b')
+        cache.set('b', 2)
+        
+        assert cache.stats() == {'hits': 1, 'misses': 1, 'evictions': 1, 'size': 1, 'hitRate': 0.5}
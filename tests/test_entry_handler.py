@@ -18,17 +18,17 @@ class TestEntryHandler:
         }
         context = {}
         
-        with patch('src.handlers.entry.ParkingService') as mock_service_class:
+        with patch('src.handlers.entry.get_parking_service') as mock_get_service:
             mock_service = Mock()
             mock_service.create_entry.return_value = 'test-ticket-id'
-            mock_service_class.return_value = mock_service
+            mock_get_service.return_value = mock_service
             
             response = lambda_handler(event, context)
         
         assert response['statusCode'] == 201
         body = json.loads(response['body'])
         assert body['ticketId'] == 'test-ticket-id'
-        mock_service.create_entry.assert_called_once_with('ABC123', 1)
+        mock_service.create_entry.assert_called_once_with('ABC123', 1, None)
 
     def test_missing_plate_parameter(self):
         """Test entry with missing plate parameter."""
@@ -142,10 +142,10 @@ class TestEntryHandler:
         }
         context = {}
         
-        with patch('src.handlers.entry.ParkingService') as mock_service_class:
+        with patch('src.handlers.entry.get_parking_service') as mock_get_service:
             mock_service = Mock()
             mock_service.create_entry.side_effect = Exception("Database error")
-            mock_service_class.return_value = mock_service
+            mock_get_service.return_value = mock_service
             
             response = lambda_handler(event, context)
         
@@ -163,16 +163,16 @@ class TestEntryHandler:
         }
         context = {}
         
-        with patch('src.handlers.entry.ParkingService') as mock_service_class:
+        with patch('src.handlers.entry.get_parking_service') as mock_get_service:
             mock_service = Mock()
             mock_service.create_entry.return_value = 'test-ticket-id'
-            mock_service_class.return_value = mock_service
+            mock_get_service.return_value = mock_service
             
             response = lambda_handler(event, context)
         
         assert response['statusCode'] == 201
         # Should be called with normalized plate
-        mock_service.create_entry.assert_called_once_with('ABC123', 1)
+        mock_service.create_entry.assert_called_once_with('ABC123', 1, None)
 
     def test_cors_headers(self):
         """Test that CORS headers are included in response."""
@@ -184,13 +184,44 @@ class TestEntryHandler:
         }
         context = {}
         
-        with patch('src.handlers.entry.ParkingService') as mock_service_class:
+        with patch('src.handlers.entry.get_parking_service') as mock_get_service:
             mock_service = Mock()
             mock_service.create_entry.return_value = 'test-ticket-id'
-            mock_service_class.return_value = mock_service
+            mock_get_service.return_value = mock_service
             
             response = lambda_handler(event, context)
         
         headers = response['headers']
         assert headers['Access-Control-Allow-Origin'] == '*'
-        assert headers['Content-Type'] == 'application/json' 
\ No newline at end of file
+        assert headers['Content-Type'] == 'application/json' 
+
+    def test_idempotency_key_header(self):
+        """Test that the Idempotency-Key header is passed to the service."""
+        event = {
+            'queryStringParameters': {'plate': 'ABC123', 'parkingLot': '1'},
+            'headers': {'idempotency-key': ' request-1 '}
+        }
+        
+        with patch('src.handlers.entry.get_parking_service') as mock_get_service:
+            mock_service = Mock()
+            mock_service.create_entry.return_value = 'test-ticket-id'
+            mock_get_service.return_value = mock_service
+            
+            response = lambda_handler(event, {})
+        
+        assert response['statusCode'] == 201
+        mock_service.create_entry.assert_called_once_with('ABC123', 1, 'request-1')
+
+    def test_invalid_idempotency_key_header(self):
+        """Test that malformed idempotency keys are rejected."""
+        event = {
+            'queryStringParameters': {'plate': 'ABC123', 'parkingLot': '1'},
+            'headers': {'Idempotency-Key': 'x' * 65}
+        }
+        
+        with patch('src.handlers.entry.get_parking_service') as mock_get_service:
+            response = lambda_handler(event, {})
+        
+        assert response['statusCode'] == 400
+        assert 'Idempotency key' in json.loads(response['body'])['error']
+        mock_get_service.assert_not_called()
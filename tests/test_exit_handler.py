@@ -24,10 +24,10 @@ class TestExitHandler:
             'chargeUSD': 7.50
         }
         
-        with patch('src.handlers.exit.ParkingService') as mock_service_class:
+        with patch('src.handlers.exit.get_parking_service') as mock_get_service:
             mock_service = Mock()
             mock_service.process_exit.return_value = expected_exit_info
-            mock_service_class.return_value = mock_service
+            mock_get_service.return_value = mock_service
             
             response = lambda_handler(event, context)
         
@@ -88,10 +88,10 @@ class TestExitHandler:
         }
         context = {}
         
-        with patch('src.handlers.exit.ParkingService') as mock_service_class:
+        with patch('src.handlers.exit.get_parking_service') as mock_get_service:
             mock_service = Mock()
             mock_service.process_exit.side_effect = ValueError("Ticket a1b2c3d4-e5f6-7890-abcd-ef1234567890 not found")
-            mock_service_class.return_value = mock_service
+            mock_get_service.return_value = mock_service
             
             response = lambda_handler(event, context)
         
@@ -108,10 +108,10 @@ class TestExitHandler:
         }
         context = {}
         
-        with patch('src.handlers.exit.ParkingService') as mock_service_class:
+        with patch('src.handlers.exit.get_parking_service') as mock_get_service:
             mock_service = Mock()
             mock_service.process_exit.side_effect = ValueError("Ticket a1b2c3d4-e5f6-7890-abcd-ef1234567890 already processed")
-            mock_service_class.return_value = mock_service
+            mock_get_service.return_value = mock_service
             
             response = lambda_handler(event, context)
         
@@ -141,10 +141,10 @@ class TestExitHandler:
         }
         context = {}
         
-        with patch('src.handlers.exit.ParkingService') as mock_service_class:
+        with patch('src.handlers.exit.get_parking_service') as mock_get_service:
             mock_service = Mock()
             mock_service.process_exit.side_effect = Exception("Database connection error")
-            mock_service_class.return_value = mock_service
+            mock_get_service.return_value = mock_service
             
             response = lambda_handler(event, context)
         
@@ -168,10 +168,10 @@ class TestExitHandler:
             'chargeUSD': 5.00
         }
         
-        with patch('src.handlers.exit.ParkingService') as mock_service_class:
+        with patch('src.handlers.exit.get_parking_service') as mock_get_service:
             mock_service = Mock()
             mock_service.process_exit.return_value = expected_exit_info
-            mock_service_class.return_value = mock_service
+            mock_get_service.return_value = mock_service
             
             response = lambda_handler(event, context)
         
@@ -195,10 +195,10 @@ class TestExitHandler:
             'chargeUSD': 2.50
         }
         
-        with patch('src.handlers.exit.ParkingService') as mock_service_class:
+        with patch('src.handlers.exit.get_parking_service') as mock_get_service:
             mock_service = Mock()
             mock_service.process_exit.return_value = expected_exit_info
-            mock_service_class.return_value = mock_service
+            mock_get_service.return_value = mock_service
             
             response = lambda_handler(event, context)
         
@@ -222,13 +222,91 @@ class TestExitHandler:
             'chargeUSD': 10.00
         }
         
-        with patch('src.handlers.exit.ParkingService') as mock_service_class:
+        with patch('src.handlers.exit.get_parking_service') as mock_get_service:
             mock_service = Mock()
             mock_service.process_exit.return_value = expected_exit_info
-            mock_service_class.return_value = mock_service
+            mock_get_service.return_value = mock_service
             
             response = lambda_handler(event, context)
         
         assert response['statusCode'] == 200
         body = json.loads(response['body'])
-        assert body == expected_exit_info 
\ No newline at end of file
+        assert body == expected_exit_info 
+
+    def test_exit_by_plate(self):
+        """Test lost-ticket exit located by license plate."""
+        event = {
+            'queryStringParameters': {
+                'plate': ' abc123 ',
+                'parkingLot': '2'
+            }
+        }
+        context = {}
+        
+        expected_exit_info = {
+            'ticketId': 'a1b2c3d4-e5f6-7890-abcd-ef1234567890',
+            'plate': 'ABC123',
+            'totalTimeMinutes': 30,
+            'parkingLot': 2,
+            'chargeUSD': 5.00
+        }
+        
+        with patch('src.handlers.exit.get_parking_service') as mock_get_service:
+            mock_service = Mock()
+            mock_service.process_exit_by_plate.return_value = expected_exit_info
+            mock_get_service.return_value = mock_service
+            
+            response = lambda_handler(event, context)
+        
+        assert response['statusCode'] == 200
+        assert json.loads(response['body']) == expected_exit_info
+        mock_service.process_exit_by_plate.assert_called_once_with('ABC123', 2)
+        mock_service.process_exit.assert_not_called()
+
+    def test_exit_by_plate_without_lot(self):
+        """Test lost-ticket exit without a parking lot."""
+        event = {
+            'queryStringParameters': {
+                'plate': 'ABC123'
+            }
+        }
+        
+        with patch('src.handlers.exit.get_parking_service') as mock_get_service:
+            mock_service = Mock()
+            mock_service.process_exit_by_plate.return_value = {}
+            mock_get_service.return_value = mock_service
+            
+            lambda_handler(event, {})
+        
+        mock_service.process_exit_by_plate.assert_called_once_with('ABC123', None)
+
+    def test_exit_by_plate_invalid_lot(self):
+        """Test lost-ticket exit with an invalid parking lot."""
+        event = {
+            'queryStringParameters': {
+                'plate': 'ABC123',
+                'parkingLot': 'invalid'
+            }
+        }
+        
+        response = lambda_handler(event, {})
+        
+        assert response['statusCode'] == 400
+        assert 'Parking lot must be a valid integer' in json.loads(response['body'])['error']
+
+    def test_exit_by_plate_not_found(self):
+        """Test lost-ticket exit when no active ticket matches."""
+        event = {
+            'queryStringParameters': {
+                'plate': 'ABC123'
+            }
+        }
+        
+        with patch('src.handlers.exit.get_parking_service') as mock_get_service:
+            mock_service = Mock()
+            mock_service.process_exit_by_plate.side_effect = ValueError("Active ticket for plate ABC123 not found")
+            mock_get_service.return_value = mock_service
+            
+            response = lambda_handler(event, {})
+        
+        assert response['statusCode'] == 404
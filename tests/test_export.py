@@ -0,0 +1,137 @@
+import io
+import json
+import threading
+import time
+import pytest
+from datetime import datetime
+from unittest.mock import patch
+from botocore.exceptions import ClientError, ReadTimeoutError
+
+from src.models.parking_ticket import ParkingTicket
+from src.services.export import write_csv, write_ndjson
+from src.services.parking_service import ParkingService
+from src.storage.memory import InMemoryStorage
+
+
+def make_ticket(index, exit_time=None):
+    return ParkingTicket(f'ticket-{index}', f'CAR{index}', 1, datetime(2024, 1, 1, 10, 0, 0), exit_time)
+
+
+class TestIterTickets:
+    """Test cases for streaming every ticket."""
+
+    def test_memory_engine(self):
+        """Test that tickets stream as ParkingTicket objects or raw items."""
+        storage = InMemoryStorage()
+        for index in range(5):
+            storage.put_ticket(make_ticket(index))
+        service = ParkingService(storage)
+        
+        tickets = list(service.iter_tickets(page_size=2))
+        raw = list(service.iter_tickets(page_size=2, raw=True, attributes=['ticket_id']))
+        
+        assert sorted(ticket.ticket_id for ticket in tickets) == [f'ticket-{index}' for index in range(5)]
+        assert all(type(ticket).__name__ == 'ParkingTicket' for ticket in tickets)
+        assert sorted(raw, key=lambda item: item['ticket_id']) == [{'ticket_id': f'ticket-{index}'} for index in range(5)]
+
+
+class TestDynamoDBSegmentedScan:
+    """Test cases for the parallel segmented Scan."""
+
+    @pytest.fixture
+    def storage(self):
+        with patch('src.storage.dynamodb.boto3.resource'):
+            from src.storage.dynamodb import DynamoDBStorage
+            yield DynamoDBStorage()
+
+    def test_segments_scanned_in_parallel(self, storage):
+        """Test that every segment is scanned to the end with the projection."""
+        def scan(**kwargs):
+            segment = kwargs['Segment']
+            page = int(kwargs.get('ExclusiveStartKey', {}).get('page', {}).get('N', '0'))
+            response = {'Items': [{'ticket_id': {'S': f'{segment}-{page}'}}]}
+            if page < 2:
+                response['LastEvaluatedKey'] = {'page': {'N': str(page + 1)}}
+            return response
+        storage.client.scan.side_effect = scan
+        
+        items = [item for page in storage.iter_ticket_pages(segments=4, page_size=10, attributes=['ticket_id', 'plate'])
+                 for item in page]
+        
+        assert sorted(item['ticket_id'] for item in items) == sorted(f'{s}-{p}' for s in range(4) for p in range(3))
+        kwargs = storage.client.scan.call_args.kwargs
+        assert kwargs['TotalSegments'] == 4
+        assert kwargs['Limit'] == 10
+        assert kwargs['ProjectionExpression'] == '#a0, #a1'
+        assert kwargs['ExpressionAttributeNames'] == {'#a0': 'ticket_id', '#a1': 'plate'}
+
+    def test_read_ahead_is_bounded(self, storage):
+        """Test that scanners wait for the consumer and stop when it does."""
+        calls = []
+        
+        def scan(**kwargs):
+            calls.append(kwargs['Segment'])
+            return {'Items': [{'ticket_id': {'S': 'x'}}], 'LastEvaluatedKey': {'ticket_id': {'S': 'x'}}}
+        storage.client.scan.side_effect = scan
+        
+        pages = storage.iter_ticket_pages(segments=2, max_buffered_pages=2)
+        next(pages)
+        time.sleep(0.2)
+        
+        # Two buffered pages, the one consumed and one blocked in each scanner
+        assert len(calls) <= 5
+        pages.close()
+        time.sleep(0.3)
+        assert not [thread for thread in threading.enumerate() if thread.name.startswith('scan-')]
+
+    def test_scan_error_raised(self, storage):
+        """Test that a failing segment surfaces as a storage error."""
+        storage.client.scan.side_effect = ClientError(
+            error_response={'Error': {'Code': 'ProvisionedThroughputExceededException', 'Message': 'Slow down'}},
+            operation_name='Scan'
+        )
+        
+        with pytest.raises(Exception, match="Failed to scan tickets: Slow down"):
+            list(storage.iter_ticket_pages(segments=2))
+
+    def test_segment_timeout_fails_scan(self, storage):
+        """Test that a segment failing with a non-ClientError fails the scan instead of ending it short."""
+        def scan(**kwargs):
+            if kwargs['Segment'] == 1:
+                raise ReadTimeoutError(endpoint_url='https://dynamodb.eu-north-1.amazonaws.com')
+            return {'Items': [{'ticket_id': {'S': str(kwargs['Segment'])}}]}
+        storage.client.scan.side_effect = scan
+        
+        with pytest.raises(Exception, match="Failed to scan tickets: Read timeout"):
+            list(storage.iter_ticket_pages(segments=3))
+
+
+class TestExportWriters:
+    """Test cases for the CSV and NDJSON writers."""
+
+    def test_csv(self):
+        """Test CSV output with a header and empty exit times for active tickets."""
+        output = io.StringIO()
+        
+        count = write_csv([make_ticket(1), make_ticket(2, datetime(2024, 1, 1, 11, 0, 0))], output)
+        
+        assert count == 2
+        assert output.getvalue().splitlines() == [
+            'ticket_id,plate,parking_lot,entry_time,exit_time',
+            'ticket-1,CAR1,1,2024-01-01T10:00:00Z,',
+            'ticket-2,CAR2,1,2024-01-01T10:00:00Z,2024-01-01T11:00:00Z'
+        ]
+
+    def test_ndjson(self):
+        """Test one JSON object per line."""
+        output = io.StringIO()
+        
+        write_ndjson([make_ticket(1)], output)
+        
+        assert [json.loads(line) for line in output.getvalue().splitlines()] == [{
+            'ticket_id': 'ticket-1',
+            'plate': 'CAR1',
+            'parking_lot': 1,
+            'entry_time': '2024-01-01T10:00:00Z',
+            'exit_time': None
+        }]
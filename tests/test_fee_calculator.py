@@ -1,5 +1,7 @@
 import pytest
-from src.services.fee_calculator import FeeCalculator
+from unittest.mock import patch
+from datetime import datetime
+from src.services.fee_calculator import FeeCalculator, create_default_calculator
 
 # AI generated tests
 
@@ -102,4 +104,81 @@ class TestFeeCalculator:
     def test_fee_calculation_scenarios(self, duration, expected_fee):
         """Test various fee calculation scenarios."""
         calculator = FeeCalculator()
-        assert calculator.calculate_fee(duration) == expected_fee 
\ No newline at end of file
+        assert calculator.calculate_fee(duration) == expected_fee 
+
+
+class TestBulkFeeCalculation:
+    """Test cases for FeeCalculator.calculate_fees."""
+
+    DURATIONS = [-10, 0, 1, 14, 15, 16, 29, 30, 31, 45, 46, 59, 60, 61, 75, 90, 119, 120, 1439, 1440, 1441, 10081]
+
+    @pytest.mark.parametrize("hourly_rate,increment", [(10.0, 15), (12.5, 20), (7.3, 7), (3.33, 1), (99.99, 60)])
+    def test_matches_scalar_path(self, hourly_rate, increment):
+        """Test bulk fees are identical to calculate_fee, including rounding."""
+        calculator = FeeCalculator(hourly_rate=hourly_rate, billing_increment_minutes=increment)
+        durations = self.DURATIONS + list(range(0, 600, 7))
+        
+        assert calculator.calculate_fees(durations) == [calculator.calculate_fee(d) for d in durations]
+
+    def test_numpy_array_input(self):
+        """Test that NumPy input returns a NumPy array of matching fees."""
+        np = pytest.importorskip("numpy")
+        calculator = FeeCalculator()
+        durations = np.array(self.DURATIONS)
+        
+        fees = calculator.calculate_fees(durations)
+        
+        assert isinstance(fees, np.ndarray)
+        assert fees.tolist() == [calculator.calculate_fee(int(d)) for d in durations]
+
+    def test_random_durations_match(self):
+        """Test a large random sample against the scalar path."""
+        np = pytest.importorskip("numpy")
+        calculator = FeeCalculator(hourly_rate=7.77, billing_increment_minutes=15)
+        durations = np.random.default_rng(42).integers(-60, 50000, size=20000)
+        
+        fees = calculator.calculate_fees(durations)
+        
+        assert fees.tolist() == [calculator.calculate_fee(int(d)) for d in durations]
+
+    def test_empty_input(self):
+        """Test bulk pricing of no durations."""
+        assert FeeCalculator().calculate_fees([]) == []
+
+    def test_without_numpy(self):
+        """Test the pure Python fallback when NumPy is not installed."""
+        calculator = FeeCalculator()
+        
+        with patch('src.services.fee_calculator.np', None):
+            fees = calculator.calculate_fees(self.DURATIONS)
+        
+        assert fees == [calculator.calculate_fee(d) for d in self.DURATIONS]
+
+
+class TestStayFeeCalculation:
+    """Test cases for FeeCalculator.calculate_stay_fee and configuration."""
+
+    def test_flat_stay_fee_uses_duration(self):
+        """Test the flat calculator prices a stay by its duration."""
+        calculator = FeeCalculator()
+        
+        fee = calculator.calculate_stay_fee(datetime(2024, 1, 1, 10, 0, 0), datetime(2024, 1, 1, 10, 46, 30))
+        
+        assert fee == calculator.calculate_fee(46)
+
+    def test_default_calculator_is_flat(self):
+        """Test the flat calculator is used without a tariff schedule."""
+        with patch.dict('os.environ', {}, clear=True):
+            calculator = create_default_calculator()
+        
+        assert type(calculator) is FeeCalculator
+
+    def test_default_calculator_uses_tariff_schedule(self):
+        """Test a tariff calculator is built from TARIFF_SCHEDULE."""
+        schedule = '{"bands": [{"start": "00:00", "hourlyRate": 4}], "dailyCap": 20}'
+        
+        with patch.dict('os.environ', {'TARIFF_SCHEDULE': schedule}):
+            calculator = create_default_calculator()
+        
+        assert calculator.daily_cap == 20
+        assert calculator.calculate_stay_fee(datetime(2024, 1, 1), datetime(2024, 1, 2)) == 20.0
@@ -0,0 +1,50 @@
+import json
+import os
+import subprocess
+import sys
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+
+# Packages of this project; the Lambda runtime imports them as top-level modules
+PACKAGES = ('handlers', 'models', 'services', 'storage', 'utils')
+
+ROLLUP_MODULES = {'models.rollup', 'services.rollups'}
+
+
+def imported_modules(handler, build_service=False, **environ):
+    """Project modules loaded by importing a handler in a fresh interpreter, as on a cold start."""
+    code = (
+        'import json, sys; '
+        f'import handlers.{handler}; '
+        + ('from services.provider import get_parking_service; get_parking_service(); ' if build_service else '')
+        + f'print(json.dumps(sorted(m for m in sys.modules if m.split(".")[0] in {PACKAGES!r})))'
+    )
+    env = dict(os.environ, PYTHONPATH=SRC, AWS_DEFAULT_REGION='eu-north-1', **environ)
+    result = subprocess.run([sys.executable, '-c', code], cwd=SRC, env=env, capture_output=True, text=True, check=True)
+    return set(json.loads(result.stdout))
+
+
+class TestHandlerImports:
+    """Test cases for the modules each handler loads on a cold start."""
+
+    def test_quote_skips_rollup_modules(self):
+        """Test that only the rollups handler imports the rollup modules."""
+        quote = imported_modules('quote')
+        rollups = imported_modules('rollups')
+        
+        assert not quote & ROLLUP_MODULES
+        assert ROLLUP_MODULES <= rollups
+        assert quote - {'handlers.quote'} <= rollups
+
+    def test_occupancy_service_skips_rollups_and_hedging(self):
+        """Test that building the DynamoDB-backed service loads neither rollups nor hedging."""
+        modules = imported_modules('occupancy', build_service=True, STORAGE_ENGINE='dynamodb')
+        
+        assert 'storage.dynamodb' in modules
+        assert not modules & (ROLLUP_MODULES | {'utils.hedging'})
+
+    def test_hedging_imported_when_enabled(self):
+        """Test that hedged reads still load the hedging module."""
+        modules = imported_modules('quote', build_service=True, STORAGE_ENGINE='dynamodb', DYNAMODB_HEDGE_READS='true')
+        
+        assert 'utils.hedging' in modules
@@ -0,0 +1,150 @@
+import threading
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+from src.utils.hedging import HedgedCaller
+
+
+class TestHedgedCaller:
+    """Test cases for hedged calls."""
+
+    @pytest.fixture
+    def executor(self):
+        executor = ThreadPoolExecutor(max_workers=4)
+        yield executor
+        executor.shutdown(wait=True)
+
+    def test_fast_call_not_hedged(self, executor):
+        """Test that a call answering within the delay is sent once."""
+        caller = HedgedCaller(executor, initial_delay=1)
+        calls = []
+        
+        assert caller.call(lambda value: calls.append(value) or value, 'a') == 'a'
+        
+        assert calls == ['a']
+        assert caller.stats()['hedged'] == 0
+
+    def test_slow_call_hedged(self, executor):
+        """Test that a stalled first request is overtaken by the backup."""
+        caller = HedgedCaller(executor, initial_delay=0.01)
+        release = threading.Event()
+        attempts = []
+        
+        def read():
+            attempts.append(1)
+            if len(attempts) == 1:
+                release.wait(5)
+                return 'primary'
+            return 'backup'
+        
+        assert caller.call(read) == 'backup'
+        release.set()
+        
+        assert caller.stats()['calls'] == 1
+        assert caller.stats()['hedged'] == 1
+        assert caller.stats()['backupWins'] == 1
+
+    def test_backup_used_when_primary_fails(self, executor):
+        """Test that an error is raised only if both requests fail."""
+        caller = HedgedCaller(executor, initial_delay=0.01)
+        attempts = []
+        
+        def read():
+            attempts.append(1)
+            if len(attempts) == 1:
+                threading.Event().wait(0.05)
+                raise RuntimeError("timed out")
+            threading.Event().wait(0.1)
+            return 'backup'
+        
+        assert caller.call(read) == 'backup'
+        
+        def fail():
+            threading.Event().wait(0.05)
+            raise RuntimeError("unavailable")
+        
+        with pytest.raises(RuntimeError, match="unavailable"):
+            caller.call(fail)
+
+    def test_counters_shared_across_threads(self, executor):
+        """Test that calls from many threads are all counted."""
+        caller = HedgedCaller(executor, initial_delay=1)
+        
+        threads = [threading.Thread(target=lambda: [caller.call(int) for _ in range(50)]) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert caller.stats()['calls'] == 400
+
+    def test_delay_follows_percentile(self, executor):
+        """Test that the delay moves to the latency percentile once enough samples exist."""
+        caller = HedgedCaller(executor, percentile=95, initial_delay=0.02, min_samples=20, window=100)
+        
+        for latency in range(1, 20):
+            caller.record(latency / 1000)
+        assert caller.delay == 0.02
+        
+        for latency in range(20, 101):
+            caller.record(latency / 1000)
+        assert caller.delay == pytest.approx(0.096)
+
+    def test_delay_has_lower_bound(self, executor):
+        """Test that very fast reads do not hedge every call."""
+        caller = HedgedCaller(executor, min_delay=0.002, min_samples=10)
+        
+        for _ in range(10):
+            caller.record(0.0001)
+        
+        assert caller.delay == 0.002
+
+
+class TestDynamoDBClientProfile:
+    """Test cases for the DynamoDB client settings and hedged ticket reads."""
+
+    def test_default_profile(self):
+        """Test that timeouts are short and retries adaptive by default."""
+        with patch('src.storage.dynamodb.boto3.resource') as mock_resource:
+            from src.storage.dynamodb import DynamoDBStorage
+            storage = DynamoDBStorage()
+        
+        config = mock_resource.call_args.kwargs['config']
+        assert (config.connect_timeout, config.read_timeout) == (1, 2)
+        assert config.retries == {'max_attempts': 3, 'mode': 'adaptive'}
+        assert config.tcp_keepalive is True
+        assert config.max_pool_connections == 10
+        assert storage.hedge is None
+
+    def test_profile_from_environment(self):
+        """Test that every setting can be overridden."""
+        env = {
+            'DYNAMODB_CONNECT_TIMEOUT_SECONDS': '0.5',
+            'DYNAMODB_READ_TIMEOUT_SECONDS': '5',
+            'DYNAMODB_MAX_ATTEMPTS': '6',
+            'DYNAMODB_RETRY_MODE': 'standard',
+            'DYNAMODB_TCP_KEEPALIVE': 'false',
+            'DYNAMODB_MAX_POOL_CONNECTIONS': '32'
+        }
+        with patch.dict('os.environ', env):
+            from src.storage.dynamodb import client_config
+            config = client_config()
+        
+        assert (config.connect_timeout, config.read_timeout) == (0.5, 5)
+        assert config.retries == {'max_attempts': 6, 'mode': 'standard'}
+        assert config.tcp_keepalive is False
+        assert config.max_pool_connections == 32
+
+    def test_hedged_ticket_read(self):
+        """Test that ticket reads go through the hedge when enabled."""
+        with patch.dict('os.environ', {'DYNAMODB_HEDGE_READS': 'true', 'DYNAMODB_HEDGE_DELAY_MS': '1000'}):
+            with patch('src.storage.dynamodb.boto3.resource'):
+                from src.storage.dynamodb import DynamoDBStorage
+                storage = DynamoDBStorage()
+        storage.table.get_item.return_value = {'Item': {'ticket_id': 't1'}}
+        
+        assert storage.get_ticket('t1') == {'ticket_id': 't1'}
+        assert storage.hedge.stats()['calls'] == 1
+        assert storage.hedge.delay == 1
+        storage.table.get_item.assert_called_once()
@@ -0,0 +1,134 @@
+import asyncio
+import json
+
+from src.server.http_server import ParkingHTTPServer, build_event, render_response
+from src.services.parking_service import ParkingService
+from src.services.provider import set_parking_service, reset_parking_service
+from src.storage.memory import InMemoryStorage
+
+
+async def send(port, raw):
+    """Send raw request bytes and read responses until the server closes or goes idle."""
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(raw)
+    await writer.drain()
+    
+    responses = []
+    while True:
+        try:
+            head = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), 1)
+        except (asyncio.IncompleteReadError, asyncio.TimeoutError):
+            break
+        lines = head.decode('latin-1').split('\r\n')
+        headers = {name.lower(): value.strip() for name, _, value in (line.partition(':') for line in lines[1:] if line)}
+        body = await reader.readexactly(int(headers['content-length']))
+        responses.append((int(lines[0].split(' ')[1]), headers, json.loads(body)))
+        if headers.get('connection') == 'close':
+            break
+    
+    writer.close()
+    return responses
+
+
+def serve(scenario):
+    """Run scenario(port) against a server on the in-memory engine."""
+    async def main():
+        server = ParkingHTTPServer(port=0, workers=4)
+        await server.start()
+        try:
+            return await scenario(server.port)
+        finally:
+            await server.close()
+    
+    # Module names differ between the test and src imports, so inject into both providers
+    import services.provider
+    service = ParkingService(InMemoryStorage())
+    set_parking_service(service)
+    services.provider.set_parking_service(service)
+    try:
+        return asyncio.run(main())
+    finally:
+        reset_parking_service()
+        services.provider.reset_parking_service()
+
+
+class TestHTTPServer:
+    """Test cases for the long-running HTTP server."""
+
+    def test_build_event(self):
+        """Test that requests become API Gateway proxy events."""
+        event = build_event('POST', '/entry?plate=ABC123&parkingLot=1', {'Idempotency-Key': 'k'}, b'')
+        
+        assert event['httpMethod'] == 'POST'
+        assert event['path'] == '/entry'
+        assert event['queryStringParameters'] == {'plate': 'ABC123', 'parkingLot': '1'}
+        assert event['headers'] == {'Idempotency-Key': 'k'}
+        assert event['body'] is None
+        assert build_event('GET', '/occupancy', {}, b'')['queryStringParameters'] is None
+
+    def test_render_response(self):
+        """Test that proxy responses are written as HTTP/1.1."""
+        raw = render_response({'statusCode': 201, 'headers': {'Content-Type': 'application/json'}, 'body': '{}'}, True)
+        
+        assert raw == (
+            b'HTTP/1.1 201 Created\r\nContent-Type: application/json\r\n'
+            b'Content-Length: 2\r\nConnection: keep-alive\r\n\r\n{}'
+        )
+
+    def test_entry_and_exit_on_one_connection(self):
+        """Test keep-alive requests routed to the unchanged handlers."""
+        async def scenario(port):
+            (status, _, body), = await send(port, b'POST /entry?plate=ABC123&parkingLot=2 HTTP/1.1\r\n\r\n')
+            assert status == 201
+            
+            exit_request = f'POST /exit?ticketId={body["ticketId"]} HTTP/1.1\r\n\r\n'.encode()
+            occupancy = b'GET /occupancy?parkingLot=2 HTTP/1.1\r\nConnection: close\r\n\r\n'
+            return await send(port, exit_request + occupancy)
+        
+        (exit_status, _, exit_body), (status, headers, body) = serve(scenario)
+        
+        assert exit_status == 200
+        assert exit_body['plate'] == 'ABC123'
+        assert status == 200
+        assert headers['connection'] == 'close'
+        assert body == {'occupancy': [{'parkingLot': 2, 'occupied': 0}]}
+
+    def test_batch_entry_body(self):
+        """Test that request bodies reach the handler."""
+        body = json.dumps({'entries': [{'plate': 'ABC123', 'parkingLot': 1}]}).encode()
+        request = b'POST /entry/batch HTTP/1.1\r\nContent-Length: %d\r\n\r\n%s' % (len(body), body)
+        
+        (status, _, response), = serve(lambda port: send(port, request))
+        
+        assert status == 200
+        assert response['results'][0]['status'] == 'created'
+
+    def test_unknown_route_and_method(self):
+        """Test 404 for unknown paths and 405 for known paths."""
+        (missing, _, _), (wrong_method, _, _) = serve(
+            lambda port: send(port, b'GET /nope HTTP/1.1\r\n\r\nGET /entry HTTP/1.1\r\n\r\n')
+        )
+        
+        assert missing == 404
+        assert wrong_method == 405
+
+    def test_malformed_request(self):
+        """Test that unparsable requests are rejected and the connection closed."""
+        (status, headers, _), = serve(lambda port: send(port, b'NONSENSE\r\n\r\n'))
+        
+        assert status == 400
+        assert headers['connection'] == 'close'
+
+    def test_concurrent_connections(self):
+        """Test many connections served at once."""
+        async def scenario(port):
+            requests = [
+                send(port, f'POST /entry?plate=CAR{index}&parkingLot=5 HTTP/1.1\r\nConnection: close\r\n\r\n'.encode())
+                for index in range(20)
+            ]
+            return await asyncio.gather(*requests)
+        
+        results = serve(scenario)
+        
+        assert [response[0][0] for response in results] == [201] * 20
+        assert len({response[0][2]['ticketId'] for response in results}) == 20
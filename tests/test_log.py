@@ -0,0 +1,124 @@
+import json
+import logging
+import pytest
+from unittest.mock import patch, Mock
+
+from src.utils import log
+from src.utils.log import JsonFormatter, configure_logging, log_request
+
+
+@pytest.fixture
+def capture():
+    """Capture root logger output as parsed JSON lines."""
+    root = logging.getLogger()
+    saved_level, saved_handlers = root.level, root.handlers[:]
+    records = []
+    
+    class Collect(logging.Handler):
+        def emit(self, record):
+            records.append(json.loads(self.format(record)))
+    
+    root.handlers = [Collect()]
+    yield records
+    root.handlers = saved_handlers
+    root.setLevel(saved_level)
+    log._sample_rate = 0.0
+
+
+class TestStructuredLogging:
+    """Test cases for structured handler logging."""
+
+    def test_json_format_with_fields(self, capture):
+        """Test that messages are formatted lazily and extra fields become keys."""
+        configure_logging('INFO', 0)
+        
+        logging.getLogger().info("Created %s", 'entry', extra={'ticketId': 'abc', 'parkingLot': 5})
+        
+        assert capture[0]['level'] == 'INFO'
+        assert capture[0]['message'] == 'Created entry'
+        assert capture[0]['ticketId'] == 'abc'
+        assert capture[0]['parkingLot'] == 5
+        assert capture[0]['time'].endswith('Z')
+
+    def test_level_from_environment(self, capture):
+        """Test that LOG_LEVEL controls the root level."""
+        with patch.dict('os.environ', {'LOG_LEVEL': 'warning'}):
+            configure_logging()
+        
+        logging.getLogger().info("hidden")
+        logging.getLogger().warning("shown")
+        
+        assert [record['message'] for record in capture] == ['shown']
+
+    def test_invalid_level_defaults_to_info(self, capture):
+        """Test that an unknown level falls back to INFO."""
+        configure_logging('LOUD', 0)
+        
+        assert logging.getLogger().level == logging.INFO
+
+    def test_log_request_summary(self, capture):
+        """Test that only the request summary is logged by default."""
+        configure_logging('INFO', 0)
+        event = {
+            'httpMethod': 'POST',
+            'path': '/entry',
+            'headers': {'User-Agent': 'test'},
+            'requestContext': {'requestId': 'req-1'},
+            'queryStringParameters': {'plate': 'ABC123'}
+        }
+        
+        log_request(logging.getLogger(), "Entry request", event, Mock(aws_request_id='aws-1'))
+        
+        assert capture[0]['message'] == 'Entry request'
+        assert capture[0]['method'] == 'POST'
+        assert capture[0]['path'] == '/entry'
+        assert capture[0]['requestId'] == 'req-1'
+        assert capture[0]['awsRequestId'] == 'aws-1'
+        assert capture[0]['query'] == {'plate': 'ABC123'}
+        assert 'event' not in capture[0]
+
+    def test_log_request_sampled_event(self, capture):
+        """Test that sampled requests include the full event."""
+        configure_logging('INFO', 1.0)
+        
+        log_request(logging.getLogger(), "Entry request", {'headers': {'User-Agent': 'test'}})
+        
+        assert capture[0]['event'] == {'headers': {'User-Agent': 'test'}}
+
+    def test_log_request_debug_event(self, capture):
+        """Test that DEBUG level always includes the full event."""
+        configure_logging('DEBUG', 0)
+        
+        log_request(logging.getLogger(), "Entry request", {'path': '/entry'})
+        
+        assert capture[0]['event'] == {'path': '/entry'}
+
+    def test_log_request_skipped_above_info(self, capture):
+        """Test that nothing is built when INFO is disabled."""
+        configure_logging('ERROR', 1.0)
+        event = Mock()
+        
+        log_request(logging.getLogger(), "Entry request", event)
+        
+        assert capture == []
+        event.get.assert_not_called()
+
+    def test_exception_included(self, capture):
+        """Test that exception tracebacks are part of the record."""
+        configure_logging('INFO', 0)
+        
+        try:
+            raise RuntimeError("boom")
+        except RuntimeError:
+            logging.getLogger().exception("Failed")
+        
+        assert 'RuntimeError: boom' in capture[0]['exception']
+
+    def test_formatter_is_json(self):
+        """Test that the formatter emits a single compact line."""
+        record = logging.LogRecord('root', logging.INFO, __file__, 1, "a\nb", None, None)
+        
+        output = JsonFormatter().format(record)
+        
+        assert '\n' not in output
+        assert json.loads(output)['message'] == 'a\nb'
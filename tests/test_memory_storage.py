@@ -0,0 +1,209 @@
+import pytest
+import threading
+from datetime import datetime
+from unittest.mock import patch
+
+from src.models.parking_ticket import ParkingTicket
+from src.services.parking_service import ParkingService
+from src.storage.base import create_storage
+from src.storage.memory import InMemoryStorage
+
+
+def make_ticket(ticket_id='ticket-1', plate='ABC123', parking_lot=1):
+    return ParkingTicket(ticket_id, plate, parking_lot, datetime(2024, 1, 1, 10, 0, 0))
+
+
+class TestInMemoryStorage:
+    """Test cases for the in-memory storage engine."""
+
+    @pytest.fixture
+    def storage(self):
+        return InMemoryStorage(lock_stripes=4)
+
+    def test_put_and_get(self, storage):
+        """Test that stored items use the storage format."""
+        storage.put_ticket(make_ticket())
+        
+        item = storage.get_ticket('ticket-1')
+        
+        assert item == make_ticket().to_dict()
+        assert storage.get_ticket('missing') is None
+
+    def test_put_existing_id_fails(self, storage):
+        """Test that ticket IDs are never overwritten."""
+        storage.put_ticket(make_ticket())
+        
+        with pytest.raises(Exception, match="already exists"):
+            storage.put_ticket(make_ticket(plate='XYZ789'))
+        
+        assert storage.get_ticket('ticket-1')['plate'] == 'ABC123'
+
+    def test_put_tickets_reports_duplicates(self, storage):
+        """Test that batch writes report tickets that were not stored."""
+        storage.put_ticket(make_ticket('ticket-1'))
+        
+        errors = storage.put_tickets([make_ticket('ticket-1'), make_ticket('ticket-2')])
+        
+        assert list(errors) == ['ticket-1']
+        assert storage.get_ticket('ticket-2') is not None
+
+    def test_exit_ticket(self, storage):
+        """Test that an exit returns the old item and closes the ticket."""
+        storage.put_ticket(make_ticket())
+        
+        old = storage.exit_ticket('ticket-1', datetime(2024, 1, 1, 11, 0, 0))
+        
+        assert 'exit_time' not in old
+        assert old['active_plate'] == 'ABC123'
+        item = storage.get_ticket('ticket-1')
+        assert item['exit_time'] == 1704106800
+        assert 'active_plate' not in item
+
+    def test_exit_ticket_conditions(self, storage):
+        """Test not found and already processed outcomes."""
+        storage.put_ticket(make_ticket())
+        storage.exit_ticket('ticket-1', datetime(2024, 1, 1, 11, 0, 0))
+        
+        with pytest.raises(ValueError, match="already processed"):
+            storage.exit_ticket('ticket-1', datetime(2024, 1, 1, 12, 0, 0))
+        with pytest.raises(ValueError, match="not found"):
+            storage.exit_ticket('missing', datetime(2024, 1, 1, 12, 0, 0))
+
+    def test_concurrent_exits_succeed_once(self, storage):
+        """Test that racing exits of one ticket let exactly one through."""
+        storage.put_ticket(make_ticket())
+        outcomes = []
+        barrier = threading.Barrier(8)
+        
+        def exit_ticket():
+            barrier.wait()
+            try:
+                storage.exit_ticket('ticket-1', datetime(2024, 1, 1, 11, 0, 0))
+                outcomes.append('processed')
+            except ValueError:
+                outcomes.append('rejected')
+        
+        threads = [threading.Thread(target=exit_ticket) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert outcomes.count('processed') == 1
+        assert storage.get_occupancy([1]) == {1: 0}
+
+    def test_find_active_by_plate(self, storage):
+        """Test that only active tickets are returned, optionally per lot."""
+        storage.put_ticket(make_ticket('ticket-1', parking_lot=1))
+        storage.put_ticket(make_ticket('ticket-2', parking_lot=2))
+        storage.put_ticket(make_ticket('ticket-3', parking_lot=3))
+        storage.exit_ticket('ticket-3', datetime(2024, 1, 1, 11, 0, 0))
+        
+        assert {item['ticket_id'] for item in storage.find_active_by_plate('ABC123')} == {'ticket-1', 'ticket-2'}
+        assert [item['ticket_id'] for item in storage.find_active_by_plate('ABC123', 2)] == ['ticket-2']
+        assert storage.find_active_by_plate('XYZ789') == []
+
+    def test_exit_states(self, storage):
+        """Test batched exit state reads."""
+        storage.put_ticket(make_ticket('ticket-1'))
+        storage.put_ticket(make_ticket('ticket-2'))
+        storage.exit_ticket('ticket-2', datetime(2024, 1, 1, 11, 0, 0))
+        
+        result = storage.get_exit_states(['ticket-1', 'ticket-2', 'missing'])
+        
+        assert result.found == {'ticket-1': {'ticket_id': 'ticket-1'}, 'ticket-2': {'ticket_id': 'ticket-2', 'exit_time': 1704106800}}
+        assert result.missing == {'missing'}
+
+    def test_occupancy(self, storage):
+        """Test that entries and exits adjust lot occupancy."""
+        storage.put_tickets([make_ticket('ticket-1'), make_ticket('ticket-2'), make_ticket('ticket-3', parking_lot=2)])
+        storage.exit_ticket('ticket-1', datetime(2024, 1, 1, 11, 0, 0))
+        
+        assert storage.get_occupancy([1, 2, 3]) == {1: 1, 2: 1, 3: 0}
+
+    def test_service_end_to_end(self, storage):
+        """Test ParkingService logic on the in-memory engine."""
+        service = ParkingService(storage)
+        ticket_id = service.create_entry("ABC123", 5)
+        
+        with patch('src.services.parking_service.datetime') as mock_datetime:
+            mock_datetime.utcnow.return_value = datetime.utcnow().replace(microsecond=0)
+            result = service.process_exit_by_plate("ABC123")
+        
+        assert result['ticketId'] == ticket_id
+        assert result['parkingLot'] == 5
+        assert service.get_occupancy([5]) == {5: 0}
+        assert service.process_exits([ticket_id])[0]['status'] == 'already_processed'
+
+    def test_bulk_exit_repeated_ticket_charged_once(self, storage):
+        """Test that a ticket listed twice in a bulk exit is exited and charged once."""
+        service = ParkingService(storage)
+        ticket_id = service.create_entry("ABC123", 5)
+        
+        results = service.process_exits([ticket_id, ticket_id])
+        
+        assert results[0]['status'] == 'processed'
+        assert 'chargeUSD' in results[0]
+        assert results[1] == {
+            'ticketId': ticket_id,
+            'status': 'duplicate',
+            'error': f"Ticket {ticket_id} is repeated in this request"
+        }
+
+    def test_create_storage_from_env(self):
+        """Test engine selection through configuration."""
+        with patch.dict('os.environ', {'STORAGE_ENGINE': 'memory'}):
+            assert type(create_storage()).__name__ == 'InMemoryStorage'
+        
+        with patch.dict('os.environ', {'STORAGE_ENGINE': 'redis'}):
+            with pytest.raises(ValueError):
+                create_storage()
+
+
+class TestInMemoryIdempotency:
+    """Test cases for idempotency keys in the in-memory engine."""
+
+    @pytest.fixture
+    def storage(self):
+        return InMemoryStorage(lock_stripes=4)
+
+    def test_repeated_key_returns_first_ticket(self, storage):
+        """Test that a retried entry does not create a second ticket."""
+        assert storage.put_ticket(make_ticket('ticket-1'), 'request-1') == 'ticket-1'
+        assert storage.put_ticket(make_ticket('ticket-2'), 'request-1') == 'ticket-1'
+        
+        assert storage.get_ticket('ticket-2') is None
+        assert storage.get_occupancy([1]) == {1: 1}
+
+    def test_key_reused_for_other_entry(self, storage):
+        """Test that a key cannot be reused for another plate or lot."""
+        storage.put_ticket(make_ticket('ticket-1'), 'request-1')
+        
+        with pytest.raises(ValueError, match="already used"):
+            storage.put_ticket(make_ticket('ticket-2', plate='XYZ789'), 'request-1')
+        with pytest.raises(ValueError, match="already used"):
+            storage.put_ticket(make_ticket('ticket-3', parking_lot=2), 'request-1')
+
+    def test_expired_key_creates_new_ticket(self, storage):
+        """Test that keys are forgotten after the TTL."""
+        storage.put_ticket(make_ticket('ticket-1'), 'request-1')
+        
+        later = ParkingTicket('ticket-2', 'ABC123', 1, datetime(2024, 1, 3, 10, 0, 0))
+        
+        assert storage.put_ticket(later, 'request-1') == 'ticket-2'
+
+    def test_concurrent_retries_create_one_ticket(self, storage):
+        """Test that racing requests with one key agree on a single ticket."""
+        results = []
+        
+        def enter(index):
+            results.append(storage.put_ticket(make_ticket(f'ticket-{index}'), 'request-1'))
+        
+        threads = [threading.Thread(target=enter, args=(index,)) for index in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert len(set(results)) == 1
+        assert storage.get_occupancy([1]) == {1: 1}
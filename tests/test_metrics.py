@@ -0,0 +1,140 @@
+import json
+import logging
+import pytest
+from datetime import datetime
+from unittest.mock import patch
+
+from src.handlers.entry import lambda_handler as entry_handler
+from src.handlers.exit import lambda_handler as exit_handler
+from src.models.ticket_id import new_ticket_id
+from src.services.parking_service import ParkingService
+from src.storage.memory import InMemoryStorage
+from src.utils.log import configure_logging
+
+
+@pytest.fixture
+def emitted(capsys):
+    """Enable metrics and return a reader of the EMF documents written to stdout."""
+    def read():
+        lines = capsys.readouterr().out.splitlines()
+        return [json.loads(line) for line in lines if line.startswith('{') and '"_aws"' in line]
+    
+    with patch.dict('os.environ', {'METRICS_ENABLED': 'true', 'METRICS_NAMESPACE': 'ParkingTest'}):
+        with patch('utils.metrics._enabled', None):
+            yield read
+
+
+def dynamodb_service(env):
+    with patch.dict('os.environ', {'PARKING_TABLE_NAME': 'test-table', **env}):
+        with patch('src.storage.dynamodb.boto3.resource') as mock_resource:
+            return ParkingService(), mock_resource.return_value
+
+
+class TestRequestMetrics:
+    """Test cases for per-stage timing and capacity metrics."""
+
+    def test_entry_emits_emf_line(self, emitted):
+        """Test that an entry logs one EMF document with its stage timings."""
+        service = ParkingService(InMemoryStorage())
+        
+        with patch('src.handlers.entry.get_parking_service', return_value=service):
+            response = entry_handler({'queryStringParameters': {'plate': 'ABC123', 'parkingLot': '1'}}, {})
+        
+        assert response['statusCode'] == 201
+        [line] = emitted()
+        directive = line['_aws']['CloudWatchMetrics'][0]
+        assert directive['Namespace'] == 'ParkingTest'
+        assert directive['Dimensions'] == [['handler']]
+        assert line['handler'] == 'entry'
+        assert isinstance(line['_aws']['Timestamp'], int)
+        
+        names = {metric['Name']: metric['Unit'] for metric in directive['Metrics']}
+        assert names == {
+            'validateMs': 'Milliseconds', 'storeMs': 'Milliseconds',
+            'serializeMs': 'Milliseconds', 'totalMs': 'Milliseconds'
+        }
+        assert all(line[name] >= 0 for name in names)
+        assert line['totalMs'] >= line['storeMs']
+
+    def test_failed_request_still_measured(self, emitted):
+        """Test that rejected requests are measured too."""
+        response = exit_handler({'queryStringParameters': {'ticketId': 'not-a-ticket'}}, {})
+        
+        assert response['statusCode'] == 400
+        [line] = emitted()
+        assert line['handler'] == 'exit'
+        assert {'validateMs', 'totalMs'} <= set(line)
+
+    def test_exit_capacity(self, emitted):
+        """Test that the exit update requests and reports consumed capacity."""
+        service, resource = dynamodb_service({})
+        table = resource.Table.return_value
+        table.update_item.return_value = {
+            'Attributes': {'ticket_id': 't1', 'plate': 'ABC123', 'parking_lot': 1, 'entry_time': '2024-01-01T10:00:00'},
+            'ConsumedCapacity': {'TableName': 'test-table', 'CapacityUnits': 1.0}
+        }
+        
+        with patch('src.handlers.exit.get_parking_service', return_value=service):
+            response = exit_handler({'queryStringParameters': {'ticketId': '8c2f1e34-3b0a-4c4e-9f53-2a6f7c1d9e10'}}, {})
+        
+        assert response['statusCode'] == 200
+        assert table.update_item.call_args.kwargs['ReturnConsumedCapacity'] == 'TOTAL'
+        [line] = emitted()
+        assert line['writeCapacityUnits'] == 1.0
+        assert {'storeMs', 'updateMs', 'feeMs', 'serializeMs'} <= set(line)
+        assert 'readCapacityUnits' not in line
+
+    def test_overlapped_read_counted(self, emitted):
+        """Test that the read running alongside the exit transaction is part of the request."""
+        env = {'OCCUPANCY_TABLE_NAME': 'occupancy-table', 'TICKET_ID_SECRET': 'test-secret'}
+        service, resource = dynamodb_service(env)
+        resource.Table.return_value.get_item.return_value = {
+            'Item': {'ticket_id': 't1', 'plate': 'ABC123', 'parking_lot': 7, 'entry_time': '2024-01-01T10:00:00'},
+            'ConsumedCapacity': {'TableName': 'test-table', 'CapacityUnits': 0.5}
+        }
+        resource.meta.client.transact_write_items.return_value = {'ConsumedCapacity': [
+            {'TableName': 'test-table', 'CapacityUnits': 2.0},
+            {'TableName': 'occupancy-table', 'CapacityUnits': 2.0}
+        ]}
+        
+        with patch.dict('os.environ', env):
+            ticket_id = new_ticket_id(datetime(2024, 1, 1, 10, 0, 0), 7)
+            with patch('src.handlers.exit.get_parking_service', return_value=service):
+                response = exit_handler({'queryStringParameters': {'ticketId': ticket_id}}, {})
+        
+        assert response['statusCode'] == 200
+        [line] = emitted()
+        assert line['readCapacityUnits'] == 0.5
+        assert line['writeCapacityUnits'] == 4.0
+        assert {'readMs', 'updateMs'} <= set(line)
+
+    def test_emitted_at_any_log_level(self, emitted):
+        """Test that metrics are written even when LOG_LEVEL hides INFO lines."""
+        service = ParkingService(InMemoryStorage())
+        root = logging.getLogger()
+        saved_level, saved_handlers = root.level, root.handlers[:]
+        root.handlers = [logging.NullHandler()]
+        try:
+            with patch.dict('os.environ', {'LOG_LEVEL': 'WARNING'}):
+                configure_logging()
+            with patch('src.handlers.entry.get_parking_service', return_value=service):
+                entry_handler({'queryStringParameters': {'plate': 'ABC123', 'parkingLot': '1'}}, {})
+        finally:
+            root.handlers = saved_handlers
+            root.setLevel(saved_level)
+        
+        [line] = emitted()
+        assert line['handler'] == 'entry'
+        assert 'totalMs' in line
+
+    def test_disabled_by_default(self, emitted):
+        """Test that nothing is measured or requested without METRICS_ENABLED."""
+        service, resource = dynamodb_service({})
+        
+        with patch.dict('os.environ', {'METRICS_ENABLED': 'false'}):
+            with patch('utils.metrics._enabled', None):
+                with patch('src.handlers.entry.get_parking_service', return_value=service):
+                    entry_handler({'queryStringParameters': {'plate': 'ABC123', 'parkingLot': '1'}}, {})
+        
+        assert emitted() == []
+        assert 'ReturnConsumedCapacity' not in resource.Table.return_value.put_item.call_args.kwargs
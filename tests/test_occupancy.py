@@ -0,0 +1,64 @@
+import pytest
+from unittest.mock import patch
+
+from src.storage.occupancy import OccupancyCounters, parse_hot_lots
+
+
+class TestOccupancyCounters:
+    """Test cases for the occupancy counter layout."""
+
+    def test_from_env_disabled_by_default(self):
+        """Test that tracking is off without a counter table."""
+        with patch.dict('os.environ', {}, clear=True):
+            assert OccupancyCounters.from_env() is None
+
+    def test_from_env(self):
+        """Test counter layout built from environment."""
+        env = {
+            'OCCUPANCY_TABLE_NAME': 'occupancy-table',
+            'OCCUPANCY_SHARDS': '2',
+            'OCCUPANCY_HOT_LOTS': '12:8, 15:4'
+        }
+        with patch.dict('os.environ', env, clear=True):
+            counters = OccupancyCounters.from_env()
+        
+        assert counters.table_name == 'occupancy-table'
+        assert counters.shard_count(1) == 2
+        assert counters.shard_count(12) == 8
+        assert counters.shard_count(15) == 4
+
+    def test_counter_ids(self):
+        """Test that every shard of a lot is listed."""
+        counters = OccupancyCounters('occupancy-table', hot_lots={7: 3})
+        
+        assert counters.counter_ids(1) == ['1#0']
+        assert counters.counter_ids(7) == ['7#0', '7#1', '7#2']
+
+    def test_write_counter_id_within_shards(self):
+        """Test that writes are spread over the lot's shards."""
+        counters = OccupancyCounters('occupancy-table', hot_lots={7: 4})
+        
+        written = {counters.write_counter_id(7) for _ in range(200)}
+        
+        assert written <= set(counters.counter_ids(7))
+        assert len(written) > 1
+
+    def test_transact_update(self):
+        """Test the low-level counter update."""
+        counters = OccupancyCounters('occupancy-table')
+        
+        update = counters.transact_update(3, -1)['Update']
+        
+        assert update['TableName'] == 'occupancy-table'
+        assert update['Key'] == {'counter_id': {'S': '3#0'}}
+        assert 'ADD occupied :delta' in update['UpdateExpression']
+        assert update['ExpressionAttributeValues'][':delta'] == {'N': '-1'}
+
+    @pytest.mark.parametrize("value,expected", [
+        ('', {}),
+        ('12:8', {12: 8}),
+        ('12:8,15:4,', {12: 8, 15: 4}),
+    ])
+    def test_parse_hot_lots(self, value, expected):
+        """Test parsing of per-lot shard overrides."""
+        assert parse_hot_lots(value) == expected
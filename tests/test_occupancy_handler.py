@@ -0,0 +1,83 @@
+import json
+from unittest.mock import patch, Mock
+
+from src.handlers.occupancy import lambda_handler
+from src.services.parking_service import ParkingService
+from src.storage.memory import InMemoryStorage
+
+
+class TestOccupancyHandler:
+    """Test cases for occupancy Lambda handler."""
+
+    def test_single_lot(self):
+        """Test occupancy for a single parking lot."""
+        event = {'queryStringParameters': {'parkingLot': '1'}}
+        
+        with patch('src.handlers.occupancy.get_parking_service') as mock_get_service:
+            mock_service = Mock()
+            mock_service.get_occupancy.return_value = {1: 42}
+            mock_get_service.return_value = mock_service
+            
+            response = lambda_handler(event, {})
+        
+        assert response['statusCode'] == 200
+        assert json.loads(response['body']) == {'occupancy': [{'parkingLot': 1, 'occupied': 42}]}
+        mock_service.get_occupancy.assert_called_once_with([1])
+
+    def test_multiple_lots(self):
+        """Test occupancy for several lots in one request."""
+        event = {'queryStringParameters': {'parkingLots': '3, 1,3'}}
+        
+        with patch('src.handlers.occupancy.get_parking_service') as mock_get_service:
+            mock_service = Mock()
+            mock_service.get_occupancy.return_value = {3: 5, 1: 0}
+            mock_get_service.return_value = mock_service
+            
+            response = lambda_handler(event, {})
+        
+        assert json.loads(response['body'])['occupancy'] == [
+            {'parkingLot': 3, 'occupied': 5},
+            {'parkingLot': 1, 'occupied': 0}
+        ]
+        mock_service.get_occupancy.assert_called_once_with([3, 1])
+
+    def test_missing_parking_lot(self):
+        """Test occupancy without a parking lot."""
+        response = lambda_handler({'queryStringParameters': None}, {})
+        
+        assert response['statusCode'] == 400
+        assert 'Parking lot is required' in json.loads(response['body'])['error']
+
+    def test_invalid_parking_lot(self):
+        """Test occupancy with an invalid parking lot in the list."""
+        response = lambda_handler({'queryStringParameters': {'parkingLots': '1,abc'}}, {})
+        
+        assert response['statusCode'] == 400
+        assert 'Parking lot must be a valid integer' in json.loads(response['body'])['error']
+
+    def test_occupancy_tracking_disabled(self):
+        """Test that occupancy without tracking is reported as not implemented."""
+        event = {'queryStringParameters': {'parkingLot': '1'}}
+        
+        with patch('src.handlers.occupancy.get_parking_service') as mock_get_service:
+            mock_get_service.return_value = ParkingService(InMemoryStorage(track_occupancy=False))
+            
+            response = lambda_handler(event, {})
+        
+        assert response['statusCode'] == 501
+        assert json.loads(response['body']) == {
+            'error': 'Occupancy tracking is not enabled',
+            'statusCode': 501,
+            'errorCode': 'NOT_IMPLEMENTED'
+        }
+
+    def test_service_exception(self):
+        """Test occupancy handler with service exception."""
+        event = {'queryStringParameters': {'parkingLot': '1'}}
+        
+        with patch('src.handlers.occupancy.get_parking_service') as mock_get_service:
+            mock_get_service.return_value.get_occupancy.side_effect = Exception("Occupancy tracking is not enabled")
+            
+            response = lambda_handler(event, {})
+        
+        assert response['statusCode'] == 500
@@ -5,6 +5,7 @@ from botocore.exceptions import ClientError
 
 from src.services.parking_service import ParkingService
 from src.models.parking_ticket import ParkingTicket
+from src.models.ticket_id import new_ticket_id
 
 # AI generated tests
 
@@ -14,7 +15,7 @@ class TestParkingService:
     @pytest.fixture
     def mock_dynamodb_table(self):
         """Mock DynamoDB table for testing."""
-        with patch('src.services.parking_service.boto3.resource') as mock_resource:
+        with patch('src.storage.dynamodb.boto3.resource') as mock_resource:
             mock_table = Mock()
             mock_resource.return_value.Table.return_value = mock_table
             yield mock_table
@@ -59,14 +60,12 @@ class TestParkingService:
             'exit_time': None
         }
         
-        mock_dynamodb_table.get_item.return_value = {'Item': ticket_data}
-        mock_dynamodb_table.update_item.return_value = {}
+        mock_dynamodb_table.update_item.return_value = {'Attributes': ticket_data}
         
-        with patch('src.models.parking_ticket.datetime') as mock_datetime:
+        with patch('src.services.parking_service.datetime') as mock_datetime:
             # Mock exit time to be 30 minutes after entry
             exit_time = datetime(2024, 1, 1, 10, 30, 0)
             mock_datetime.utcnow.return_value = exit_time
-            mock_datetime.fromisoformat = datetime.fromisoformat
             
             result = parking_service.process_exit('test-ticket-id')
         
@@ -85,7 +84,10 @@ class TestParkingService:
 
     def test_process_exit_ticket_not_found(self, parking_service, mock_dynamodb_table):
         """Test exit processing for non-existent ticket."""
-        mock_dynamodb_table.get_item.return_value = {}
+        mock_dynamodb_table.update_item.side_effect = ClientError(
+            error_response={'Error': {'Code': 'ConditionalCheckFailedException', 'Message': 'The conditional request failed'}},
+            operation_name='UpdateItem'
+        )
         
         with pytest.raises(ValueError) as exc_info:
             parking_service.process_exit('non-existent-ticket')
@@ -102,7 +104,14 @@ class TestParkingService:
             'exit_time': '2024-01-01T11:00:00'  # Already has exit time
         }
         
-        mock_dynamodb_table.get_item.return_value = {'Item': ticket_data}
+        # The condition check failure carries the stored item in low-level format
+        mock_dynamodb_table.update_item.side_effect = ClientError(
+            error_response={
+                'Error': {'Code': 'ConditionalCheckFailedException', 'Message': 'The conditional request failed'},
+                'Item': {key: {'S': str(value)} for key, value in ticket_data.items()}
+            },
+            operation_name='UpdateItem'
+        )
         
         with pytest.raises(ValueError) as exc_info:
             parking_service.process_exit('test-ticket-id')
@@ -111,9 +120,9 @@ class TestParkingService:
 
     def test_process_exit_dynamodb_error(self, parking_service, mock_dynamodb_table):
         """Test exit processing with DynamoDB error."""
-        mock_dynamodb_table.get_item.side_effect = ClientError(
+        mock_dynamodb_table.update_item.side_effect = ClientError(
             error_response={'Error': {'Code': 'ResourceNotFoundException', 'Message': 'Table not found'}},
-            operation_name='GetItem'
+            operation_name='UpdateItem'
         )
         
         with pytest.raises(Exception) as exc_info:
@@ -121,6 +130,27 @@ class TestParkingService:
         
         assert "Failed to process exit" in str(exc_info.value)
 
+    def test_process_exit_single_conditional_update(self, parking_service, mock_dynamodb_table):
+        """Test that exit is one conditional update returning the old item."""
+        ticket_data = {
+            'ticket_id': 'test-ticket-id',
+            'plate': 'ABC123',
+            'parking_lot': 1,
+            'entry_time': '2024-01-01T10:00:00',
+            'exit_time': None
+        }
+        mock_dynamodb_table.update_item.return_value = {'Attributes': ticket_data}
+        
+        parking_service.process_exit('test-ticket-id')
+        
+        mock_dynamodb_table.get_item.assert_not_called()
+        mock_dynamodb_table.update_item.assert_called_once()
+        kwargs = mock_dynamodb_table.update_item.call_args.kwargs
+        assert kwargs['Key'] == {'ticket_id': 'test-ticket-id'}
+        assert 'attribute_not_exists(exit_time)' in kwargs['ConditionExpression']
+        assert kwargs['ReturnValues'] == 'ALL_OLD'
+        assert kwargs['ReturnValuesOnConditionCheckFailure'] == 'ALL_OLD'
+
     def test_get_ticket_success(self, parking_service, mock_dynamodb_table):
         """Test successful ticket retrieval."""
         ticket_data = {
@@ -157,4 +187,717 @@ class TestParkingService:
         
         ticket = parking_service.get_ticket('test-ticket-id')
         
-        assert ticket is None 
\ No newline at end of file
+        assert ticket is None 
+
+    def test_create_entries_success(self, parking_service):
+        """Test batch entry creation writes all tickets in one batch call."""
+        parking_service.storage.dynamodb.batch_write_item.return_value = {'UnprocessedItems': {}}
+        
+        results = parking_service.create_entries([("ABC123", 1), ("XYZ789", 2)])
+        
+        assert [result['status'] for result in results] == ['created', 'created']
+        assert all(len(result['ticketId']) == 36 for result in results)
+        parking_service.storage.dynamodb.batch_write_item.assert_called_once()
+        request_items = parking_service.storage.dynamodb.batch_write_item.call_args.kwargs['RequestItems']
+        assert len(request_items['test-table']) == 2
+
+    def test_create_entries_chunks_of_25(self, parking_service):
+        """Test batch entry creation splits writes into chunks of 25."""
+        parking_service.storage.dynamodb.batch_write_item.return_value = {'UnprocessedItems': {}}
+        
+        results = parking_service.create_entries([("ABC123", 1)] * 60)
+        
+        assert len(results) == 60
+        assert parking_service.storage.dynamodb.batch_write_item.call_count == 3
+
+    def test_create_entries_retries_unprocessed(self, parking_service):
+        """Test that unprocessed items are retried until written."""
+        def batch_write(RequestItems):
+            requests = RequestItems['test-table']
+            if len(requests) > 1:
+                return {'UnprocessedItems': {'test-table': requests[1:]}}
+            return {'UnprocessedItems': {}}
+        
+        parking_service.storage.dynamodb.batch_write_item.side_effect = batch_write
+        
+        with patch('src.storage.dynamodb.time.sleep'):
+            results = parking_service.create_entries([("ABC123", 1), ("XYZ789", 2), ("DEF456", 3)])
+        
+        assert [result['status'] for result in results] == ['created'] * 3
+        assert parking_service.storage.dynamodb.batch_write_item.call_count == 3
+
+    def test_create_entries_reports_failed_items(self, parking_service):
+        """Test that items left unprocessed after all retries are reported as failed."""
+        def batch_write(RequestItems):
+            requests = RequestItems['test-table']
+            unprocessed = [request for request in requests if request['PutRequest']['Item']['plate'] == 'XYZ789']
+            return {'UnprocessedItems': {'test-table': unprocessed}}
+        
+        parking_service.storage.dynamodb.batch_write_item.side_effect = batch_write
+        
+        with patch('src.storage.dynamodb.time.sleep'):
+            results = parking_service.create_entries([("ABC123", 1), ("XYZ789", 2)])
+        
+        assert results[0]['status'] == 'created'
+        assert results[1]['status'] == 'failed'
+        assert results[1]['ticketId'] is None
+
+    def test_create_entries_dynamodb_error(self, parking_service):
+        """Test batch entry creation with DynamoDB error."""
+        parking_service.storage.dynamodb.batch_write_item.side_effect = ClientError(
+            error_response={'Error': {'Code': 'ValidationException', 'Message': 'Test error'}},
+            operation_name='BatchWriteItem'
+        )
+        
+        results = parking_service.create_entries([("ABC123", 1)])
+        
+        assert results[0]['status'] == 'failed'
+        assert "Failed to create parking entry" in results[0]['error']
+
+    def test_process_exits_mixed_results(self, parking_service, mock_dynamodb_table):
+        """Test bulk exit answers missing and exited tickets without updates."""
+        parking_service.storage.dynamodb.batch_get_item.return_value = {
+            'Responses': {'test-table': [
+                {'ticket_id': 'active-ticket', 'exit_time': None},
+                {'ticket_id': 'exited-ticket', 'exit_time': '2024-01-01T11:00:00'}
+            ]},
+            'UnprocessedKeys': {}
+        }
+        mock_dynamodb_table.update_item.return_value = {'Attributes': {
+            'ticket_id': 'active-ticket',
+            'plate': 'ABC123',
+            'parking_lot': 1,
+            'entry_time': '2024-01-01T10:00:00',
+            'exit_time': None
+        }}
+        
+        with patch('src.services.parking_service.datetime') as mock_datetime:
+            mock_datetime.utcnow.return_value = datetime(2024, 1, 1, 10, 45, 0)
+            results = parking_service.process_exits(['active-ticket', 'missing-ticket', 'exited-ticket'])
+        
+        assert results[0] == {
+            'ticketId': 'active-ticket',
+            'status': 'processed',
+            'plate': 'ABC123',
+            'totalTimeMinutes': 45,
+            'parkingLot': 1,
+            'chargeUSD': 7.5
+        }
+        assert results[1]['status'] == 'not_found'
+        assert results[2]['status'] == 'already_processed'
+        mock_dynamodb_table.update_item.assert_called_once()
+
+    def test_process_exits_batches_of_100_keys(self, parking_service, mock_dynamodb_table):
+        """Test bulk exit reads tickets in BatchGetItem chunks of 100 keys."""
+        parking_service.storage.dynamodb.batch_get_item.return_value = {'Responses': {'test-table': []}}
+        
+        results = parking_service.process_exits([f"ticket-{i}" for i in range(250)])
+        
+        assert parking_service.storage.dynamodb.batch_get_item.call_count == 3
+        assert all(result['status'] == 'not_found' for result in results)
+        mock_dynamodb_table.update_item.assert_not_called()
+
+    def test_process_exits_update_race(self, parking_service, mock_dynamodb_table):
+        """Test that a ticket exited after the read is reported by the condition check."""
+        parking_service.storage.dynamodb.batch_get_item.return_value = {
+            'Responses': {'test-table': [{'ticket_id': 'test-ticket-id'}]}
+        }
+        mock_dynamodb_table.update_item.side_effect = ClientError(
+            error_response={
+                'Error': {'Code': 'ConditionalCheckFailedException', 'Message': 'The conditional request failed'},
+                'Item': {'ticket_id': {'S': 'test-ticket-id'}}
+            },
+            operation_name='UpdateItem'
+        )
+        
+        results = parking_service.process_exits(['test-ticket-id'])
+        
+        assert results[0]['status'] == 'already_processed'
+
+    def test_process_exits_read_failure_falls_back_to_updates(self, parking_service, mock_dynamodb_table):
+        """Test bulk exit still processes tickets when the batch read fails."""
+        parking_service.storage.dynamodb.batch_get_item.side_effect = ClientError(
+            error_response={'Error': {'Code': 'ProvisionedThroughputExceededException', 'Message': 'Slow down'}},
+            operation_name='BatchGetItem'
+        )
+        mock_dynamodb_table.update_item.side_effect = Exception("Failed to process exit: Slow down")
+        
+        results = parking_service.process_exits(['test-ticket-id'])
+        
+        assert results[0]['status'] == 'failed'
+        mock_dynamodb_table.update_item.assert_called_once()
+
+    def test_create_entry_sets_active_plate(self, parking_service, mock_dynamodb_table):
+        """Test that new tickets are written with the sparse plate index key."""
+        parking_service.create_entry("ABC123", 1)
+        
+        item = mock_dynamodb_table.put_item.call_args.kwargs['Item']
+        assert item['active_plate'] == 'ABC123'
+
+    def test_process_exit_removes_active_plate(self, parking_service, mock_dynamodb_table):
+        """Test that exit removes the ticket from the plate index."""
+        mock_dynamodb_table.update_item.return_value = {'Attributes': {
+            'ticket_id': 'test-ticket-id',
+            'plate': 'ABC123',
+            'parking_lot': 1,
+            'entry_time': '2024-01-01T10:00:00'
+        }}
+        
+        parking_service.process_exit('test-ticket-id')
+        
+        kwargs = mock_dynamodb_table.update_item.call_args.kwargs
+        assert 'REMOVE active_plate' in kwargs['UpdateExpression']
+
+    def test_index_active_plates(self, parking_service, mock_dynamodb_table):
+        """Test that active tickets stored before the plate index are added to it."""
+        storage = parking_service.storage
+        storage.client.scan.return_value = {'Items': [
+            {'ticket_id': {'S': 'parked'}, 'plate': {'S': 'ABC123'}},
+            {'ticket_id': {'S': 'exited-meanwhile'}, 'plate': {'S': 'XYZ789'}}
+        ]}
+        mock_dynamodb_table.update_item.side_effect = [{}, ClientError(
+            error_response={'Error': {'Code': 'ConditionalCheckFailedException', 'Message': 'Exited'}},
+            operation_name='UpdateItem'
+        )]
+        
+        assert storage.index_active_plates() == 1
+        
+        scan = storage.client.scan.call_args.kwargs
+        assert 'attribute_not_exists(active_plate)' in scan['FilterExpression']
+        first = mock_dynamodb_table.update_item.call_args_list[0].kwargs
+        assert first['Key'] == {'ticket_id': 'parked'}
+        assert first['ExpressionAttributeValues'][':plate'] == 'ABC123'
+        assert 'attribute_not_exists(exit_time)' in first['ConditionExpression']
+
+    def test_find_active_by_plate(self, parking_service, mock_dynamodb_table):
+        """Test plate lookup queries the index and follows pagination."""
+        mock_dynamodb_table.query.side_effect = [
+            {
+                'Items': [{'ticket_id': 'older', 'plate': 'ABC123', 'parking_lot': 1, 'entry_time': '2024-01-01T10:00:00'}],
+                'LastEvaluatedKey': {'ticket_id': 'older'}
+            },
+            {
+                'Items': [{'ticket_id': 'newer', 'plate': 'ABC123', 'parking_lot': 2, 'entry_time': '2024-01-02T10:00:00'}]
+            }
+        ]
+        
+        tickets = parking_service.find_active_by_plate('ABC123')
+        
+        assert [ticket.ticket_id for ticket in tickets] == ['newer', 'older']
+        assert mock_dynamodb_table.query.call_count == 2
+        first_call = mock_dynamodb_table.query.call_args_list[0].kwargs
+        assert first_call['IndexName'] == 'active-plate-index'
+        assert 'FilterExpression' not in first_call
+        assert mock_dynamodb_table.query.call_args_list[1].kwargs['ExclusiveStartKey'] == {'ticket_id': 'older'}
+        mock_dynamodb_table.scan.assert_not_called()
+
+    def test_find_active_by_plate_with_lot(self, parking_service, mock_dynamodb_table):
+        """Test plate lookup restricted to a parking lot."""
+        mock_dynamodb_table.query.return_value = {'Items': []}
+        
+        assert parking_service.find_active_by_plate('ABC123', 2) == []
+        assert 'FilterExpression' in mock_dynamodb_table.query.call_args.kwargs
+
+    def test_process_exit_by_plate(self, parking_service, mock_dynamodb_table):
+        """Test lost-ticket exit closes the single active ticket."""
+        mock_dynamodb_table.query.return_value = {'Items': [
+            {'ticket_id': 'test-ticket-id', 'plate': 'ABC123', 'parking_lot': 1, 'entry_time': '2024-01-01T10:00:00'}
+        ]}
+        mock_dynamodb_table.update_item.return_value = {'Attributes': {
+            'ticket_id': 'test-ticket-id',
+            'plate': 'ABC123',
+            'parking_lot': 1,
+            'entry_time': '2024-01-01T10:00:00'
+        }}
+        
+        result = parking_service.process_exit_by_plate('ABC123')
+        
+        assert result['ticketId'] == 'test-ticket-id'
+        assert result['plate'] == 'ABC123'
+        assert mock_dynamodb_table.update_item.call_args.kwargs['Key'] == {'ticket_id': 'test-ticket-id'}
+
+    def test_process_exit_by_plate_not_found(self, parking_service, mock_dynamodb_table):
+        """Test lost-ticket exit with no active ticket for the plate."""
+        mock_dynamodb_table.query.return_value = {'Items': []}
+        
+        with pytest.raises(ValueError) as exc_info:
+            parking_service.process_exit_by_plate('ABC123')
+        
+        assert "not found" in str(exc_info.value)
+
+    def test_process_exit_by_plate_ambiguous(self, parking_service, mock_dynamodb_table):
+        """Test lost-ticket exit requires a lot when the plate is parked twice."""
+        mock_dynamodb_table.query.return_value = {'Items': [
+            {'ticket_id': 'first', 'plate': 'ABC123', 'parking_lot': 1, 'entry_time': '2024-01-01T10:00:00'},
+            {'ticket_id': 'second', 'plate': 'ABC123', 'parking_lot': 2, 'entry_time': '2024-01-01T11:00:00'}
+        ]}
+        
+        with pytest.raises(ValueError) as exc_info:
+            parking_service.process_exit_by_plate('ABC123')
+        
+        assert "parking lot is required" in str(exc_info.value)
+        mock_dynamodb_table.update_item.assert_not_called()
+
+
+    def test_create_entry_compact_item(self, parking_service, mock_dynamodb_table):
+        """Test that entries are stored with epoch timestamps and no null attributes."""
+        parking_service.create_entry("ABC123", 1)
+        
+        item = mock_dynamodb_table.put_item.call_args.kwargs['Item']
+        assert isinstance(item['entry_time'], int)
+        assert 'exit_time' not in item
+
+    def test_process_exit_compact_item(self, parking_service, mock_dynamodb_table):
+        """Test exit of a compact ticket stores an epoch exit time."""
+        mock_dynamodb_table.update_item.return_value = {'Attributes': {
+            'ticket_id': 'test-ticket-id',
+            'plate': 'ABC123',
+            'parking_lot': 1,
+            'entry_time': 1704103200
+        }}
+        
+        with patch('src.services.parking_service.datetime') as mock_datetime:
+            mock_datetime.utcnow.return_value = datetime(2024, 1, 1, 11, 0, 0)
+            result = parking_service.process_exit('test-ticket-id')
+        
+        assert result['totalTimeMinutes'] == 60
+        values = mock_dynamodb_table.update_item.call_args.kwargs['ExpressionAttributeValues']
+        assert values[':exit_time'] == 1704106800
+
+    def test_get_ticket_uses_projection(self, parking_service, mock_dynamodb_table):
+        """Test that ticket reads only fetch the model attributes."""
+        mock_dynamodb_table.get_item.return_value = {}
+        
+        parking_service.get_ticket('test-ticket-id')
+        
+        projection = mock_dynamodb_table.get_item.call_args.kwargs['ProjectionExpression']
+        assert projection == 'ticket_id, plate, parking_lot, entry_time, exit_time, charge_cents, duration_minutes'
+
+
+class TestParkingServiceOccupancy:
+    """Test cases for ParkingService with occupancy counters enabled."""
+
+    @pytest.fixture
+    def mock_dynamodb_resource(self):
+        """Mock DynamoDB resource for testing."""
+        with patch('src.storage.dynamodb.boto3.resource') as mock_resource:
+            yield mock_resource.return_value
+
+    @pytest.fixture
+    def parking_service(self, mock_dynamodb_resource):
+        """Create ParkingService instance with occupancy tracking."""
+        env = {'PARKING_TABLE_NAME': 'test-table', 'OCCUPANCY_TABLE_NAME': 'occupancy-table', 'OCCUPANCY_SHARDS': '2'}
+        with patch.dict('os.environ', env):
+            return ParkingService()
+
+    def test_create_entry_is_transactional(self, parking_service, mock_dynamodb_resource):
+        """Test that ticket and counter are written in one transaction."""
+        ticket_id = parking_service.create_entry("ABC123", 7)
+        
+        mock_dynamodb_resource.Table.return_value.put_item.assert_not_called()
+        items = mock_dynamodb_resource.meta.client.transact_write_items.call_args.kwargs['TransactItems']
+        assert items[0]['Put']['Item']['ticket_id'] == {'S': ticket_id}
+        assert items[0]['Put']['Item']['parking_lot'] == {'N': '7'}
+        assert items[1]['Update']['TableName'] == 'occupancy-table'
+        assert items[1]['Update']['Key']['counter_id']['S'] in ('7#0', '7#1')
+        assert items[1]['Update']['ExpressionAttributeValues'][':delta'] == {'N': '1'}
+
+    def test_process_exit_is_transactional(self, parking_service, mock_dynamodb_resource):
+        """Test that exit update and counter decrement share a transaction."""
+        table = mock_dynamodb_resource.Table.return_value
+        table.get_item.return_value = {'Item': {
+            'ticket_id': 'test-ticket-id',
+            'plate': 'ABC123',
+            'parking_lot': 7,
+            'entry_time': '2024-01-01T10:00:00'
+        }}
+        
+        with patch('src.services.parking_service.datetime') as mock_datetime:
+            mock_datetime.utcnow.return_value = datetime(2024, 1, 1, 10, 15, 0)
+            result = parking_service.process_exit('test-ticket-id')
+        
+        assert result['chargeUSD'] == 2.5
+        table.update_item.assert_not_called()
+        items = mock_dynamodb_resource.meta.client.transact_write_items.call_args.kwargs['TransactItems']
+        assert items[0]['Update']['Key'] == {'ticket_id': {'S': 'test-ticket-id'}}
+        assert items[1]['Update']['ExpressionAttributeValues'][':delta'] == {'N': '-1'}
+
+    def test_process_exit_not_found(self, parking_service, mock_dynamodb_resource):
+        """Test that a missing ticket is re-read consistently before failing."""
+        table = mock_dynamodb_resource.Table.return_value
+        table.get_item.return_value = {}
+        
+        with pytest.raises(ValueError) as exc_info:
+            parking_service.process_exit('test-ticket-id')
+        
+        assert "not found" in str(exc_info.value)
+        assert table.get_item.call_args.kwargs['ConsistentRead'] is True
+        mock_dynamodb_resource.meta.client.transact_write_items.assert_not_called()
+
+    def test_process_exit_concurrent_exit(self, parking_service, mock_dynamodb_resource):
+        """Test that a cancelled transaction is reported as already processed."""
+        mock_dynamodb_resource.Table.return_value.get_item.return_value = {'Item': {
+            'ticket_id': 'test-ticket-id',
+            'plate': 'ABC123',
+            'parking_lot': 7,
+            'entry_time': '2024-01-01T10:00:00'
+        }}
+        mock_dynamodb_resource.meta.client.transact_write_items.side_effect = ClientError(
+            error_response={
+                'Error': {'Code': 'TransactionCanceledException', 'Message': 'Transaction cancelled'},
+                'CancellationReasons': [{'Code': 'ConditionalCheckFailed'}, {'Code': 'None'}]
+            },
+            operation_name='TransactWriteItems'
+        )
+        
+        with pytest.raises(ValueError) as exc_info:
+            parking_service.process_exit('test-ticket-id')
+        
+        assert "already processed" in str(exc_info.value)
+
+    def test_process_exit_signed_id_skips_lot_lookup(self, parking_service, mock_dynamodb_resource):
+        """Test that a signed ID supplies the lot, so the read overlaps the transaction."""
+        with patch.dict('os.environ', {'TICKET_ID_SECRET': 'test-secret'}):
+            ticket_id = new_ticket_id(datetime(2024, 1, 1, 10, 0, 0), 7)
+            table = mock_dynamodb_resource.Table.return_value
+            table.get_item.return_value = {'Item': {
+                'ticket_id': ticket_id,
+                'plate': 'ABC123',
+                'parking_lot': 7,
+                'entry_time': 1704103200,
+                'exit_time': 1704104100
+            }}
+            
+            with patch('src.services.parking_service.datetime') as mock_datetime:
+                mock_datetime.utcnow.return_value = datetime(2024, 1, 1, 10, 15, 0)
+                result = parking_service.process_exit(ticket_id)
+        
+        assert result == {'plate': 'ABC123', 'totalTimeMinutes': 15, 'parkingLot': 7, 'chargeUSD': 2.5}
+        items = mock_dynamodb_resource.meta.client.transact_write_items.call_args.kwargs['TransactItems']
+        assert items[0]['Update']['Key'] == {'ticket_id': {'S': ticket_id}}
+        assert items[1]['Update']['Key']['counter_id']['S'] in ('7#0', '7#1')
+
+    def test_process_exit_signed_id_not_found(self, parking_service, mock_dynamodb_resource):
+        """Test that a cancelled transaction without an old item means not found."""
+        mock_dynamodb_resource.Table.return_value.get_item.return_value = {}
+        mock_dynamodb_resource.meta.client.transact_write_items.side_effect = ClientError(
+            error_response={
+                'Error': {'Code': 'TransactionCanceledException', 'Message': 'Transaction cancelled'},
+                'CancellationReasons': [{'Code': 'ConditionalCheckFailed'}, {'Code': 'None'}]
+            },
+            operation_name='TransactWriteItems'
+        )
+        
+        with patch.dict('os.environ', {'TICKET_ID_SECRET': 'test-secret'}):
+            with pytest.raises(ValueError) as exc_info:
+                parking_service.process_exit(new_ticket_id(datetime(2024, 1, 1, 10, 0, 0), 7))
+        
+        assert "not found" in str(exc_info.value)
+
+    def test_create_entries_adjusts_counters(self, parking_service, mock_dynamodb_resource):
+        """Test that batch entries add one counter update per lot."""
+        mock_dynamodb_resource.batch_write_item.return_value = {'UnprocessedItems': {}}
+        
+        parking_service.create_entries([("ABC123", 1), ("XYZ789", 1), ("DEF456", 2)])
+        
+        deltas = {
+            call.kwargs['Key']['counter_id']['S'].split('#')[0]: call.kwargs['ExpressionAttributeValues'][':delta']['N']
+            for call in mock_dynamodb_resource.meta.client.update_item.call_args_list
+        }
+        assert deltas == {'1': '2', '2': '1'}
+
+    def test_create_entries_counter_failures(self, parking_service, mock_dynamodb_resource):
+        """Test that throttled counter updates are retried and other failures logged."""
+        mock_dynamodb_resource.batch_write_item.return_value = {'UnprocessedItems': {}}
+        throttled = ClientError(
+            error_response={'Error': {'Code': 'ThrottlingException', 'Message': 'Rate exceeded'}},
+            operation_name='UpdateItem'
+        )
+        denied = ClientError(
+            error_response={'Error': {'Code': 'AccessDeniedException', 'Message': 'Access denied'}},
+            operation_name='UpdateItem'
+        )
+        mock_dynamodb_resource.meta.client.update_item.side_effect = [throttled, None, denied]
+        
+        with patch('src.storage.dynamodb.time.sleep'):
+            with patch('storage.dynamodb.logger') as mock_logger:
+                results = parking_service.create_entries([("ABC123", 1), ("XYZ789", 1), ("DEF456", 2)])
+        
+        assert [result['status'] for result in results] == ['created'] * 3
+        assert mock_dynamodb_resource.meta.client.update_item.call_count == 3
+        mock_logger.warning.assert_called_once()
+        assert mock_logger.warning.call_args.kwargs['extra'] == {
+            'parkingLot': 2, 'count': 1, 'errorCode': 'AccessDeniedException'
+        }
+
+    def test_get_occupancy_sums_shards(self, parking_service, mock_dynamodb_resource):
+        """Test occupancy reads every shard in one batch and sums them."""
+        mock_dynamodb_resource.batch_get_item.return_value = {'Responses': {'occupancy-table': [
+            {'counter_id': '1#0', 'occupied': 3},
+            {'counter_id': '1#1', 'occupied': 4},
+            {'counter_id': '2#1', 'occupied': 1}
+        ]}}
+        
+        occupancy = parking_service.get_occupancy([1, 2, 3])
+        
+        assert occupancy == {1: 7, 2: 1, 3: 0}
+        mock_dynamodb_resource.batch_get_item.assert_called_once()
+        keys = mock_dynamodb_resource.batch_get_item.call_args.kwargs['RequestItems']['occupancy-table']['Keys']
+        assert len(keys) == 6
+
+    def test_get_occupancy_disabled(self):
+        """Test occupancy reads fail clearly when tracking is off."""
+        with patch('src.storage.dynamodb.boto3.resource'):
+            with patch.dict('os.environ', {}, clear=True):
+                service = ParkingService()
+        
+        with pytest.raises(Exception) as exc_info:
+            service.get_occupancy([1])
+        
+        assert "not enabled" in str(exc_info.value)
+
+
+class TestParkingServiceIdempotency:
+    """Test cases for idempotent entry creation."""
+
+    @pytest.fixture
+    def mock_dynamodb_resource(self):
+        """Mock DynamoDB resource for testing."""
+        with patch('src.storage.dynamodb.boto3.resource') as mock_resource:
+            yield mock_resource.return_value
+
+    @pytest.fixture
+    def parking_service(self, mock_dynamodb_resource):
+        """Create ParkingService instance with an idempotency table."""
+        env = {'PARKING_TABLE_NAME': 'test-table', 'IDEMPOTENCY_TABLE_NAME': 'idempotency-table'}
+        with patch.dict('os.environ', env):
+            return ParkingService()
+
+    def test_create_entry_writes_idempotency_record(self, parking_service, mock_dynamodb_resource):
+        """Test that ticket and idempotency record share a transaction."""
+        ticket_id = parking_service.create_entry("ABC123", 7, 'request-1')
+        
+        items = mock_dynamodb_resource.meta.client.transact_write_items.call_args.kwargs['TransactItems']
+        assert items[0]['Put']['Item']['ticket_id'] == {'S': ticket_id}
+        record = items[1]['Put']
+        assert record['TableName'] == 'idempotency-table'
+        assert record['Item']['idempotency_key'] == {'S': 'request-1'}
+        assert record['Item']['ticket_id'] == {'S': ticket_id}
+        assert record['ReturnValuesOnConditionCheckFailure'] == 'ALL_OLD'
+
+    def test_create_entry_replays_existing_ticket(self, mock_dynamodb_resource):
+        """Test that a repeated key returns the ticket stored by the first request."""
+        mock_dynamodb_resource.meta.client.transact_write_items.side_effect = ClientError(
+            error_response={
+                'Error': {'Code': 'TransactionCanceledException', 'Message': 'Transaction cancelled'},
+                'CancellationReasons': [
+                    {'Code': 'None'},
+                    {'Code': 'ConditionalCheckFailed', 'Item': {
+                        'idempotency_key': {'S': 'request-1'},
+                        'ticket_id': {'S': 'original-ticket-id'},
+                        'plate': {'S': 'ABC123'},
+                        'parking_lot': {'N': '7'},
+                        'expires_at': {'N': '4102444800'}
+                    }}
+                ]
+            },
+            operation_name='TransactWriteItems'
+        )
+        with patch.dict('os.environ', {'PARKING_TABLE_NAME': 'test-table'}):
+            parking_service = ParkingService()
+        
+        assert parking_service.create_entry("ABC123", 7, 'request-1') == 'original-ticket-id'
+        
+        with pytest.raises(ValueError, match="already used"):
+            ParkingService(parking_service.storage).create_entry("XYZ789", 7, 'request-1')
+
+    def test_create_entry_cached_key_skips_storage(self, parking_service, mock_dynamodb_resource):
+        """Test that a retry on a warm container is answered from the cache."""
+        client = mock_dynamodb_resource.meta.client
+        ticket_id = parking_service.create_entry("ABC123", 7, 'request-1')
+        
+        assert parking_service.create_entry("ABC123", 7, 'request-1') == ticket_id
+        assert client.transact_write_items.call_count == 1
+        
+        with pytest.raises(ValueError, match="already used"):
+            parking_service.create_entry("ABC123", 8, 'request-1')
+
+
+class TestParkingServiceTicketCache:
+    """Test cases for the container-level ticket cache."""
+
+    @pytest.fixture
+    def mock_dynamodb_table(self):
+        """Mock DynamoDB table for testing."""
+        with patch('src.storage.dynamodb.boto3.resource') as mock_resource:
+            mock_table = Mock()
+            mock_resource.return_value.Table.return_value = mock_table
+            yield mock_table
+
+    @pytest.fixture
+    def parking_service(self, mock_dynamodb_table):
+        """Create ParkingService instance with mocked dependencies."""
+        with patch.dict('os.environ', {'PARKING_TABLE_NAME': 'test-table'}):
+            return ParkingService()
+
+    def exit_ticket(self, parking_service, mock_dynamodb_table):
+        mock_dynamodb_table.update_item.return_value = {'Attributes': {
+            'ticket_id': 'test-ticket-id',
+            'plate': 'ABC123',
+            'parking_lot': 1,
+            'entry_time': 1704103200
+        }}
+        with patch('src.services.parking_service.datetime') as mock_datetime:
+            mock_datetime.utcnow.return_value = datetime(2024, 1, 1, 10, 30, 0)
+            return parking_service.process_exit('test-ticket-id')
+
+    def test_repeat_exit_answered_from_cache(self, parking_service, mock_dynamodb_table):
+        """Test that a second exit of the same ticket makes no storage call."""
+        self.exit_ticket(parking_service, mock_dynamodb_table)
+        
+        with pytest.raises(ValueError, match="already processed"):
+            parking_service.process_exit('test-ticket-id')
+        
+        assert mock_dynamodb_table.update_item.call_count == 1
+        assert parking_service.cache_stats()['ticketCache']['hits'] == 1
+
+    def test_exited_ticket_read_from_cache(self, parking_service, mock_dynamodb_table):
+        """Test that tickets exited by this container are served from memory."""
+        self.exit_ticket(parking_service, mock_dynamodb_table)
+        
+        ticket = parking_service.get_ticket('test-ticket-id')
+        
+        assert ticket.exit_time == datetime(2024, 1, 1, 10, 30, 0)
+        mock_dynamodb_table.get_item.assert_not_called()
+
+    def test_get_ticket_read_through(self, parking_service, mock_dynamodb_table):
+        """Test that repeat lookups hit the cache and misses are counted."""
+        mock_dynamodb_table.get_item.return_value = {'Item': {
+            'ticket_id': 'test-ticket-id',
+            'plate': 'ABC123',
+            'parking_lot': 1,
+            'entry_time': 1704103200
+        }}
+        
+        first = parking_service.get_ticket('test-ticket-id')
+        second = parking_service.get_ticket('test-ticket-id')
+        
+        assert first == second
+        assert mock_dynamodb_table.get_item.call_count == 1
+        stats = parking_service.cache_stats()['ticketCache']
+        assert (stats['hits'], stats['misses'], stats['size']) == (1, 1, 1)
+
+    def test_active_ticket_expires(self, parking_service, mock_dynamodb_table):
+        """Test that active tickets are re-read after the short TTL."""
+        mock_dynamodb_table.get_item.return_value = {'Item': {
+            'ticket_id': 'test-ticket-id',
+            'plate': 'ABC123',
+            'parking_lot': 1,
+            'entry_time': 1704103200
+        }}
+        clock = [0.0]
+        parking_service.ticket_cache.clock = lambda: clock[0]
+        
+        parking_service.get_ticket('test-ticket-id')
+        clock[0] = parking_service.ticket_cache.ttl_seconds
+        parking_service.get_ticket('test-ticket-id')
+        
+        assert mock_dynamodb_table.get_item.call_count == 2
+
+    def test_process_exits_skips_cached_exits(self, parking_service, mock_dynamodb_table):
+        """Test that bulk exits answer cached exited tickets without a read."""
+        self.exit_ticket(parking_service, mock_dynamodb_table)
+        
+        with patch.object(parking_service.storage.dynamodb, 'batch_get_item') as batch_get:
+            results = parking_service.process_exits(['test-ticket-id'])
+        
+        assert results[0]['status'] == 'already_processed'
+        batch_get.assert_not_called()
+
+
+class TestParkingServiceQuote:
+    """Test cases for read-only fee quotes."""
+
+    @pytest.fixture
+    def mock_dynamodb_table(self):
+        with patch('src.storage.dynamodb.boto3.resource') as mock_resource:
+            mock_table = Mock()
+            mock_resource.return_value.Table.return_value = mock_table
+            yield mock_table
+
+    @pytest.fixture
+    def parking_service(self, mock_dynamodb_table):
+        with patch.dict('os.environ', {'PARKING_TABLE_NAME': 'test-table'}):
+            return ParkingService()
+
+    def quote(self, parking_service, now):
+        with patch('src.services.parking_service.datetime') as mock_datetime:
+            mock_datetime.utcnow.return_value = now
+            return parking_service.quote_exit('test-ticket-id')
+
+    def test_quote_prices_without_writing(self, parking_service, mock_dynamodb_table):
+        """Test that a quote is one projected, eventually consistent read and no write."""
+        mock_dynamodb_table.get_item.return_value = {'Item': {
+            'ticket_id': 'test-ticket-id',
+            'plate': 'ABC123',
+            'parking_lot': 1,
+            'entry_time': 1704103200
+        }}
+        
+        quote = self.quote(parking_service, datetime(2024, 1, 1, 10, 50, 30, 999))
+        
+        assert quote == {
+            'ticketId': 'test-ticket-id',
+            'plate': 'ABC123',
+            'parkingLot': 1,
+            'entryTime': '2024-01-01T10:00:00Z',
+            'quotedAt': '2024-01-01T10:50:30Z',
+            'totalTimeMinutes': 50,
+            'amountDueUSD': 10.0
+        }
+        kwargs = mock_dynamodb_table.get_item.call_args.kwargs
+        assert 'ProjectionExpression' in kwargs
+        assert not kwargs.get('ConsistentRead')
+        mock_dynamodb_table.update_item.assert_not_called()
+        mock_dynamodb_table.put_item.assert_not_called()
+
+    def test_polling_reads_once_per_cache_ttl(self, parking_service, mock_dynamodb_table):
+        """Test that repeated quotes of an active ticket are served from the cache."""
+        mock_dynamodb_table.get_item.return_value = {'Item': {
+            'ticket_id': 'test-ticket-id',
+            'plate': 'ABC123',
+            'parking_lot': 1,
+            'entry_time': 1704103200
+        }}
+        
+        first = self.quote(parking_service, datetime(2024, 1, 1, 10, 10, 0))
+        second = self.quote(parking_service, datetime(2024, 1, 1, 10, 20, 0))
+        
+        assert (first['amountDueUSD'], second['amountDueUSD']) == (2.5, 5.0)
+        assert mock_dynamodb_table.get_item.call_count == 1
+
+    def test_quote_exited_or_missing_ticket(self, parking_service, mock_dynamodb_table):
+        """Test that only active tickets can be quoted."""
+        mock_dynamodb_table.get_item.return_value = {}
+        with pytest.raises(ValueError, match="not found"):
+            self.quote(parking_service, datetime(2024, 1, 1, 11, 0, 0))
+        
+        mock_dynamodb_table.get_item.return_value = {'Item': {
+            'ticket_id': 'test-ticket-id',
+            'plate': 'ABC123',
+            'parking_lot': 1,
+            'entry_time': 1704103200,
+            'exit_time': 1704106800
+        }}
+        with pytest.raises(ValueError, match="already processed"):
+            self.quote(parking_service, datetime(2024, 1, 1, 11, 0, 0))
+
+    def test_quote_storage_error(self, parking_service, mock_dynamodb_table):
+        """Test that a failed read is an error, not a missing ticket."""
+        mock_dynamodb_table.get_item.side_effect = ClientError(
+            error_response={'Error': {'Code': 'ProvisionedThroughputExceededException', 'Message': 'Rate exceeded'}},
+            operation_name='GetItem'
+        )
+        
+        with pytest.raises(Exception, match="Failed to get ticket"):
+            self.quote(parking_service, datetime(2024, 1, 1, 11, 0, 0))
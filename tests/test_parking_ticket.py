@@ -0,0 +1,101 @@
+import pytest
+from datetime import datetime
+from decimal import Decimal
+
+from src.models.parking_ticket import ParkingTicket, to_epoch, from_storage_time
+
+
+class TestParkingTicket:
+    """Test cases for ParkingTicket model and storage format."""
+
+    def test_slotted_model(self):
+        """Test that tickets carry no per-instance __dict__."""
+        ticket = ParkingTicket.create_new("ABC123", 1)
+        
+        assert not hasattr(ticket, '__dict__')
+        with pytest.raises(AttributeError):
+            ticket.unknown_attribute = 'value'
+
+    def test_to_dict_active_ticket(self):
+        """Test compact format of an active ticket omits exit_time."""
+        ticket = ParkingTicket('test-ticket-id', 'ABC123', 1, datetime(2024, 1, 1, 10, 0, 0))
+        
+        assert ticket.to_dict() == {
+            'ticket_id': 'test-ticket-id',
+            'plate': 'ABC123',
+            'parking_lot': 1,
+            'entry_time': 1704103200,
+            'active_plate': 'ABC123'
+        }
+
+    def test_to_dict_exited_ticket(self):
+        """Test compact format of an exited ticket stores epoch exit time and no index key."""
+        ticket = ParkingTicket('test-ticket-id', 'ABC123', 1, datetime(2024, 1, 1, 10, 0, 0), datetime(2024, 1, 1, 11, 0, 0))
+        
+        data = ticket.to_dict()
+        
+        assert data['exit_time'] == 1704106800
+        assert 'active_plate' not in data
+
+    def test_from_dict_compact_format(self):
+        """Test reading epoch timestamps as returned by DynamoDB (Decimal)."""
+        ticket = ParkingTicket.from_dict({
+            'ticket_id': 'test-ticket-id',
+            'plate': 'ABC123',
+            'parking_lot': Decimal('2'),
+            'entry_time': Decimal('1704103200'),
+            'exit_time': Decimal('1704106800')
+        })
+        
+        assert ticket.parking_lot == 2
+        assert ticket.entry_time == datetime(2024, 1, 1, 10, 0, 0)
+        assert ticket.exit_time == datetime(2024, 1, 1, 11, 0, 0)
+        assert ticket.get_duration_minutes() == 60
+
+    @pytest.mark.parametrize("exit_time", [None, '2024-01-01T11:30:00'])
+    def test_from_dict_legacy_iso_format(self, exit_time):
+        """Test reading items written with ISO-8601 strings and explicit nulls."""
+        ticket = ParkingTicket.from_dict({
+            'ticket_id': 'test-ticket-id',
+            'plate': 'ABC123',
+            'parking_lot': 1,
+            'entry_time': '2024-01-01T10:00:00.123456',
+            'exit_time': exit_time
+        })
+        
+        assert ticket.entry_time == datetime(2024, 1, 1, 10, 0, 0, 123456)
+        assert ticket.exit_time == (datetime(2024, 1, 1, 11, 30, 0) if exit_time else None)
+
+    def test_round_trip(self):
+        """Test that a ticket survives the storage format at one second resolution."""
+        ticket = ParkingTicket.create_new(" ABC123 ", 5)
+        ticket.mark_exit()
+        
+        restored = ParkingTicket.from_dict(ticket.to_dict())
+        
+        assert restored.plate == 'ABC123'
+        assert restored.entry_time == ticket.entry_time.replace(microsecond=0)
+        assert restored.exit_time == ticket.exit_time.replace(microsecond=0)
+
+    def test_charge_round_trip(self):
+        """Test that a stored charge and duration survive the storage format."""
+        ticket = ParkingTicket('test-ticket-id', 'ABC123', 1, datetime(2024, 1, 1, 10, 0, 0), datetime(2024, 1, 1, 11, 0, 0), 1000, 60)
+        
+        restored = ParkingTicket.from_dict(ticket.to_dict())
+        
+        assert (restored.charge_cents, restored.duration_minutes) == (1000, 60)
+        assert 'charge_cents' not in ParkingTicket('id', 'ABC123', 1, datetime(2024, 1, 1)).to_dict()
+
+    def test_duration_requires_exit_time(self):
+        """Test duration of an active ticket is an error."""
+        ticket = ParkingTicket.create_new("ABC123", 1)
+        
+        with pytest.raises(ValueError):
+            ticket.get_duration_minutes()
+
+    def test_epoch_helpers(self):
+        """Test epoch conversion helpers."""
+        value = datetime(2024, 6, 30, 23, 59, 59)
+        
+        assert from_storage_time(to_epoch(value)) == value
+        assert from_storage_time(value.isoformat()) == value
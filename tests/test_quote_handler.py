@@ -0,0 +1,57 @@
+import json
+import pytest
+from unittest.mock import patch, Mock
+
+from src.handlers.quote import lambda_handler
+
+TICKET_ID = 'a1b2c3d4-e5f6-7890-abcd-ef1234567890'
+
+
+class TestQuoteHandler:
+    """Test cases for quote Lambda handler."""
+
+    def test_successful_quote(self):
+        """Test that the quote is returned as is."""
+        quote = {
+            'ticketId': TICKET_ID,
+            'plate': 'ABC123',
+            'parkingLot': 1,
+            'entryTime': '2024-01-01T10:00:00Z',
+            'quotedAt': '2024-01-01T10:45:00Z',
+            'totalTimeMinutes': 45,
+            'amountDueUSD': 7.5
+        }
+        
+        with patch('src.handlers.quote.get_parking_service') as mock_get_service:
+            mock_service = Mock()
+            mock_service.quote_exit.return_value = quote
+            mock_get_service.return_value = mock_service
+            
+            response = lambda_handler({'queryStringParameters': {'ticketId': f' {TICKET_ID} '}}, {})
+        
+        assert response['statusCode'] == 200
+        assert json.loads(response['body']) == quote
+        mock_service.quote_exit.assert_called_once_with(TICKET_ID)
+        mock_service.process_exit.assert_not_called()
+
+    def test_invalid_ticket_id(self):
+        """Test that malformed IDs are rejected before any read."""
+        with patch('src.handlers.quote.get_parking_service') as mock_get_service:
+            response = lambda_handler({'queryStringParameters': {'ticketId': 'not-a-ticket'}}, {})
+        
+        assert response['statusCode'] == 400
+        assert 'Invalid ticket ID format' in json.loads(response['body'])['error']
+        mock_get_service.assert_not_called()
+
+    @pytest.mark.parametrize('error, status', [
+        (ValueError(f"Ticket {TICKET_ID} not found"), 404),
+        (ValueError(f"Ticket {TICKET_ID} already processed"), 400),
+        (Exception("Failed to get ticket: Rate exceeded"), 500),
+    ])
+    def test_errors(self, error, status):
+        """Test error status codes."""
+        with patch('src.handlers.quote.get_parking_service') as mock_get_service:
+            mock_get_service.return_value.quote_exit.side_effect = error
+            response = lambda_handler({'queryStringParameters': {'ticketId': TICKET_ID}}, {})
+        
+        assert response['statusCode'] == status
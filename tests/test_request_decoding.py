@@ -0,0 +1,85 @@
+import pytest
+
+from src.utils.request_decoding import (
+    compile_decoder, plate, parking_lot, ticket_id,
+    ENTRY_REQUEST, EXIT_REQUEST, LOST_TICKET_EXIT_REQUEST, OCCUPANCY_REQUEST
+)
+from src.utils.validation import validate_license_plate, validate_parking_lot, validate_ticket_id
+
+
+class TestRequestDecoding:
+    """Test cases for compiled request decoders."""
+
+    def test_entry_request_valid(self):
+        """Test that plate is normalized and parking lot converted."""
+        values, error = ENTRY_REQUEST({'plate': ' abc-123 ', 'parkingLot': '42'})
+        
+        assert error is None
+        assert values == {'plate': 'ABC-123', 'parking_lot': 42}
+
+    def test_missing_params(self):
+        """Test that missing queryStringParameters report the first field."""
+        values, error = ENTRY_REQUEST(None)
+        
+        assert values is None
+        assert error == "License plate is required and must be a string"
+
+    @pytest.mark.parametrize('value', ['', '   ', 'A', 'A' * 16, 'ABC@123', 'ab c-1', 'XYZ789'])
+    def test_plate_matches_validation(self, value):
+        """Test that plate errors match validate_license_plate."""
+        values, error = ENTRY_REQUEST({'plate': value, 'parkingLot': '1'})
+        
+        expected_valid, expected_error = validate_license_plate(value.strip().upper())
+        assert error == expected_error
+        assert (values is not None) == expected_valid
+
+    @pytest.mark.parametrize('value', ['', None, 'abc', '1.5', '0', '10000', '1', ' 9999 '])
+    def test_parking_lot_matches_validation(self, value):
+        """Test that parking lot errors match validate_parking_lot."""
+        values, error = ENTRY_REQUEST({'plate': 'ABC123', 'parkingLot': value})
+        
+        expected_valid, expected_error = validate_parking_lot(value)
+        assert error == expected_error
+        if expected_valid:
+            assert values['parking_lot'] == int(value)
+
+    @pytest.mark.parametrize('value', ['', 'invalid-id', '12345678-1234-1234-1234-123456789ABC', ' 12345678-1234-1234-1234-123456789abc '])
+    def test_ticket_id_matches_validation(self, value):
+        """Test that ticket ID errors match validate_ticket_id."""
+        values, error = EXIT_REQUEST({'ticketId': value})
+        
+        expected_valid, expected_error = validate_ticket_id(value.strip())
+        assert error == expected_error
+        if expected_valid:
+            assert values['ticket_id'] == value.strip()
+
+    def test_optional_field(self):
+        """Test that an empty optional field decodes to None."""
+        values, error = LOST_TICKET_EXIT_REQUEST({'plate': 'ABC123', 'parkingLot': ''})
+        
+        assert error is None
+        assert values == {'plate': 'ABC123', 'parking_lot': None}
+
+    def test_optional_field_still_validated(self):
+        """Test that a present optional field is validated."""
+        values, error = LOST_TICKET_EXIT_REQUEST({'plate': 'ABC123', 'parkingLot': 'abc'})
+        
+        assert values is None
+        assert error == "Parking lot must be a valid integer"
+
+    def test_parking_lots(self):
+        """Test that lot lists are parsed and de-duplicated in order."""
+        values, error = OCCUPANCY_REQUEST({'parkingLots': '3, 1,3'})
+        
+        assert error is None
+        assert values == {'parking_lots': [3, 1]}
+        assert OCCUPANCY_REQUEST({'parkingLots': '1,,2'}) == (None, "Parking lot is required")
+
+    def test_custom_names(self):
+        """Test that fields read from and write to custom names."""
+        decode = compile_decoder(ticket_id('id', 'ticket'), plate(required=False), parking_lot('lot', 'lot'))
+        
+        values, error = decode({'id': '12345678-1234-1234-1234-123456789abc', 'lot': 7})
+        
+        assert error is None
+        assert values == {'ticket': '12345678-1234-1234-1234-123456789abc', 'plate': None, 'lot': 7}
@@ -0,0 +1,128 @@
+import json
+import os
+import subprocess
+import sys
+import pytest
+from unittest.mock import patch
+from datetime import datetime
+from decimal import Decimal
+
+from src.utils import response
+from src.utils.response import (
+    create_response, success_response, error_response, not_found_response,
+    internal_error_response, set_json_encoder, stdlib_dumps, orjson_dumps, DEFAULT_HEADERS
+)
+
+BODIES = [
+    {'ticketId': 'a1b2c3d4-e5f6-7890-abcd-ef1234567890'},
+    {'plate': 'ABC-123', 'totalTimeMinutes': 90, 'parkingLot': 5, 'chargeUSD': 15.0},
+    {'results': [{'ticketId': None, 'status': 'invalid', 'error': 'Invalid ticket ID format'}]},
+    {'entryTime': datetime(2024, 1, 1, 10, 30), 'amount': Decimal('2.50'), 'note': 'Målilla'},
+    {1: 'int key', 'nested': {'list': (1, 2.5, True, None)}}
+]
+
+
+@pytest.fixture
+def stdlib_encoder():
+    """Use the standard library encoder for the duration of a test."""
+    set_json_encoder(stdlib_dumps)
+    yield
+    set_json_encoder(None)
+
+
+class TestResponse:
+    """Test cases for response construction."""
+
+    @pytest.mark.parametrize('body', BODIES)
+    def test_stdlib_byte_identical(self, body, stdlib_encoder):
+        """Test that the stdlib path matches json.dumps(body, default=str) exactly."""
+        assert success_response(body)['body'] == json.dumps(body, default=str)
+
+    @pytest.mark.parametrize('body', BODIES + [{'plate': 'קוד', 'n': 1e20}])
+    def test_default_encoder_byte_identical(self, body):
+        """Test that the encoder used without configuration matches json.dumps(body, default=str)."""
+        with patch.dict('os.environ', {}, clear=True):
+            set_json_encoder(None)
+        try:
+            assert success_response(body)['body'] == json.dumps(body, default=str)
+        finally:
+            set_json_encoder(None)
+
+    def test_orjson_not_imported_by_default(self):
+        """Test that importing the module doesn't import orjson."""
+        code = "import sys; import src.utils.response; print('orjson' in sys.modules)"
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        result = subprocess.run([sys.executable, '-c', code], cwd=root, capture_output=True, text=True, check=True)
+        
+        assert result.stdout.strip() == 'False'
+
+    def test_orjson_opt_in(self):
+        """Test that orjson is only used when selected."""
+        if response._load_orjson() is None:
+            pytest.skip("orjson is not installed")
+        
+        with patch.dict('os.environ', {'RESPONSE_JSON_ENCODER': 'orjson'}):
+            set_json_encoder(None)
+        try:
+            assert success_response({'plate': 'קוד'})['body'] == '{"plate":"קוד"}'
+        finally:
+            set_json_encoder(None)
+
+    @pytest.mark.parametrize('body', BODIES)
+    def test_orjson_equivalent(self, body):
+        """Test that orjson output decodes to the same document."""
+        if response._load_orjson() is None:
+            pytest.skip("orjson is not installed")
+        
+        assert json.loads(orjson_dumps(body)) == json.loads(stdlib_dumps(body))
+
+    def test_orjson_falls_back_for_big_integers(self):
+        """Test that bodies orjson rejects are still encoded."""
+        if response._load_orjson() is None:
+            pytest.skip("orjson is not installed")
+        
+        assert orjson_dumps({'value': 2 ** 70}) == json.dumps({'value': 2 ** 70})
+
+    def test_headers_are_copies(self):
+        """Test that responses get their own headers dict."""
+        first = success_response({})
+        first['headers']['X-Test'] = '1'
+        
+        second = create_response(200, {}, {'Cache-Control': 'no-store'})
+        
+        assert 'X-Test' not in success_response({})['headers']
+        assert 'X-Test' not in DEFAULT_HEADERS
+        assert second['headers']['Cache-Control'] == 'no-store'
+        assert second['headers']['Content-Type'] == 'application/json'
+
+    def test_error_response(self, stdlib_encoder):
+        """Test that error bodies are unchanged."""
+        result = not_found_response("Ticket not found")
+        
+        assert result['statusCode'] == 404
+        assert result['body'] == json.dumps({'error': 'Ticket not found', 'statusCode': 404, 'errorCode': 'NOT_FOUND'})
+        assert json.loads(error_response("Failed")['body']) == {'error': 'Failed', 'statusCode': 500}
+
+    def test_only_fixed_error_bodies_cached(self, stdlib_encoder):
+        """Test that internal errors are encoded once and per-ticket messages are not cached."""
+        internal_error_response("Failed to process parking exit")
+        internal_error_response("Failed to process parking exit")
+        not_found_response("Ticket a1b2 not found")
+        
+        info = response._fixed_error_body.cache_info()
+        assert (info.hits, info.misses, info.currsize) == (1, 1, 1)
+        assert json.loads(internal_error_response("Failed")['body']) == {
+            'error': 'Failed', 'statusCode': 500, 'errorCode': 'INTERNAL_ERROR'
+        }
+
+    def test_set_json_encoder(self):
+        """Test that a custom encoder is used for success and error bodies."""
+        set_json_encoder(lambda body: 'custom')
+        try:
+            assert success_response({'a': 1})['body'] == 'custom'
+            assert error_response("Failed")['body'] == 'custom'
+            assert internal_error_response()['body'] == 'custom'
+        finally:
+            set_json_encoder(None)
+        
+        assert error_response("Failed")['body'] != 'custom'
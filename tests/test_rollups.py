@@ -0,0 +1,292 @@
+import json
+import pytest
+from datetime import datetime
+from botocore.exceptions import ClientError
+from unittest.mock import patch, Mock
+
+from src.handlers.rollup_stream import lambda_handler as stream_handler
+from src.handlers.rollups import lambda_handler as rollups_handler
+from src.models.parking_ticket import ParkingTicket
+from src.services.parking_service import ParkingService
+from src.services.rollups import RollupKey, RollupTotals, aggregate_exits, exited_ticket
+from src.storage.dynamodb import serialize
+from src.storage.memory import InMemoryStorage
+
+
+def exited(ticket_id, lot, exit_time, charge_cents=500, duration_minutes=30):
+    return ParkingTicket(ticket_id, 'ABC123', lot, datetime(2024, 1, 1, 9, 0, 0), exit_time, charge_cents, duration_minutes)
+
+
+def stream_record(event_id, old_item, new_item):
+    images = {}
+    if old_item is not None:
+        images['OldImage'] = serialize(old_item)
+    if new_item is not None:
+        images['NewImage'] = serialize(new_item)
+    return {'eventID': event_id, 'eventName': 'MODIFY', 'dynamodb': images}
+
+
+class TestRollupAggregation:
+    """Test cases for summing exits into buckets."""
+
+    def test_hourly_and_daily_buckets(self):
+        """Test that each exit counts once per hour and day bucket of its lot."""
+        deltas = aggregate_exits([
+            exited('t1', 1, datetime(2024, 1, 1, 10, 5, 0), 500, 30),
+            exited('t2', 1, datetime(2024, 1, 1, 10, 55, 0), 250, 15),
+            exited('t3', 1, datetime(2024, 1, 1, 11, 0, 0), 1000, 60),
+            exited('t4', 2, datetime(2024, 1, 1, 10, 0, 0), 100, 5)
+        ])
+        
+        assert deltas[RollupKey(1, 'hour', datetime(2024, 1, 1, 10))] == RollupTotals(2, 750, 45)
+        assert deltas[RollupKey(1, 'hour', datetime(2024, 1, 1, 11))] == RollupTotals(1, 1000, 60)
+        assert deltas[RollupKey(1, 'day', datetime(2024, 1, 1))] == RollupTotals(3, 1750, 105)
+        assert deltas[RollupKey(2, 'day', datetime(2024, 1, 1))] == RollupTotals(1, 100, 5)
+        assert len(deltas) == 5
+
+    def test_only_exits_are_counted(self):
+        """Test that only the change setting exit_time is an exit."""
+        active = ParkingTicket('t1', 'ABC123', 1, datetime(2024, 1, 1, 9, 0, 0)).to_dict()
+        done = exited('t1', 1, datetime(2024, 1, 1, 10, 0, 0)).to_dict()
+        
+        assert exited_ticket(active, done).charge_cents == 500
+        assert exited_ticket({**active, 'exit_time': None}, done) is not None
+        assert exited_ticket(None, active) is None
+        # Archiving rewrites an exited ticket; TTL deletes it
+        assert exited_ticket(done, {**done, 'expires_at': 1}) is None
+        assert exited_ticket(done, None) is None
+
+
+class TestParkingServiceRollups:
+    """Test cases for storing exit charges and maintaining rollups."""
+
+    @pytest.fixture
+    def service(self):
+        return ParkingService(InMemoryStorage())
+
+    def test_signed_exit_stores_charge(self, service):
+        """Test that a signed exit stores its charge and duration with the exit time."""
+        with patch.dict('os.environ', {'TICKET_ID_SECRET': 'test-secret'}):
+            with patch('models.parking_ticket.datetime') as mock_datetime:
+                mock_datetime.utcnow.return_value = datetime(2024, 1, 1, 10, 0, 0)
+                ticket_id = service.create_entry('ABC123', 1)
+            with patch('src.services.parking_service.datetime') as mock_datetime:
+                mock_datetime.utcnow.return_value = datetime(2024, 1, 1, 11, 0, 0)
+                result = service.process_exit(ticket_id)
+        
+        item = service.storage.get_ticket(ticket_id)
+        assert item['charge_cents'] == round(result['chargeUSD'] * 100) == 1000
+        assert item['duration_minutes'] == result['totalTimeMinutes'] == 60
+
+    def test_legacy_exit_stores_charge_when_read_first(self, service):
+        """Test that an engine reading the ticket before the exit stores a legacy ID's charge."""
+        with patch('models.parking_ticket.datetime') as mock_datetime:
+            mock_datetime.utcnow.return_value = datetime(2024, 1, 1, 10, 0, 0)
+            ticket_id = service.create_entry('ABC123', 1)
+        with patch('src.services.parking_service.datetime') as mock_datetime:
+            mock_datetime.utcnow.return_value = datetime(2024, 1, 1, 10, 30, 0)
+            result = service.process_exit(ticket_id)
+        
+        item = service.storage.get_ticket(ticket_id)
+        assert (item['charge_cents'], item['duration_minutes']) == (500, 30)
+        assert result['chargeUSD'] == 5.0
+
+    def test_legacy_exit_priced_for_rollup(self, service):
+        """Test that exits stored without a charge are priced when rolled up."""
+        ticket = exited('t1', 3, datetime(2024, 1, 1, 10, 30, 0), None, None)
+        
+        assert service.record_rollups([ticket]) == 2
+        
+        buckets = service.get_rollups(3, 'hour', datetime(2024, 1, 1, 10, 0, 0), datetime(2024, 1, 1, 10, 0, 0))
+        assert buckets == [{
+            'start': '2024-01-01T10:00:00Z', 'exits': 1, 'revenueUSD': 15.0, 'totalMinutes': 90, 'averageMinutes': 90.0
+        }]
+
+    def test_repeated_batch_not_counted_twice(self, service):
+        """Test that a retried batch adds nothing, even when it is split differently."""
+        tickets = [exited('t1', 1, datetime(2024, 1, 1, 10, 0, 0)), exited('t2', 1, datetime(2024, 1, 2, 10, 0, 0))]
+        
+        service.record_rollups(tickets)
+        assert service.record_rollups(tickets) == 0
+        assert service.record_rollups(tickets[1:] + [exited('t3', 1, datetime(2024, 1, 2, 11, 0, 0))]) == 2
+        
+        buckets = service.get_rollups(1, 'day', datetime(2024, 1, 1), datetime(2024, 1, 31))
+        assert [(bucket['start'], bucket['exits']) for bucket in buckets] == [
+            ('2024-01-01T00:00:00Z', 1), ('2024-01-02T00:00:00Z', 2)
+        ]
+
+    def test_large_batches_chunked(self, service):
+        """Test that each write holds at most 100 buckets and exit markers."""
+        tickets = [exited(f't{lot}', lot, datetime(2024, 1, 1, 10, 0, 0)) for lot in range(1, 101)]
+        
+        with patch.object(service.storage, 'add_rollups', wraps=service.storage.add_rollups) as add_rollups:
+            assert service.record_rollups(tickets) == 200
+        
+        sizes = [len(call.args[0]) + len(call.args[1]) for call in add_rollups.call_args_list]
+        assert max(sizes) <= 100
+        assert sum(len(call.args[1]) for call in add_rollups.call_args_list) == 100
+
+    def test_unknown_period(self, service):
+        """Test that only hour and day rollups exist."""
+        with pytest.raises(ValueError, match="Unknown rollup period"):
+            service.get_rollups(1, 'week', datetime(2024, 1, 1), datetime(2024, 1, 31))
+
+
+class TestDynamoDBRollups:
+    """Test cases for the DynamoDB rollup writes and queries."""
+
+    @pytest.fixture
+    def storage(self):
+        with patch('src.storage.dynamodb.boto3.resource'):
+            from src.storage.dynamodb import DynamoDBStorage
+            yield DynamoDBStorage()
+
+    def test_buckets_added_with_exit_markers(self, storage):
+        """Test that bucket ADDs and conditional exit markers share one transaction."""
+        deltas = {RollupKey(1, 'hour', datetime(2024, 1, 1, 10)): RollupTotals(2, 500, 30)}
+        
+        assert storage.add_rollups(deltas, ['t1', 't2']) == set()
+        
+        items = storage.client.transact_write_items.call_args.kwargs['TransactItems']
+        assert [item['Put']['Item']['series'] for item in items[:2]] == [{'S': 'exit#t1'}, {'S': 'exit#t2'}]
+        assert items[0]['Put']['ConditionExpression'] == 'attribute_not_exists(series)'
+        assert 'expires_at' in items[0]['Put']['Item']
+        update = items[2]['Update']
+        assert update['Key'] == {'series': {'S': '1#hour'}, 'bucket_start': {'S': '2024-01-01T10:00:00Z'}}
+        assert 'ADD exits :exits, revenue_cents :revenue_cents' in update['UpdateExpression']
+        assert update['ExpressionAttributeValues'][':revenue_cents'] == {'N': '500'}
+
+    def test_counted_exits_reported(self, storage):
+        """Test that exits counted by an earlier attempt are reported instead of raising."""
+        storage.client.transact_write_items.side_effect = ClientError(
+            error_response={
+                'Error': {'Code': 'TransactionCanceledException', 'Message': 'Transaction cancelled'},
+                'CancellationReasons': [{'Code': 'None'}, {'Code': 'ConditionalCheckFailed'}, {'Code': 'None'}]
+            },
+            operation_name='TransactWriteItems'
+        )
+        deltas = {RollupKey(1, 'hour', datetime(2024, 1, 1, 10)): RollupTotals(2, 500, 30)}
+        
+        assert storage.add_rollups(deltas, ['t1', 't2']) == {'t2'}
+
+    def test_other_failures_raised(self, storage):
+        """Test that cancellations without counted exits fail the write."""
+        storage.client.transact_write_items.side_effect = ClientError(
+            error_response={
+                'Error': {'Code': 'TransactionCanceledException', 'Message': 'Transaction cancelled'},
+                'CancellationReasons': [{'Code': 'None'}, {'Code': 'TransactionConflict'}]
+            },
+            operation_name='TransactWriteItems'
+        )
+        
+        with pytest.raises(Exception, match="Failed to update rollups"):
+            storage.add_rollups({RollupKey(1, 'hour', datetime(2024, 1, 1, 10)): RollupTotals(1, 500, 30)}, ['t1'])
+
+    def test_query_by_bucket_range(self, storage):
+        """Test that rollups are read with one key range query."""
+        storage.rollup_table.query.return_value = {'Items': [{'bucket_start': '2024-01-01T10:00:00Z', 'exits': 2}]}
+        
+        items = storage.get_rollups(1, 'hour', datetime(2024, 1, 1, 10), datetime(2024, 1, 1, 12))
+        
+        assert items == [{'bucket_start': '2024-01-01T10:00:00Z', 'exits': 2}]
+        storage.rollup_table.query.assert_called_once()
+
+    def test_legacy_exit_priced_from_occupancy_read(self):
+        """Test that the read before the occupancy transaction prices a legacy exit."""
+        with patch.dict('os.environ', {'OCCUPANCY_TABLE_NAME': 'occupancy-table'}):
+            with patch('src.storage.dynamodb.boto3.resource'):
+                service = ParkingService()
+        service.storage.table.get_item.return_value = {'Item': {
+            'ticket_id': 't1', 'plate': 'ABC123', 'parking_lot': 7, 'entry_time': '2024-01-01T10:00:00'
+        }}
+        
+        with patch('src.services.parking_service.datetime') as mock_datetime:
+            mock_datetime.utcnow.return_value = datetime(2024, 1, 1, 11, 0, 0)
+            result = service.process_exit('t1')
+        
+        update = service.storage.client.transact_write_items.call_args.kwargs['TransactItems'][0]['Update']
+        assert 'charge_cents = :charge_cents' in update['UpdateExpression']
+        assert update['ExpressionAttributeValues'][':charge_cents'] == {'N': '1000'}
+        assert update['ExpressionAttributeValues'][':duration_minutes'] == {'N': '60'}
+        assert result['chargeUSD'] == 10.0
+
+    def test_signed_exit_update_stores_charge(self, storage):
+        """Test that a priced exit sets charge and duration in the exit update."""
+        from src.storage.base import ExitCharge
+        storage.table.update_item.return_value = {'Attributes': {'ticket_id': 't1'}}
+        
+        storage.exit_ticket('t1', datetime(2024, 1, 1, 11, 0, 0), 1, ExitCharge(1000, 60))
+        
+        kwargs = storage.table.update_item.call_args.kwargs
+        assert 'charge_cents = :charge_cents' in kwargs['UpdateExpression']
+        assert kwargs['ExpressionAttributeValues'][':charge_cents'] == 1000
+        assert kwargs['ExpressionAttributeValues'][':duration_minutes'] == 60
+
+
+class TestRollupStreamHandler:
+    """Test cases for the DynamoDB Streams consumer."""
+
+    def test_exits_rolled_up(self):
+        """Test that a batch's exits reach the rollups and other changes are skipped."""
+        service = ParkingService(InMemoryStorage())
+        active = ParkingTicket('t1', 'ABC123', 1, datetime(2024, 1, 1, 9, 0, 0)).to_dict()
+        done = exited('t1', 1, datetime(2024, 1, 1, 10, 15, 0)).to_dict()
+        event = {'Records': [
+            stream_record('1', active, done),
+            stream_record('2', None, active),
+            stream_record('3', done, {**done, 'expires_at': 1})
+        ]}
+        
+        with patch('src.handlers.rollup_stream.get_parking_service', return_value=service):
+            result = stream_handler(event, {})
+            stream_handler(event, {})
+        
+        assert result == {'records': 3, 'exits': 1, 'buckets': 2}
+        buckets = service.get_rollups(1, 'hour', datetime(2024, 1, 1, 10), datetime(2024, 1, 1, 10))
+        assert [bucket['exits'] for bucket in buckets] == [1]
+
+    def test_storage_error_fails_batch(self):
+        """Test that a failed write is raised so Lambda retries the batch."""
+        service = Mock()
+        service.record_rollups.side_effect = Exception("Failed to update rollups")
+        active = ParkingTicket('t1', 'ABC123', 1, datetime(2024, 1, 1, 9, 0, 0)).to_dict()
+        done = exited('t1', 1, datetime(2024, 1, 1, 10, 15, 0)).to_dict()
+        
+        with patch('src.handlers.rollup_stream.get_parking_service', return_value=service):
+            with pytest.raises(Exception, match="Failed to update rollups"):
+                stream_handler({'Records': [stream_record('1', active, done)]}, {})
+
+
+class TestRollupsHandler:
+    """Test cases for the rollup query endpoint."""
+
+    def test_hourly_range(self):
+        """Test that the requested range is aligned to buckets."""
+        event = {'queryStringParameters': {
+            'parkingLot': '4', 'period': 'hour', 'from': '2024-01-01T10:30:00Z', 'to': '2024-01-01T12:10:00+00:00'
+        }}
+        
+        with patch('src.handlers.rollups.get_parking_service') as mock_get_service:
+            mock_get_service.return_value.get_rollups.return_value = []
+            response = rollups_handler(event, {})
+        
+        assert response['statusCode'] == 200
+        body = json.loads(response['body'])
+        assert (body['from'], body['to'], body['buckets']) == ('2024-01-01T10:00:00Z', '2024-01-01T12:00:00Z', [])
+        mock_get_service.return_value.get_rollups.assert_called_once_with(
+            4, 'hour', datetime(2024, 1, 1, 10), datetime(2024, 1, 1, 12)
+        )
+
+    @pytest.mark.parametrize('params, error', [
+        ({'period': 'hour'}, 'Parking lot is required'),
+        ({'parkingLot': '1', 'period': 'week'}, 'Period must be one of'),
+        ({'parkingLot': '1', 'from': 'yesterday'}, 'Invalid timestamp'),
+        ({'parkingLot': '1', 'from': '2024-01-02', 'to': '2024-01-01'}, "'from' must not be after 'to'"),
+        ({'parkingLot': '1', 'from': '2020-01-01', 'to': '2024-01-01'}, 'At most 1000 buckets'),
+    ])
+    def test_invalid_requests(self, params, error):
+        """Test that invalid lots, periods and ranges are rejected."""
+        response = rollups_handler({'queryStringParameters': params}, {})
+        
+        assert response['statusCode'] == 400
+        assert error in json.loads(response['body'])['error']
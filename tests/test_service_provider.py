@@ -0,0 +1,55 @@
+import pytest
+from unittest.mock import patch, Mock
+
+from src.services import provider
+
+
+class TestServiceProvider:
+    """Test cases for the container-scoped ParkingService provider."""
+
+    @pytest.fixture(autouse=True)
+    def reset_provider(self):
+        """Make sure every test starts without a cached service."""
+        provider.reset_parking_service()
+        yield
+        provider.reset_parking_service()
+
+    def test_lazy_initialization(self):
+        """Test that the service is only built on first use."""
+        with patch('src.services.provider.ParkingService') as mock_service_class:
+            mock_service_class.assert_not_called()
+            service = provider.get_parking_service()
+
+        mock_service_class.assert_called_once_with()
+        assert service is mock_service_class.return_value
+
+    def test_service_reused_across_calls(self):
+        """Test that warm calls return the same instance."""
+        with patch('src.services.provider.ParkingService') as mock_service_class:
+            first = provider.get_parking_service()
+            second = provider.get_parking_service()
+
+        assert first is second
+        mock_service_class.assert_called_once()
+
+    def test_reset_builds_new_instance(self):
+        """Test that reset forces a new instance on next use."""
+        with patch('src.services.provider.ParkingService') as mock_service_class:
+            mock_service_class.side_effect = [Mock(), Mock()]
+            first = provider.get_parking_service()
+            provider.reset_parking_service()
+            second = provider.get_parking_service()
+
+        assert first is not second
+        assert mock_service_class.call_count == 2
+
+    def test_injected_service_is_returned(self):
+        """Test that an injected service is used without building one."""
+        injected = Mock()
+
+        with patch('src.services.provider.ParkingService') as mock_service_class:
+            provider.set_parking_service(injected)
+            service = provider.get_parking_service()
+
+        assert service is injected
+        mock_service_class.assert_not_called()
@@ -0,0 +1,156 @@
+import json
+import pytest
+from datetime import datetime, timedelta
+
+from src.services.tariff import TariffFeeCalculator, TimeBand, CompiledTariff, parse_time_of_day
+
+
+DAY_NIGHT_BANDS = [TimeBand(7 * 60, 12.0), TimeBand(19 * 60, 4.0)]
+
+
+def reference_fee(calculator, bands, entry_time, exit_time):
+    """Minute-by-minute pricing used to check the compiled tables."""
+    duration = int((exit_time - entry_time).total_seconds() / 60)
+    if duration <= 0:
+        return 0.0
+    increment = calculator.billing_increment_minutes
+    billable = -(-duration // increment) * increment
+    
+    starts = sorted(bands, key=lambda band: band.start_minute)
+    start = entry_time.hour * 60 + entry_time.minute
+    windows = {}
+    for minute in range(billable):
+        if calculator.first_period_rate is not None and minute < calculator.first_period_minutes:
+            rate = calculator.first_period_rate
+        else:
+            time_of_day = (start + minute) % 1440
+            rate = starts[-1].hourly_rate
+            for band in starts:
+                if band.start_minute <= time_of_day:
+                    rate = band.hourly_rate
+        windows[minute // 1440] = windows.get(minute // 1440, 0.0) + rate / 60
+    
+    cap = calculator.daily_cap
+    return round(sum(min(price, cap) if cap is not None else price for price in windows.values()), 2)
+
+
+class TestCompiledTariff:
+    """Test cases for the precomputed cumulative price table."""
+
+    def test_flat_band(self):
+        """Test a single band behaves like a flat hourly rate."""
+        tariff = CompiledTariff([TimeBand(0, 6.0)])
+        
+        assert tariff.day_price == pytest.approx(144.0)
+        assert tariff.price_window(1380, 120) == pytest.approx(12.0)
+
+    def test_window_across_midnight(self):
+        """Test a window wrapping into the next day uses the night band."""
+        tariff = CompiledTariff(DAY_NIGHT_BANDS)
+        
+        # 18:00-20:00: one hour at 12, one hour at 4
+        assert tariff.price_window(18 * 60, 120) == pytest.approx(16.0)
+        # 06:00-08:00: one night hour carried over from 19:00, one day hour
+        assert tariff.price_window(6 * 60, 120) == pytest.approx(16.0)
+        assert tariff.day_price == pytest.approx(12 * 12.0 + 12 * 4.0)
+
+    @pytest.mark.parametrize("bands", [[], [TimeBand(60, 1.0), TimeBand(60, 2.0)], [TimeBand(1440, 1.0)]])
+    def test_invalid_bands(self, bands):
+        """Test that empty, duplicate or out-of-range bands are rejected."""
+        with pytest.raises(ValueError):
+            CompiledTariff(bands)
+
+
+class TestTariffFeeCalculator:
+    """Test cases for TariffFeeCalculator."""
+
+    def test_day_rate(self):
+        """Test a daytime stay with 15 minute increments."""
+        calculator = TariffFeeCalculator(DAY_NIGHT_BANDS)
+        
+        fee = calculator.calculate_stay_fee(datetime(2024, 1, 1, 10, 0), datetime(2024, 1, 1, 10, 50))
+        
+        # 50 minutes -> 60 minutes at $12/hour
+        assert fee == 12.0
+
+    def test_first_hour_premium(self):
+        """Test the premium rate replaces band rates for the first hour."""
+        calculator = TariffFeeCalculator(DAY_NIGHT_BANDS, first_period_rate=20.0)
+        
+        fee = calculator.calculate_stay_fee(datetime(2024, 1, 1, 10, 0), datetime(2024, 1, 1, 12, 0))
+        
+        assert fee == 32.0
+
+    def test_daily_cap(self):
+        """Test the cap applies to every 24 hours of parking."""
+        calculator = TariffFeeCalculator(DAY_NIGHT_BANDS, daily_cap=50.0)
+        
+        fee = calculator.calculate_stay_fee(datetime(2024, 1, 1, 10, 0), datetime(2024, 1, 3, 12, 0))
+        
+        # Two capped full days plus 10:00-12:00 at $12/hour
+        assert fee == 124.0
+
+    def test_non_positive_duration(self):
+        """Test zero and negative stays are free."""
+        calculator = TariffFeeCalculator(DAY_NIGHT_BANDS)
+        entry_time = datetime(2024, 1, 1, 10, 0)
+        
+        assert calculator.calculate_stay_fee(entry_time, entry_time) == 0.0
+        assert calculator.calculate_stay_fee(entry_time, entry_time - timedelta(minutes=5)) == 0.0
+
+    def test_time_zone(self):
+        """Test band times are applied in the configured time zone."""
+        calculator = TariffFeeCalculator(DAY_NIGHT_BANDS, tz='Asia/Jerusalem')
+        
+        # 17:30 UTC is 19:30 in Jerusalem (UTC+2 in January): night rate
+        fee = calculator.calculate_stay_fee(datetime(2024, 1, 1, 17, 30), datetime(2024, 1, 1, 18, 30))
+        
+        assert fee == 4.0
+
+    @pytest.mark.parametrize("daily_cap,first_period_rate", [(None, None), (60.0, None), (None, 25.0), (45.0, 30.0)])
+    def test_matches_minute_by_minute_reference(self, daily_cap, first_period_rate):
+        """Test compiled pricing against minute-by-minute pricing over many stays."""
+        bands = [TimeBand(0, 3.0), TimeBand(6 * 60 + 30, 9.0), TimeBand(9 * 60, 14.0), TimeBand(18 * 60, 7.5)]
+        calculator = TariffFeeCalculator(bands, daily_cap=daily_cap, first_period_rate=first_period_rate)
+        base = datetime(2024, 1, 1, 0, 0)
+        
+        for entry_offset in range(0, 1440, 97):
+            for duration in (1, 14, 59, 61, 400, 1439, 1440, 1441, 3000, 4400):
+                entry_time = base + timedelta(minutes=entry_offset)
+                exit_time = entry_time + timedelta(minutes=duration)
+                expected = reference_fee(calculator, bands, entry_time, exit_time)
+                assert calculator.calculate_stay_fee(entry_time, exit_time) == pytest.approx(expected, abs=0.011)
+
+    def test_long_stay(self):
+        """Test that multi-week stays price in constant work."""
+        calculator = TariffFeeCalculator(DAY_NIGHT_BANDS, daily_cap=50.0)
+        
+        fee = calculator.calculate_stay_fee(datetime(2024, 1, 1, 10, 0), datetime(2024, 3, 1, 10, 0))
+        
+        assert fee == 60 * 50.0
+
+    def test_from_json(self):
+        """Test building a calculator from a JSON schedule."""
+        schedule = json.dumps({
+            'bands': [{'start': '07:00', 'hourlyRate': 12}, {'start': '19:00', 'hourlyRate': 4}],
+            'dailyCap': 60,
+            'firstHourRate': 15,
+            'billingIncrementMinutes': 30
+        })
+        
+        calculator = TariffFeeCalculator.from_json(schedule)
+        
+        assert calculator.daily_cap == 60
+        assert calculator.first_period_rate == 15
+        assert calculator.billing_increment_minutes == 30
+        assert calculator.get_billing_info()['daily_cap_usd'] == 60
+
+    @pytest.mark.parametrize("value,expected", [('00:00', 0), ('07:30', 450), ('23:59', 1439)])
+    def test_parse_time_of_day(self, value, expected):
+        """Test parsing of band start times."""
+        assert parse_time_of_day(value) == expected
+
+    def test_parse_time_of_day_invalid(self):
+        """Test out-of-range band start times are rejected."""
+        with pytest.raises(ValueError):
+            parse_time_of_day('24:00')
@@ -0,0 +1,96 @@
+import pytest
+from datetime import datetime
+from unittest.mock import patch
+
+from src.models.ticket_id import (
+    SIGNED_ID_LENGTH, SignedTicketId, decode_signed_ticket_id, new_ticket_id, normalize_ticket_id
+)
+from src.services.parking_service import ParkingService
+from src.storage.memory import InMemoryStorage
+from src.utils.request_decoding import EXIT_REQUEST
+
+ENTRY_TIME = datetime(2024, 1, 1, 10, 0, 0)
+LEGACY_ID = 'a1b2c3d4-e5f6-7890-abcd-ef1234567890'
+
+
+@pytest.fixture
+def secret():
+    with patch.dict('os.environ', {'TICKET_ID_SECRET': 'test-secret'}):
+        yield
+
+
+class TestSignedTicketId:
+    """Test cases for signed ticket IDs."""
+
+    def test_round_trip(self, secret):
+        """Test that entry time and lot are recovered from the ID."""
+        ticket_id = new_ticket_id(ENTRY_TIME.replace(microsecond=123456), 42)
+        
+        assert len(ticket_id) == SIGNED_ID_LENGTH
+        assert decode_signed_ticket_id(ticket_id) == SignedTicketId(ENTRY_TIME, 42)
+        assert decode_signed_ticket_id(ticket_id.upper()) == SignedTicketId(ENTRY_TIME, 42)
+
+    def test_ids_are_unique_and_time_ordered(self, secret):
+        """Test that IDs sort by entry time."""
+        earlier = [new_ticket_id(datetime(2024, 1, 1, 10, 0, second), 9999) for second in range(30)]
+        later = new_ticket_id(datetime(2024, 1, 1, 10, 0, 30), 1)
+        
+        assert len(set(earlier)) == 30
+        assert sorted(earlier + [later])[-1] == later
+        assert sorted(earlier) == sorted(earlier, key=lambda ticket_id: decode_signed_ticket_id(ticket_id).entry_time)
+
+    def test_forged_id_rejected(self, secret):
+        """Test that a changed character or another key fails verification."""
+        ticket_id = new_ticket_id(ENTRY_TIME, 42)
+        tampered = ticket_id[:8] + ('0' if ticket_id[8] != '0' else '1') + ticket_id[9:]
+        
+        assert decode_signed_ticket_id(tampered) is None
+        with patch.dict('os.environ', {'TICKET_ID_SECRET': 'other-secret'}):
+            assert decode_signed_ticket_id(ticket_id) is None
+
+    @pytest.mark.parametrize('value', ['', 'x' * 32, 'i' * 32, '=' * 32, 'abc'])
+    def test_malformed_id_rejected(self, secret, value):
+        """Test that malformed IDs are rejected without raising."""
+        assert decode_signed_ticket_id(value) is None
+        assert normalize_ticket_id(value) is None
+
+    def test_uuid_without_secret(self):
+        """Test that IDs stay random UUIDs when no key is configured."""
+        with patch.dict('os.environ', {}, clear=True):
+            ticket_id = new_ticket_id(ENTRY_TIME, 42)
+            
+            assert len(ticket_id) == 36
+            assert decode_signed_ticket_id(ticket_id) is None
+
+    def test_legacy_ids_still_valid(self, secret):
+        """Test that UUID tickets keep working next to signed ones."""
+        assert normalize_ticket_id(LEGACY_ID) == LEGACY_ID
+        assert EXIT_REQUEST({'ticketId': LEGACY_ID}) == ({'ticket_id': LEGACY_ID}, None)
+
+    def test_exit_request_accepts_signed_ids(self, secret):
+        """Test that the exit decoder verifies and lower-cases signed IDs."""
+        ticket_id = new_ticket_id(ENTRY_TIME, 42)
+        
+        assert EXIT_REQUEST({'ticketId': f' {ticket_id.upper()} '}) == ({'ticket_id': ticket_id}, None)
+        assert EXIT_REQUEST({'ticketId': 'z' * 32}) == (None, "Invalid ticket ID format")
+
+
+class TestSignedTicketExit:
+    """Test cases for exits priced from signed ticket IDs."""
+
+    def test_entry_and_exit(self, secret):
+        """Test a full entry and exit with a signed ID."""
+        service = ParkingService(InMemoryStorage())
+        
+        with patch('models.parking_ticket.datetime') as mock_datetime:
+            mock_datetime.utcnow.return_value = ENTRY_TIME
+            ticket_id = service.create_entry('ABC123', 7)
+        
+        assert decode_signed_ticket_id(ticket_id) == SignedTicketId(ENTRY_TIME, 7)
+        
+        with patch('src.services.parking_service.datetime') as mock_datetime:
+            mock_datetime.utcnow.return_value = datetime(2024, 1, 1, 11, 0, 0)
+            result = service.process_exit(ticket_id)
+        
+        assert result == {'plate': 'ABC123', 'totalTimeMinutes': 60, 'parkingLot': 7, 'chargeUSD': 10.0}
+        assert service.get_occupancy([7]) == {7: 0}